@@ -0,0 +1 @@
+"""Benchmarks locais do pipeline de cliques (executados contra navegadores falsos)."""
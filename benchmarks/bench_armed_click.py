@@ -0,0 +1,92 @@
+"""
+Benchmark de desvio clique-a-clique: caminho serial atual x arm/fire.
+
+Uso:
+    python benchmarks/bench_armed_click.py --browsers 4 --rounds 50
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.atomic_click import AtomicClickExecutor
+from src.click_manager.sync_backends import UserspaceSyncBackend, select_sync_backend
+
+XPATH = "//button[@id='alvo']"
+
+
+def clicar_serial(drivers, xpaths):
+    """Reproduz o caminho anterior: preparação e cliques em série."""
+    elements = []
+    for driver, xpath in zip(drivers, xpaths):
+        element = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, xpath))
+        )
+        driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        elements.append(element)
+    for driver, element in zip(drivers, elements):
+        driver.execute_script("arguments[0].click();", element)
+
+
+def clicar_armado(executor, drivers, xpaths):
+    handle = executor.arm(drivers, xpaths)
+    executor.fire(handle)
+
+
+def medir(rodada, drivers, rounds):
+    """Executa `rodada` várias vezes e retorna o desvio (μs) entre navegadores."""
+    skews = []
+    for _ in range(rounds):
+        for driver in drivers:
+            driver.click_times.clear()
+        rodada()
+        times = [driver.click_times[-1] for driver in drivers]
+        skews.append((max(times) - min(times)) / 1000)
+    return skews
+
+
+def resumo(nome, skews):
+    skews = sorted(skews)
+    p50 = statistics.median(skews)
+    p90 = skews[int(len(skews) * 0.9) - 1]
+    print(f"{nome:<10} p50={p50:10.1f}μs  p90={p90:10.1f}μs  max={skews[-1]:10.1f}μs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--browsers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--rtt-ms', type=float, default=2.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.3)
+    parser.add_argument('--backend', choices=('auto', 'userspace'), default='userspace',
+                        help="backend de sincronização (auto usa o kernel se disponível)")
+    args = parser.parse_args()
+
+    drivers = [
+        FakeWebDriver(rtt_ms=args.rtt_ms, jitter_ms=args.jitter_ms, seed=i)
+        for i in range(args.browsers)
+    ]
+    xpaths = [XPATH] * args.browsers
+    logger = logging.getLogger("bench")
+    if args.backend == 'auto':
+        backend = select_sync_backend(logger)
+    else:
+        backend = UserspaceSyncBackend(logger)
+    executor = AtomicClickExecutor(logger, backend)
+    print(f"backend de sincronização: {backend.name}")
+
+    resumo("serial", medir(lambda: clicar_serial(drivers, xpaths), drivers, args.rounds))
+    resumo("armado", medir(lambda: clicar_armado(executor, drivers, xpaths), drivers, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark de transporte: execute_script via WebDriver HTTP x comandos CDP via websocket.
+
+Tudo roda localmente: um chromedriver falso (HTTP, respostas no formato W3C)
+atende o Selenium de verdade, e um servidor DevTools falso atende o
+CDPClickExecutor. Mede-se o round-trip de cada caminho e o custo de enviar
+o par mousePressed/mouseReleased em pipeline x um comando por vez.
+
+Uso:
+    python benchmarks/bench_cdp_transport.py --rounds 500 --browsers 4
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from selenium import webdriver
+from selenium.webdriver.remote.client_config import ClientConfig
+
+from benchmarks.fake_cdp_server import FakeCDPServer
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.cdp_click import CDPClickExecutor, CDPConnection, _mouse_event
+from src.click_manager.element_cache import ElementCache
+
+XPATH = "//button[@id='alvo']"
+
+
+def chromedriver_falso(debugger_address):
+    """Servidor HTTP com as rotas do chromedriver usadas pelo benchmark."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Como o chromedriver: sem atraso de Nagle nas respostas
+        disable_nagle_algorithm = True
+
+        def _responder(self, value):
+            corpo = json.dumps({"value": value}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def _ler(self):
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(tamanho)
+
+        def do_POST(self):
+            self._ler()
+            if self.path == "/session":
+                self._responder({
+                    "sessionId": "fake",
+                    "capabilities": {
+                        "browserName": "chrome",
+                        "goog:chromeOptions": {"debuggerAddress": debugger_address},
+                    },
+                })
+            else:
+                # /session/fake/execute/sync
+                self._responder(1)
+
+        def do_GET(self):
+            # /session/fake/window
+            self._responder("page-1")
+
+        def do_DELETE(self):
+            self._responder(None)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def cronometrar(funcao, rounds):
+    """Duração (μs) de cada execução de `funcao`."""
+    duracoes = []
+    for _ in range(rounds):
+        inicio = time.perf_counter_ns()
+        funcao()
+        duracoes.append((time.perf_counter_ns() - inicio) / 1000)
+    return duracoes
+
+
+def resumo(nome, valores):
+    valores = sorted(valores)
+    p50 = statistics.median(valores)
+    p99 = valores[max(0, int(len(valores) * 0.99) - 1)]
+    print(f"{nome:<40} p50 {p50:9.1f}μs   p99 {p99:9.1f}μs")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=500)
+    parser.add_argument('--browsers', type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    cdp = FakeCDPServer().start()
+    http = chromedriver_falso(cdp.address)
+
+    options = webdriver.ChromeOptions()
+    driver = webdriver.Remote(
+        command_executor=f"http://127.0.0.1:{http.server_port}",
+        options=options,
+        client_config=ClientConfig(f"http://127.0.0.1:{http.server_port}", keep_alive=True),
+    )
+    conexao = CDPConnection(cdp.url())
+
+    print(f"Round-trip de um comando ({args.rounds} rodadas)")
+    selenium_p50 = resumo("Selenium execute_script (HTTP)", cronometrar(
+        lambda: driver.execute_script("return 1"), args.rounds))
+    cdp_p50 = resumo("CDP Runtime.evaluate (websocket)", cronometrar(
+        lambda: conexao.call('Runtime.evaluate', {'expression': '1', 'returnByValue': True}),
+        args.rounds))
+    print(f"→ CDP {selenium_p50 / cdp_p50:.1f}x mais rápido por round-trip\n")
+
+    print("Par mousePressed/mouseReleased")
+    resumo("um comando por vez", cronometrar(lambda: [
+        conexao.call(*_mouse_event(tipo, 100.0, 50.0)) for tipo in ('mousePressed', 'mouseReleased')
+    ], args.rounds))
+    resumo("pipeline", cronometrar(lambda: conexao.pipeline([
+        _mouse_event(tipo, 100.0, 50.0) for tipo in ('mousePressed', 'mouseReleased')
+    ]), args.rounds))
+
+    def preparado():
+        ids, dados = conexao.prepare([_mouse_event(t, 100.0, 50.0) for t in ('mousePressed', 'mouseReleased')])
+        inicio = time.perf_counter_ns()
+        conexao.send_prepared(dados)
+        conexao.wait(ids)
+        return (time.perf_counter_ns() - inicio) / 1000
+    resumo("pipeline pré-serializado (disparo)", [preparado() for _ in range(args.rounds)])
+
+    # Executor completo: armação pelo WebDriver falso, disparo pelos websockets
+    drivers = [FakeWebDriver(rtt_ms=2.0, jitter_ms=0.5, seed=i) for i in range(args.browsers)]
+    paginas = {id(d): f"page-{i + 1}" for i, d in enumerate(drivers)}
+    executor = CDPClickExecutor(
+        logging.getLogger("bench"), ElementCache(), url_resolver=lambda d: cdp.url(paginas[id(d)])
+    )
+    skews = []
+    for _ in range(min(args.rounds, 100)):
+        handle = executor.arm(drivers, [XPATH] * len(drivers))
+        executor.fire(handle)
+        skews.append(handle.skew_ns() / 1000)
+    print(f"\nDisparo CDP em {args.browsers} navegadores")
+    resumo("desvio de envio entre navegadores", skews)
+    chegadas = [cdp.press_times(pagina)[-1] for pagina in paginas.values()]
+    print(f"{'desvio de chegada no servidor (última)':<40} {(max(chegadas) - min(chegadas)) / 1000:9.1f}μs")
+
+    executor.cleanup()
+    conexao.close()
+    driver.quit()
+    http.shutdown()
+    cdp.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Limites cgroup v2 por navegador e PSI no dimensionamento da frota.
+
+Roda o ProcessPlacementService sobre processos reais (benchmarks/bench_placement.py)
+com uma árvore cgroupfs falsa em um diretório temporário, verifica os
+arquivos escritos em cada grupo (cpuset.cpus, memory.high, memory.max,
+cpu.max), a reaplicação quando o PERFORMANCE_CONFIG muda, e depois escreve
+arquivos PSI simulados para conferir a reação do FleetScaler:
+
+- um navegador fora de controle (pressão só no próprio grupo): frota mantida
+- pressão de memória espalhada pela frota: encolhe um navegador
+- pressão de CPU: não cresce
+
+Uso:
+    python benchmarks/bench_cgroup_pressure.py [--navegadores 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+import psutil
+
+from benchmarks.bench_placement import abrir_navegador, aguardar_filhos, cgroupfs_falso
+from log_config import get_logger
+from navegador.frota import FleetScaler, processos_do_navegador
+from navegador.posicionamento import ProcessPlacementService
+from src.sistema.cgroup_v2 import CgroupManager, parse_size
+from src.sistema.cpu_manager import CPUManager
+
+logger = get_logger(__name__)
+
+GIB = 1024 ** 3
+
+
+def escrever_psi(caminho, memoria=0.0, cpu=0.0, atual=None, high=0):
+    def psi(avg10):
+        return (f"some avg10={avg10:.2f} avg60=0.00 avg300=0.00 total=0\n"
+                f"full avg10={avg10 / 2:.2f} avg60=0.00 avg300=0.00 total=0\n")
+    with open(os.path.join(caminho, "memory.pressure"), "w") as f:
+        f.write(psi(memoria))
+    with open(os.path.join(caminho, "cpu.pressure"), "w") as f:
+        f.write(psi(cpu))
+    with open(os.path.join(caminho, "memory.events"), "w") as f:
+        f.write(f"low 0\nhigh {high}\nmax 0\noom 0\noom_kill 0\n")
+    if atual is not None:
+        with open(os.path.join(caminho, "memory.current"), "w") as f:
+            f.write(f"{atual}\n")
+
+
+def ler(caminho, arquivo):
+    with open(os.path.join(caminho, arquivo)) as f:
+        return f.read().strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--navegadores', type=int, default=4)
+    args = parser.parse_args()
+
+    erros = []
+    drivers = [abrir_navegador() for _ in range(args.navegadores)]
+    with tempfile.TemporaryDirectory() as raiz:
+        try:
+            for driver in drivers:
+                aguardar_filhos(driver, 1)
+            performance_config = {'memoria_por_instancia': '2G', 'cores_por_instancia': 2}
+            cgroups = CgroupManager(logger, root=cgroupfs_falso(raiz))
+            servico = ProcessPlacementService(drivers, CPUManager(logger), cgroups=cgroups,
+                                              performance_config=performance_config)
+            servico.aplicar()
+
+            # Limites escritos em cada grupo
+            esperado = {"memory.high": str(3 * GIB), "memory.max": str(5 * GIB), "cpu.max": "200000 100000"}
+            for index, estado in sorted(servico.estados.items()):
+                caminho = cgroups.groups[estado.grupo]
+                arquivos = {nome: ler(caminho, nome) for nome in ("cpuset.cpus", *esperado)}
+                print(f"{estado.grupo}: " + ", ".join(f"{k}={v}" for k, v in arquivos.items()))
+                for nome, valor in esperado.items():
+                    if arquivos[nome] != valor:
+                        erros.append(f"{estado.grupo}: {nome}={arquivos[nome]}, esperado {valor}")
+
+            # RSS medido abaixo do orçamento (abas leves) não reduz os limites; acima dele, aumenta
+            for medido, base in (('900M', '2G'), ('3G', '3G')):
+                performance_config['rss_por_instancia'] = medido
+                servico.aplicar()
+                alta = ler(cgroups.groups[servico.estados[0].grupo], "memory.high")
+                print(f"rss_por_instancia={medido} -> memory.high={alta}")
+                if int(alta) != int(parse_size(base) * 1.5):
+                    erros.append(f"memory.high {alta} com rss_por_instancia={medido}, esperado 1,5x {base}")
+
+            pool = SimpleNamespace(ativos=drivers)
+            frota = FleetScaler(pool, {}, medidor=lambda ds: [(parse_size('900M'), 0.1)] * len(ds),
+                                memoria_disponivel=lambda: 64 * GIB, minimo=1, maximo=args.navegadores + 4,
+                                nucleos=64, pressao=servico.ler_pressao)
+            frota.medir()
+            grupos = [cgroups.groups[servico.estados[i].grupo] for i in range(args.navegadores)]
+
+            cenarios = []
+            # 1) Aba fora de controle no navegador 1: pressão no grupo dele (e, portanto, no grupo-base)
+            escrever_psi(cgroups.base, memoria=35.0)
+            escrever_psi(grupos[0], memoria=70.0, atual=int(1.3 * GIB), high=412)
+            for caminho in grupos[1:]:
+                escrever_psi(caminho, memoria=0.5, atual=700 * 1024 ** 2)
+            cenarios.append(("navegador 1 fora de controle", lambda alvo: alvo >= args.navegadores))
+            # 2) Pressão de memória espalhada: a frota é grande demais para o host
+            cenarios.append(("pressão espalhada", lambda alvo: alvo == args.navegadores - 1))
+            # 3) CPU saturada: sem pressão de memória, mas não cresce
+            cenarios.append(("CPU saturada", lambda alvo: alvo == args.navegadores))
+
+            for numero, (nome, ok) in enumerate(cenarios):
+                if numero == 1:
+                    escrever_psi(cgroups.base, memoria=25.0)
+                    for caminho in grupos:
+                        escrever_psi(caminho, memoria=25.0, atual=int(1.2 * GIB), high=30)
+                elif numero == 2:
+                    escrever_psi(cgroups.base, cpu=65.0)
+                    for caminho in grupos:
+                        escrever_psi(caminho, cpu=60.0, atual=700 * 1024 ** 2)
+                servico.aplicar()
+                alvo = frota.alvo()
+                print(f"{nome}: alvo {alvo} (frota {args.navegadores})")
+                if not ok(alvo):
+                    erros.append(f"{nome}: alvo {alvo}")
+            for linha in servico.resumo():
+                print(f"  {linha}")
+        finally:
+            for driver in drivers:
+                for proc in reversed(processos_do_navegador(driver)):
+                    try:
+                        proc.kill()
+                    except psutil.Error:
+                        pass
+                driver.service.process.wait()
+
+    for erro in erros:
+        print(f"❌ {erro}")
+    print("ok" if not erros else "FALHOU")
+    sys.exit(1 if erros else 0)
+
+
+if __name__ == '__main__':
+    main()
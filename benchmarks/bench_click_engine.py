@@ -0,0 +1,85 @@
+"""
+Benchmark de latência por comando "click": motor frio (criado a cada comando) x quente.
+
+Uso:
+    python benchmarks/bench_click_engine.py --browsers 4 --rounds 30
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.precision_click_manager import LinuxPrecisionClickManager
+from src.click_manager.sync_executor import SynchronizedClickExecutor
+from src.click_manager.timestamp_logger import PreciseTimestampLogger
+
+XPATH = "//button[@id='alvo']"
+
+
+def criar_executor(logger, num_browsers):
+    """Como o comando fazia antes: gerenciador completo por comando (ou só o executor sem dispositivo)."""
+    try:
+        manager = LinuxPrecisionClickManager(max_workers=num_browsers, logger=logger)
+        return manager.sync_executor, manager.cleanup
+    except OSError:
+        executor = SynchronizedClickExecutor(logger, PreciseTimestampLogger(logger), num_browsers)
+        return executor, executor.cleanup
+
+
+def comando_frio(logger, drivers, xpaths):
+    executor, cleanup = criar_executor(logger, len(drivers))
+    try:
+        executor.execute_synchronized_clicks(drivers, xpaths)
+    finally:
+        cleanup()
+
+
+def medir(fn, rounds):
+    tempos = []
+    for _ in range(rounds):
+        inicio = time.perf_counter_ns()
+        fn()
+        tempos.append((time.perf_counter_ns() - inicio) / 1e6)
+    return tempos
+
+
+def resumo(nome, tempos):
+    print(f"{nome:<6} p50={statistics.median(tempos):8.2f}ms  "
+          f"min={min(tempos):8.2f}ms  max={max(tempos):8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--browsers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=30)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    drivers = [FakeWebDriver(rtt_ms=1.0, jitter_ms=0.1, seed=i) for i in range(args.browsers)]
+    xpaths = [XPATH] * args.browsers
+
+    frio = medir(lambda: comando_frio(logger, drivers, xpaths), args.rounds)
+
+    executor, cleanup = criar_executor(logger, args.browsers)
+    try:
+        quente = medir(lambda: executor.execute_synchronized_clicks(drivers, xpaths), args.rounds)
+    finally:
+        cleanup()
+
+    resumo("frio", frio)
+    resumo("quente", quente)
+    print(f"custo de inicialização por comando: "
+          f"{statistics.median(frio) - statistics.median(quente):.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
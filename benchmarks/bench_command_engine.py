@@ -0,0 +1,68 @@
+"""
+Benchmark do comando 'new link': carregamento serial x motor assíncrono.
+
+Cada FakeWebDriver leva --carga-ms para concluir driver.get().
+
+Uso:
+    python benchmarks/bench_command_engine.py --browsers 8 --carga-ms 500
+"""
+import argparse
+import builtins
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.commands.engine import CommandEngine
+from src.commands.link_command import carregar_link, executar_comando_new_link
+
+LINK = "https://exemplo.local/pagina"
+
+
+class NavegadorComCarga(FakeWebDriver):
+    """FakeWebDriver cujo get() simula o carregamento completo da página."""
+
+    def __init__(self, carga_s, **kwargs):
+        super().__init__(**kwargs)
+        self.carga_s = carga_s
+
+    def get(self, url):
+        self._round_trip()
+        time.sleep(self.carga_s)
+        self.current_url = url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--browsers', type=int, default=8)
+    parser.add_argument('--carga-ms', type=float, default=500.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    builtins.input = lambda prompt: LINK
+    drivers = [NavegadorComCarga(args.carga_ms / 1000, seed=i) for i in range(args.browsers)]
+    config = {i: {"link": None, "xpaths": []} for i in range(args.browsers)}
+
+    inicio = time.perf_counter()
+    for index, driver in enumerate(drivers):
+        carregar_link(driver, index, LINK, config)
+    serial = time.perf_counter() - inicio
+
+    engine = CommandEngine()
+    inicio = time.perf_counter()
+    resultados = engine.executar(executar_comando_new_link(engine, drivers, config))
+    paralelo = time.perf_counter() - inicio
+    engine.encerrar()
+
+    ok = sum(1 for r in resultados.values() if r.ok)
+    print(f"'new link' em {args.browsers} navegadores (carga de {args.carga_ms:.0f}ms cada)")
+    print(f"  serial:           {serial:6.2f}s")
+    print(f"  motor assíncrono: {paralelo:6.2f}s  ({ok}/{len(resultados)} ok, {serial / paralelo:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Simulação do dimensionamento da frota com uma fábrica de navegadores falsa.
+
+Cada "navegador" é um FakeWebDriver que leva --abertura-ms para abrir e
+consome --rss-mb; a memória livre do host é simulada e sofre um pico de
+pressão no meio da execução para exercitar o encolhimento da frota.
+
+Uso:
+    python benchmarks/bench_fleet_scaling.py --memoria-gb 16 --rss-mb 700
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from navegador.pool_navegadores import BrowserPool
+from navegador.frota import FleetScaler
+
+
+class HostSimulado:
+    """Memória do host: total livre menos o RSS dos navegadores abertos e da pressão externa."""
+
+    def __init__(self, memoria_bytes, rss_bytes):
+        self.memoria = memoria_bytes
+        self.rss = rss_bytes
+        self.abertos = 0
+        self.pressao = 0
+        self.inicios = []
+        self.simultaneos = 0
+        self.pico_simultaneos = 0
+        self._lock = threading.Lock()
+
+    def disponivel(self):
+        return max(0, self.memoria - self.abertos * self.rss - self.pressao)
+
+    def fabrica(self, abertura_s):
+        def abrir(index, tempos):
+            with self._lock:
+                self.inicios.append(time.monotonic())
+                self.simultaneos += 1
+                self.pico_simultaneos = max(self.pico_simultaneos, self.simultaneos)
+            inicio = time.perf_counter()
+            time.sleep(abertura_s)
+            driver = FakeWebDriver(rtt_ms=0.2, seed=index)
+            original_quit = driver.quit
+
+            def quit():
+                with self._lock:
+                    self.abertos -= 1
+                original_quit()
+            driver.quit = quit
+            tempos['spawn'] = time.perf_counter() - inicio
+            with self._lock:
+                self.abertos += 1
+                self.simultaneos -= 1
+            return driver
+        return abrir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--memoria-gb', type=float, default=16)
+    parser.add_argument('--rss-mb', type=float, default=700)
+    parser.add_argument('--cpu', type=float, default=0.1, help="núcleos por navegador")
+    parser.add_argument('--abertura-ms', type=float, default=300)
+    parser.add_argument('--maximo', type=int, default=16)
+    parser.add_argument('--nucleos', type=int, default=16)
+    args = parser.parse_args()
+
+    rss = int(args.rss_mb * 1024 ** 2)
+    host = HostSimulado(int(args.memoria_gb * 1024 ** 3), rss)
+    pool = BrowserPool(2, num_reservas=0, fabrica=host.fabrica(args.abertura_ms / 1000))
+    drivers = []
+    navegadores_config = {i: {"link": None, "xpaths": []} for i in range(2)}
+
+    frota = FleetScaler(
+        pool,
+        navegadores_config,
+        medidor=lambda ds: [(rss, args.cpu)] * len(ds),
+        memoria_disponivel=host.disponivel,
+        maximo=args.maximo,
+        nucleos=args.nucleos,
+    )
+
+    inicio = time.perf_counter()
+    pool.iniciar(drivers)
+    tamanho = frota.dimensionar()
+    duracao = time.perf_counter() - inicio
+    intervalos = [b - a for a, b in zip(host.inicios, host.inicios[1:])]
+    print(f"inicial: {tamanho} navegadores em {duracao:.2f}s "
+          f"(pico de {host.pico_simultaneos} aberturas simultâneas, "
+          f"intervalo mínimo entre inícios {min(intervalos, default=0) * 1000:.0f}ms)")
+
+    host.pressao = int(host.memoria * 0.5)
+    print(f"pressão de memória: {frota.ajustar()} navegadores")
+
+    host.pressao = 0
+    for rodada in range(1, 5):
+        print(f"alívio, ajuste {rodada}: {frota.ajustar()} navegadores")
+
+    consistente = len(drivers) == len(navegadores_config) == len(pool.ativos)
+    print(f"drivers/navegadores_config consistentes: {consistente}")
+    pool.encerrar()
+
+
+if __name__ == '__main__':
+    main()
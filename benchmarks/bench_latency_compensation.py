@@ -0,0 +1,85 @@
+"""
+Benchmark de compensação de latência: desvio no DOM com liberação simultânea x atrasos por navegador.
+
+Os navegadores falsos têm latências diferentes (--rtts-ms), como páginas e
+núcleos diferentes na frota real. O desvio é medido no instante em que o
+clique chega a cada "navegador". Diferenças de latência menores que a
+incerteza da calibração de relógio (RTT/2 por navegador) não viram atraso,
+então com RTTs altos e próximos a compensação fica desligada.
+
+Uso:
+    python benchmarks/bench_latency_compensation.py --rtts-ms 1,2,4,8 --rounds 30
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.atomic_click import AtomicClickExecutor
+from src.click_manager.latency_model import DriverLatencyModel
+from src.click_manager.sync_backends import UserspaceSyncBackend
+
+XPATH = "//button[@id='alvo']"
+
+
+def medir(executor, drivers, rounds):
+    """Desvio real no "navegador" (μs) de cada rodada arm/fire."""
+    skews = []
+    for _ in range(rounds):
+        for driver in drivers:
+            driver.click_times.clear()
+        handle = executor.arm(drivers, [XPATH] * len(drivers))
+        executor.fire(handle)
+        times = [driver.click_times[-1] for driver in drivers]
+        skews.append((max(times) - min(times)) / 1000)
+    return skews
+
+
+def resumo(nome, skews):
+    skews = sorted(skews)
+    p90 = skews[max(0, int(len(skews) * 0.9) - 1)]
+    print(f"{nome:<14} p50={statistics.median(skews):9.1f}μs  p90={p90:9.1f}μs  max={skews[-1]:9.1f}μs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rtts-ms', default='1,2,4,8',
+                        help="RTT médio de cada navegador falso, separados por vírgula")
+    parser.add_argument('--jitter-ms', type=float, default=0.1)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=5,
+                        help="rodadas para o modelo aprender antes da medição compensada")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    logger = logging.getLogger("bench")
+    rtts = [float(rtt) for rtt in args.rtts_ms.split(',')]
+    drivers = [FakeWebDriver(rtt_ms=rtt, jitter_ms=args.jitter_ms, seed=i) for i, rtt in enumerate(rtts)]
+    backend = UserspaceSyncBackend(logger)
+    model = DriverLatencyModel()
+
+    sem = AtomicClickExecutor(logger, backend, latency_model=model, compensate=False)
+    resumo("sem compensação", medir(sem, drivers, args.rounds))
+
+    com = AtomicClickExecutor(logger, backend, latency_model=model)
+    medir(com, drivers, args.warmup)
+    resumo("com compensação", medir(com, drivers, args.rounds))
+
+    estimativas = [model.estimate_ns(driver) for driver in drivers]
+    print("latência estimada (ms): " + ", ".join(f"{e / 1e6:.2f}" for e in estimativas))
+    print("atrasos (ms): " + ", ".join(f"{d / 1e6:.2f}" for d in model.delays_ns(drivers)))
+    summary = model.skew_summary()
+    erro = summary['error_p50_ns'] / 1000
+    print(f"relatório do modelo (eco da página, últimas {summary['rounds']} rodadas): "
+          f"p50 {summary['before_p50_ns'] / 1000:.1f}±{erro:.1f}μs sem -> "
+          f"{summary['after_p50_ns'] / 1000:.1f}±{erro:.1f}μs com "
+          f"({summary['significant_rounds']} rodadas com melhora acima do erro)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark do custo de I/O de log no caminho do clique.
+
+Compara: sem logs, handler síncrono como antes (Formatter criado por registro)
+e o modo assíncrono (QueueHandler/QueueListener + hot_section).
+
+Uso:
+    python benchmarks/bench_log_overhead.py --browsers 4 --rounds 30
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from log_config import LogFormatter, setup_logging, stop_logging
+from src.click_manager.sync_executor import SynchronizedClickExecutor
+from src.click_manager.timestamp_logger import PreciseTimestampLogger
+
+XPATH = "//button[@id='alvo']"
+
+
+class LegacyLogFormatter(LogFormatter):
+    """Formatação anterior: um logging.Formatter novo a cada registro."""
+
+    def format(self, record):
+        log_fmt = self.FORMATS.get(record.levelno, "%(message)s")
+        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        return formatter.format(record)
+
+
+def configurar(modo, stream):
+    root = logging.getLogger()
+    if modo == "assincrono":
+        setup_logging(logging.INFO, async_mode=True, stream=stream, force=True)
+        return
+
+    setup_logging(logging.INFO, async_mode=False, stream=stream, force=True)
+    if modo == "sem-log":
+        root.setLevel(logging.WARNING)
+    else:
+        # Handler síncrono sem retenção na hot section, como antes
+        for handler in root.handlers:
+            handler.filters.clear()
+            handler.setFormatter(LegacyLogFormatter())
+
+
+def medir(executor, drivers, xpaths, rounds):
+    latencias, skews = [], []
+    for _ in range(rounds):
+        for driver in drivers:
+            driver.click_times.clear()
+        inicio = time.perf_counter_ns()
+        executor.execute_synchronized_clicks(drivers, xpaths)
+        latencias.append((time.perf_counter_ns() - inicio) / 1e6)
+        times = [driver.click_times[-1] for driver in drivers]
+        skews.append((max(times) - min(times)) / 1000)
+    return latencias, skews
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--browsers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=30)
+    args = parser.parse_args()
+
+    drivers = [FakeWebDriver(rtt_ms=1.0, jitter_ms=0.1, seed=i) for i in range(args.browsers)]
+    xpaths = [XPATH] * args.browsers
+
+    with tempfile.TemporaryFile('w') as stream:
+        resultados = {}
+        for modo in ("sem-log", "sincrono", "assincrono"):
+            configurar(modo, stream)
+            logger = logging.getLogger("bench")
+            executor = SynchronizedClickExecutor(logger, PreciseTimestampLogger(logger), args.browsers)
+            try:
+                resultados[modo] = medir(executor, drivers, xpaths, args.rounds)
+            finally:
+                executor.cleanup()
+        stop_logging()
+
+    for modo, (latencias, skews) in resultados.items():
+        print(f"{modo:<11} latência p50={statistics.median(latencias):7.2f}ms  "
+              f"desvio p50={statistics.median(skews):8.1f}μs  max={max(skews):8.1f}μs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Posicionamento das árvores de processos dos navegadores com processos reais.
+
+Cada "navegador" é um `sh` com um filho `sleep` (o "renderer"), ligado a um
+driver falso por `service.process`. O script aplica o plano, cria renderers
+novos depois da primeira rodada e verifica se a segunda rodada os encontra,
+comparando a afinidade de cada processo com as CPUs do slot. Com --cgroup,
+os grupos são criados numa árvore cgroupfs falsa em um diretório temporário.
+
+Uso:
+    python benchmarks/bench_placement.py [--navegadores 3] [--cgroup]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+import psutil
+
+from log_config import get_logger
+from navegador.frota import processos_do_navegador
+from navegador.posicionamento import ProcessPlacementService
+from src.sistema.cgroup_v2 import CgroupManager
+from src.sistema.cpu_manager import CPUManager
+
+logger = get_logger(__name__)
+
+# Um renderer no início e outro a cada linha recebida no stdin
+SCRIPT_NAVEGADOR = "sleep 60 & while read linha; do sleep 60 & done; wait"
+
+
+def abrir_navegador():
+    processo = subprocess.Popen(["sh", "-c", SCRIPT_NAVEGADOR], stdin=subprocess.PIPE, text=True)
+    return SimpleNamespace(service=SimpleNamespace(process=processo))
+
+
+def novo_renderer(driver):
+    driver.service.process.stdin.write("\n")
+    driver.service.process.stdin.flush()
+
+
+def aguardar_filhos(driver, quantidade, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if len(processos_do_navegador(driver)) >= quantidade + 1:
+            return
+        time.sleep(0.01)
+
+
+def verificar(servico, drivers):
+    erros = []
+    for index, driver in enumerate(drivers):
+        estado = servico.estados[index]
+        for proc in processos_do_navegador(driver):
+            afinidade = set(proc.cpu_affinity())
+            if afinidade != estado.cpus:
+                erros.append(f"navegador {index + 1}: PID {proc.pid} em {sorted(afinidade)}, esperado {sorted(estado.cpus)}")
+    return erros
+
+
+def cgroupfs_falso(raiz):
+    with open(os.path.join(raiz, "cgroup.controllers"), "w") as f:
+        f.write("cpuset cpu io memory pids\n")
+    return raiz
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--navegadores', type=int, default=3)
+    parser.add_argument('--cgroup', action='store_true', help="cgroups numa árvore cgroupfs falsa")
+    args = parser.parse_args()
+
+    drivers = [abrir_navegador() for _ in range(args.navegadores)]
+    temporario = tempfile.TemporaryDirectory() if args.cgroup else None
+    try:
+        for driver in drivers:
+            aguardar_filhos(driver, 1)
+        cgroups = CgroupManager(logger, root=cgroupfs_falso(temporario.name)) if temporario else None
+        servico = ProcessPlacementService(drivers, CPUManager(logger), cgroups=cgroups, memoria_max="3G")
+
+        inicio = time.perf_counter()
+        primeira = servico.aplicar()
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        print(f"1ª rodada: {primeira} processos posicionados em {duracao_ms:.1f} ms")
+
+        for driver in drivers:
+            novo_renderer(driver)
+            aguardar_filhos(driver, 2)
+        segunda = servico.aplicar()
+        terceira = servico.aplicar()
+        print(f"2ª rodada: {segunda} renderers novos; 3ª rodada: {terceira}")
+        for linha in servico.resumo():
+            print(f"  {linha}")
+
+        erros = verificar(servico, drivers)
+        if segunda != len(drivers):
+            erros.append(f"2ª rodada posicionou {segunda} processos, esperado {len(drivers)}")
+        if terceira:
+            erros.append(f"3ª rodada reposicionou {terceira} processos já vistos")
+        if cgroups is not None:
+            for index, estado in sorted(servico.estados.items()):
+                with open(os.path.join(cgroups.groups[estado.grupo], "cgroup.procs")) as f:
+                    print(f"  cgroup {estado.grupo}: último PID {f.read().strip()}")
+        for erro in erros:
+            print(f"❌ {erro}")
+        print("ok" if not erros else "FALHOU")
+        sys.exit(1 if erros else 0)
+    finally:
+        for driver in drivers:
+            for proc in reversed(processos_do_navegador(driver)):
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+            driver.service.process.wait()
+        if temporario:
+            temporario.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Latência de despertar e desvio de clique por política de escalonamento.
+
+Para cada política (off, fifo, deadline) roda a auto-medição estilo
+cyclictest do RTProfile com processos de carga ocupando as CPUs, confere
+que a política volta ao normal ao fim da janela e mede o desvio de
+envio do executor atômico com navegadores falsos. Sem root as políticas
+RT são recusadas e o perfil cai para 'off' (o script reporta a política
+efetivamente aplicada).
+
+Uso:
+    python benchmarks/bench_rt_wakeup.py [--carga 2] [--ciclos 1000] [--rounds 30]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.atomic_click import AtomicClickExecutor
+from src.click_manager.rt_profile import RT_POLICIES, RT_POLICY_OFF, RTProfile
+from src.click_manager.sync_backends import UserspaceSyncBackend
+
+XPATH = "//button[@id='alvo']"
+POLITICAS = {0: "SCHED_OTHER", 1: "SCHED_FIFO", 2: "SCHED_RR", 6: "SCHED_DEADLINE"}
+
+
+def queimar_cpu():
+    while True:
+        pass
+
+
+def politica_na_janela(profile):
+    """(política dentro da janela, política depois) na mesma thread."""
+    resultado = []
+
+    def medir():
+        with profile.window():
+            resultado.append(os.sched_getscheduler(0))
+        resultado.append(os.sched_getscheduler(0))
+
+    thread = threading.Thread(target=medir)
+    thread.start()
+    thread.join()
+    return [POLITICAS.get(p & ~os.SCHED_RESET_ON_FORK, p) for p in resultado]
+
+
+def desvio_atomico(profile, rounds, browsers):
+    drivers = [FakeWebDriver(rtt_ms=2.0, jitter_ms=0.3, seed=i) for i in range(browsers)]
+    logger = logging.getLogger("bench")
+    executor = AtomicClickExecutor(logger, UserspaceSyncBackend(logger), compensate=False, rt_profile=profile)
+    skews = []
+    for _ in range(rounds):
+        handle = executor.arm(drivers, [XPATH] * browsers)
+        executor.fire(handle)
+        if handle.skew_ns() is not None:
+            skews.append(handle.skew_ns() / 1000)
+    return statistics.median(skews), max(skews)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--carga', type=int, default=os.cpu_count(), help="processos ocupando CPU durante a medição")
+    parser.add_argument('--ciclos', type=int, default=1000)
+    parser.add_argument('--intervalo-us', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--browsers', type=int, default=4)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    carga = [multiprocessing.Process(target=queimar_cpu, daemon=True) for _ in range(args.carga)]
+    for proc in carga:
+        proc.start()
+    print(f"carga: {args.carga} processos ocupando CPU em {os.cpu_count()} CPUs")
+    try:
+        for policy in RT_POLICIES:
+            profile = RTProfile(logger, policy)
+            dentro, depois = politica_na_janela(profile)
+            report = profile.measure_wakeup_latency(args.intervalo_us, args.ciclos)
+            p50, pior = desvio_atomico(profile, args.rounds, args.browsers)
+            efetiva = f"{policy}->{profile.policy}" if profile.policy != policy else policy
+            print(f"{efetiva:<14} janela {dentro} / depois {depois}")
+            print(f"  despertar: {report.describe()} ({'apto' if report.fit else 'não apto'})")
+            print(f"  desvio de envio atômico: p50 {p50:.1f}μs, máx {pior:.1f}μs")
+            if depois != "SCHED_OTHER":
+                print(f"  ❌ política não restaurada ({depois})")
+                sys.exit(1)
+            if policy == RT_POLICY_OFF and dentro != "SCHED_OTHER":
+                print(f"  ❌ perfil 'off' alterou a política ({dentro})")
+                sys.exit(1)
+    finally:
+        for proc in carga:
+            proc.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark de clique em horário absoluto: espera + clique completo x agendador (arm antes, fire no alvo).
+
+O desvio é medido no "navegador" falso (instante em que o clique chega),
+convertido para horário de parede e comparado com o alvo.
+
+Uso:
+    python benchmarks/bench_target_click.py --browsers 4 --rounds 10
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.atomic_click import AtomicClickExecutor
+from src.click_manager.sync_backends import UserspaceSyncBackend
+from src.click_manager.target_time import TargetTimeScheduler, WallClockMapper, monotonic_to_raw_offset_ns
+
+XPATH = "//button[@id='alvo']"
+
+
+def desvios_us(drivers, mapper, alvo_ns):
+    """Chegada de cada clique (monotonic no driver falso) em relação ao alvo de parede (μs)."""
+    offset = monotonic_to_raw_offset_ns()
+    return [(mapper.raw_to_wall(d.click_times[-1] - offset) - alvo_ns) / 1000 for d in drivers]
+
+
+def rodada_espera(executor, scheduler, drivers, xpaths, alvo_ns):
+    """Caminho anterior: espera o horário e só então arma e dispara."""
+    scheduler.wait_until(alvo_ns)
+    executor.execute_synchronized_clicks(drivers, xpaths)
+
+
+def rodada_agendada(executor, scheduler, drivers, xpaths, alvo_ns):
+    scheduler.schedule(executor, drivers, xpaths, alvo_ns)
+
+
+def medir(rodada, executor, scheduler, drivers, xpaths, rounds, antecedencia_s):
+    erros = []
+    for _ in range(rounds):
+        for driver in drivers:
+            driver.click_times.clear()
+        alvo_ns = time.time_ns() + int(antecedencia_s * 1e9)
+        rodada(executor, scheduler, drivers, xpaths, alvo_ns)
+        erros.extend(desvios_us(drivers, scheduler.mapper, alvo_ns))
+    return erros
+
+
+def resumo(nome, erros):
+    erros = sorted(erros)
+    absolutos = sorted(abs(e) for e in erros)
+    print(f"{nome:<10} mediana={statistics.median(erros):+10.1f}μs  "
+          f"p90|erro|={absolutos[int(len(absolutos) * 0.9) - 1]:10.1f}μs  "
+          f"faixa=[{erros[0]:+.1f}, {erros[-1]:+.1f}]μs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--browsers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--rtt-ms', type=float, default=2.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.3)
+    parser.add_argument('--antecedencia-s', type=float, default=0.5,
+                        help="distância entre o agendamento e o horário alvo")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    logger = logging.getLogger("bench")
+    drivers = [
+        FakeWebDriver(rtt_ms=args.rtt_ms, jitter_ms=args.jitter_ms, seed=i)
+        for i in range(args.browsers)
+    ]
+    xpaths = [XPATH] * args.browsers
+    executor = AtomicClickExecutor(logger, UserspaceSyncBackend(logger))
+    scheduler = TargetTimeScheduler(logger, WallClockMapper())
+
+    resumo("espera", medir(rodada_espera, executor, scheduler, drivers, xpaths, args.rounds, args.antecedencia_s))
+    resumo("agendado", medir(rodada_agendada, executor, scheduler, drivers, xpaths, args.rounds, args.antecedencia_s))
+    print(f"drift estimado: {scheduler.mapper.drift_ppm:+.3f}ppm  "
+          f"armação estimada: {scheduler.latency.lead_ns(drivers) / 1e6:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
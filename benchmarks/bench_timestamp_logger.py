@@ -0,0 +1,75 @@
+"""
+Micro-benchmark do custo por chamada de log_timestamp: lista de dicts x buffer circular.
+
+Uso:
+    python benchmarks/bench_timestamp_logger.py --calls 100000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from src.click_manager.timestamp_logger import PreciseTimestampLogger
+
+
+class LegacyTimestampLogger:
+    """Implementação anterior: um dict por evento em uma lista sem limite."""
+
+    def __init__(self):
+        self.timestamps = []
+        self.click_timestamps = []
+
+    def log_timestamp(self, event_name, driver_id):
+        timestamp = {
+            'event': event_name,
+            'driver_id': driver_id,
+            'monotonic_ns': time.monotonic_ns(),
+            'process_time_ns': time.process_time_ns(),
+            'thread_time_ns': time.thread_time_ns()
+        }
+        self.timestamps.append(timestamp)
+        if event_name == 'Post-Click':
+            self.click_timestamps.append(timestamp)
+
+
+def medir(ts_logger, calls, repeticoes=5):
+    """Retorna (melhor ns por chamada, KiB retidos após as chamadas)."""
+    driver_id = id(ts_logger)
+    ts_logger.log_timestamp('Post-Barrier', driver_id)  # aquece o buffer da thread
+
+    ns_por_chamada = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        for _ in range(calls):
+            ts_logger.log_timestamp('Post-Barrier', driver_id)
+        ns_por_chamada = min(ns_por_chamada, (time.perf_counter_ns() - inicio) / calls)
+
+    tracemalloc.start()
+    for _ in range(calls):
+        ts_logger.log_timestamp('Post-Barrier', driver_id)
+    retido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ns_por_chamada, retido / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    implementacoes = [
+        ("lista", LegacyTimestampLogger()),
+        ("circular", PreciseTimestampLogger(logging.getLogger("bench"))),
+    ]
+    for nome, ts_logger in implementacoes:
+        ns, kib = medir(ts_logger, args.calls)
+        print(f"{nome:<9} {ns:8.1f} ns/chamada  memória retida={kib:10.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Camada de ajustes do sistema: custo, idempotência e restauração garantida.
+
+Monta uma raiz falsa de sysfs/procfs em um diretório temporário (swappiness,
+THP no formato 'always madvise [never]', governor por CPU, no_turbo e boost)
+e confere o TuningEngine:
+
+- tempo da abordagem antiga (um `sh -c 'echo v > arquivo'` por ajuste)
+  contra as escritas diretas
+- apply() -> restore() devolve exatamente os originais
+- um segundo apply() não regrava nada e preserva o snapshot original
+- SIGTERM (SignalHandler com exit_on_signal) e saída normal (atexit)
+  restauram em um subprocesso
+
+Uso:
+    python benchmarks/bench_tuning.py [--cpus 8] [--repeticoes 20]
+"""
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from src.sistema.tuning import TuningEngine, _selected
+
+ORIGINAIS = {
+    "proc/sys/vm/swappiness": "60",
+    "sys/kernel/mm/transparent_hugepage/enabled": "always [madvise] never",
+    "sys/kernel/mm/transparent_hugepage/defrag": "always defer defer+madvise [madvise] never",
+    "sys/devices/system/cpu/intel_pstate/no_turbo": "0",
+    "sys/devices/system/cpu/cpufreq/boost": "1",
+}
+
+# Subprocesso: aplica, instala os ganchos e espera o sinal (ou sai normalmente)
+FILHO = """
+import logging, sys, time
+sys.path[:0] = [{root!r}, {src!r}]
+from src.sistema.signal_handler import SignalHandler, TERMINATION_SIGNALS
+from src.sistema.tuning import TuningEngine
+logger = logging.getLogger("filho")
+engine = TuningEngine(logger, root={raiz!r}, vendor="Intel")
+engine.install_restore_hooks(SignalHandler(logger, signals=TERMINATION_SIGNALS, exit_on_signal=True))
+engine.apply()
+print("pronto", flush=True)
+if {esperar!r}:
+    time.sleep(30)
+"""
+
+
+def raiz_falsa(raiz, cpus):
+    arquivos = dict(ORIGINAIS)
+    for cpu in range(cpus):
+        arquivos[f"sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor"] = "powersave"
+    for relativo, valor in arquivos.items():
+        caminho = os.path.join(raiz, relativo)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, "w") as f:
+            f.write(valor + "\n")
+    return arquivos
+
+
+def estado(raiz, arquivos):
+    estado_atual = {}
+    for relativo in arquivos:
+        with open(os.path.join(raiz, relativo)) as f:
+            estado_atual[relativo] = _selected(f.read())
+    return estado_atual
+
+
+def tempo_subprocesso(engine):
+    """Abordagem antiga: um shell por arquivo."""
+    inicio = time.perf_counter()
+    for knob in engine.profile:
+        if knob.vendor and knob.vendor != engine.vendor:
+            continue
+        for caminho in engine._expand(knob):
+            subprocess.run(["sh", "-c", f"echo {knob.value} > {caminho}"], check=True)
+    return time.perf_counter() - inicio
+
+
+def rodar_filho(raiz, esperar):
+    codigo = FILHO.format(root=ROOT, src=os.path.join(ROOT, 'src'), raiz=raiz, esperar=esperar)
+    proc = subprocess.Popen([sys.executable, "-c", codigo], stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()
+    if esperar:
+        proc.send_signal(signal.SIGTERM)
+    proc.wait(timeout=30)
+    return proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cpus', type=int, default=8)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    erros = []
+    with tempfile.TemporaryDirectory() as raiz:
+        arquivos = raiz_falsa(raiz, args.cpus)
+        original = estado(raiz, arquivos)
+
+        # Custo: shell por ajuste x escrita direta (sempre partindo dos originais)
+        antigos, diretos = [], []
+        for _ in range(args.repeticoes):
+            raiz_falsa(raiz, args.cpus)
+            antigos.append(tempo_subprocesso(TuningEngine(logger, root=raiz, vendor="Intel")))
+            raiz_falsa(raiz, args.cpus)
+            engine = TuningEngine(logger, root=raiz, vendor="Intel")
+            inicio = time.perf_counter()
+            engine.apply()
+            diretos.append(time.perf_counter() - inicio)
+            engine.restore()
+        antigo, direto = sorted(antigos)[len(antigos) // 2], sorted(diretos)[len(diretos) // 2]
+        print(f"{len(engine.results)} arquivos: sh -c echo {antigo * 1000:.2f}ms, "
+              f"escrita direta {direto * 1000:.2f}ms ({antigo / direto:.0f}x)")
+
+        # apply -> restore devolve os originais
+        raiz_falsa(raiz, args.cpus)
+        engine = TuningEngine(logger, root=raiz, vendor="Intel")
+        engine.apply()
+        for linha in engine.report():
+            print(f"  {linha}")
+        aplicado = estado(raiz, arquivos)
+        if aplicado["proc/sys/vm/swappiness"] != "10" or aplicado["sys/kernel/mm/transparent_hugepage/enabled"] != "never":
+            erros.append(f"perfil não aplicado: {aplicado}")
+        if aplicado["sys/devices/system/cpu/cpufreq/boost"] != "1":
+            erros.append("ajuste de AMD aplicado em CPU Intel")
+
+        # Segundo apply: nada regravado, snapshot intacto
+        snapshot = dict(engine.originals)
+        segundo = engine.apply()
+        regravados = [r.name for r in segundo if r.status != "inalterado"]
+        print(f"segundo apply: {len(segundo) - len(regravados)}/{len(segundo)} inalterados")
+        if regravados or engine.originals != snapshot:
+            erros.append(f"segundo apply regravou {regravados} ou alterou o snapshot")
+
+        engine.restore()
+        if engine.restore() != 0:
+            erros.append("restore() não é idempotente")
+        if estado(raiz, arquivos) != original:
+            erros.append(f"restore: {estado(raiz, arquivos)} != {original}")
+        else:
+            print("apply -> restore: originais devolvidos")
+
+        # Restauração no SIGTERM e no atexit de um processo real
+        for nome, esperar in (("SIGTERM", True), ("atexit", False)):
+            raiz_falsa(raiz, args.cpus)
+            codigo = rodar_filho(raiz, esperar)
+            restaurado = estado(raiz, arquivos) == original
+            print(f"{nome}: código de saída {codigo}, {'restaurado' if restaurado else 'NÃO restaurado'}")
+            if not restaurado:
+                erros.append(f"{nome}: originais não restaurados")
+
+    for erro in erros:
+        print(f"❌ {erro}")
+    print("ok" if not erros else "FALHOU")
+    sys.exit(1 if erros else 0)
+
+
+if __name__ == '__main__':
+    main()
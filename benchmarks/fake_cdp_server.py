@@ -0,0 +1,75 @@
+"""Servidor DevTools falso para benchmarks: websocket local que responde comandos CDP."""
+import asyncio
+import json
+import threading
+import time
+
+from websockets.asyncio.server import serve
+
+
+class FakeCDPServer:
+    """
+    Servidor websocket que imita o endpoint /devtools/page/<id> do Chrome.
+
+    Todo comando recebe {"id", "result"} na hora; Runtime.evaluate devolve
+    o valor 1 e os Input.dispatchMouseEvent são registrados com o instante
+    de chegada, por página.
+
+    Args:
+        host: Endereço de escuta
+        port: Porta (0 = escolhida pelo sistema)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.events = {}
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}"
+
+    def url(self, page="page-1"):
+        return f"ws://{self.address}/devtools/page/{page}"
+
+    async def _handler(self, websocket):
+        page = websocket.request.path.rsplit("/", 1)[-1]
+        async for raw in websocket:
+            message = json.loads(raw)
+            result = {}
+            if message.get("method") == "Runtime.evaluate":
+                result = {"result": {"type": "number", "value": 1}}
+            elif message.get("method") == "Input.dispatchMouseEvent":
+                self.events.setdefault(page, []).append(
+                    (message["params"]["type"], time.monotonic_ns())
+                )
+            await websocket.send(json.dumps({"id": message["id"], "result": result}))
+
+    async def _main(self):
+        self._stop = asyncio.Event()
+        async with serve(self._handler, self.host, self.port, compression=None) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(self._main(),), name="fake-cdp", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def press_times(self, page="page-1"):
+        return [t for kind, t in self.events.get(page, []) if kind == "mousePressed"]
+
+    def stop(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
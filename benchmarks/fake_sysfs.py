@@ -0,0 +1,87 @@
+"""
+Árvores sysfs falsas para a descoberta de topologia de CPU.
+
+Cada layout reproduz os arquivos lidos por src/sistema/cpu_topology.py
+(online, topology/*, cache/index*/, node*/cpulist e /proc/cpuinfo) com a
+numeração que o kernel usa em cada família de processador.
+"""
+import os
+
+VENDOR_IDS = {"AMD": "AuthenticAMD", "Intel": "GenuineIntel"}
+
+
+def _cpu_list(cpus):
+    from src.sistema.cpu_topology import format_cpu_list
+    return format_cpu_list(cpus)
+
+
+def layout_smt(packages, cores_per_l3, l3_per_package, smt=True, vendor="AMD", numa_per_package=True):
+    """
+    Layout com a numeração usual do Linux: primeiro todos os threads 0 dos
+    núcleos, depois os irmãos SMT (cpu N e N + núcleos totais).
+    """
+    cores_total = packages * l3_per_package * cores_per_l3
+    cpus = []
+    core = 0
+    for package in range(packages):
+        for _ in range(l3_per_package):
+            group_cores = list(range(core, core + cores_per_l3))
+            l3 = set(group_cores) | ({c + cores_total for c in group_cores} if smt else set())
+            for c in group_cores:
+                siblings = {c, c + cores_total} if smt else {c}
+                node = package if numa_per_package else 0
+                for cpu in sorted(siblings):
+                    cpus.append({"cpu": cpu, "package": package, "core": c, "siblings": siblings,
+                                 "l3": l3, "node": node})
+            core += cores_per_l3
+    return {"vendor": vendor, "cpus": sorted(cpus, key=lambda c: c["cpu"]), "l3": True, "numa": True}
+
+
+# Layouts de referência
+LAYOUTS = {
+    # Ryzen 9 5900X: 12 núcleos/24 threads, 2 CCX de 6 núcleos
+    "ryzen_5900x": layout_smt(1, 6, 2, vendor="AMD"),
+    # Core i7 de 8 núcleos/16 threads, L3 único
+    "intel_8c16t": layout_smt(1, 8, 1, vendor="Intel"),
+    # Xeon com 2 sockets de 8 núcleos/16 threads, um nó NUMA por socket
+    "xeon_2s": layout_smt(2, 8, 1, vendor="Intel"),
+    # EPYC 7313: 16 núcleos/32 threads, 4 CCDs de 4 núcleos
+    "epyc_7313": layout_smt(1, 4, 4, vendor="AMD", numa_per_package=False),
+    # VM com 4 vCPUs, sem SMT, sem L3 nem nós NUMA expostos
+    "vm_4vcpu": dict(layout_smt(1, 4, 1, smt=False, vendor="Intel"), l3=False, numa=False),
+}
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+def write_sysfs(root, layout):
+    """Escreve o layout em `root` e retorna `root` (use como sysfs_root)."""
+    cpu_root = os.path.join(root, "sys/devices/system/cpu")
+    cpus = layout["cpus"]
+    _write(os.path.join(cpu_root, "online"), _cpu_list(c["cpu"] for c in cpus))
+    for c in cpus:
+        base = os.path.join(cpu_root, f"cpu{c['cpu']}")
+        _write(os.path.join(base, "topology/core_id"), str(c["core"]))
+        _write(os.path.join(base, "topology/physical_package_id"), str(c["package"]))
+        _write(os.path.join(base, "topology/thread_siblings_list"), _cpu_list(c["siblings"]))
+        _write(os.path.join(base, "cache/index0/level"), "1")
+        _write(os.path.join(base, "cache/index0/shared_cpu_list"), _cpu_list(c["siblings"]))
+        _write(os.path.join(base, "cache/index2/level"), "2")
+        _write(os.path.join(base, "cache/index2/shared_cpu_list"), _cpu_list(c["siblings"]))
+        if layout["l3"]:
+            _write(os.path.join(base, "cache/index3/level"), "3")
+            _write(os.path.join(base, "cache/index3/shared_cpu_list"), _cpu_list(c["l3"]))
+    if layout["numa"]:
+        nodes = {}
+        for c in cpus:
+            nodes.setdefault(c["node"], set()).add(c["cpu"])
+        for node, members in nodes.items():
+            _write(os.path.join(root, f"sys/devices/system/node/node{node}/cpulist"), _cpu_list(members))
+    _write(os.path.join(root, "proc/cpuinfo"), "\n\n".join(
+        f"processor\t: {c['cpu']}\nvendor_id\t: {VENDOR_IDS[layout['vendor']]}" for c in cpus
+    ))
+    return root
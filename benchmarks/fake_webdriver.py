@@ -0,0 +1,108 @@
+"""WebDriver falso para benchmarks: simula a latência HTTP do chromedriver."""
+import random
+import threading
+import time
+
+
+class FakeElement:
+    """Elemento mínimo compatível com as condições do WebDriverWait."""
+
+    def __init__(self, driver, xpath):
+        self.parent = driver
+        self.xpath = xpath
+        self.id = f"{id(driver)}:{xpath}"
+        self.tag_name = "button"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.parent._round_trip(click=True)
+
+
+class FakeWebDriver:
+    """
+    Simula um WebDriver remoto.
+
+    Cada chamada custa um round-trip: metade da latência até o "navegador",
+    onde o clique é registrado, e metade de volta.
+
+    Args:
+        rtt_ms: Latência média de ida e volta por comando
+        jitter_ms: Desvio padrão da latência
+        seed: Semente do gerador aleatório
+        clock_resolution_ms: Granularidade de performance.now() na página
+    """
+
+    def __init__(self, rtt_ms=2.0, jitter_ms=0.5, seed=None, url="about:blank", clock_resolution_ms=0.1):
+        self.rtt_s = rtt_ms / 1000
+        self.jitter_s = jitter_ms / 1000
+        self.random = random.Random(seed)
+        self.session_id = f"fake-{id(self)}"
+        self.current_url = url
+        self.title = "fake"
+        self.click_times = []
+        self.calls = 0
+        self.clock_resolution_ms = clock_resolution_ms
+        self._lock = threading.Lock()
+        self._navigate()
+
+    def _navigate(self):
+        """Nova página: novo performance.timeOrigin."""
+        self.origin_ns = time.monotonic_ns()
+        self.time_origin = time.time() * 1000
+
+    def _page_now(self, monotonic_ns):
+        """performance.now() da página no instante `monotonic_ns`, com a granularidade do navegador."""
+        now = (monotonic_ns - self.origin_ns) / 1e6
+        return now - now % self.clock_resolution_ms
+
+    def _half_trip(self):
+        delay = max(0.0, self.random.gauss(self.rtt_s / 2, self.jitter_s))
+        time.sleep(delay)
+
+    def _round_trip(self, click=False):
+        if self.session_id is None:
+            raise RuntimeError("sessão encerrada")
+        with self._lock:
+            self.calls += 1
+        self._half_trip()
+        arrival = time.monotonic_ns()
+        if click:
+            self.click_times.append(arrival)
+        self._half_trip()
+        return arrival
+
+    def find_element(self, by=None, value=None):
+        self._round_trip()
+        return FakeElement(self, value)
+
+    def execute_script(self, script, *args):
+        arrival = self._round_trip(click="click()" in script)
+        if "isConnected" in script:
+            # Validação em lote do cache de elementos: tudo continua conectado
+            return [self.current_url, [element and element.tag_name for element in args[0]]]
+        if "clique-sem-animacoes" in script and "location.href" in script:
+            # Preparação da sessão: página já sem animações
+            return [self.current_url, False]
+        if "document.evaluate" in script:
+            # Localização em lote: todo XPath existe na página falsa
+            return [[FakeElement(self, xpath), "button"] for xpath in args[0]]
+        if "getBoundingClientRect" in script:
+            # Centro da caixa do elemento para o clique via CDP
+            return [100.0, 50.0]
+        if "performance.timeOrigin" in script:
+            # Relógio da página (calibração e eco do instante do clique)
+            return [self.time_origin, self._page_now(arrival)]
+        return None
+
+    def get(self, url):
+        self._round_trip()
+        self.current_url = url
+        self._navigate()
+
+    def quit(self):
+        self.session_id = None
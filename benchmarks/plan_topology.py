@@ -0,0 +1,100 @@
+"""
+Descoberta de topologia e plano de posicionamento sobre layouts sysfs falsos.
+
+Para cada layout de benchmarks/fake_sysfs.py, descobre a topologia, monta o
+plano para várias frotas e verifica as regras do planejador: sistema separado
+e limitado a poucos núcleos, Chrome e worker de cada navegador no mesmo L3,
+núcleo do worker sem irmão SMT ocupado quando marcado como exclusivo e, havendo
+núcleo livre no L3, Chrome fora dos núcleos de worker. Sai com código 1 se
+alguma regra falhar.
+
+Uso:
+    python benchmarks/plan_topology.py [--layout ryzen_5900x] [--browsers 1,2,4,8] [--verbose]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+from benchmarks.fake_sysfs import LAYOUTS, write_sysfs
+from src.sistema.cpu_topology import SYSTEM_CORES, discover_topology, plan_placement
+
+
+def verificar(topology, plan, browsers):
+    """Lista de violações das regras do plano."""
+    erros = []
+    nucleos_sistema = {topology.cpus[cpu].siblings for cpu in plan.system}
+    if len(nucleos_sistema) > SYSTEM_CORES:
+        erros.append(f"sistema reserva {len(nucleos_sistema)} núcleos (máximo {SYSTEM_CORES})")
+    if len(plan.slots) != browsers:
+        erros.append(f"{len(plan.slots)} slots para {browsers} navegadores")
+    ocupadas = set()
+    for slot in plan.slots:
+        nome = f"navegador {slot.index + 1}"
+        cpus = slot.browser_cpus | {slot.worker_cpu}
+        if not slot.browser_cpus or slot.worker_cpu is None:
+            erros.append(f"{nome}: sem CPUs")
+        if cpus & plan.system:
+            erros.append(f"{nome}: usa CPUs do sistema {sorted(cpus & plan.system)}")
+        if not cpus <= slot.l3:
+            erros.append(f"{nome}: fora do próprio L3")
+        ocupadas |= slot.browser_cpus
+    por_l3 = {}
+    for slot in plan.slots:
+        por_l3[slot.l3] = por_l3.get(slot.l3, 0) + 1
+    for slot in plan.slots:
+        # Com ao menos duas CPUs por navegador no L3, a CPU do worker não roda Chrome
+        if slot.worker_cpu in ocupadas and len(slot.l3) >= 2 * por_l3[slot.l3]:
+            erros.append(f"navegador {slot.index + 1}: CPU do worker {slot.worker_cpu} também roda Chrome")
+    for slot in plan.slots:
+        # Com mais de um núcleo no L3, o Chrome não usa irmão SMT de worker
+        if len({topology.cpus[cpu].siblings for cpu in slot.l3}) > 1:
+            nucleos_worker = {topology.cpus[s.worker_cpu].siblings for s in plan.slots if s.l3 == slot.l3}
+            dividido = set().union(*nucleos_worker) & slot.browser_cpus
+            if dividido:
+                erros.append(f"navegador {slot.index + 1}: Chrome em núcleo de worker {sorted(dividido)}")
+        if slot.worker_exclusive:
+            nucleo = topology.cpus[slot.worker_cpu].siblings
+            outros = {s.worker_cpu for s in plan.slots if s is not slot}
+            if nucleo & (ocupadas | outros):
+                erros.append(f"navegador {slot.index + 1}: núcleo do worker dividido com {sorted(nucleo & (ocupadas | outros))}")
+    return erros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), default=None)
+    parser.add_argument('--browsers', default='1,2,4,8')
+    parser.add_argument('--verbose', action='store_true', help="imprime o plano de cada frota")
+    args = parser.parse_args()
+
+    frotas = [int(n) for n in args.browsers.split(',')]
+    falhas = 0
+    for nome in [args.layout] if args.layout else sorted(LAYOUTS):
+        layout = LAYOUTS[nome]
+        with tempfile.TemporaryDirectory() as raiz:
+            topology = discover_topology(write_sysfs(raiz, layout))
+        print(f"{nome}: {topology.describe()}")
+        if topology.vendor != layout["vendor"]:
+            print(f"  ❌ fabricante {topology.vendor}, esperado {layout['vendor']}")
+            falhas += 1
+        for browsers in frotas:
+            plan = plan_placement(topology, browsers)
+            erros = verificar(topology, plan, browsers)
+            exclusivos = sum(slot.worker_exclusive for slot in plan.slots)
+            print(f"  {browsers:>2} navegadores: {'ok' if not erros else 'FALHOU'} "
+                  f"({exclusivos}/{browsers} workers com núcleo exclusivo)")
+            for erro in erros:
+                print(f"    ❌ {erro}")
+            if args.verbose or erros:
+                for line in plan.describe():
+                    print(f"    {line}")
+            falhas += bool(erros)
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Reexecuta um plano de comandos contra navegadores falsos.
+
+Os horários de clique são rebaseados para --inicio-s segundos a partir de
+agora (mantendo o espaçamento entre eles), então o mesmo plano serve para
+comparar mudanças no código ao longo do tempo.
+
+Uso:
+    python benchmarks/replay_plan.py benchmarks/planos/exemplo.json --browsers 4 --resultados /tmp/r.json
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+import config
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.commands.click_command import executar_cliques_simultaneos
+from src.commands.engine import CommandEngine
+from src.commands.plan import carregar_plano, executar_plano, horario_epoch, salvar_resultados
+
+
+def rebasear_horarios(plano, inicio_s):
+    """Move os cliques agendados para começar daqui a `inicio_s` segundos."""
+    plano = copy.deepcopy(plano)
+    agendados = [p for p in plano["passos"] if p["comando"] == "click" and "horario" in p]
+    if agendados:
+        primeiro = min(horario_epoch(p["horario"]) for p in agendados)
+        base = time.time() + inicio_s
+        for passo in agendados:
+            passo["horario"] = base + horario_epoch(passo["horario"]) - primeiro
+    return plano
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('plano')
+    parser.add_argument('--browsers', type=int, default=4)
+    parser.add_argument('--rtt-ms', type=float, default=2.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.5)
+    parser.add_argument('--inicio-s', type=float, default=1.0)
+    parser.add_argument('--resultados', default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    # Navegadores falsos no lugar da frota real (a validação do clique lê config.drivers)
+    config.drivers[:] = [
+        FakeWebDriver(args.rtt_ms, args.jitter_ms, seed=i) for i in range(args.browsers)
+    ]
+    config.navegadores_config.clear()
+    config.navegadores_config.update({i: {"link": None, "xpaths": []} for i in range(args.browsers)})
+
+    desvios = []
+
+    def clicar(drivers, navegadores_config, mode=None, horario=None):
+        """Clique real do projeto + desvio entre navegadores medido no "navegador"."""
+        for driver in drivers:
+            driver.click_times.clear()
+        ok = executar_cliques_simultaneos(drivers, navegadores_config, mode=mode, horario=horario)
+        tempos = [d.click_times[-1] for d in drivers if d.click_times]
+        desvios.append(round((max(tempos) - min(tempos)) / 1000, 3) if len(tempos) == len(drivers) else None)
+        return ok
+
+    plano = rebasear_horarios(carregar_plano(args.plano), args.inicio_s)
+    engine = CommandEngine()
+    resultados = engine.executar(
+        executar_plano(plano, engine, config.drivers, config.navegadores_config, clicar=clicar)
+    )
+    engine.encerrar()
+
+    cliques = [p for p in resultados["passos"] if p["comando"] == "click" and "duracao_clique_s" in p]
+    for passo, desvio in zip(cliques, desvios):
+        passo["desvio_clique_us"] = desvio
+
+    if args.resultados:
+        salvar_resultados(resultados, args.resultados)
+    print(json.dumps(resultados, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,127 +1,233 @@
 //
+#define _GNU_SOURCE
 #include <Python.h>
-#include <time.h>
-#include <sched.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <limits.h>
+#include <linux/futex.h>
 #include <pthread.h>
-#include <sys/mman.h>
+#include <sched.h>
 #include <stdint.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <sys/syscall.h>
+#include <time.h>
+#include <unistd.h>
 
-// Definição mínima de MAX_CPUS (ajuste conforme necessário)
-#ifndef MAX_CPUS
-#define MAX_CPUS 128
-#endif
+#include "click_sync_shm.h"
+
+#define SHM_MAGIC 0x434c4b53u         // "CLKS"
+#define SHM_MAX_PARTIES 64
+#define SYNC_DELAY_NS 50000ULL        // 50μs entre a liberação e o alvo
+#define SPIN_BEFORE_FUTEX_NS 200000ULL // spin antes de dormir no futex
 
-// Estrutura compartilhada entre threads
+// Segmento compartilhado entre processos (um por rodada de cliques)
 typedef struct {
+    uint32_t magic;
+    uint32_t num_parties;
     uint64_t target_ns;
-    pthread_barrier_t barrier;
-    int num_threads;
-    int thread_to_cpu[MAX_CPUS];
-    pthread_spinlock_t sync_lock;
-} __attribute__((aligned(64))) sync_data;
-
-// Declaração global da variável shared_data
-static sync_data *shared_data = NULL;
-
-// Declaração de função get_next_cpu
-static int get_next_cpu(void) {
-    static int current_cpu = 0;
-    current_cpu = (current_cpu + 1) % MAX_CPUS;
-    return current_cpu;
+    // Contador de chegada e palavra de geração em linhas de cache separadas
+    uint32_t arrived __attribute__((aligned(64)));
+    uint32_t generation __attribute__((aligned(64)));
+    uint64_t release_ns[SHM_MAX_PARTIES] __attribute__((aligned(64)));
+} __attribute__((aligned(64))) shm_sync_data;
+
+// Segmento mapeado por este processo
+static shm_sync_data *shared_data = NULL;
+
+static inline uint64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + ts.tv_nsec;
 }
 
-// Função dummy para setup_sync (implementação real deve ser feita)
-static PyObject* setup_sync(PyObject* self, PyObject* args) {
-    int num_threads;
-    if (!PyArg_ParseTuple(args, "i", &num_threads)) {
-        PyErr_SetString(PyExc_ValueError, "Número de threads inválido");
-        return NULL;
-    }
+static inline void cpu_relax(void) {
+#if defined(__x86_64__) || defined(__i386__)
+    __builtin_ia32_pause();
+#else
+    __asm__ volatile("" ::: "memory");
+#endif
+}
 
-    if (shared_data == NULL) {
-        shared_data = (sync_data *)mmap(NULL, sizeof(sync_data),
-                                       PROT_READ | PROT_WRITE,
-                                       MAP_SHARED | MAP_ANONYMOUS, -1, 0);
-        if (shared_data == MAP_FAILED) {
-            PyErr_SetString(PyExc_RuntimeError, "Falha ao mapear memória compartilhada");
-            return NULL;
-        }
-        pthread_barrier_init(&shared_data->barrier, NULL, num_threads);
-        shared_data->num_threads = num_threads;
-    }
+// Futex sem FUTEX_PRIVATE_FLAG: a palavra vive em memória compartilhada entre processos
+static inline long futex(uint32_t *uaddr, int op, uint32_t val) {
+    return syscall(SYS_futex, uaddr, op, val, NULL, NULL, 0);
+}
 
-    Py_RETURN_NONE;
+static void unmap_segment(void) {
+    if (shared_data != NULL) {
+        munmap(shared_data, sizeof(shm_sync_data));
+        shared_data = NULL;
+    }
 }
 
-static PyObject* wait_for_click(PyObject* self, PyObject* args) {
-    struct timespec ts;
-    uint64_t now, target;
-    const uint64_t SYNC_DELAY_NS = 50000; // 50μs
+static int map_segment(const char *name, int create) {
+    int flags = O_RDWR | (create ? (O_CREAT | O_EXCL) : 0);
+    int fd = shm_open(name, flags, 0600);
+    if (fd < 0) {
+        PyErr_SetFromErrnoWithFilename(PyExc_OSError, name);
+        return -1;
+    }
 
-    // Configura afinidade de CPU
-    cpu_set_t set;
-    int cpu = get_next_cpu();
-    CPU_ZERO(&set);
-    CPU_SET(cpu, &set);
-    pthread_setaffinity_np(pthread_self(), sizeof(set), &set);
+    if (create && ftruncate(fd, sizeof(shm_sync_data)) != 0) {
+        PyErr_SetFromErrnoWithFilename(PyExc_OSError, name);
+        close(fd);
+        shm_unlink(name);
+        return -1;
+    }
 
-    // Configura prioridade RT
-    struct sched_param param = { .sched_priority = 99 };
-    pthread_setschedparam(pthread_self(), SCHED_FIFO, &param);
+    void *addr = mmap(NULL, sizeof(shm_sync_data), PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (addr == MAP_FAILED) {
+        PyErr_SetString(PyExc_RuntimeError, "Falha ao mapear memória compartilhada");
+        return -1;
+    }
 
-    // Prefetch dados na cache
-    __builtin_prefetch(&shared_data->target_ns);
+    unmap_segment();
+    shared_data = (shm_sync_data *)addr;
+    return 0;
+}
 
-    // Barreira de sincronização
-    pthread_barrier_wait(&shared_data->barrier);
+PyObject* click_sync_shm_create(PyObject* self, PyObject* args) {
+    const char *name;
+    int num_parties;
+    if (!PyArg_ParseTuple(args, "si", &name, &num_parties)) {
+        return NULL;
+    }
+    if (num_parties < 1 || num_parties > SHM_MAX_PARTIES) {
+        PyErr_Format(PyExc_ValueError, "Número de participantes inválido: %d", num_parties);
+        return NULL;
+    }
 
-    // Timestamp preciso
-    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
-    now = ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+    if (map_segment(name, 1) != 0) {
+        return NULL;
+    }
 
-    // Define target com operação atômica
-    target = now + SYNC_DELAY_NS;
-    __atomic_store_n(&shared_data->target_ns, target, __ATOMIC_RELEASE);
+    memset(shared_data, 0, sizeof(shm_sync_data));
+    shared_data->num_parties = (uint32_t)num_parties;
+    __atomic_store_n(&shared_data->magic, SHM_MAGIC, __ATOMIC_RELEASE);
+    Py_RETURN_NONE;
+}
 
-    // Busy wait otimizado
-    while (1) {
-        uint64_t cycles_start, cycles_end;
-        __asm__ volatile("rdtsc" : "=a" (cycles_start));
+PyObject* click_sync_shm_attach(PyObject* self, PyObject* args) {
+    const char *name;
+    if (!PyArg_ParseTuple(args, "s", &name)) {
+        return NULL;
+    }
 
-        clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
-        now = ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+    if (map_segment(name, 0) != 0) {
+        return NULL;
+    }
 
-        if (now >= target) break;
+    if (__atomic_load_n(&shared_data->magic, __ATOMIC_ACQUIRE) != SHM_MAGIC) {
+        unmap_segment();
+        PyErr_Format(PyExc_RuntimeError, "Segmento %s não inicializado", name);
+        return NULL;
+    }
+    return Py_BuildValue("I", shared_data->num_parties);
+}
 
-        __asm__ volatile("rdtsc" : "=a" (cycles_end));
+PyObject* click_sync_shm_barrier_wait(PyObject* self, PyObject* args) {
+    int party;
+    unsigned long long delay_ns = SYNC_DELAY_NS;
+    if (!PyArg_ParseTuple(args, "i|K", &party, &delay_ns)) {
+        return NULL;
+    }
+    if (shared_data == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "Nenhum segmento de sincronização mapeado");
+        return NULL;
+    }
+    if (party < 0 || (uint32_t)party >= shared_data->num_parties) {
+        PyErr_Format(PyExc_ValueError, "Participante inválido: %d", party);
+        return NULL;
+    }
 
-        if ((cycles_end - cycles_start) < 1000) {
-            for (int i = 0; i < 10; i++) {
-                __asm__ volatile("pause");
+    shm_sync_data *d = shared_data;
+    uint64_t released;
+
+    // Espera sem o GIL: outros threads Python continuam rodando
+    Py_BEGIN_ALLOW_THREADS
+    uint32_t gen = __atomic_load_n(&d->generation, __ATOMIC_ACQUIRE);
+
+    if (__atomic_add_fetch(&d->arrived, 1, __ATOMIC_ACQ_REL) == d->num_parties) {
+        // Último a chegar: define o alvo e libera a geração
+        __atomic_store_n(&d->arrived, 0, __ATOMIC_RELAXED);
+        __atomic_store_n(&d->target_ns, now_ns() + delay_ns, __ATOMIC_RELAXED);
+        __atomic_store_n(&d->generation, gen + 1, __ATOMIC_RELEASE);
+        futex(&d->generation, FUTEX_WAKE, INT_MAX);
+    } else {
+        uint64_t spin_until = now_ns() + SPIN_BEFORE_FUTEX_NS;
+        while (__atomic_load_n(&d->generation, __ATOMIC_ACQUIRE) == gen) {
+            if (now_ns() < spin_until) {
+                cpu_relax();
+            } else {
+                futex(&d->generation, FUTEX_WAIT, gen);
             }
         }
     }
 
-    return Py_BuildValue("K", target);
+    // Busy wait até o alvo comum
+    uint64_t target = __atomic_load_n(&d->target_ns, __ATOMIC_RELAXED);
+    while ((released = now_ns()) < target) {
+        cpu_relax();
+    }
+    d->release_ns[party] = released;
+    Py_END_ALLOW_THREADS
+
+    return PyLong_FromUnsignedLongLong(released);
 }
 
-// Define os métodos do módulo
-static PyMethodDef SyncMethods[] = {
-    {"setup_sync", setup_sync, METH_VARARGS, "Setup sync"},
-    {"wait_for_click", wait_for_click, METH_VARARGS, "Wait for click"},
-    {NULL, NULL, 0, NULL}
-};
-
-// Define o módulo Python
-static struct PyModuleDef moduledef = {
-    PyModuleDef_HEAD_INIT,
-    "click_sync",  // Nome do módulo
-    NULL,          // Documentação
-    -1,
-    SyncMethods
-};
-
-// Função de inicialização do módulo
-PyMODINIT_FUNC PyInit_click_sync(void) {
-    return PyModule_Create(&moduledef);
+PyObject* click_sync_shm_release_times(PyObject* self, PyObject* args) {
+    if (shared_data == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "Nenhum segmento de sincronização mapeado");
+        return NULL;
+    }
+
+    PyObject *result = PyTuple_New(shared_data->num_parties);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (uint32_t i = 0; i < shared_data->num_parties; i++) {
+        PyTuple_SET_ITEM(result, i, PyLong_FromUnsignedLongLong(shared_data->release_ns[i]));
+    }
+    return result;
+}
+
+PyObject* click_sync_shm_detach(PyObject* self, PyObject* args) {
+    unmap_segment();
+    Py_RETURN_NONE;
+}
+
+PyObject* click_sync_shm_unlink(PyObject* self, PyObject* args) {
+    const char *name;
+    if (!PyArg_ParseTuple(args, "s", &name)) {
+        return NULL;
+    }
+    if (shm_unlink(name) != 0 && errno != ENOENT) {
+        return PyErr_SetFromErrnoWithFilename(PyExc_OSError, name);
+    }
+    Py_RETURN_NONE;
+}
+
+// Afinidade explícita (substitui o rodízio sobre MAX_CPUS)
+PyObject* click_sync_set_cpu(PyObject* self, PyObject* args) {
+    int cpu;
+    if (!PyArg_ParseTuple(args, "i", &cpu)) {
+        return NULL;
+    }
+    if (cpu < 0 || cpu >= CPU_SETSIZE) {
+        PyErr_Format(PyExc_ValueError, "CPU inválida: %d", cpu);
+        return NULL;
+    }
+
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(cpu, &set);
+    int ret = pthread_setaffinity_np(pthread_self(), sizeof(set), &set);
+    if (ret != 0) {
+        errno = ret;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
 }
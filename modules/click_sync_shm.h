@@ -0,0 +1,24 @@
+#ifndef CLICK_SYNC_SHM_H
+#define CLICK_SYNC_SHM_H
+
+#include <Python.h>
+
+// Primitiva de sincronização entre processos (implementada em click_sync.c)
+PyObject* click_sync_shm_create(PyObject* self, PyObject* args);
+PyObject* click_sync_shm_attach(PyObject* self, PyObject* args);
+PyObject* click_sync_shm_barrier_wait(PyObject* self, PyObject* args);
+PyObject* click_sync_shm_release_times(PyObject* self, PyObject* args);
+PyObject* click_sync_shm_detach(PyObject* self, PyObject* args);
+PyObject* click_sync_shm_unlink(PyObject* self, PyObject* args);
+PyObject* click_sync_set_cpu(PyObject* self, PyObject* args);
+
+#define CLICK_SYNC_SHM_METHODS \
+    {"shm_create", click_sync_shm_create, METH_VARARGS, "Cria segmento nomeado com barreira para N processos"}, \
+    {"shm_attach", click_sync_shm_attach, METH_VARARGS, "Anexa a um segmento nomeado existente"}, \
+    {"shm_barrier_wait", click_sync_shm_barrier_wait, METH_VARARGS, "Aguarda a barreira e o instante alvo; retorna ns"}, \
+    {"shm_release_times", click_sync_shm_release_times, METH_NOARGS, "Instantes de liberação de cada participante"}, \
+    {"shm_detach", click_sync_shm_detach, METH_NOARGS, "Desmapeia o segmento atual"}, \
+    {"shm_unlink", click_sync_shm_unlink, METH_VARARGS, "Remove o segmento nomeado"}, \
+    {"set_cpu", click_sync_set_cpu, METH_VARARGS, "Fixa a thread chamadora em uma CPU"},
+
+#endif
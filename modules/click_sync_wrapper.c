@@ -8,6 +8,9 @@
 #include <pthread.h>
 #include <sys/mman.h>
 #include <errno.h>
+#include <string.h>
+
+#include "click_sync_shm.h"
 
 // Definições de comandos ioctl
 #define CLICK_SYNC_MAGIC 'k'
@@ -16,27 +19,15 @@
 
 // Configurações de otimização
 #define MAX_CPU_CORES 32
-#define RT_PRIORITY 99
 
 // Variáveis globais do módulo
 static int device_fd = -1;  // File descriptor do dispositivo
 static int initialized = 0;  // Flag de inicialização
-static cpu_set_t cpu_mask;  // Máscara de CPU para afinidade
 
-// Função auxiliar para configurar prioridade RT e afinidade de CPU
+// Função auxiliar para travar a memória do processo
+// (a prioridade RT é aplicada pelo perfil RT do Python só na janela arm→fire,
+// e não mais de forma permanente na thread que chama setup_sync)
 static int setup_thread_attributes(void) {
-    struct sched_param param;
-    int ret;
-
-    // Configura prioridade RT
-    param.sched_priority = RT_PRIORITY;
-    ret = pthread_setschedparam(pthread_self(), SCHED_FIFO, &param);
-    if (ret != 0) {
-        PyErr_Format(PyExc_RuntimeError,
-                    "Falha ao configurar prioridade RT: %s", strerror(errno));
-        return -1;
-    }
-
     // Lock memória
     if (mlockall(MCL_CURRENT | MCL_FUTURE) != 0) {
         PyErr_Format(PyExc_RuntimeError,
@@ -122,6 +113,7 @@ static void cleanup_sync(void* self) {
 static PyMethodDef SyncMethods[] = {
     {"setup_sync", setup_sync, METH_VARARGS, "Setup sync"},
     {"wait_for_click", wait_for_click, METH_VARARGS, "Wait for click"},
+    CLICK_SYNC_SHM_METHODS
     {NULL, NULL, 0, NULL}
 };
 
@@ -4,12 +4,16 @@ import os
 # Obtém o caminho absoluto do diretório atual
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
-# Define o caminho para o arquivo fonte
-source_file = os.path.join(current_dir, 'modules', 'click_sync_wrapper.c')
+# Define os caminhos para os arquivos fonte
+source_files = [
+    os.path.join(current_dir, 'modules', 'click_sync_wrapper.c'),
+    os.path.join(current_dir, 'modules', 'click_sync.c'),
+]
 
 module = Extension(
     'click_sync',
-    sources=[source_file],
+    sources=source_files,
+    include_dirs=[os.path.join(current_dir, 'modules')],
     extra_compile_args=['-O3', '-march=native'],
     libraries=['pthread', 'rt']
 )
@@ -1,190 +1,275 @@
-import ctypes
-import fcntl
-import os
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-# Constantes alinhadas com o kernel
-CLICK_SYNC_MAGIC = ord('k')
-CLICK_BUFFER_SIZE = 256
-MAX_THREADS = 16
-
-class ThreadCount(ctypes.Structure):
-    """Estrutura para contagem de threads, alinhada com o kernel."""
-    _pack_ = 1
-    _fields_ = [
-        ('count', ctypes.c_int)
-    ]
-
-class ClickData(ctypes.Structure):
-    """Estrutura alinhada para dados do clique."""
-    _pack_ = 1
-    _fields_ = [
-        ('element_ptr', ctypes.c_void_p),
-        ('click_time', ctypes.c_uint64),
-        ('driver_id', ctypes.c_int),
-        ('xpath', ctypes.c_char * CLICK_BUFFER_SIZE),
-        ('status', ctypes.c_int),
-        ('actual_click_time', ctypes.c_uint64)
-    ]
-
-class SyncClickCmd(ctypes.Structure):
-    """Comando de sincronização alinhado."""
-    _pack_ = 1
-    _fields_ = [
-        ('clicks', ClickData * MAX_THREADS),
-        ('num_clicks', ctypes.c_int),
-        ('sync_time', ctypes.c_uint64),
-        ('completed_clicks', ctypes.c_int),
-        ('cmd_lock', ctypes.c_uint32)
-    ]
+from log_config import hot_section
+from .click_engine import ClickEngine
+from .element_cache import ElementCache, element_cache as shared_element_cache
+from .latency_model import CLICK_ECHO_SCRIPT, CompensationReport, DriverLatencyModel, wait_until_ns
+from .rt_profile import RT_POLICY_OFF, RTProfile
+from .sync_backends import (
+    CLICK_BUFFER_SIZE,
+    CLICK_PENDING,
+    MAX_THREADS,
+    SyncBackend,
+    SyncClickCmd,
+    select_sync_backend,
+)
+
+# Tempo máximo que um clique armado aguarda pelo disparo
+ARM_TIMEOUT_S = 30.0
+
+@dataclass
+class ArmedClick:
+    """Handle de cliques armados: elementos resolvidos e workers de disparo prontos."""
+    drivers: List[WebDriver]
+    xpaths: List[str]
+    elements: list
+    cmd: SyncClickCmd
+    release: threading.Barrier
+    # Jobs de disparo enfileirados nos workers do ClickEngine
+    futures: List[Future] = field(default_factory=list)
+    click_times: List[Optional[Tuple[int, int]]] = field(default_factory=list)
+    errors: List[Optional[Exception]] = field(default_factory=list)
+    # Duração da armação de cada navegador (ns)
+    arm_ns: List[int] = field(default_factory=list)
+    # Atraso de cada navegador após a liberação (compensação de latência)
+    delays_ns: List[int] = field(default_factory=list)
+    # Eco do relógio da página no instante de cada clique
+    echoes: list = field(default_factory=list)
+    # Tempo que cada thread esperou entre a liberação e o envio
+    waited_ns: List[int] = field(default_factory=list)
+    release_ns: int = 0
+    compensation: Optional[CompensationReport] = None
+    fired: bool = False
+
+    def skew_ns(self) -> Optional[int]:
+        """Desvio entre o primeiro e o último envio de clique (monotonic_ns)."""
+        starts = [t[0] for t in self.click_times if t is not None]
+        if len(starts) < 2:
+            return None
+        return max(starts) - min(starts)
 
 class AtomicClickExecutor:
-    def __init__(self, logger):
+    def __init__(self, logger, backend: Optional[SyncBackend] = None, element_cache: Optional[ElementCache] = None,
+                 latency_model: Optional[DriverLatencyModel] = None, compensate: bool = True,
+                 rt_profile: Optional[RTProfile] = None, click_engine: Optional[ClickEngine] = None):
         self.logger = logger
-        self.device_fd = None
-        self.element_cache = {}
-        
-        # Definição correta dos comandos IOCTL
-        self.CLICK_SYNC_SET_THREADS = self._IOW(CLICK_SYNC_MAGIC, 1, ThreadCount)
-        self.CLICK_SYNC_WAIT = self._IOW(CLICK_SYNC_MAGIC, 2, ctypes.c_ulong)
-        self.CLICK_SYNC_ATOMIC = self._IOW(CLICK_SYNC_MAGIC, 3, SyncClickCmd)
-        
-        self._initialize_device()
-
-    def _IOW(self, type_num: int, nr: int, struct_type) -> int:
-        """Recria macro _IOW do kernel usando tipos ctypes."""
-        if isinstance(struct_type, str):
-            size = ctypes.sizeof(getattr(ctypes, 'c_' + struct_type))
-        else:
-            size = ctypes.sizeof(struct_type)
-            
-        IOC_WRITE = 1
-        IOC_SIZEBITS = 14
-        IOC_SIZESHIFT = 16
-        
-        return (IOC_WRITE << 30) | (size << IOC_SIZESHIFT) | (type_num << 8) | nr
-
-    def _initialize_device(self) -> None:
-        """Inicializa dispositivo de sincronização."""
-        try:
-            self.device_fd = os.open("/dev/precise_sync", os.O_RDWR)
-            self.logger.info("Dispositivo de sincronização inicializado")
-        except Exception as e:
-            self.logger.error(f"Erro ao inicializar dispositivo: {e}")
-            raise
+        self.element_cache = element_cache or shared_element_cache
+        # Kernel (ioctl) quando disponível, senão userspace
+        self.backend = backend or select_sync_backend(logger)
+        # Latência por navegador: atrasa os mais rápidos para alinhar os cliques no DOM
+        self.latency_model = latency_model or DriverLatencyModel()
+        self.compensate = compensate
+        # Escalonamento RT só entre a espera na barreira e o envio do clique
+        self.rt_profile = rt_profile or RTProfile(logger, RT_POLICY_OFF)
+        # Armação e disparo nos workers persistentes e fixados (um por navegador)
+        self.click_engine = click_engine or ClickEngine(logger, 0, rt_profile=self.rt_profile)
 
     def _set_threads(self, num_threads: int) -> bool:
-        """Configura número de threads usando estrutura alinhada."""
-        if not (0 < num_threads <= MAX_THREADS):
-            return False
+        """Configura número de threads no backend de sincronização."""
+        return self.backend.set_threads(num_threads)
 
-        try:
-            # Cria e inicializa estrutura ThreadCount
-            tc = ThreadCount()
-            tc.count = num_threads
-            
-            # Log para debug
-            self.logger.debug(f"Enviando ThreadCount: size={ctypes.sizeof(tc)}, count={tc.count}")
-            
-            result = fcntl.ioctl(self.device_fd, self.CLICK_SYNC_SET_THREADS, tc)
-            return result >= 0
-        except Exception as e:
-            self.logger.error(f"Erro ao configurar threads: {e}")
-            return False
+    def _sync_point(self, cmd: SyncClickCmd) -> bool:
+        """Ponto de sincronização atômica (kernel ou userspace)."""
+        return self.backend.sync(cmd)
 
-    def execute_synchronized_clicks(self, drivers: List[WebDriver], xpaths: List[str]) -> bool:
-        """Executa cliques sincronizados usando estruturas alinhadas."""
-        if len(drivers) != len(xpaths) or len(drivers) > MAX_THREADS:
+    def _prepare_element(self, driver: WebDriver, xpath: str):
+        """Localiza o elemento e prepara a renderização (no worker do navegador)."""
+        start_ns = time.monotonic_ns()
+        element = self.element_cache.get(driver, xpath)
+
+        # Otimiza renderização
+        driver.execute_script("""
+            if (!document.getElementById('clique-sem-animacoes')) {
+                const style = document.createElement('style');
+                style.id = 'clique-sem-animacoes';
+                style.textContent = '*{animation:none!important;transition:none!important}';
+                document.head.appendChild(style);
+            }
+            arguments[0].scrollIntoView(true);
+        """, element)
+        self.latency_model.ensure_clock(driver)
+        return element, time.monotonic_ns() - start_ns
+
+    def _fire_worker(self, handle: ArmedClick, index: int) -> None:
+        """Job de disparo: aguarda a liberação e envia apenas o clique final."""
+        driver = handle.drivers[index]
+        element = handle.elements[index]
+        with self.rt_profile.window():
+            try:
+                handle.release.wait()
+            except threading.BrokenBarrierError as e:
+                handle.errors[index] = e
+                return
+
+            try:
+                woke_ns = time.monotonic_ns()
+                delay = handle.delays_ns[index]
+                if delay:
+                    wait_until_ns(handle.release_ns + delay)
+                start_ns = time.monotonic_ns()
+                handle.waited_ns[index] = start_ns - woke_ns
+                handle.echoes[index] = driver.execute_script(CLICK_ECHO_SCRIPT, element)
+                handle.click_times[index] = (start_ns, time.monotonic_ns())
+            except Exception as e:
+                handle.errors[index] = e
+
+    def arm(self, drivers: List[WebDriver], xpaths: List[str]) -> Optional[ArmedClick]:
+        """
+        Fase de armação: resolve e rola todos os elementos em paralelo.
+
+        Args:
+            drivers: Lista de WebDrivers
+            xpaths: Lista de XPaths (um por driver)
+
+        Returns:
+            ArmedClick pronto para fire(), ou None em caso de falha
+        """
+        if len(drivers) != len(xpaths) or not drivers or len(drivers) > MAX_THREADS:
+            return None
+
+        if not self._set_threads(len(drivers)):
+            return None
+
+        # Um worker por navegador: o worker i fica na CPU de worker do slot i
+        self.click_engine.resize(len(drivers))
+
+        # Resolve elementos em paralelo
+        futures = self.click_engine.submit(self._prepare_element, list(zip(drivers, xpaths)))
+        prepared = []
+        for i, future in enumerate(futures):
+            try:
+                prepared.append(future.result())
+            except Exception as e:
+                self.logger.error(f"Erro ao preparar elemento {i}: {e}")
+                for pending in futures[i + 1:]:
+                    pending.exception()
+                return None
+        elements = [element for element, _ in prepared]
+
+        # Prepara comando
+        cmd = SyncClickCmd()
+        cmd.num_clicks = len(drivers)
+        cmd.sync_time = 0
+        cmd.completed_clicks = 0
+        cmd.cmd_lock = 0  # Inicializa o lock
+
+        for i, (element, xpath) in enumerate(zip(elements, xpaths)):
+            # Configura dados do clique
+            click = cmd.clicks[i]
+            click.element_ptr = id(element)
+            click.driver_id = i
+
+            encoded_xpath = xpath.encode('utf-8')[:CLICK_BUFFER_SIZE-1]
+            click.xpath = encoded_xpath + b'\0' * (CLICK_BUFFER_SIZE - len(encoded_xpath))
+
+            click.status = CLICK_PENDING
+            click.click_time = 0
+            click.actual_click_time = 0
+            self.logger.debug(f"Preparado clique {i}: xpath={xpath[:32]}...")
+
+        # Workers de disparo + thread chamadora de fire()
+        handle = ArmedClick(
+            drivers=list(drivers),
+            xpaths=list(xpaths),
+            elements=elements,
+            cmd=cmd,
+            release=threading.Barrier(len(drivers) + 1, timeout=ARM_TIMEOUT_S),
+            click_times=[None] * len(drivers),
+            errors=[None] * len(drivers),
+            arm_ns=[duration for _, duration in prepared],
+            delays_ns=self.latency_model.delays_ns(drivers) if self.compensate else [0] * len(drivers),
+            echoes=[None] * len(drivers),
+            waited_ns=[0] * len(drivers),
+        )
+        handle.futures = self.click_engine.submit(
+            self._fire_worker, [(handle, i) for i in range(len(drivers))]
+        )
+        return handle
+
+    def fire(self, handle: ArmedClick) -> bool:
+        """
+        Fase de disparo: sincroniza e libera todas as threads de clique ao mesmo tempo.
+
+        Args:
+            handle: Resultado de arm()
+
+        Returns:
+            bool: True se todos os cliques foram enviados
+        """
+        if handle is None or handle.fired:
             return False
+        handle.fired = True
 
-        try:
-            # Configura threads
-            if not self._set_threads(len(drivers)):
+        with self.rt_profile.window(), hot_section():
+            if not self._sync_point(handle.cmd):
+                self.cancel(handle)
                 return False
 
-            # Prepara comando
-            cmd = SyncClickCmd()
-            cmd.num_clicks = len(drivers)
-            cmd.sync_time = 0
-            cmd.completed_clicks = 0
-            cmd.cmd_lock = 0  # Inicializa o lock
-
-            # Prepara elementos
-            for i, (driver, xpath) in enumerate(zip(drivers, xpaths)):
-                try:
-                    # Localiza elemento
-                    element = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, xpath))
-                    )
-                    
-                    # Otimiza renderização
-                    driver.execute_script("""
-                        const style = document.createElement('style');
-                        style.textContent = '*{animation:none!important;transition:none!important}';
-                        document.head.appendChild(style);
-                        arguments[0].scrollIntoView(true);
-                    """, element)
-
-                    # Configura dados do clique
-                    click = cmd.clicks[i]
-                    click.element_ptr = id(element)
-                    click.driver_id = i
-                    
-                    encoded_xpath = xpath.encode('utf-8')[:CLICK_BUFFER_SIZE-1]
-                    click.xpath = encoded_xpath + b'\0' * (CLICK_BUFFER_SIZE - len(encoded_xpath))
-                    
-                    click.status = 0  # CLICK_PENDING
-                    click.click_time = 0
-                    click.actual_click_time = 0
-
-                    # Cache do elemento
-                    self.element_cache[f"{i}:{xpath}"] = element
-                    self.logger.debug(f"Preparado clique {i}: xpath={xpath[:32]}...")
-
-                except Exception as e:
-                    self.logger.error(f"Erro ao preparar elemento {i}: {e}")
-                    return False
-
-            # Debug log
-            self.logger.debug(f"Enviando SyncClickCmd: size={ctypes.sizeof(cmd)}, num_clicks={cmd.num_clicks}")
-
-            # Executa sincronização
+            # Base dos atrasos por navegador (visível às threads após a barreira)
+            handle.release_ns = time.monotonic_ns()
             try:
-                result = fcntl.ioctl(self.device_fd, self.CLICK_SYNC_ATOMIC, cmd)
-                if result < 0:
-                    raise OSError(f"IOCTL falhou com código {result}")
-            except Exception as e:
-                self.logger.error(f"Erro na sincronização atômica: {e}")
+                handle.release.wait()
+            except threading.BrokenBarrierError:
+                self.logger.error("Barreira de disparo quebrada antes da liberação")
                 return False
 
-            # Executa cliques usando elemento em cache
-            for i, (driver, xpath) in enumerate(zip(drivers, xpaths)):
-                try:
-                    element = self.element_cache[f"{i}:{xpath}"]
-                    driver.execute_script("arguments[0].click();", element)
-                except Exception as e:
-                    self.logger.error(f"Erro ao clicar no elemento {i}: {e}")
-                    return False
+            for future in handle.futures:
+                future.result()
+
+        self._record_latencies(handle)
+        success = True
+        for i, error in enumerate(handle.errors):
+            if error is not None:
+                self.logger.error(f"Erro ao clicar no elemento {i}: {error}")
+                success = False
+        return success
 
-            return True
+    def _record_latencies(self, handle: ArmedClick) -> None:
+        """Alimenta o modelo de latência com os ecos e reporta o desvio no DOM."""
+        report = CompensationReport(delays_ns=list(handle.delays_ns))
+        for driver, times, echo, waited in zip(handle.drivers, handle.click_times, handle.echoes, handle.waited_ns):
+            if times is None:
+                report.dom_ns.append(None)
+                report.applied_ns.append(None)
+                report.uncertainty_ns.append(None)
+                continue
+            report.dom_ns.append(self.latency_model.record_echo(driver, times[0], echo))
+            report.applied_ns.append(waited)
+            report.uncertainty_ns.append(self.latency_model.clock_uncertainty_ns(driver))
+        handle.compensation = report
+        self.latency_model.record_report(report)
+
+        after, before, error = report.skew_ns(), report.uncompensated_skew_ns(), report.skew_error_ns()
+        if after is not None and before is not None:
+            error = (error or 0) / 1000
+            self.logger.info(
+                f"📏 Desvio no DOM: {after / 1000:.1f}±{error:.1f}μs com compensação "
+                f"(estimado sem compensação: {before / 1000:.1f}±{error:.1f}μs)"
+            )
+
+    def cancel(self, handle: ArmedClick) -> None:
+        """Desarma um handle sem disparar."""
+        handle.fired = True
+        handle.release.abort()
+        for future in handle.futures:
+            future.result()
+
+    def execute_synchronized_clicks(self, drivers: List[WebDriver], xpaths: List[str]) -> bool:
+        """Executa cliques sincronizados usando estruturas alinhadas."""
+        try:
+            handle = self.arm(drivers, xpaths)
+            if handle is None:
+                return False
+            return self.fire(handle)
 
         except Exception as e:
             self.logger.error(f"Erro durante execução sincronizada: {e}")
             return False
-            
-        finally:
-            self.element_cache.clear()
 
     def cleanup(self) -> None:
         """Limpa recursos."""
-        if self.device_fd is not None:
-            try:
-                os.close(self.device_fd)
-            except:
-                pass
-            self.device_fd = None
-        self.element_cache.clear()
\ No newline at end of file
+        self.backend.close()
@@ -0,0 +1,276 @@
+import itertools
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import websocket
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from log_config import hot_section
+from .element_cache import ElementCache, element_cache as shared_element_cache
+from .rt_profile import RT_POLICY_OFF, RTProfile
+
+# Tempo máximo aguardando respostas do DevTools
+CDP_TIMEOUT_S = 5.0
+
+# Rola o elemento para o centro e retorna o centro da caixa (coordenadas da viewport)
+CENTER_SCRIPT = """
+const el = arguments[0];
+el.scrollIntoView({block: 'center', inline: 'center'});
+const r = el.getBoundingClientRect();
+return [r.left + r.width / 2, r.top + r.height / 2];
+"""
+
+class CDPError(Exception):
+    """Erro retornado pelo Chrome DevTools Protocol."""
+
+def cdp_websocket_url(driver: WebDriver) -> str:
+    """URL do websocket DevTools da aba atual de um driver do Chrome."""
+    options = driver.capabilities.get('goog:chromeOptions', {})
+    address = options.get('debuggerAddress')
+    if not address:
+        raise CDPError("Driver sem debuggerAddress (Chrome sem porta de depuração)")
+    return f"ws://{address}/devtools/page/{driver.current_window_handle}"
+
+class CDPConnection:
+    """
+    Conexão persistente com o DevTools de uma aba.
+
+    send() apenas escreve no socket; várias mensagens podem ser enviadas em
+    sequência (pipeline) e as respostas coletadas depois com wait().
+    """
+
+    def __init__(self, url: str, timeout: float = CDP_TIMEOUT_S):
+        self.url = url
+        # Sem cabeçalho Origin: o Chrome recusa origens não autorizadas
+        self.ws = websocket.create_connection(url, timeout=timeout, suppress_origin=True)
+        self.ws.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._responses: Dict[int, dict] = {}
+
+    def send(self, method: str, params: Optional[dict] = None) -> int:
+        """Envia um comando sem aguardar a resposta; retorna o id."""
+        message_id = next(self._ids)
+        self.ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        return message_id
+
+    def prepare(self, commands: List[Tuple[str, dict]]) -> Tuple[List[int], bytes]:
+        """
+        Serializa e mascara comandos antecipadamente.
+
+        Returns:
+            (ids reservados, bytes prontos para send_prepared)
+        """
+        ids = []
+        frames = []
+        for method, params in commands:
+            message_id = next(self._ids)
+            frame = websocket.ABNF.create_frame(
+                json.dumps({'id': message_id, 'method': method, 'params': params}),
+                websocket.ABNF.OPCODE_TEXT
+            )
+            ids.append(message_id)
+            frames.append(frame.format())
+        return ids, b''.join(frames)
+
+    def send_prepared(self, data: bytes) -> None:
+        """Escreve comandos preparados com uma única chamada ao socket."""
+        self.ws.sock.sendall(data)
+
+    def wait(self, ids: List[int]) -> List[dict]:
+        """Lê mensagens até receber a resposta de todos os ids (eventos são descartados)."""
+        with self._lock:
+            while any(message_id not in self._responses for message_id in ids):
+                message = json.loads(self.ws.recv())
+                if 'id' in message:
+                    self._responses[message['id']] = message
+            responses = [self._responses.pop(message_id) for message_id in ids]
+
+        for response in responses:
+            if 'error' in response:
+                raise CDPError(response['error'].get('message', response['error']))
+        return [response.get('result', {}) for response in responses]
+
+    def pipeline(self, commands: List[Tuple[str, dict]]) -> List[dict]:
+        """Envia todos os comandos de uma vez e aguarda as respostas."""
+        return self.wait([self.send(method, params) for method, params in commands])
+
+    def call(self, method: str, params: Optional[dict] = None) -> dict:
+        return self.pipeline([(method, params or {})])[0]
+
+    def close(self) -> None:
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+def _mouse_event(event_type: str, x: float, y: float) -> Tuple[str, dict]:
+    params = {'type': event_type, 'x': x, 'y': y}
+    if event_type != 'mouseMoved':
+        params.update(button='left', clickCount=1)
+    return 'Input.dispatchMouseEvent', params
+
+@dataclass
+class CDPArmedClick:
+    """Cliques armados: conexões abertas e pontos de clique já calculados."""
+    drivers: List[WebDriver]
+    xpaths: List[str]
+    connections: List[CDPConnection]
+    points: List[Tuple[float, float]]
+    # Par mousePressed/mouseReleased já serializado por navegador: (ids, bytes)
+    frames: List[Tuple[List[int], bytes]]
+    sent_ns: List[Optional[int]] = field(default_factory=list)
+    # Duração da armação de cada navegador (ns)
+    arm_ns: List[int] = field(default_factory=list)
+    fired: bool = False
+
+    def skew_ns(self) -> Optional[int]:
+        """Desvio entre o primeiro e o último envio de mousePressed."""
+        sent = [t for t in self.sent_ns if t is not None]
+        if len(sent) < 2:
+            return None
+        return max(sent) - min(sent)
+
+class CDPClickExecutor:
+    """
+    Executor de cliques via Chrome DevTools Protocol.
+
+    O caminho quente não passa pelo chromedriver: cada navegador tem um
+    websocket persistente e o clique é um par mousePressed/mouseReleased
+    no centro da caixa calculado na armação, serializado de antemão e
+    escrito com um único send por navegador.
+    """
+
+    def __init__(self, logger, element_cache: Optional[ElementCache] = None, url_resolver: Optional[Callable] = None,
+                 rt_profile: Optional[RTProfile] = None):
+        self.logger = logger
+        # RT apenas durante as escritas dos cliques
+        self.rt_profile = rt_profile or RTProfile(logger, RT_POLICY_OFF)
+        self.element_cache = element_cache or shared_element_cache
+        self.url_resolver = url_resolver or cdp_websocket_url
+        self.connections: Dict[int, Tuple[Optional[str], CDPConnection]] = {}
+        self.last_armed: Optional[CDPArmedClick] = None
+
+    def _connection(self, driver: WebDriver) -> CDPConnection:
+        """Conexão persistente do driver (reaberta se a sessão mudou)."""
+        session_id = getattr(driver, 'session_id', None)
+        cached = self.connections.get(id(driver))
+        if cached is not None and cached[0] == session_id:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+
+        connection = CDPConnection(self.url_resolver(driver))
+        self.connections[id(driver)] = (session_id, connection)
+        return connection
+
+    def _drop(self, driver: WebDriver) -> None:
+        cached = self.connections.pop(id(driver), None)
+        if cached is not None:
+            cached[1].close()
+
+    def _arm_driver(self, driver: WebDriver, xpath: str):
+        start_ns = time.monotonic_ns()
+        element = self.element_cache.get(driver, xpath)
+        x, y = driver.execute_script(CENTER_SCRIPT, element)
+        connection = self._connection(driver)
+        # Hover fora do caminho quente
+        connection.call(*_mouse_event('mouseMoved', x, y))
+        return connection, (x, y), time.monotonic_ns() - start_ns
+
+    def arm(self, drivers: List[WebDriver], xpaths: List[str]) -> Optional[CDPArmedClick]:
+        """Resolve elementos, calcula os pontos de clique e abre as conexões (em paralelo)."""
+        if len(drivers) != len(xpaths) or not drivers:
+            return None
+
+        with ThreadPoolExecutor(max_workers=len(drivers)) as pool:
+            futures = [pool.submit(self._arm_driver, d, x) for d, x in zip(drivers, xpaths)]
+            armed = []
+            for i, future in enumerate(futures):
+                try:
+                    armed.append(future.result())
+                except Exception as e:
+                    self.logger.error(f"Erro ao armar clique CDP {i}: {e}")
+                    self._drop(drivers[i])
+                    return None
+
+        connections = [connection for connection, _, _ in armed]
+        points = [point for _, point, _ in armed]
+        return CDPArmedClick(
+            drivers=list(drivers),
+            xpaths=list(xpaths),
+            connections=connections,
+            points=points,
+            frames=[
+                connection.prepare([_mouse_event('mousePressed', x, y), _mouse_event('mouseReleased', x, y)])
+                for connection, (x, y) in zip(connections, points)
+            ],
+            sent_ns=[None] * len(drivers),
+            arm_ns=[duration for _, _, duration in armed],
+        )
+
+    def fire(self, handle: CDPArmedClick) -> bool:
+        """Envia os pares de eventos de todos os navegadores e só então lê as respostas."""
+        if handle is None or handle.fired:
+            return False
+        handle.fired = True
+
+        pending: List[Optional[List[int]]] = []
+        failed = []
+        with hot_section():
+            # Primeiro todas as escritas (uma por navegador), sem esperar resposta de ninguém
+            with self.rt_profile.window():
+                for i, (connection, (ids, data)) in enumerate(zip(handle.connections, handle.frames)):
+                    try:
+                        handle.sent_ns[i] = time.monotonic_ns()
+                        connection.send_prepared(data)
+                        pending.append(ids)
+                    except Exception as e:
+                        self.logger.error(f"Erro ao enviar clique CDP {i}: {e}")
+                        pending.append(None)
+                        failed.append(i)
+
+            for i, ids in enumerate(pending):
+                if ids is None:
+                    continue
+                try:
+                    handle.connections[i].wait(ids)
+                except CDPError as e:
+                    self.logger.error(f"Clique CDP {i} rejeitado: {e}")
+                    failed.append(i)
+                except Exception as e:
+                    self.logger.error(f"Erro na resposta do clique CDP {i}: {e}")
+                    failed.append(i)
+                    self._drop(handle.drivers[i])
+
+        for i in failed:
+            if pending[i] is None:
+                self._drop(handle.drivers[i])
+
+        skew = handle.skew_ns()
+        if skew is not None:
+            self.logger.info(f"📏 Desvio de envio CDP entre navegadores: {skew / 1000:.3f}μs")
+        return not failed
+
+    def execute_synchronized_clicks(self, drivers: List[WebDriver], xpaths: List[str]) -> bool:
+        """Arma e dispara cliques via CDP."""
+        try:
+            handle = self.arm(drivers, xpaths)
+            if handle is None:
+                return False
+            self.last_armed = handle
+            return self.fire(handle)
+        except Exception as e:
+            self.logger.error(f"Erro durante execução CDP: {e}")
+            return False
+
+    def cleanup(self) -> None:
+        """Fecha os websockets."""
+        for _, connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
@@ -0,0 +1,163 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.sistema.cpu_manager import CPUManager
+from .rt_profile import RT_POLICY_OFF, RTProfile
+
+class ClickWorker(threading.Thread):
+    """Thread dedicada a um navegador, fixada nos núcleos atribuídos."""
+
+    def __init__(self, index: int, cores: Set[int], logger, setup: Optional[Callable[[], object]] = None):
+        super().__init__(name=f"click-worker-{index}", daemon=True)
+        self.index = index
+        self.cores = cores
+        self.logger = logger
+        # Executado na própria thread antes do primeiro job (ex.: travar a pilha)
+        self.setup = setup
+        self.jobs: "queue.SimpleQueue[Optional[Tuple[Callable, tuple, Future]]]" = queue.SimpleQueue()
+        self.ready = threading.Event()
+
+    def _pin(self, cores: Set[int]) -> None:
+        self.cores = cores
+        if cores:
+            try:
+                # pid 0 = thread chamadora
+                os.sched_setaffinity(0, cores)
+            except OSError as e:
+                self.logger.warning(f"Worker {self.index}: falha ao fixar núcleos {cores}: {e}")
+
+    def run(self):
+        self._pin(self.cores)
+        if self.setup is not None:
+            self.setup()
+        self.ready.set()
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            fn, args, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        self.jobs.put((fn, args, future))
+        return future
+
+    def repin(self, cores: Set[int]) -> Future:
+        """Troca os núcleos do worker (executado na própria thread, na ordem da fila)."""
+        return self.submit(self._pin, cores)
+
+    def stop(self):
+        self.jobs.put(None)
+
+class ClickEngine:
+    """
+    Motor de cliques de longa duração.
+
+    Mantém uma thread pré-aquecida e fixada por navegador e reaproveita a
+    mesma barreira (e o contador de geração) entre cliques, em vez de criar
+    um ThreadPoolExecutor e uma Barrier a cada comando.
+
+    Com tantos workers quanto navegadores, o worker i fica na CPU de worker
+    do slot i do plano de posicionamento (a mesma que o
+    ProcessPlacementService mantém fora do Chrome).
+    """
+
+    def __init__(self, logger, num_workers: int, cpu_manager: Optional[CPUManager] = None,
+                 rt_profile: Optional[RTProfile] = None):
+        self.logger = logger
+        self.cpu_manager = cpu_manager or CPUManager(logger)
+        # Pilhas dos workers criadas e travadas sob o perfil RT (threads de disparo)
+        self.rt_profile = rt_profile or RTProfile(logger, RT_POLICY_OFF)
+        self.workers: List[ClickWorker] = []
+        self.generation = 0
+        self._barriers: Dict[int, threading.Barrier] = {}
+        self._lock = threading.Lock()
+        self.resize(num_workers)
+
+    def _assign_cores(self, num_workers: int) -> List[Set[int]]:
+        """Núcleos por worker, restritos aos permitidos para o processo."""
+        if num_workers <= 0:
+            return []
+        allowed = os.sched_getaffinity(0)
+        assignments = self.cpu_manager.assign_cores_for_tasks(num_workers, os.cpu_count(), allowed)
+        return [cores & allowed for cores in assignments]
+
+    def resize(self, num_workers: int) -> None:
+        """Ajusta o número de workers, reaproveitando os existentes (refixados no plano novo)."""
+        with self._lock:
+            if num_workers == len(self.workers):
+                return
+
+            for worker in self.workers[num_workers:]:
+                worker.stop()
+            del self.workers[num_workers:]
+
+            assignments = self._assign_cores(num_workers)
+            for worker in self.workers:
+                if worker.cores != assignments[worker.index]:
+                    worker.repin(assignments[worker.index])
+            with self.rt_profile.worker_stacks():
+                for index in range(len(self.workers), num_workers):
+                    worker = ClickWorker(index, assignments[index], self.logger, self.rt_profile.lock_thread_stack)
+                    worker.start()
+                    self.workers.append(worker)
+
+            for worker in self.workers:
+                worker.ready.wait()
+            self.logger.info(f"⚙️ Motor de cliques com {len(self.workers)} workers prontos")
+
+    def barrier_for(self, parties: int) -> threading.Barrier:
+        """Barreira reutilizável para `parties` navegadores."""
+        barrier = self._barriers.get(parties)
+        if barrier is None:
+            barrier = self._barriers[parties] = threading.Barrier(parties)
+        elif barrier.broken:
+            barrier.reset()
+        return barrier
+
+    def submit(self, fn: Callable, args_per_worker: Sequence[tuple]) -> List[Future]:
+        """
+        Enfileira `fn` com um conjunto de argumentos por worker, sem esperar.
+
+        Returns:
+            Lista de futures na ordem dos argumentos
+        """
+        if len(args_per_worker) > len(self.workers):
+            self.resize(len(args_per_worker))
+
+        self.generation += 1
+        return [
+            worker.submit(fn, *args)
+            for worker, args in zip(self.workers, args_per_worker)
+        ]
+
+    def run(self, fn: Callable, args_per_worker: Sequence[tuple]) -> List:
+        """
+        Executa `fn` em paralelo, um conjunto de argumentos por worker.
+
+        Returns:
+            Lista de resultados na ordem dos argumentos
+        """
+        return [future.result() for future in self.submit(fn, args_per_worker)]
+
+    def shutdown(self) -> None:
+        """Encerra todos os workers."""
+        with self._lock:
+            for worker in self.workers:
+                worker.stop()
+            for worker in self.workers:
+                worker.join(timeout=1)
+            self.workers.clear()
+            for barrier in self._barriers.values():
+                barrier.abort()
+            self._barriers.clear()
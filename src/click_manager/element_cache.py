@@ -0,0 +1,273 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Tempo máximo aguardando os XPaths pendentes de um navegador
+LOCATE_TIMEOUT_S = 5.0
+# Intervalo entre as avaliações do laço de polling
+LOCATE_POLL_S = 0.05
+
+# Valida todos os handles de um driver em um único round-trip.
+# Retorna [id da navegação, [tag do handle ainda utilizável ou null...]]
+VALIDATE_SCRIPT = """
+const [elements, interactable] = arguments;
+const navigation = performance.timeOrigin + '|' + location.href;
+return [navigation, elements.map(e =>
+    (!!e && e.isConnected &&
+     (!interactable || (!e.disabled && e.getClientRects().length > 0)))
+        ? e.tagName.toLowerCase() : null
+)];
+"""
+
+# Avalia vários XPaths de uma vez com document.evaluate.
+# Para cada XPath: [elemento, tag], [null, erro] ou null (ainda não disponível)
+LOCATE_SCRIPT = """
+const [xpaths, interactable] = arguments;
+return xpaths.map(xpath => {
+    let el;
+    try {
+        el = document.evaluate(xpath, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) {
+        return [null, String(e)];
+    }
+    if (!el || (interactable && (el.disabled || el.getClientRects().length === 0))) {
+        return null;
+    }
+    return [el, el.tagName.toLowerCase()];
+});
+"""
+
+def locate_batch(
+    driver: WebDriver,
+    xpaths: List[str],
+    interactable: bool = True,
+    timeout: float = LOCATE_TIMEOUT_S,
+    errors: Optional[Dict[str, Exception]] = None
+) -> Dict[str, Tuple[object, str]]:
+    """
+    Resolve vários XPaths com um único laço de polling (um execute_script por volta).
+
+    Args:
+        driver: WebDriver do navegador
+        xpaths: XPaths a resolver
+        interactable: Exige elemento visível e habilitado
+        timeout: Prazo para todos os XPaths pendentes
+        errors: Dicionário opcional que recebe as falhas por XPath
+
+    Returns:
+        Dicionário xpath -> (elemento, tag) com os XPaths encontrados
+    """
+    found: Dict[str, Tuple[object, str]] = {}
+    failed: Dict[str, Exception] = {}
+    pending = list(dict.fromkeys(xpaths))
+    deadline = time.monotonic() + timeout
+
+    while pending:
+        results = driver.execute_script(LOCATE_SCRIPT, pending, interactable) or []
+        for xpath, result in zip(pending, results):
+            if not result:
+                continue
+            element, detail = result
+            if element is None:
+                failed[xpath] = JavascriptException(f"XPath inválido '{xpath}': {detail}")
+            else:
+                found[xpath] = (element, detail)
+
+        pending = [xpath for xpath in pending if xpath not in found and xpath not in failed]
+        if not pending or time.monotonic() >= deadline:
+            break
+        time.sleep(LOCATE_POLL_S)
+
+    for xpath in pending:
+        failed[xpath] = TimeoutException(f"Elemento não encontrado em {timeout:.1f}s: {xpath}")
+    if errors is not None:
+        errors.update(failed)
+    return found
+
+@dataclass
+class _DriverEntries:
+    """Handles de um navegador, válidos para uma sessão e uma navegação."""
+    session_id: Optional[str]
+    navigation: Optional[str] = None
+    elements: Dict[str, object] = field(default_factory=dict)
+
+class ElementCache:
+    """
+    Cache de handles de elementos por (driver, xpath, navegação).
+
+    A validação é feita em lote (um execute_script por driver, checando
+    isConnected); apenas as entradas obsoletas são resolvidas novamente.
+    Se algum handle estiver destacado, o chromedriver rejeita a chamada em
+    lote inteira (stale element); nesse caso cada handle é validado
+    separadamente, para que um único handle obsoleto não descarte os demais.
+    """
+
+    def __init__(self):
+        self._drivers: Dict[int, _DriverEntries] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _entries_for(self, driver: WebDriver) -> _DriverEntries:
+        session_id = getattr(driver, 'session_id', None)
+        with self._lock:
+            entries = self._drivers.get(id(driver))
+            if entries is None or entries.session_id != session_id:
+                # Driver novo ou sessão reiniciada
+                entries = self._drivers[id(driver)] = _DriverEntries(session_id)
+            return entries
+
+    @staticmethod
+    def _validate_each(driver: WebDriver, cached: List[Optional[object]], interactable: bool):
+        """Validação um handle por chamada: os destacados viram None sem afetar os outros."""
+        navigation, _ = driver.execute_script(VALIDATE_SCRIPT, [], interactable)
+        tags = []
+        for element in cached:
+            if element is None:
+                tags.append(None)
+                continue
+            try:
+                _, (tag,) = driver.execute_script(VALIDATE_SCRIPT, [element], interactable)
+            except StaleElementReferenceException:
+                tag = None
+            tags.append(tag)
+        return navigation, tags
+
+    def _validate(self, driver: WebDriver, entries: _DriverEntries, xpaths: List[str], interactable: bool):
+        """Atualiza a navegação atual e retorna a tag de cada handle ainda utilizável."""
+        cached = [entries.elements.get(xpath) for xpath in xpaths]
+        try:
+            try:
+                navigation, tags = driver.execute_script(VALIDATE_SCRIPT, cached, interactable)
+            except StaleElementReferenceException:
+                navigation, tags = self._validate_each(driver, cached, interactable)
+        except Exception:
+            navigation, tags = None, [None] * len(xpaths)
+
+        if navigation is None or navigation != entries.navigation:
+            # Página recarregada ou trocada: nenhum handle anterior serve
+            entries.elements.clear()
+            entries.navigation = navigation
+            tags = [None] * len(xpaths)
+        tags = [tag if element is not None else None for tag, element in zip(tags, cached)]
+        return tags, cached
+
+    def lookup(
+        self,
+        driver: WebDriver,
+        xpaths: List[str],
+        interactable: bool = True,
+        errors: Optional[Dict[str, Exception]] = None,
+        resolver: Optional[Callable] = None
+    ) -> List[Optional[Tuple[object, Optional[str]]]]:
+        """
+        Retorna (elemento, tag) de cada XPath, resolvendo apenas os ausentes ou obsoletos.
+
+        Args:
+            driver: WebDriver dono dos elementos
+            xpaths: XPaths desejados
+            interactable: Exige elemento visível e habilitado para usar o handle
+            errors: Dicionário opcional que recebe as falhas de resolução por XPath
+            resolver: Função (driver, xpath) -> elemento; por padrão os pendentes
+                são resolvidos em lote com locate_batch
+
+        Returns:
+            Lista de (elemento, tag), com None onde a resolução falhou
+        """
+        entries = self._entries_for(driver)
+        tags, cached = self._validate(driver, entries, xpaths, interactable)
+
+        results: List[Optional[Tuple[object, Optional[str]]]] = [None] * len(xpaths)
+        pending = []
+        stale = 0
+        for i, (tag, previous) in enumerate(zip(tags, cached)):
+            if tag is not None:
+                results[i] = (previous, tag)
+                continue
+            pending.append(i)
+            if previous is not None:
+                stale += 1
+
+        failed: Dict[str, Exception] = {}
+        if pending:
+            pending_xpaths = [xpaths[i] for i in pending]
+            if resolver is None:
+                found = locate_batch(driver, pending_xpaths, interactable, errors=failed)
+            else:
+                found = {}
+                for xpath in dict.fromkeys(pending_xpaths):
+                    try:
+                        found[xpath] = (resolver(driver, xpath), None)
+                    except Exception as e:
+                        failed[xpath] = e
+
+            for i in pending:
+                xpath = xpaths[i]
+                if xpath in found:
+                    results[i] = found[xpath]
+                    entries.elements[xpath] = found[xpath][0]
+                else:
+                    entries.elements.pop(xpath, None)
+
+        if errors is not None:
+            errors.update(failed)
+        with self._lock:
+            self.hits += len(xpaths) - len(pending)
+            self.misses += len(pending)
+            self.stale += stale
+        return results
+
+    def get_many(
+        self,
+        driver: WebDriver,
+        xpaths: List[str],
+        interactable: bool = True,
+        errors: Optional[Dict[str, Exception]] = None,
+        resolver: Optional[Callable] = None
+    ) -> List[Optional[object]]:
+        """Como lookup(), mas retorna apenas os elementos (None onde falhou)."""
+        return [
+            result[0] if result else None
+            for result in self.lookup(driver, xpaths, interactable, errors, resolver)
+        ]
+
+    def get(self, driver: WebDriver, xpath: str, interactable: bool = True, resolver: Optional[Callable] = None):
+        """Retorna um elemento do cache (ou resolvido); propaga a falha de resolução."""
+        errors: Dict[str, Exception] = {}
+        element = self.get_many(driver, [xpath], interactable, errors, resolver)[0]
+        if element is None:
+            raise errors[xpath]
+        return element
+
+    def invalidate(self, driver: Optional[WebDriver] = None, xpath: Optional[str] = None) -> None:
+        """Descarta entradas de um XPath, de um driver ou de todo o cache."""
+        with self._lock:
+            if driver is None:
+                self._drivers.clear()
+                return
+            entries = self._drivers.get(id(driver))
+            if entries is None:
+                return
+            if xpath is None:
+                del self._drivers[id(driver)]
+            else:
+                entries.elements.pop(xpath, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de acerto/falha do cache."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+# Cache compartilhado entre os comandos localize e click
+element_cache = ElementCache()
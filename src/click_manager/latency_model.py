@@ -0,0 +1,239 @@
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+from .scheduled_click import ClockOffset, calibrate_clock
+
+# Medidas de latência mantidas por navegador
+LATENCY_HISTORY = 32
+# Medidas necessárias antes de compensar um navegador
+MIN_LATENCY_SAMPLES = 3
+# Amostras da calibração de relógio feita na armação
+LATENCY_CALIBRATION_SAMPLES = 8
+# Maior atraso aplicado a um navegador (protege contra medidas anômalas)
+MAX_LEAD_NS = 50_000_000
+# Últimos instantes do atraso feitos em spin (o resto é sleep, que libera o GIL)
+LEAD_SPIN_NS = 100_000
+# Rodadas mantidas no resumo de desvio antes/depois da compensação
+SKEW_HISTORY = 256
+# Granularidade de performance.now() em páginas sem isolamento cross-origin (Chrome)
+PAGE_CLOCK_RESOLUTION_NS = 100_000
+
+# Clique com eco do instante do evento no relógio da página
+CLICK_ECHO_SCRIPT = """
+const now = performance.now();
+arguments[0].click();
+return [performance.timeOrigin, now];
+"""
+
+def wait_until_ns(deadline_ns: int) -> None:
+    """Dorme até perto de `deadline_ns` (monotonic) e conclui em spin."""
+    remaining = deadline_ns - time.monotonic_ns()
+    if remaining > LEAD_SPIN_NS:
+        time.sleep((remaining - LEAD_SPIN_NS) / 1e9)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+def _skew(values: List[int]) -> Optional[int]:
+    return max(values) - min(values) if len(values) >= 2 else None
+
+def _percentile(values: List[int], p: float) -> int:
+    values = sorted(values)
+    return values[max(0, int(len(values) * p) - 1)]
+
+@dataclass
+class CompensationReport:
+    """Desvio no DOM de uma rodada, com e sem os atrasos por navegador."""
+    delays_ns: List[int]
+    # Instante do evento no DOM convertido para o monotonic do host
+    dom_ns: List[Optional[int]] = field(default_factory=list)
+    # Atraso efetivamente aplicado (espera da thread antes do envio)
+    applied_ns: List[Optional[int]] = field(default_factory=list)
+    # Erro máximo de cada instante em dom_ns (incerteza da calibração de relógio)
+    uncertainty_ns: List[Optional[int]] = field(default_factory=list)
+
+    def skew_ns(self) -> Optional[int]:
+        """Desvio no DOM com compensação."""
+        return _skew([d for d in self.dom_ns if d is not None])
+
+    def uncompensated_skew_ns(self) -> Optional[int]:
+        """Desvio no DOM estimado sem compensação (atraso aplicado descontado)."""
+        return _skew([
+            d - a for d, a in zip(self.dom_ns, self.applied_ns)
+            if d is not None and a is not None
+        ])
+
+    def skew_error_ns(self) -> Optional[int]:
+        """
+        Erro máximo dos dois desvios acima.
+
+        Os instantes no DOM vêm de relógios calibrados por navegador; o desvio
+        entre dois deles pode errar pela soma das duas incertezas.
+        """
+        errors = sorted(
+            u for d, u in zip(self.dom_ns, self.uncertainty_ns)
+            if d is not None and u is not None
+        )
+        return sum(errors[-2:]) if len(errors) >= 2 else None
+
+class DriverLatencyModel:
+    """
+    Distribuição de latência chamada Python -> evento no DOM, por navegador.
+
+    A fonte principal é o eco do clique: a página devolve performance.now()
+    no instante do click(), convertido para o monotonic do host pela
+    calibração de relógio (refeita quando performance.timeOrigin muda, ou
+    seja, após navegação). Sem eco, usa metade do round-trip registrado
+    no PreciseTimestampLogger (Post-Barrier -> Post-Click).
+
+    Os atrasos por navegador (maior latência - latência do navegador) fazem
+    os mais rápidos esperarem, alinhando os cliques no DOM.
+
+    O eco só é tão bom quanto a calibração: o offset de cada página pode
+    errar até RTT/2 (mais a granularidade de performance.now()), e esse erro
+    aparece como latência. Por isso a diferença entre dois navegadores só
+    vira atraso no que exceder a soma das duas incertezas, e os desvios
+    reportados trazem o mesmo limite de erro.
+    """
+
+    def __init__(self, history: int = LATENCY_HISTORY):
+        self.history = history
+        self.clocks: Dict[int, ClockOffset] = {}
+        self.echo_ns: Dict[int, deque] = {}
+        self.half_trip_ns: Dict[int, deque] = {}
+        self.skews: deque = deque(maxlen=SKEW_HISTORY)
+        self._lock = threading.Lock()
+
+    def _samples(self, table: Dict[int, deque], driver_id: int) -> deque:
+        samples = table.get(driver_id)
+        if samples is None:
+            samples = table[driver_id] = deque(maxlen=self.history)
+        return samples
+
+    def ensure_clock(self, driver: WebDriver, samples: int = LATENCY_CALIBRATION_SAMPLES) -> ClockOffset:
+        """Calibra o relógio da página se ainda não houver calibração válida."""
+        clock = self.clocks.get(id(driver))
+        if clock is None:
+            clock = self.clocks[id(driver)] = calibrate_clock(driver, samples)
+        return clock
+
+    def clock_uncertainty_ns(self, driver: WebDriver) -> Optional[int]:
+        """Erro máximo de um instante da página convertido para o monotonic do host."""
+        clock = self.clocks.get(id(driver))
+        if clock is None:
+            return None
+        return clock.uncertainty_ns() + PAGE_CLOCK_RESOLUTION_NS
+
+    def record_echo(self, driver: WebDriver, send_ns: int, echo) -> Optional[int]:
+        """
+        Registra a latência de um clique a partir do eco da página.
+
+        Args:
+            driver: WebDriver que clicou
+            send_ns: Início do envio do clique (monotonic)
+            echo: [performance.timeOrigin, performance.now()] devolvido por CLICK_ECHO_SCRIPT
+
+        Returns:
+            Instante do evento no monotonic do host, ou None se o eco não for utilizável
+        """
+        clock = self.clocks.get(id(driver))
+        if clock is None or not echo:
+            return None
+        time_origin, now = echo
+        if time_origin != clock.time_origin:
+            # Página navegou desde a calibração: recalibra na próxima armação
+            self.clocks.pop(id(driver), None)
+            return None
+        dom_ns = clock.to_monotonic_ns(time_origin + now)
+        uncertainty = clock.uncertainty_ns() + PAGE_CLOCK_RESOLUTION_NS
+        with self._lock:
+            self._samples(self.echo_ns, id(driver)).append((dom_ns - send_ns, uncertainty))
+        return dom_ns
+
+    def record_round_trip(self, driver_id: int, round_trip_ns: int) -> None:
+        """Registra metade de um round-trip de clique como latência de ida (mesmo relógio, sem calibração)."""
+        with self._lock:
+            self._samples(self.half_trip_ns, driver_id).append((round_trip_ns // 2, 0))
+
+    def learn_from_timestamps(self, timestamp_logger, drivers: List[WebDriver], since_ns: Optional[int] = None) -> None:
+        """Aprende com os pares Post-Barrier/Post-Click do PreciseTimestampLogger."""
+        cols = timestamp_logger.columns(since_ns)
+        codes = timestamp_logger.event_codes
+        events, driver_ids, times = cols['event'], cols['driver_id'], cols['monotonic_ns']
+        for driver in drivers:
+            own = driver_ids == id(driver)
+            barrier = times[own & (events == codes['Post-Barrier'])]
+            click = times[own & (events == codes['Post-Click'])]
+            if barrier.size and click.size and click[-1] > barrier[-1]:
+                self.record_round_trip(id(driver), int(click[-1] - barrier[-1]))
+
+    def estimate(self, driver: WebDriver) -> Optional[Tuple[int, int]]:
+        """(latência mediana, erro máximo de calibração) do navegador, ou None sem medidas suficientes."""
+        with self._lock:
+            for table in (self.echo_ns, self.half_trip_ns):
+                samples = table.get(id(driver))
+                if samples and len(samples) >= MIN_LATENCY_SAMPLES:
+                    # O viés de cada calibração é constante nas suas amostras: vale o pior
+                    return (int(statistics.median(latency for latency, _ in samples)),
+                            max(uncertainty for _, uncertainty in samples))
+        return None
+
+    def estimate_ns(self, driver: WebDriver) -> Optional[int]:
+        """Latência mediana do navegador (eco quando houver), ou None sem medidas suficientes."""
+        estimate = self.estimate(driver)
+        return None if estimate is None else estimate[0]
+
+    def delays_ns(self, drivers: List[WebDriver]) -> List[int]:
+        """
+        Atraso de liberação de cada navegador; navegadores sem medidas não atrasam.
+
+        Da diferença para o mais lento é descontada a incerteza das duas
+        calibrações: só o que os relógios conseguem distinguir vira atraso.
+        """
+        estimates = [self.estimate(driver) for driver in drivers]
+        known = [e for e in estimates if e is not None]
+        if len(known) < 2:
+            return [0] * len(drivers)
+        slowest, slowest_error = max(known)
+        return [
+            0 if e is None else min(max(0, slowest - e[0] - slowest_error - e[1]), MAX_LEAD_NS)
+            for e in estimates
+        ]
+
+    def record_report(self, report: CompensationReport) -> None:
+        before, after, error = report.uncompensated_skew_ns(), report.skew_ns(), report.skew_error_ns()
+        if before is not None and after is not None:
+            with self._lock:
+                self.skews.append((before, after, error or 0))
+
+    def skew_summary(self) -> Optional[dict]:
+        """
+        Percentis do desvio no DOM sem e com compensação nas rodadas recentes.
+
+        `error_*_ns` é o erro máximo de cada desvio (incerteza das calibrações);
+        `significant_rounds` conta as rodadas em que a melhora supera o erro
+        dos dois desvios, ou seja, não pode ser só viés dos relógios.
+        """
+        with self._lock:
+            skews = list(self.skews)
+        if not skews:
+            return None
+        summary = {
+            'rounds': len(skews),
+            'significant_rounds': sum(before - after > 2 * error for before, after, error in skews),
+        }
+        for name, values in (('before', [b for b, _, _ in skews]), ('after', [a for _, a, _ in skews]),
+                             ('error', [e for _, _, e in skews])):
+            summary[f'{name}_p50_ns'] = int(statistics.median(values))
+            summary[f'{name}_p90_ns'] = _percentile(values, 0.9)
+        return summary
+
+    def forget(self, driver: WebDriver) -> None:
+        """Descarta calibração e medidas de um navegador (substituído ou removido do pool)."""
+        with self._lock:
+            self.clocks.pop(id(driver), None)
+            self.echo_ns.pop(id(driver), None)
+            self.half_trip_ns.pop(id(driver), None)
@@ -1,39 +1,141 @@
 import os
 import logging
 import threading
-from sync_constants import SyncDevice
 from .timestamp_logger import PreciseTimestampLogger
 from .sync_executor import SynchronizedClickExecutor
 from .atomic_click import AtomicClickExecutor
+from .sync_backends import select_sync_backend
+from .element_cache import element_cache
+from .click_engine import ClickEngine
+from .scheduled_click import InPageScheduledClickExecutor
+from .process_executor import MultiProcessClickExecutor
+from .cdp_click import CDPClickExecutor
+from .target_time import TargetTimeScheduler
+from .latency_model import DriverLatencyModel
+from .rt_profile import RT_POLICY_FIFO, RTProfile
+
+# Modos de execução disponíveis
+CLICK_MODE_ATOMIC = 'atomic'
+CLICK_MODE_LEGACY = 'legacy'
+CLICK_MODE_IN_PAGE = 'in_page'
+CLICK_MODE_PROCESS = 'process'
+CLICK_MODE_CDP = 'cdp'
 
 class LinuxPrecisionClickManager:
-    def __init__(self, max_workers=None, logger=None):
+    def __init__(self, max_workers=None, logger=None, rt_policy=RT_POLICY_FIFO, lock_all_memory=False):
         self.max_workers = max_workers or max(2, os.cpu_count() - 2)
         self.logger = logger or logging.getLogger(__name__)
-        self.sync_device = SyncDevice()
-        self.ccx_size = 6
+
+        # Perfil RT da janela arm→fire; cada worker de disparo trava a própria pilha
+        self.rt_profile = RTProfile(self.logger, rt_policy)
+        if lock_all_memory:
+            # Opt-in: mlockall trava também as pilhas de todas as outras threads
+            self.rt_profile.lock_memory()
+        self.last_wakeup_report = None
         
+        # Handles de elementos compartilhados com o comando localize
+        self.element_cache = element_cache
+
         # Inicializa loggers e executores
         self.timestamp_logger = PreciseTimestampLogger(self.logger)
         
+        # Motor de cliques persistente (um worker fixado por navegador)
+        self.click_engine = ClickEngine(self.logger, self.max_workers, rt_profile=self.rt_profile)
+
+        # Latência por navegador compartilhada pelos executores com barreira
+        self.latency_model = DriverLatencyModel()
+        
         # Inicializa executores
         self.sync_executor = SynchronizedClickExecutor(
             self.logger, 
             self.timestamp_logger, 
-            self.max_workers
+            self.max_workers,
+            click_engine=self.click_engine,
+            latency_model=self.latency_model,
+            rt_profile=self.rt_profile
         )
+
+        # Executor de clique agendado dentro da página
+        self.in_page_executor = InPageScheduledClickExecutor(self.logger)
+
+        # Executor multiprocesso (criado sob demanda)
+        self.process_executor = None
+
+        # Executor via DevTools Protocol (criado sob demanda)
+        self.cdp_executor = None
+
+        # Cliques em horário absoluto (mapeamento de relógio + latência de armação)
+        self.target_scheduler = TargetTimeScheduler(self.logger, rt_profile=self.rt_profile)
+        self.last_target_report = None
         
+        # Backend do kernel quando o dispositivo existe, senão userspace
+        self.sync_backend = select_sync_backend(self.logger)
+        self.sync_backend_name = self.sync_backend.name
+
         # Tenta inicializar o executor atômico
         try:
-            self.atomic_executor = AtomicClickExecutor(self.logger)
+            self.atomic_executor = AtomicClickExecutor(
+                self.logger, self.sync_backend, latency_model=self.latency_model, rt_profile=self.rt_profile,
+                click_engine=self.click_engine
+            )
             self.has_atomic = True
-            self.logger.info("Executor atômico inicializado com sucesso")
+            self.logger.info(f"Executor atômico inicializado com sucesso (backend {self.sync_backend_name})")
         except Exception as e:
             self.has_atomic = False
             self.atomic_executor = None
             self.logger.warning(f"Executor atômico não disponível: {e}")
     
-    def execute_synchronized_clicks(self, drivers, xpaths, force_legacy=False):
+    def latency_skew_summary(self):
+        """Desvio no DOM sem e com compensação de latência (rodadas recentes)."""
+        return self.latency_model.skew_summary()
+
+    def forget_driver(self, driver):
+        """Descarta calibração e latências de um navegador que saiu do pool (id(driver) pode ser reutilizado)."""
+        self.latency_model.forget(driver)
+        self.element_cache.invalidate(driver)
+
+    def measure_wakeup_latency(self, loops=None):
+        """
+        Auto-medição estilo cyclictest na CPU de um worker de clique, sob o perfil RT.
+
+        Returns:
+            WakeupLatencyReport (report.fit indica se o host está apto a cliques precisos)
+        """
+        worker_cpus = [min(worker.cores) for worker in self.click_engine.workers if worker.cores]
+        kwargs = {} if loops is None else {'loops': loops}
+        self.last_wakeup_report = self.rt_profile.measure_wakeup_latency(
+            cpu=worker_cpus[0] if worker_cpus else None, **kwargs
+        )
+        return self.last_wakeup_report
+
+    def calibrate_clocks(self, drivers):
+        """Estima o offset de relógio de cada navegador para o modo in_page."""
+        return self.in_page_executor.calibrate(drivers)
+
+    def _get_process_executor(self):
+        """Cria o executor multiprocesso na primeira utilização."""
+        if self.process_executor is None:
+            self.process_executor = MultiProcessClickExecutor(self.logger)
+        return self.process_executor
+
+    def _get_cdp_executor(self):
+        """Cria o executor CDP na primeira utilização."""
+        if self.cdp_executor is None:
+            self.cdp_executor = CDPClickExecutor(self.logger, self.element_cache, rt_profile=self.rt_profile)
+        return self.cdp_executor
+
+    def _resolve_mode(self, mode, force_legacy):
+        """Decide qual executor usar."""
+        if force_legacy:
+            return CLICK_MODE_LEGACY
+        if mode is None:
+            return CLICK_MODE_ATOMIC if self.has_atomic else CLICK_MODE_LEGACY
+        if mode == CLICK_MODE_ATOMIC and not self.has_atomic:
+            self.logger.warning("Executor atômico indisponível, usando legacy")
+            return CLICK_MODE_LEGACY
+        return mode
+
+    def execute_synchronized_clicks(self, drivers, xpaths, force_legacy=False, mode=None):
         """
         Executa cliques sincronizados com suporte a modo atômico.
         
@@ -41,19 +143,29 @@ class LinuxPrecisionClickManager:
             drivers: Lista de WebDrivers
             xpaths: Lista de XPaths
             force_legacy: Força uso do executor legacy mesmo se atomic estiver disponível
+            mode: 'atomic', 'legacy', 'in_page', 'process' ou 'cdp' (None escolhe automaticamente)
             
         Returns:
             bool: True se sucesso, False caso contrário
         """
         # Log início da execução
         self.logger.info(f"Iniciando execução sincronizada para {len(drivers)} navegadores")
+        self.timestamp_logger.begin_group()
         
         try:
-            # Decide qual executor usar
-            use_atomic = self.has_atomic and not force_legacy
+            mode = self._resolve_mode(mode, force_legacy)
             
-            if use_atomic:
-                self.logger.info("Usando executor atômico")
+            if mode == CLICK_MODE_IN_PAGE:
+                self.logger.info("Usando clique agendado na página")
+                result = self.in_page_executor.execute_synchronized_clicks(drivers, xpaths)
+            elif mode == CLICK_MODE_PROCESS:
+                self.logger.info("Usando executor multiprocesso")
+                result = self._get_process_executor().execute_synchronized_clicks(drivers, xpaths)
+            elif mode == CLICK_MODE_CDP:
+                self.logger.info("Usando cliques via DevTools Protocol")
+                result = self._get_cdp_executor().execute_synchronized_clicks(drivers, xpaths)
+            elif mode == CLICK_MODE_ATOMIC:
+                self.logger.info(f"Usando executor atômico (backend {self.sync_backend_name})")
                 # Registra timestamp pré-execução
                 for driver in drivers:
                     self.timestamp_logger.log_timestamp('Pre-Atomic', id(driver))
@@ -69,8 +181,14 @@ class LinuxPrecisionClickManager:
                 # Usa implementação existente
                 result = self.sync_executor.execute_synchronized_clicks(drivers, xpaths)
             
-            # Analisa timestamps
-            self.timestamp_logger.analyze_timestamps()
+            # Analisa apenas o grupo de cliques atual
+            self.timestamp_logger.analyze_timestamps(latest_only=True)
+
+            stats = self.element_cache.stats()
+            self.logger.info(
+                f"📦 Cache de elementos: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['stale']} obsoletos, taxa {stats['hit_rate']:.0%})"
+            )
             
             return result
             
@@ -78,6 +196,49 @@ class LinuxPrecisionClickManager:
             self.logger.error(f"Erro durante execução sincronizada: {e}")
             return False
     
+    def _armable_executor(self, mode):
+        """Executor com arm()/fire() para o modo, ou None se o modo não separa as fases."""
+        if mode == CLICK_MODE_ATOMIC:
+            return self.atomic_executor
+        if mode == CLICK_MODE_CDP:
+            return self._get_cdp_executor()
+        return None
+
+    def schedule_synchronized_clicks(self, drivers, xpaths, target_wall_ns, mode=None):
+        """
+        Executa cliques sincronizados em um horário de parede absoluto.
+
+        Args:
+            drivers: Lista de WebDrivers
+            xpaths: Lista de XPaths
+            target_wall_ns: Horário alvo em ns epoch (CLOCK_REALTIME)
+            mode: Como em execute_synchronized_clicks; 'atomic' e 'cdp' armam
+                antes do alvo, os demais aguardam o alvo e executam por inteiro
+
+        Returns:
+            bool: True se sucesso, False caso contrário
+        """
+        mode = self._resolve_mode(mode, False)
+        self.last_target_report = None
+        executor = self._armable_executor(mode)
+        if executor is None:
+            self.logger.warning(f"Modo {mode} sem armação antecipada; executando no alvo")
+            if not self.target_scheduler.wait_until(target_wall_ns):
+                self.logger.warning("Clique agendado cancelado")
+                return False
+            return self.execute_synchronized_clicks(drivers, xpaths, mode=mode)
+
+        self.logger.info(f"Agendando {len(drivers)} cliques ({mode}) para o horário alvo")
+        self.timestamp_logger.begin_group()
+        try:
+            report = self.target_scheduler.schedule(executor, drivers, xpaths, target_wall_ns)
+        except Exception as e:
+            self.logger.error(f"Erro durante clique agendado: {e}")
+            return False
+        self.last_target_report = report
+        self.timestamp_logger.analyze_timestamps(latest_only=True)
+        return report.success
+
     def cleanup(self):
         """Limpa recursos de todos os componentes."""
         try:
@@ -88,6 +249,14 @@ class LinuxPrecisionClickManager:
             # Limpa executor atômico
             if self.atomic_executor:
                 self.atomic_executor.cleanup()
+
+            # Encerra processos de clique
+            if self.process_executor:
+                self.process_executor.cleanup()
+
+            # Fecha os websockets do DevTools
+            if self.cdp_executor:
+                self.cdp_executor.cleanup()
                 
             self.logger.info("Recursos limpos com sucesso.")
         except Exception as e:
@@ -0,0 +1,202 @@
+import itertools
+import multiprocessing
+import os
+from typing import Dict, List, Optional
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from src.sistema.cpu_manager import CPUManager
+
+# Tempo máximo aguardando a resposta de um processo de clique
+WORKER_TIMEOUT_S = 30.0
+# Participantes da barreira compartilhada (SHM_MAX_PARTIES em modules/click_sync.c)
+SHM_MAX_PARTIES = 64
+
+class _AttachedDriver(WebDriver):
+    """WebDriver remoto anexado a uma sessão já existente do chromedriver."""
+
+    def __init__(self, executor_url: str, session_id: str):
+        self._attach_session_id = session_id
+        super().__init__(command_executor=executor_url, options=Options())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        # Reaproveita a sessão aberta pelo processo principal
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+def _executor_url(driver: WebDriver) -> str:
+    """URL do chromedriver usado por um driver do processo principal."""
+    executor = driver.command_executor
+    url = getattr(executor, '_url', None)
+    if url is None:
+        url = executor._client_config.remote_server_addr
+    return url
+
+def _click_process_main(conn) -> None:
+    """Laço do processo de clique: anexa à sessão, arma, sincroniza e clica."""
+    import click_sync
+
+    drivers: Dict[str, _AttachedDriver] = {}
+    attached_name = None
+    pinned_cpu = None
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+
+        element = None
+        error = None
+        try:
+            if job['cpu'] is not None and job['cpu'] != pinned_cpu:
+                click_sync.set_cpu(job['cpu'])
+                pinned_cpu = job['cpu']
+
+            driver = drivers.get(job['session_id'])
+            if driver is None:
+                driver = drivers[job['session_id']] = _AttachedDriver(job['executor_url'], job['session_id'])
+
+            element = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.XPATH, job['xpath']))
+            )
+            driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        except Exception as e:
+            error = e
+
+        try:
+            if job['shm_name'] != attached_name:
+                click_sync.shm_attach(job['shm_name'])
+                attached_name = job['shm_name']
+
+            # Participa da barreira mesmo sem elemento para não travar os demais
+            released_ns = click_sync.shm_barrier_wait(job['party'])
+            if element is None:
+                raise error
+            driver.execute_script("arguments[0].click();", element)
+            conn.send({'ok': True, 'released_ns': released_ns})
+        except Exception as e:
+            conn.send({'ok': False, 'error': repr(e)})
+
+    if attached_name is not None:
+        click_sync.shm_detach()
+
+class MultiProcessClickExecutor:
+    """
+    Executor com um processo de clique por navegador.
+
+    Os processos se encontram na barreira de memória compartilhada do
+    click_sync (segmento nomeado + contador de geração com futex), cada um
+    fixado explicitamente em uma CPU e sem disputar o GIL do processo principal.
+    """
+
+    def __init__(self, logger, cpu_manager: Optional[CPUManager] = None):
+        import click_sync
+
+        if not hasattr(click_sync, 'shm_create'):
+            raise RuntimeError("click_sync compilado sem suporte a memória compartilhada")
+
+        self.logger = logger
+        self.click_sync = click_sync
+        self.cpu_manager = cpu_manager or CPUManager(logger)
+        self.context = multiprocessing.get_context('spawn')
+        self.workers: List[tuple] = []
+        self._rounds = itertools.count()
+        self.last_release_ns: List[int] = []
+
+    def _ensure_workers(self, count: int) -> None:
+        while len(self.workers) < count:
+            parent_conn, child_conn = self.context.Pipe()
+            process = self.context.Process(
+                target=_click_process_main,
+                args=(child_conn,),
+                name=f"click-process-{len(self.workers)}",
+                daemon=True
+            )
+            process.start()
+            self.workers.append((process, parent_conn))
+
+    def _assign_cpus(self, count: int) -> List[Optional[int]]:
+        """Uma CPU explícita por processo (primeiro núcleo de cada grupo atribuído)."""
+        allowed = os.sched_getaffinity(0)
+        cpus = []
+        for cores in self.cpu_manager.assign_cores_for_tasks(count, os.cpu_count(), allowed):
+            cores = sorted(cores & allowed)
+            cpus.append(cores[0] if cores else None)
+        return cpus
+
+    def execute_synchronized_clicks(self, drivers: List[WebDriver], xpaths: List[str]) -> bool:
+        """Executa cliques sincronizados, um processo por navegador."""
+        if len(drivers) != len(xpaths) or not drivers:
+            return False
+
+        if len(drivers) > SHM_MAX_PARTIES:
+            self.logger.error(
+                f"Clique multiprocesso limitado a {SHM_MAX_PARTIES} navegadores por barreira "
+                f"({len(drivers)} pedidos); use outro modo de clique ou divida a frota"
+            )
+            return False
+
+        shm_name = f"/clique_sync_{os.getpid()}_{next(self._rounds)}"
+        try:
+            self.click_sync.shm_create(shm_name, len(drivers))
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Erro ao criar segmento de sincronização: {e}")
+            return False
+
+        try:
+            self._ensure_workers(len(drivers))
+            cpus = self._assign_cpus(len(drivers))
+
+            for party, (driver, xpath) in enumerate(zip(drivers, xpaths)):
+                _, conn = self.workers[party]
+                conn.send({
+                    'executor_url': _executor_url(driver),
+                    'session_id': driver.session_id,
+                    'xpath': xpath,
+                    'shm_name': shm_name,
+                    'party': party,
+                    'cpu': cpus[party],
+                })
+
+            results = []
+            for party in range(len(drivers)):
+                _, conn = self.workers[party]
+                if not conn.poll(WORKER_TIMEOUT_S):
+                    raise TimeoutError(f"Processo de clique {party} não respondeu")
+                results.append(conn.recv())
+        except Exception as e:
+            self.logger.error(f"Erro durante execução multiprocesso: {e}")
+            self.cleanup()
+            return False
+        finally:
+            self.click_sync.shm_unlink(shm_name)
+
+        success = True
+        for party, result in enumerate(results):
+            if not result['ok']:
+                self.logger.error(f"❌ Processo {party}: {result['error']}")
+                success = False
+
+        self.last_release_ns = [r['released_ns'] for r in results if r['ok']]
+        if len(self.last_release_ns) >= 2:
+            skew = max(self.last_release_ns) - min(self.last_release_ns)
+            self.logger.info(f"📏 Desvio de liberação entre processos: {skew / 1000:.3f}μs")
+        return success
+
+    def cleanup(self) -> None:
+        """Encerra os processos de clique."""
+        for process, conn in self.workers:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self.workers.clear()
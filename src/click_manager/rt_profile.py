@@ -0,0 +1,386 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import platform
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Políticas do perfil de tempo real
+RT_POLICY_OFF = 'off'
+RT_POLICY_FIFO = 'fifo'
+RT_POLICY_DEADLINE = 'deadline'
+RT_POLICIES = (RT_POLICY_OFF, RT_POLICY_FIFO, RT_POLICY_DEADLINE)
+
+# Prioridade SCHED_FIFO das threads de clique (abaixo das threads do kernel em 99)
+RT_FIFO_PRIORITY = 80
+# Orçamento SCHED_DEADLINE: até DL_RUNTIME_NS de CPU a cada DL_PERIOD_NS
+DL_RUNTIME_NS = 300_000
+DL_DEADLINE_NS = 1_000_000
+DL_PERIOD_NS = 1_000_000
+# Pilha das threads de disparo (pré-carregada e travada com mlock em cada worker)
+WORKER_STACK_BYTES = 512 * 1024
+# Bytes reservados para um pthread_attr_t (56 em x86_64, 64 em aarch64)
+PTHREAD_ATTR_BYTES = 128
+
+# Auto-medição estilo cyclictest: intervalo e número de ciclos
+WAKEUP_INTERVAL_US = 1000
+WAKEUP_LOOPS = 1000
+# Host apto a cliques precisos: p99 e máximo da latência de despertar
+WAKEUP_FIT_P99_US = 100
+WAKEUP_FIT_MAX_US = 500
+
+# Números do syscall sched_setattr por arquitetura
+SYS_SCHED_SETATTR = {'x86_64': 314, 'aarch64': 274, 'armv7l': 380, 'i686': 351}
+SCHED_DEADLINE = 6
+SCHED_FLAG_RESET_ON_FORK = 0x01
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+RT_RUNTIME_PATH = "/proc/sys/kernel/sched_rt_runtime_us"
+
+class SchedAttr(ctypes.Structure):
+    """struct sched_attr do kernel (include/uapi/linux/sched/types.h)."""
+    _fields_ = [
+        ('size', ctypes.c_uint32),
+        ('sched_policy', ctypes.c_uint32),
+        ('sched_flags', ctypes.c_uint64),
+        ('sched_nice', ctypes.c_int32),
+        ('sched_priority', ctypes.c_uint32),
+        ('sched_runtime', ctypes.c_uint64),
+        ('sched_deadline', ctypes.c_uint64),
+        ('sched_period', ctypes.c_uint64),
+    ]
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+_libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+_libc.pthread_self.restype = ctypes.c_ulong
+_libc.pthread_getattr_np.argtypes = [ctypes.c_ulong, ctypes.c_void_p]
+_libc.pthread_attr_getstack.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)]
+_libc.mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+
+def _raise_memlock_limit() -> None:
+    """Sobe o limite soft de RLIMIT_MEMLOCK até o hard (sem privilégio não passa disso)."""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_MEMLOCK)
+        resource.setrlimit(resource.RLIMIT_MEMLOCK, (hard, hard))
+    except (ValueError, OSError):
+        pass
+
+def _current_stack() -> Tuple[int, int]:
+    """(endereço base, tamanho) da pilha da thread chamadora, sem a página de guarda."""
+    attr = ctypes.create_string_buffer(PTHREAD_ATTR_BYTES)
+    code = _libc.pthread_getattr_np(_libc.pthread_self(), attr)
+    if code != 0:
+        raise OSError(code, os.strerror(code))
+    try:
+        addr, size = ctypes.c_void_p(), ctypes.c_size_t()
+        code = _libc.pthread_attr_getstack(attr, ctypes.byref(addr), ctypes.byref(size))
+        if code != 0:
+            raise OSError(code, os.strerror(code))
+        return addr.value, size.value
+    finally:
+        _libc.pthread_attr_destroy(attr)
+
+def _sched_setattr_deadline(runtime_ns: int, deadline_ns: int, period_ns: int) -> None:
+    """SCHED_DEADLINE na thread chamadora (OSError em caso de falha)."""
+    number = SYS_SCHED_SETATTR.get(platform.machine())
+    if number is None:
+        raise OSError(f"sched_setattr desconhecido em {platform.machine()}")
+    attr = SchedAttr(
+        size=ctypes.sizeof(SchedAttr),
+        sched_policy=SCHED_DEADLINE,
+        sched_flags=SCHED_FLAG_RESET_ON_FORK,
+        sched_runtime=runtime_ns,
+        sched_deadline=deadline_ns,
+        sched_period=period_ns,
+    )
+    if _libc.syscall(number, 0, ctypes.byref(attr), 0) != 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code))
+
+def _sleep_until_monotonic(deadline_ns: int) -> None:
+    """clock_nanosleep absoluto em CLOCK_MONOTONIC (como o cyclictest)."""
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    while _libc.clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None) != 0:
+        # EINTR: volta a dormir até o mesmo prazo
+        continue
+
+def _read_status_kib(field_name: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field_name + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def rt_throttle_ratio() -> Optional[float]:
+    """Fração de cada segundo liberada para tarefas RT (None = sem limite ou ilegível)."""
+    try:
+        with open(RT_RUNTIME_PATH) as f:
+            runtime = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return None if runtime < 0 else runtime / 1_000_000
+
+@dataclass
+class WakeupLatencyReport:
+    """Latência de despertar medida com sleeps absolutos periódicos (μs)."""
+    policy: str
+    interval_us: int
+    samples: List[float] = field(default_factory=list)
+    locked_kib: Optional[int] = None
+    rt_throttle: Optional[float] = None
+
+    def _stat(self, fn) -> Optional[float]:
+        return fn(self.samples) if self.samples else None
+
+    @property
+    def min_us(self) -> Optional[float]:
+        return self._stat(min)
+
+    @property
+    def avg_us(self) -> Optional[float]:
+        return self._stat(statistics.fmean)
+
+    @property
+    def max_us(self) -> Optional[float]:
+        return self._stat(max)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    @property
+    def fit(self) -> bool:
+        """Host apto a cliques precisos (p99 e máximo dentro dos limites)."""
+        return bool(self.samples) and self.percentile(99) <= WAKEUP_FIT_P99_US and self.max_us <= WAKEUP_FIT_MAX_US
+
+    def describe(self) -> str:
+        if not self.samples:
+            return f"{self.policy}: sem amostras"
+        return (f"{self.policy}: {len(self.samples)} ciclos de {self.interval_us}μs | "
+                f"mín {self.min_us:.0f}μs, média {self.avg_us:.0f}μs, p50 {self.percentile(50):.0f}μs, "
+                f"p99 {self.percentile(99):.0f}μs, máx {self.max_us:.0f}μs")
+
+    def as_dict(self) -> dict:
+        return {
+            "politica": self.policy,
+            "intervalo_us": self.interval_us,
+            "ciclos": len(self.samples),
+            "min_us": self.min_us,
+            "media_us": self.avg_us,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "max_us": self.max_us,
+            "memoria_travada_kib": self.locked_kib,
+            "limite_rt": self.rt_throttle,
+            "apto": self.fit,
+        }
+
+class RTProfile:
+    """
+    Perfil de escalonamento de tempo real para as threads de clique.
+
+    Só a janela arm→fire roda em RT: `window()` aplica SCHED_FIFO (ou
+    SCHED_DEADLINE com orçamento limitado) na thread chamadora e restaura a
+    política anterior na saída. Sem permissão, o perfil cai para a política
+    seguinte (deadline → fifo → off) com um único aviso.
+
+    SCHED_DEADLINE exige que a afinidade da thread cubra todo o domínio de
+    escalonamento; em threads fixadas em poucos núcleos o kernel recusa e o
+    perfil usa SCHED_FIFO. Quando o controle de admissão recusa o orçamento
+    (EBUSY: soma de runtime/period acima do limite RT), só aquela janela
+    usa SCHED_FIFO.
+
+    Args:
+        logger: Logger
+        policy: 'fifo', 'deadline' ou 'off'
+        priority: Prioridade SCHED_FIFO
+        runtime_ns/deadline_ns/period_ns: Orçamento SCHED_DEADLINE
+    """
+
+    def __init__(self, logger, policy: str = RT_POLICY_FIFO, priority: int = RT_FIFO_PRIORITY,
+                 runtime_ns: int = DL_RUNTIME_NS, deadline_ns: int = DL_DEADLINE_NS, period_ns: int = DL_PERIOD_NS):
+        if policy not in RT_POLICIES:
+            raise ValueError(f"Política RT inválida: {policy} (use {', '.join(RT_POLICIES)})")
+        self.logger = logger
+        self.policy = policy
+        self.priority = priority
+        self.runtime_ns = runtime_ns
+        self.deadline_ns = deadline_ns
+        self.period_ns = period_ns
+        self.memory_locked = False
+        self._admission_warned = False
+        self._stack_lock_warned = False
+        self._memlock_raised = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _fallback(self, error: OSError) -> None:
+        with self._lock:
+            anterior = self.policy
+            self.policy = RT_POLICY_FIFO if anterior == RT_POLICY_DEADLINE else RT_POLICY_OFF
+        self.logger.warning(f"⚠️ Política RT {anterior} recusada ({error}); usando {self.policy}")
+
+    def _set_fifo(self) -> None:
+        os.sched_setscheduler(0, os.SCHED_FIFO | os.SCHED_RESET_ON_FORK, os.sched_param(self.priority))
+
+    def _apply(self) -> None:
+        while self.policy != RT_POLICY_OFF:
+            policy = self.policy
+            try:
+                if policy == RT_POLICY_DEADLINE:
+                    try:
+                        _sched_setattr_deadline(self.runtime_ns, self.deadline_ns, self.period_ns)
+                    except OSError as e:
+                        if e.errno != errno.EBUSY:
+                            raise
+                        if not self._admission_warned:
+                            self._admission_warned = True
+                            self.logger.warning("⚠️ Orçamento SCHED_DEADLINE esgotado; janelas excedentes usam SCHED_FIFO")
+                        self._set_fifo()
+                else:
+                    self._set_fifo()
+                return
+            except OSError as e:
+                if self.policy == policy:
+                    self._fallback(e)
+
+    def enter(self) -> Optional[Tuple[int, int]]:
+        """Entra em RT na thread chamadora; retorna a política anterior para leave()."""
+        if self.policy == RT_POLICY_OFF:
+            return None
+        saved = (os.sched_getscheduler(0), os.sched_getparam(0).sched_priority)
+        self._apply()
+        return saved
+
+    def leave(self, saved: Optional[Tuple[int, int]]) -> None:
+        """Restaura a política salva por enter()."""
+        if saved is None:
+            return
+        policy, priority = saved
+        try:
+            os.sched_setscheduler(0, policy, os.sched_param(priority))
+        except OSError as e:
+            self.logger.warning(f"⚠️ Falha ao restaurar a política de escalonamento: {e}")
+
+    @contextmanager
+    def window(self):
+        """Janela RT na thread chamadora (janelas aninhadas reaproveitam a externa)."""
+        depth = getattr(self._local, 'depth', 0)
+        saved = self.enter() if depth == 0 else None
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self.leave(saved)
+
+    @contextmanager
+    def worker_stacks(self):
+        """Cria threads com pilha de WORKER_STACK_BYTES (travada por lock_thread_stack() no worker)."""
+        if self.policy == RT_POLICY_OFF:
+            yield
+            return
+        previous = threading.stack_size(WORKER_STACK_BYTES)
+        try:
+            yield
+        finally:
+            threading.stack_size(previous)
+
+    def lock_thread_stack(self) -> bool:
+        """
+        Pré-carrega e trava (mlock) a pilha da thread chamadora.
+
+        Chamado no início de cada worker de disparo: só essas pilhas ficam
+        residentes, sem travar as pilhas de 8MB das demais threads do processo.
+        """
+        if self.policy == RT_POLICY_OFF:
+            return False
+        with self._lock:
+            if not self._memlock_raised:
+                _raise_memlock_limit()
+                self._memlock_raised = True
+        try:
+            addr, size = _current_stack()
+            if _libc.mlock(addr, size) != 0:
+                code = ctypes.get_errno()
+                raise OSError(code, os.strerror(code))
+        except OSError as e:
+            with self._lock:
+                warn, self._stack_lock_warned = not self._stack_lock_warned, True
+            if warn:
+                self.logger.warning(f"⚠️ mlock da pilha recusado ({e.strerror or e}); pilhas dos workers não travadas")
+            return False
+        return True
+
+    def lock_memory(self) -> bool:
+        """
+        mlockall(MCL_CURRENT | MCL_FUTURE) de todo o processo (opt-in).
+
+        Trava também as pilhas de todas as threads e cada mapeamento novo; por
+        padrão só as pilhas dos workers de disparo são travadas (lock_thread_stack).
+        """
+        if self.memory_locked or self.policy == RT_POLICY_OFF:
+            return self.memory_locked
+        _raise_memlock_limit()
+        if _libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            code = ctypes.get_errno()
+            self.logger.warning(f"⚠️ mlockall recusado ({os.strerror(code)}); memória do processo não travada")
+            return False
+        self.memory_locked = True
+        self.logger.info(f"🔒 Memória travada: {_read_status_kib('VmLck') or 0} KiB")
+        return True
+
+    def measure_wakeup_latency(self, interval_us: int = WAKEUP_INTERVAL_US, loops: int = WAKEUP_LOOPS,
+                               cpu: Optional[int] = None) -> WakeupLatencyReport:
+        """
+        Auto-medição estilo cyclictest: uma thread sob este perfil dorme até
+        instantes absolutos periódicos e registra o atraso de cada despertar.
+
+        Args:
+            interval_us: Período entre despertares
+            loops: Número de ciclos
+            cpu: CPU onde medir (ex.: a de um worker de clique); None mantém a afinidade
+        """
+        report = WakeupLatencyReport(policy=self.policy, interval_us=interval_us, rt_throttle=rt_throttle_ratio())
+
+        def medir():
+            if cpu is not None:
+                try:
+                    os.sched_setaffinity(0, {cpu})
+                except OSError as e:
+                    self.logger.warning(f"⚠️ Medição fora da CPU {cpu}: {e}")
+            with self.window():
+                report.policy = self.policy
+                interval_ns = interval_us * 1000
+                deadline = time.monotonic_ns() + interval_ns
+                for _ in range(loops):
+                    _sleep_until_monotonic(deadline)
+                    report.samples.append((time.monotonic_ns() - deadline) / 1000)
+                    deadline += interval_ns
+
+        with self.worker_stacks():
+            thread = threading.Thread(target=medir, name="rt-wakeup-test", daemon=True)
+            thread.start()
+        thread.join()
+        report.locked_kib = _read_status_kib('VmLck')
+
+        nivel = self.logger.info if report.fit else self.logger.warning
+        nivel(f"⏱️ Latência de despertar {report.describe()} "
+              f"({'apto' if report.fit else 'NÃO apto'} a cliques precisos)")
+        return report
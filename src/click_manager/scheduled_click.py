@@ -0,0 +1,297 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from .element_cache import ElementCache, element_cache as shared_element_cache
+
+# Amostras usadas na calibração do relógio de cada navegador
+CALIBRATION_SAMPLES = 15
+# Folga entre o fim da armação e o instante de disparo
+SCHEDULE_MARGIN_NS = 50_000_000
+# Últimos milissegundos antes do prazo são feitos em spin dentro da página
+IN_PAGE_SPIN_MS = 4.0
+# Tempo extra aguardado após o prazo antes de coletar os resultados
+COLLECT_GRACE_NS = 20_000_000
+# Idade máxima de uma calibração antes de medir o offset de novo (deriva/slew)
+OFFSET_MAX_AGE_NS = 60_000_000_000
+
+# Instala o agendador na página (idempotente)
+SCHEDULER_INSTALL_SCRIPT = """
+if (!window.__cliqueScheduler) {
+    const now = () => performance.timeOrigin + performance.now();
+    window.__cliqueScheduler = {
+        now: now,
+        timer: null,
+        armed: false,
+        result: null,
+        arm: function(el, deadline, spinMs) {
+            const s = window.__cliqueScheduler;
+            s.disarm();
+            const armed = now();
+            // Prazo já passou: não dispara atrasado
+            if (armed >= deadline) return {armed: false, now: armed};
+            const fire = () => {
+                while (now() < deadline) {}
+                const fired = now();
+                s.armed = false;
+                el.click();
+                s.result = {deadline: deadline, fired: fired};
+            };
+            s.timer = setTimeout(fire, Math.max(0, deadline - armed - spinMs));
+            s.armed = true;
+            return {armed: true, now: armed};
+        },
+        disarm: function() {
+            const s = window.__cliqueScheduler;
+            clearTimeout(s.timer);
+            s.timer = null;
+            s.armed = false;
+            s.result = null;
+        }
+    };
+}
+return performance.timeOrigin;
+"""
+
+# Arma o clique; retorna null se o agendador sumiu (navegação)
+SCHEDULER_ARM_SCRIPT = """
+if (!window.__cliqueScheduler) return null;
+return window.__cliqueScheduler.arm(arguments[0], arguments[1], arguments[2]);
+"""
+
+# Cancela um clique armado (armação abortada em outra página)
+SCHEDULER_DISARM_SCRIPT = """
+if (window.__cliqueScheduler) window.__cliqueScheduler.disarm();
+"""
+
+SCHEDULER_RESULT_SCRIPT = """
+return window.__cliqueScheduler ? window.__cliqueScheduler.result : null;
+"""
+
+# timeOrigin separado de now(): muda a cada navegação e invalida a calibração
+CLOCK_SCRIPT = "return [performance.timeOrigin, performance.now()];"
+
+class ScheduledClickError(Exception):
+    """Armação que não terminou antes do instante de disparo."""
+
+@dataclass
+class ClockOffset:
+    """Offset (ns) entre o relógio da página e o monotonic do host."""
+    offset_ns: int
+    rtt_ns: int
+    # performance.timeOrigin da página calibrada (ms)
+    time_origin: float = 0.0
+    # Instante (monotonic do host) da calibração
+    calibrated_ns: int = 0
+
+    def is_valid(self, time_origin: float, now_ns: int, max_age_ns: int = OFFSET_MAX_AGE_NS) -> bool:
+        """Mesma página (timeOrigin) e calibração recente o bastante."""
+        return time_origin == self.time_origin and now_ns - self.calibrated_ns < max_age_ns
+
+    def uncertainty_ns(self) -> int:
+        """Erro máximo do offset: o instante lido na página está em algum ponto do round-trip."""
+        return self.rtt_ns // 2
+
+    def to_page_ms(self, monotonic_ns: int) -> float:
+        return (monotonic_ns + self.offset_ns) / 1e6
+
+    def to_monotonic_ns(self, page_ms: float) -> int:
+        return int(page_ms * 1e6) - self.offset_ns
+
+def calibrate_clock(driver: WebDriver, samples: int = CALIBRATION_SAMPLES) -> ClockOffset:
+    """Offset do relógio da página; escolhe a amostra de menor RTT (estilo NTP)."""
+    best = None
+    for _ in range(samples):
+        t0 = time.monotonic_ns()
+        time_origin, now = driver.execute_script(CLOCK_SCRIPT)
+        t1 = time.monotonic_ns()
+        sample = ClockOffset(
+            offset_ns=int((time_origin + now) * 1e6) - (t0 + t1) // 2,
+            rtt_ns=t1 - t0,
+            time_origin=time_origin,
+            calibrated_ns=t1
+        )
+        if best is None or sample.rtt_ns < best.rtt_ns:
+            best = sample
+    return best
+
+@dataclass
+class ScheduledClick:
+    """Cliques agendados dentro das páginas para um mesmo instante."""
+    drivers: List[WebDriver]
+    xpaths: List[str]
+    target_ns: int
+    fired_ns: List[Optional[int]] = field(default_factory=list)
+
+    def errors_ns(self) -> List[Optional[int]]:
+        """Distância de cada disparo real ao alvo (ns)."""
+        return [None if f is None else f - self.target_ns for f in self.fired_ns]
+
+    def skew_ns(self) -> Optional[int]:
+        fired = [f for f in self.fired_ns if f is not None]
+        if len(fired) < 2:
+            return None
+        return max(fired) - min(fired)
+
+class InPageScheduledClickExecutor:
+    """
+    Executor que agenda o clique dentro da própria página.
+
+    O Python envia um prazo absoluto (no relógio da página) durante a armação;
+    a página faz spin em performance.now() e dispara click() sozinha, sem
+    pagar o round-trip do WebDriver no momento do clique.
+
+    A calibração de cada navegador é refeita quando a página muda
+    (performance.timeOrigin diferente) ou fica mais velha que
+    OFFSET_MAX_AGE_NS. Uma armação que termina depois do prazo, ou que
+    alguma página recusa, desarma as páginas já armadas, levanta
+    ScheduledClickError e aumenta a folga das próximas armações.
+    """
+
+    def __init__(self, logger, element_cache: Optional[ElementCache] = None):
+        self.logger = logger
+        self.element_cache = element_cache or shared_element_cache
+        self.offsets: Dict[int, ClockOffset] = {}
+        self.last_scheduled: Optional[ScheduledClick] = None
+        # Folga mínima aprendida com a duração das armações anteriores
+        self.margin_ns = SCHEDULE_MARGIN_NS
+
+    def _parallel(self, fn, *iterables):
+        items = list(zip(*iterables))
+        with ThreadPoolExecutor(max_workers=max(1, len(items))) as pool:
+            return list(pool.map(lambda args: fn(*args), items))
+
+    def calibrate(self, drivers: List[WebDriver], samples: int = CALIBRATION_SAMPLES) -> Dict[int, ClockOffset]:
+        """Estima o offset de relógio de cada navegador em relação ao host."""
+        offsets = self._parallel(
+            lambda driver: calibrate_clock(driver, samples), drivers
+        )
+        for i, (driver, offset) in enumerate(zip(drivers, offsets)):
+            self.offsets[id(driver)] = offset
+            self.logger.info(
+                f"⏱️ Navegador {i}: offset={offset.offset_ns / 1e6:.3f}ms "
+                f"rtt={offset.rtt_ns / 1000:.1f}μs"
+            )
+        return self.offsets
+
+    def _resolve(self, driver: WebDriver, xpath: str):
+        """Elemento e performance.timeOrigin atual da página."""
+        element = self.element_cache.get(driver, xpath)
+        time_origin = driver.execute_script(SCHEDULER_INSTALL_SCRIPT)
+        driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        return element, time_origin
+
+    def _arm_driver(self, driver: WebDriver, element, target_ns: int) -> bool:
+        """Arma uma página; False se ela recebeu o prazo já vencido."""
+        deadline_ms = self.offsets[id(driver)].to_page_ms(target_ns)
+        armed = driver.execute_script(SCHEDULER_ARM_SCRIPT, element, deadline_ms, IN_PAGE_SPIN_MS)
+        if armed is None:
+            driver.execute_script(SCHEDULER_INSTALL_SCRIPT)
+            armed = driver.execute_script(SCHEDULER_ARM_SCRIPT, element, deadline_ms, IN_PAGE_SPIN_MS)
+        return bool(armed and armed.get('armed'))
+
+    def _disarm(self, drivers: List[WebDriver], armed: List[bool]) -> None:
+        """Cancela o clique das páginas que chegaram a armar."""
+        def disarm(i, driver):
+            try:
+                driver.execute_script(SCHEDULER_DISARM_SCRIPT)
+            except Exception as e:
+                self.logger.error(f"Erro ao desarmar clique agendado no navegador {i}: {e}")
+
+        indices = [i for i, ok in enumerate(armed) if ok]
+        self._parallel(disarm, indices, [drivers[i] for i in indices])
+
+    def arm(self, drivers: List[WebDriver], xpaths: List[str],
+            delay_ns: Optional[int] = None) -> ScheduledClick:
+        """
+        Resolve os elementos e agenda o clique em todas as páginas.
+
+        Args:
+            drivers: Lista de WebDrivers
+            xpaths: Lista de XPaths
+            delay_ns: Distância entre o fim da resolução e o instante de disparo
+                (padrão: folga aprendida, no mínimo SCHEDULE_MARGIN_NS)
+
+        Returns:
+            ScheduledClick com o instante alvo no monotonic do host
+
+        Raises:
+            ScheduledClickError: se a armação terminou depois do instante alvo
+        """
+        resolved = self._parallel(self._resolve, drivers, xpaths)
+        now_ns = time.monotonic_ns()
+        stale = [
+            driver for driver, (_, time_origin) in zip(drivers, resolved)
+            if id(driver) not in self.offsets
+            or not self.offsets[id(driver)].is_valid(time_origin, now_ns)
+        ]
+        if stale:
+            self.calibrate(stale)
+
+        delay_ns = self.margin_ns if delay_ns is None else delay_ns
+        start_ns = time.monotonic_ns()
+        target_ns = start_ns + delay_ns
+
+        def arm_driver(i, driver, resolved_item):
+            try:
+                return self._arm_driver(driver, resolved_item[0], target_ns)
+            except Exception as e:
+                # Conta como recusa: as páginas já armadas são desarmadas abaixo
+                self.logger.error(f"Erro ao armar clique agendado no navegador {i}: {e}")
+                return False
+
+        armed = self._parallel(arm_driver, range(len(drivers)), drivers, resolved)
+        end_ns = time.monotonic_ns()
+        # Próximas armações com o dobro da duração desta como folga
+        self.margin_ns = max(SCHEDULE_MARGIN_NS, 2 * (end_ns - start_ns))
+        if end_ns >= target_ns or not all(armed):
+            late = [i for i, ok in enumerate(armed) if not ok]
+            # Sem todas as páginas a tempo, nenhuma dispara (nada de clique parcial)
+            self._disarm(drivers, armed)
+            raise ScheduledClickError(
+                f"armação incompleta: levou {(end_ns - start_ns) / 1e6:.1f}ms com folga de "
+                f"{delay_ns / 1e6:.1f}ms (navegadores sem disparo: {late}); todas desarmadas, "
+                f"próxima folga {self.margin_ns / 1e6:.1f}ms"
+            )
+        return ScheduledClick(drivers=list(drivers), xpaths=list(xpaths), target_ns=target_ns)
+
+    def collect(self, scheduled: ScheduledClick) -> ScheduledClick:
+        """Aguarda o prazo e lê o instante real de disparo informado por cada página."""
+        remaining = scheduled.target_ns + COLLECT_GRACE_NS - time.monotonic_ns()
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+
+        results = self._parallel(
+            lambda driver: driver.execute_script(SCHEDULER_RESULT_SCRIPT), scheduled.drivers
+        )
+        scheduled.fired_ns = [
+            None if result is None
+            else self.offsets[id(driver)].to_monotonic_ns(result['fired'])
+            for driver, result in zip(scheduled.drivers, results)
+        ]
+        return scheduled
+
+    def execute_synchronized_clicks(self, drivers: List[WebDriver], xpaths: List[str]) -> bool:
+        """Agenda, aguarda e reporta o desvio dos cliques disparados na página."""
+        if len(drivers) != len(xpaths) or not drivers:
+            return False
+
+        try:
+            scheduled = self.collect(self.arm(drivers, xpaths))
+        except Exception as e:
+            self.logger.error(f"Erro durante clique agendado na página: {e}")
+            return False
+
+        self.last_scheduled = scheduled
+        for i, error in enumerate(scheduled.errors_ns()):
+            if error is None:
+                self.logger.error(f"❌ Navegador {i}: clique agendado não disparou")
+            else:
+                self.logger.info(f"🎯 Navegador {i}: disparo a {error / 1000:+.1f}μs do alvo")
+
+        skew = scheduled.skew_ns()
+        if skew is not None:
+            self.logger.info(f"📏 Desvio entre navegadores (na página): {skew / 1000:.1f}μs")
+
+        return all(f is not None for f in scheduled.fired_ns)
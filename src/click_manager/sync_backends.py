@@ -0,0 +1,208 @@
+import ctypes
+import fcntl
+import os
+import statistics
+import time
+
+# Constantes alinhadas com o kernel
+CLICK_SYNC_MAGIC = ord('k')
+CLICK_BUFFER_SIZE = 256
+MAX_THREADS = 16
+
+# Mesmos valores de modules/click_sync/click_sync_types.h
+SYNC_TIMEOUT_NS = 5000
+CLICK_PENDING = 0
+CLICK_READY = 1
+
+# Chamadas de sincronização medidas por backend na escolha inicial
+PROBE_ROUNDS = 20
+
+class ThreadCount(ctypes.Structure):
+    """Estrutura para contagem de threads, alinhada com o kernel."""
+    _pack_ = 1
+    _fields_ = [
+        ('count', ctypes.c_int)
+    ]
+
+class ClickData(ctypes.Structure):
+    """Estrutura alinhada para dados do clique."""
+    _pack_ = 1
+    _fields_ = [
+        ('element_ptr', ctypes.c_void_p),
+        ('click_time', ctypes.c_uint64),
+        ('driver_id', ctypes.c_int),
+        ('xpath', ctypes.c_char * CLICK_BUFFER_SIZE),
+        ('status', ctypes.c_int),
+        ('actual_click_time', ctypes.c_uint64)
+    ]
+
+class SyncClickCmd(ctypes.Structure):
+    """Comando de sincronização alinhado."""
+    _pack_ = 1
+    _fields_ = [
+        ('clicks', ClickData * MAX_THREADS),
+        ('num_clicks', ctypes.c_int),
+        ('sync_time', ctypes.c_uint64),
+        ('completed_clicks', ctypes.c_int),
+        ('cmd_lock', ctypes.c_uint32)
+    ]
+
+def _IOW(type_num: int, nr: int, struct_type) -> int:
+    """Recria macro _IOW do kernel usando tipos ctypes."""
+    size = ctypes.sizeof(struct_type)
+
+    IOC_WRITE = 1
+    IOC_SIZESHIFT = 16
+
+    return (IOC_WRITE << 30) | (size << IOC_SIZESHIFT) | (type_num << 8) | nr
+
+CLICK_SYNC_SET_THREADS = _IOW(CLICK_SYNC_MAGIC, 1, ThreadCount)
+CLICK_SYNC_WAIT = _IOW(CLICK_SYNC_MAGIC, 2, ctypes.c_ulong)
+CLICK_SYNC_ATOMIC = _IOW(CLICK_SYNC_MAGIC, 3, SyncClickCmd)
+
+class SyncBackend:
+    """Interface dos backends de sincronização usados pelo executor atômico."""
+
+    name = 'base'
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def set_threads(self, num_threads: int) -> bool:
+        """Configura o número de participantes da próxima sincronização."""
+        raise NotImplementedError
+
+    def sync(self, cmd: SyncClickCmd) -> bool:
+        """Ponto de sincronização: preenche sync_time/click_time/status do comando."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera recursos do backend."""
+
+class KernelSyncBackend(SyncBackend):
+    """Sincronização via ioctl em /dev/precise_sync (módulo click_sync)."""
+
+    name = 'kernel'
+    DEVICE_PATH = "/dev/precise_sync"
+
+    def __init__(self, logger):
+        super().__init__(logger)
+        self.device_fd = os.open(self.DEVICE_PATH, os.O_RDWR)
+        self.logger.info("Dispositivo de sincronização inicializado")
+
+    def set_threads(self, num_threads: int) -> bool:
+        if not (0 < num_threads <= MAX_THREADS):
+            return False
+
+        try:
+            tc = ThreadCount()
+            tc.count = num_threads
+            self.logger.debug(f"Enviando ThreadCount: size={ctypes.sizeof(tc)}, count={tc.count}")
+
+            result = fcntl.ioctl(self.device_fd, CLICK_SYNC_SET_THREADS, tc)
+            return result >= 0
+        except Exception as e:
+            self.logger.error(f"Erro ao configurar threads: {e}")
+            return False
+
+    def sync(self, cmd: SyncClickCmd) -> bool:
+        self.logger.debug(f"Enviando SyncClickCmd: size={ctypes.sizeof(cmd)}, num_clicks={cmd.num_clicks}")
+        try:
+            result = fcntl.ioctl(self.device_fd, CLICK_SYNC_ATOMIC, cmd)
+            if result < 0:
+                raise OSError(f"IOCTL falhou com código {result}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro na sincronização atômica: {e}")
+            return False
+
+    def close(self) -> None:
+        if self.device_fd is not None:
+            try:
+                os.close(self.device_fd)
+            except OSError:
+                pass
+            self.device_fd = None
+
+class UserspaceSyncBackend(SyncBackend):
+    """
+    Sincronização sem módulo kernel, com a mesma semântica de CLICK_SYNC_ATOMIC.
+
+    O prazo é calculado em CLOCK_MONOTONIC_RAW (no lugar do TSC) e a thread
+    chamadora faz spin até ele; as threads de disparo continuam aguardando na
+    barreira do executor (futex) e são liberadas logo em seguida.
+    """
+
+    name = 'userspace'
+
+    def __init__(self, logger, timeout_ns: int = SYNC_TIMEOUT_NS):
+        super().__init__(logger)
+        self.timeout_ns = timeout_ns
+        self.num_threads = 0
+
+    @staticmethod
+    def now_ns() -> int:
+        return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
+
+    def set_threads(self, num_threads: int) -> bool:
+        if not (0 < num_threads <= MAX_THREADS):
+            return False
+        self.num_threads = num_threads
+        return True
+
+    def sync(self, cmd: SyncClickCmd) -> bool:
+        if not (0 < cmd.num_clicks <= MAX_THREADS):
+            self.logger.error(f"Número de cliques inválido: {cmd.num_clicks}")
+            return False
+
+        deadline = self.now_ns() + self.timeout_ns
+        cmd.sync_time = deadline
+        cmd.completed_clicks = 0
+        for i in range(cmd.num_clicks):
+            cmd.clicks[i].click_time = deadline
+            cmd.clicks[i].status = CLICK_READY
+
+        # Spin até o prazo comum
+        while self.now_ns() < deadline:
+            pass
+        return True
+
+def _probe_latency_ns(backend: SyncBackend) -> float:
+    """Mediana do custo de uma chamada de sincronização com um clique (inf se falhar)."""
+    cmd = SyncClickCmd()
+    cmd.num_clicks = 1
+    samples = []
+    for _ in range(PROBE_ROUNDS):
+        start = time.perf_counter_ns()
+        if not backend.sync(cmd):
+            return float('inf')
+        samples.append(time.perf_counter_ns() - start)
+    return statistics.median(samples)
+
+def select_sync_backend(logger) -> SyncBackend:
+    """
+    Escolhe o backend de sincronização pela capacidade: o do kernel quando
+    /dev/precise_sync existe e responde, senão o de userspace.
+
+    Os dois não fazem o mesmo trabalho (o ioctl só carimba os prazos em TSC,
+    o userspace faz spin até o prazo), então o custo da chamada não serve para
+    compará-los; ele só é registrado no log.
+
+    Returns:
+        SyncBackend: Backend do kernel ou de userspace
+    """
+    try:
+        kernel = KernelSyncBackend(logger)
+    except OSError as e:
+        logger.warning(f"Backend do kernel indisponível: {e}")
+    else:
+        latency = _probe_latency_ns(kernel)
+        if latency != float('inf'):
+            logger.info(f"🔧 Backend de sincronização: kernel (ioctl em {latency / 1000:.2f}μs)")
+            return kernel
+        logger.warning("Backend do kernel não respondeu ao ioctl de sincronização; usando userspace")
+        kernel.close()
+
+    backend = UserspaceSyncBackend(logger)
+    logger.info(f"🔧 Backend de sincronização: userspace (spin de {backend.timeout_ns / 1000:.1f}μs até o prazo)")
+    return backend
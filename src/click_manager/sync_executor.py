@@ -1,31 +1,37 @@
 import os
 import time
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException
+from log_config import hot_section
+from .click_engine import ClickEngine
+from .element_cache import element_cache as shared_element_cache
+from .latency_model import DriverLatencyModel, wait_until_ns
+from .rt_profile import RT_POLICY_OFF, RTProfile
 
 class SynchronizedClickExecutor:
-    def __init__(self, logger, timestamp_logger, max_workers=None):
+    def __init__(self, logger, timestamp_logger, max_workers=None, click_engine=None, element_cache=None,
+                 latency_model=None, compensate=True, rt_profile=None):
         self.logger = logger
+        self.element_cache = element_cache or shared_element_cache
         self.timestamp_logger = timestamp_logger
         self.max_workers = max_workers or max(2, os.cpu_count() - 2)
+        self.click_engine = click_engine or ClickEngine(logger, self.max_workers)
+        # Atrasos por navegador aprendidos dos round-trips de clique
+        self.latency_model = latency_model or DriverLatencyModel()
+        self.compensate = compensate
+        # Workers em RT só da espera na barreira até o clique
+        self.rt_profile = rt_profile or RTProfile(logger, RT_POLICY_OFF)
 
     def localizar_elemento_resiliente(self, driver, xpath, tentativas=3):
         """Localiza elemento com tentativas resilientes."""
         for _ in range(tentativas):
             try:
-                elemento = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, xpath))
-                )
-                return elemento
+                return self.element_cache.get(driver, xpath)
             except StaleElementReferenceException:
+                self.element_cache.invalidate(driver, xpath)
                 self.logger.warning("🔄 Tentando localizar elemento novamente...")
         return None
 
-    def execute_synchronized_click(self, driver, xpath, barrier):
+    def execute_synchronized_click(self, driver, xpath, barrier, delay_ns=0):
         """Executa clique sincronizado com captura de timestamps."""
         try:
             self.timestamp_logger.log_timestamp('Pre-Localization', id(driver))
@@ -45,20 +51,27 @@ class SynchronizedClickExecutor:
             self.logger.info("👀 Elemento visível no centro da tela")
 
             self.timestamp_logger.log_timestamp('Post-Localization', id(driver))
-            self.logger.info("🚦 Aguardando na barreira de sincronização...")
 
-            # Sincronização
-            barrier.wait()
-            self.timestamp_logger.log_timestamp('Post-Barrier', id(driver))
+            # Logs da janela barreira→clique são retidos até o clique sair
+            with self.rt_profile.window(), hot_section():
+                self.logger.info("🚦 Aguardando na barreira de sincronização...")
 
-            # Clique
-            self.logger.info("🖱️ Executando clique...")
-            elemento.click()
-            self.timestamp_logger.log_timestamp('Post-Click', id(driver))
+                # Sincronização
+                barrier.wait()
+                if delay_ns:
+                    wait_until_ns(time.monotonic_ns() + delay_ns)
+                self.timestamp_logger.log_timestamp('Post-Barrier', id(driver))
+
+                # Clique
+                self.logger.info("🖱️ Executando clique...")
+                elemento.click()
+                self.timestamp_logger.log_timestamp('Post-Click', id(driver))
             self.logger.info("🎯 Clique executado com sucesso!")
             return True
 
         except Exception as e:
+            # Libera os demais workers presos na barreira compartilhada
+            barrier.abort()
             self.logger.error(f"❌ Erro ao executar clique [XPath: {xpath}]: {e}")
             return False
 
@@ -69,15 +82,15 @@ class SynchronizedClickExecutor:
             return False
 
         self.logger.info(f"🚀 Iniciando cliques sincronizados para {len(drivers)} navegadores...")
-        barrier = threading.Barrier(len(drivers))
+        barrier = self.click_engine.barrier_for(len(drivers))
+        delays = self.latency_model.delays_ns(drivers) if self.compensate else [0] * len(drivers)
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            self.logger.info("🌟 Pool de threads inicializado")
-            futures = [
-                executor.submit(self.execute_synchronized_click, driver, xpath, barrier)
-                for driver, xpath in zip(drivers, xpaths)
-            ]
-            resultados = [future.result() for future in as_completed(futures)]
+        inicio = time.monotonic_ns()
+        resultados = self.click_engine.run(
+            self.execute_synchronized_click,
+            [(driver, xpath, barrier, delay) for driver, xpath, delay in zip(drivers, xpaths, delays)]
+        )
+        self.latency_model.learn_from_timestamps(self.timestamp_logger, drivers, since_ns=inicio)
 
         success = all(resultados)
         if success:
@@ -86,3 +99,7 @@ class SynchronizedClickExecutor:
             self.logger.error("💥 Falha na execução dos cliques sincronizados")
 
         return success
+
+    def cleanup(self):
+        """Encerra os workers do motor de cliques."""
+        self.click_engine.shutdown()
@@ -0,0 +1,318 @@
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from .rt_profile import RT_POLICY_OFF, RTProfile
+
+# Intervalo entre reestimativas do mapeamento relógio de parede -> monotonic
+CLOCK_RESAMPLE_INTERVAL_S = 1.0
+# Amostras mantidas para estimar offset e drift
+CLOCK_SAMPLES = 32
+# Salto de offset tratado como ajuste do relógio (settimeofday/NTP step)
+CLOCK_STEP_NS = 1_000_000
+# Últimos instantes antes do alvo feitos em spin (o resto é sleep)
+SPIN_WINDOW_NS = 2_000_000
+# Fatia máxima de cada sleep grosso (permite reestimar o mapeamento no caminho)
+COARSE_SLEEP_SLICE_S = 0.5
+# Latência de armação assumida para navegadores ainda não medidos
+DEFAULT_ARM_LATENCY_NS = 250_000_000
+# Folga somada à maior latência de armação estimada
+ARM_MARGIN_NS = 20_000_000
+# Fator de segurança sobre a latência de armação estimada
+ARM_SAFETY_FACTOR = 1.5
+# Medidas de armação mantidas por navegador
+ARM_HISTORY = 20
+
+def raw_ns() -> int:
+    return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
+
+def _bracket(clock_id) -> tuple:
+    """Lê `clock_id` entre duas leituras de CLOCK_MONOTONIC_RAW; retorna (raw no meio, valor, largura)."""
+    before = raw_ns()
+    value = time.clock_gettime_ns(clock_id)
+    after = raw_ns()
+    return (before + after) // 2, value, after - before
+
+def monotonic_to_raw_offset_ns(rounds: int = 5) -> int:
+    """Offset CLOCK_MONOTONIC - CLOCK_MONOTONIC_RAW (melhor de `rounds` leituras)."""
+    best = min((_bracket(time.CLOCK_MONOTONIC) for _ in range(rounds)), key=lambda s: s[2])
+    return best[1] - best[0]
+
+class WallClockMapper:
+    """
+    Mapeia horário de parede (CLOCK_REALTIME) para CLOCK_MONOTONIC_RAW.
+
+    O offset é amostrado periodicamente (leitura entre duas leituras do
+    relógio RAW, mantendo a de menor largura) e o drift é a inclinação da
+    regressão linear do offset no tempo, o que acompanha o slew do NTP.
+    Saltos do relógio de parede descartam o histórico.
+    """
+
+    def __init__(self, resample_interval_s: float = CLOCK_RESAMPLE_INTERVAL_S):
+        self.resample_interval_ns = int(resample_interval_s * 1e9)
+        self.samples = deque(maxlen=CLOCK_SAMPLES)
+        self._lock = threading.Lock()
+        self.sample()
+
+    def sample(self, rounds: int = 5) -> None:
+        """Registra uma nova amostra (raw, offset realtime - raw)."""
+        raw, real, _ = min((_bracket(time.CLOCK_REALTIME) for _ in range(rounds)), key=lambda s: s[2])
+        offset = real - raw
+        with self._lock:
+            if self.samples and abs(offset - self._predict_offset(raw)) > CLOCK_STEP_NS:
+                # Relógio de parede ajustado em degrau: o histórico não vale mais
+                self.samples.clear()
+            self.samples.append((raw, offset))
+
+    def refresh(self) -> None:
+        """Reamostra se a última amostra for mais antiga que o intervalo configurado."""
+        with self._lock:
+            last = self.samples[-1][0] if self.samples else None
+        if last is None or raw_ns() - last >= self.resample_interval_ns:
+            self.sample()
+
+    def _fit(self):
+        """(t0, offset inteiro em t0, correção fracionária, drift adimensional).
+
+        Os valores absolutos (~1e18 ns) ficam em inteiros; só diferenças pequenas
+        passam por float, preservando a resolução de nanossegundos.
+        """
+        t0, offset0 = self.samples[-1]
+        if len(self.samples) < 2:
+            return t0, offset0, 0.0, 0.0
+        xs = [raw - t0 for raw, _ in self.samples]
+        ys = [offset - offset0 for _, offset in self.samples]
+        mean_x = statistics.fmean(xs)
+        mean_y = statistics.fmean(ys)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        if var_x == 0:
+            return t0, offset0, 0.0, 0.0
+        drift = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+        # Reta ancorada na média, avaliada em t0
+        return t0, offset0, mean_y - drift * mean_x, drift
+
+    def _predict_offset(self, raw: int) -> float:
+        t0, offset0, correction, drift = self._fit()
+        return offset0 + correction + drift * (raw - t0)
+
+    @property
+    def drift_ppm(self) -> float:
+        with self._lock:
+            return self._fit()[3] * 1e6
+
+    def wall_to_raw(self, wall_ns: int) -> int:
+        """Instante RAW em que o relógio de parede marcará `wall_ns`."""
+        with self._lock:
+            t0, offset0, correction, drift = self._fit()
+        # wall = raw + offset0 + correction + drift * (raw - t0)
+        return t0 + round((wall_ns - offset0 - t0 - correction) / (1 + drift))
+
+    def raw_to_wall(self, raw: int) -> int:
+        with self._lock:
+            t0, offset0, correction, drift = self._fit()
+        return raw + offset0 + round(correction + drift * (raw - t0))
+
+class ArmLatencyModel:
+    """Histórico da duração de armação por navegador, usado para decidir quando armar."""
+
+    def __init__(self, default_ns: int = DEFAULT_ARM_LATENCY_NS):
+        self.default_ns = default_ns
+        self.history: Dict[int, deque] = {}
+
+    def record(self, driver: WebDriver, duration_ns: int) -> None:
+        self.history.setdefault(id(driver), deque(maxlen=ARM_HISTORY)).append(duration_ns)
+
+    def estimate_ns(self, driver: WebDriver) -> int:
+        """Percentil ~90 das armações recentes (padrão se o navegador nunca foi medido)."""
+        history = sorted(self.history.get(id(driver), ()))
+        if not history:
+            return self.default_ns
+        return history[min(len(history) - 1, int(len(history) * 0.9))]
+
+    def lead_ns(self, drivers: List[WebDriver]) -> int:
+        """Antecedência da armação em relação ao alvo para o conjunto de navegadores."""
+        slowest = max((self.estimate_ns(driver) for driver in drivers), default=self.default_ns)
+        return int(slowest * ARM_SAFETY_FACTOR) + ARM_MARGIN_NS
+
+@dataclass
+class TargetReport:
+    """Onde cada disparo caiu em relação ao instante alvo."""
+    target_wall_ns: int
+    target_raw_ns: int
+    armed_raw_ns: int
+    arm_lead_ns: int
+    arm_ns: List[int] = field(default_factory=list)
+    # Início do envio do clique de cada navegador em relação ao alvo (ns)
+    landing_ns: List[Optional[int]] = field(default_factory=list)
+    late_arm: bool = False
+    success: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            'alvo_epoch': self.target_wall_ns / 1e9,
+            'antecedencia_armacao_ms': self.arm_lead_ns / 1e6,
+            'folga_apos_armacao_ms': (self.target_raw_ns - self.armed_raw_ns) / 1e6,
+            'armacao_ms': [round(ns / 1e6, 3) for ns in self.arm_ns],
+            'disparo_vs_alvo_us': [None if ns is None else round(ns / 1000, 3) for ns in self.landing_ns],
+            'armacao_atrasada': self.late_arm,
+            'ok': self.success,
+        }
+
+def spin_until_raw(deadline_raw: int) -> None:
+    """Spin em CLOCK_MONOTONIC_RAW até o prazo."""
+    while raw_ns() < deadline_raw:
+        pass
+
+def sleep_until_raw(deadline_raw: int, mapper: Optional[WallClockMapper] = None,
+                    cancel: Optional[threading.Event] = None, spin_window_ns: int = SPIN_WINDOW_NS,
+                    spin: bool = True) -> bool:
+    """
+    Sleep grosso em fatias até perto do prazo e spin em CLOCK_MONOTONIC_RAW no fim.
+
+    Args:
+        spin: False retorna ao fim do sleep grosso (prazo - spin_window_ns), para
+            o chamador fazer o spin final com spin_until_raw() em outro contexto
+
+    Returns:
+        False se `cancel` foi sinalizado durante o sleep
+    """
+    while True:
+        remaining = deadline_raw - raw_ns() - spin_window_ns
+        if remaining <= 0:
+            break
+        fatia = min(remaining / 1e9, COARSE_SLEEP_SLICE_S)
+        if cancel is not None:
+            if cancel.wait(fatia):
+                return False
+        else:
+            time.sleep(fatia)
+        if mapper is not None:
+            mapper.refresh()
+    if spin:
+        spin_until_raw(deadline_raw)
+    return True
+
+class TargetTimeScheduler:
+    """
+    Dispara cliques sincronizados em um horário de parede absoluto.
+
+    1. Converte o alvo para CLOCK_MONOTONIC_RAW (offset + drift reestimados).
+    2. Dorme até alvo - antecedência, com a antecedência derivada da latência
+       de armação medida por navegador.
+    3. Arma (resolve elementos, prepara threads/conexões).
+    4. Dorme até perto do alvo, faz spin em CLOCK_MONOTONIC_RAW e chama fire()
+       descontando o spin interno do backend de sincronização.
+    5. Reporta o desvio de cada disparo em relação ao alvo.
+
+    Args:
+        logger: Logger
+        mapper: WallClockMapper compartilhado (um novo por padrão)
+        latency: ArmLatencyModel compartilhado (um novo por padrão)
+        rt_profile: RTProfile aplicado ao spin final e ao disparo (opcional)
+    """
+
+    def __init__(self, logger, mapper: Optional[WallClockMapper] = None, latency: Optional[ArmLatencyModel] = None,
+                 rt_profile: Optional[RTProfile] = None):
+        self.logger = logger
+        self.rt_profile = rt_profile or RTProfile(logger, RT_POLICY_OFF)
+        self.mapper = mapper or WallClockMapper()
+        self.latency = latency or ArmLatencyModel()
+        self.last_report: Optional[TargetReport] = None
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """Cancela o agendamento em andamento (antes do disparo)."""
+        self._cancel.set()
+
+    def wait_until(self, target_wall_ns: int) -> bool:
+        """Aguarda o horário alvo sem armar nada; False se cancelado."""
+        self._cancel.clear()
+        self.mapper.refresh()
+        return sleep_until_raw(self.mapper.wall_to_raw(target_wall_ns), self.mapper, self._cancel)
+
+    @staticmethod
+    def _fire_lead_ns(executor) -> int:
+        """Spin que o fire() do executor faz antes de liberar os cliques (backend userspace)."""
+        backend = getattr(executor, 'backend', None)
+        return getattr(backend, 'timeout_ns', 0)
+
+    @staticmethod
+    def _send_times_ns(handle) -> List[Optional[int]]:
+        """Início do envio de cada clique (CLOCK_MONOTONIC) conforme o tipo de handle."""
+        if hasattr(handle, 'click_times'):
+            return [None if t is None else t[0] for t in handle.click_times]
+        return list(getattr(handle, 'sent_ns', []))
+
+    def schedule(self, executor, drivers: List[WebDriver], xpaths: List[str], target_wall_ns: int) -> TargetReport:
+        """
+        Arma e dispara os cliques de `executor` (com arm/fire) no horário `target_wall_ns`.
+
+        Returns:
+            TargetReport com o desvio de cada navegador
+        """
+        self._cancel.clear()
+        self.mapper.refresh()
+        target_raw = self.mapper.wall_to_raw(target_wall_ns)
+        lead = self.latency.lead_ns(drivers)
+        report = TargetReport(target_wall_ns, target_raw, 0, lead)
+        self.last_report = report
+
+        if target_raw - lead < raw_ns():
+            self.logger.warning(
+                f"⏰ Alvo a {(target_raw - raw_ns()) / 1e6:.1f}ms; armação estimada precisa de {lead / 1e6:.1f}ms"
+            )
+        if not sleep_until_raw(target_raw - lead, self.mapper, self._cancel):
+            self.logger.warning("Clique agendado cancelado antes da armação")
+            return report
+
+        handle = executor.arm(drivers, xpaths)
+        report.armed_raw_ns = raw_ns()
+        if handle is None:
+            self.logger.error("Falha na armação do clique agendado")
+            return report
+        report.arm_ns = list(getattr(handle, 'arm_ns', []))
+        for driver, duration in zip(drivers, report.arm_ns):
+            self.latency.record(driver, duration)
+
+        # Reestima perto do alvo: o mapeamento usado no disparo é o mais recente possível
+        self.mapper.sample()
+        target_raw = report.target_raw_ns = self.mapper.wall_to_raw(target_wall_ns)
+        fire_at = target_raw - self._fire_lead_ns(executor)
+        if report.armed_raw_ns > fire_at:
+            report.late_arm = True
+            self.logger.warning(
+                f"⏰ Armação terminou {(report.armed_raw_ns - fire_at) / 1e6:.3f}ms após o alvo; disparando já"
+            )
+        # Sleep grosso na política normal; RT só no spin final e no disparo
+        if not sleep_until_raw(fire_at, cancel=self._cancel, spin=False):
+            self.logger.warning("Clique agendado cancelado após a armação")
+            if hasattr(executor, 'cancel'):
+                executor.cancel(handle)
+            return report
+        with self.rt_profile.window():
+            spin_until_raw(fire_at)
+            report.success = executor.fire(handle)
+
+        offset = monotonic_to_raw_offset_ns()
+        report.landing_ns = [
+            None if sent is None else sent - offset - target_raw
+            for sent in self._send_times_ns(handle)
+        ]
+        self._log(report)
+        return report
+
+    def _log(self, report: TargetReport) -> None:
+        self.logger.info(
+            f"🎯 Alvo {time.strftime('%H:%M:%S', time.localtime(report.target_wall_ns / 1e9))}"
+            f".{report.target_wall_ns % 1_000_000_000 // 1_000_000:03d}: armação com "
+            f"{report.arm_lead_ns / 1e6:.1f}ms de antecedência, folga de "
+            f"{(report.target_raw_ns - report.armed_raw_ns) / 1e6:.1f}ms, drift {self.mapper.drift_ppm:+.2f}ppm"
+        )
+        for i, landing in enumerate(report.landing_ns):
+            if landing is None:
+                self.logger.error(f"❌ Navegador {i}: clique não enviado")
+            else:
+                self.logger.info(f"🎯 Navegador {i}: disparo a {landing / 1000:+.1f}μs do alvo")
@@ -1,11 +1,73 @@
+import threading
 import time
+from array import array
+from collections import deque
+
+import numpy as np
+
+# Códigos inteiros dos eventos registrados no caminho crítico
+EVENT_CODES = {
+    'Pre-Localization': 1,
+    'Post-Localization': 2,
+    'Post-Barrier': 3,
+    'Post-Click': 4,
+    'Pre-Atomic': 5,
+    'Post-Atomic': 6,
+}
+
+# Capacidade (potência de 2) do buffer circular de cada thread
+RING_CAPACITY = 4096
+
+# Inícios de grupo mantidos (grupos mais antigos já saíram dos buffers)
+GROUP_HISTORY = 1024
+
+# Percentis reportados para o desvio entre navegadores
+SKEW_PERCENTILES = (50, 90, 99, 99.9)
+
+# Faixas (μs) do histograma de jitter em relação ao navegador mediano
+JITTER_BINS_US = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, float('inf'))
+
+class TimestampRing:
+    """Buffer circular pré-alocado, com colunas array('q'), de um único thread escritor."""
+
+    COLUMNS = ('event', 'driver_id', 'monotonic_ns', 'process_time_ns', 'thread_time_ns', 'tsc')
+
+    def __init__(self, capacity=RING_CAPACITY):
+        if capacity & (capacity - 1):
+            raise ValueError("Capacidade do buffer deve ser potência de 2")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.pos = 0
+        zeros = bytes(8 * capacity)
+        self.event = array('q', zeros)
+        self.driver_id = array('q', zeros)
+        self.monotonic_ns = array('q', zeros)
+        self.process_time_ns = array('q', zeros)
+        self.thread_time_ns = array('q', zeros)
+        self.tsc = array('q', zeros)
+
+    def __len__(self):
+        return min(self.pos, self.capacity)
+
+    def indices(self):
+        """Índices válidos, do mais antigo para o mais recente."""
+        start = max(0, self.pos - self.capacity)
+        return [i & self.mask for i in range(start, self.pos)]
 
 class PreciseTimestampLogger:
-    def __init__(self, logger):
+    def __init__(self, logger, capacity=RING_CAPACITY):
         self.logger = logger
-        self.timestamps = []
-        self.click_timestamps = []
+        self.capacity = capacity
         self.has_tsc = False
+        self.event_codes = dict(EVENT_CODES)
+        self.event_names = {code: name for name, code in self.event_codes.items()}
+        self.rings = []
+        self._owners = []
+        self.group_starts = deque(maxlen=GROUP_HISTORY)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (posição de cada buffer, colunas ordenadas): reaproveitado enquanto nada for registrado
+        self._columns_cache = None
         
         # Tenta importar click_sync mas não falha se não conseguir
         try:
@@ -20,107 +82,281 @@ class PreciseTimestampLogger:
         except:
             self.click_sync = None
             self.has_tsc = False
+
+    def _register_ring(self):
+        """Associa um buffer à thread atual, reaproveitando o de threads já encerradas."""
+        current = threading.current_thread()
+        with self._lock:
+            for index, owner in enumerate(self._owners):
+                if not owner.is_alive():
+                    ring = self.rings[index]
+                    self._owners[index] = current
+                    break
+            else:
+                ring = TimestampRing(self.capacity)
+                self.rings.append(ring)
+                self._owners.append(current)
+        self._local.ring = ring
+        return ring
+
+    def _register_event(self, event_name):
+        """Atribui código a um evento fora da tabela padrão."""
+        with self._lock:
+            code = self.event_codes.get(event_name)
+            if code is None:
+                code = len(self.event_codes) + 1
+                self.event_codes[event_name] = code
+                self.event_names[code] = event_name
+        return code
         
     def log_timestamp(self, event_name, driver_id):
-        """Registra timestamps precisos."""
-        timestamp = {
-            'event': event_name,
-            'driver_id': driver_id,
-            'monotonic_ns': time.monotonic_ns(),
-            'process_time_ns': time.process_time_ns(),
-            'thread_time_ns': time.thread_time_ns()
-        }
+        """Registra timestamps precisos no buffer da thread, sem lock nem alocação de registros."""
+        try:
+            ring = self._local.ring
+        except AttributeError:
+            ring = self._register_ring()
+
+        code = self.event_codes.get(event_name)
+        if code is None:
+            code = self._register_event(event_name)
+
+        i = ring.pos & ring.mask
+        ring.event[i] = code
+        ring.driver_id[i] = driver_id
+        ring.monotonic_ns[i] = time.monotonic_ns()
+        ring.process_time_ns[i] = time.process_time_ns()
+        ring.thread_time_ns[i] = time.thread_time_ns()
         
         # Adiciona TSC apenas se disponível
         if self.has_tsc:
             try:
-                timestamp['tsc'] = self.click_sync.read_tsc()
+                ring.tsc[i] = self.click_sync.read_tsc()
             except:
                 self.has_tsc = False
-        
-        self.timestamps.append(timestamp)
-        
-        if event_name == 'Post-Click':
-            self.click_timestamps.append(timestamp)
+                ring.tsc[i] = 0
+        ring.pos += 1
+
+    def begin_group(self):
+        """Marca o início de um novo grupo de cliques (base da análise incremental)."""
+        self.group_starts.append(time.monotonic_ns())
+
+    def _sorted_columns(self):
+        """Colunas de todos os buffers ordenadas, recalculadas só quando há registros novos."""
+        with self._lock:
+            rings = list(self.rings)
+            cache = self._columns_cache
+        state = tuple(ring.pos for ring in rings)
+        if cache is not None and cache[0] == state:
+            return cache[1]
+
+        if not rings:
+            cols = {name: np.empty(0, dtype=np.int64) for name in TimestampRing.COLUMNS}
+        else:
+            parts = {name: [] for name in TimestampRing.COLUMNS}
+            for ring, pos in zip(rings, state):
+                count = min(pos, ring.capacity)
+                for name in TimestampRing.COLUMNS:
+                    # Visão sem cópia do array('q'); ordem corrigida pelo argsort abaixo
+                    parts[name].append(np.frombuffer(getattr(ring, name), dtype=np.int64)[:count])
+            cols = {name: np.concatenate(arrays) for name, arrays in parts.items()}
+            keep = np.argsort(cols['monotonic_ns'], kind='stable')
+            cols = {name: col[keep] for name, col in cols.items()}
+        for col in cols.values():
+            # Compartilhadas entre chamadores: ninguém altera a cópia em cache
+            col.flags.writeable = False
+
+        with self._lock:
+            self._columns_cache = (state, cols)
+        return cols
+
+    def columns(self, since_ns=None):
+        """
+        Colunas numpy de todos os buffers, ordenadas por monotonic_ns.
+
+        A concatenação e a ordenação são feitas uma vez por lote de registros
+        e compartilhadas entre as chamadas de uma mesma análise.
+
+        Args:
+            since_ns: Considera apenas eventos a partir deste instante monotonic
+
+        Returns:
+            dict nome da coluna -> np.ndarray (int64), somente leitura
+        """
+        cols = self._sorted_columns()
+        if since_ns is None:
+            return dict(cols)
+        start = int(np.searchsorted(cols['monotonic_ns'], since_ns, side='left'))
+        return {name: col[start:] for name, col in cols.items()}
+
+    def _event_mask(self, events, prefix):
+        codes = [code for name, code in self.event_codes.items() if name.startswith(prefix)]
+        return np.isin(events, codes)
+
+    def _records(self):
+        """Materializa os registros de todos os buffers como dicts (fora do caminho crítico)."""
+        with self._lock:
+            rings = list(self.rings)
+
+        records = []
+        for ring in rings:
+            for i in ring.indices():
+                record = {
+                    'event': self.event_names[ring.event[i]],
+                    'driver_id': ring.driver_id[i],
+                    'monotonic_ns': ring.monotonic_ns[i],
+                    'process_time_ns': ring.process_time_ns[i],
+                    'thread_time_ns': ring.thread_time_ns[i]
+                }
+                if self.has_tsc:
+                    record['tsc'] = ring.tsc[i]
+                records.append(record)
+        return records
+
+    @property
+    def timestamps(self):
+        return self._records()
+
+    @property
+    def click_timestamps(self):
+        clicks = [ts for ts in self._records() if ts['event'] == 'Post-Click']
+        return sorted(clicks, key=lambda x: x['monotonic_ns'])
     
-    def analyze_timestamps(self):
-        """Análise detalhada dos timestamps capturados."""
-        if len(self.timestamps) < 2:
-            return
-            
-        sorted_timestamps = sorted(self.timestamps, key=lambda x: x['monotonic_ns'])
-        
-        pre_click = [ts for ts in sorted_timestamps if 'Pre-' in ts['event']]
-        post_click = [ts for ts in sorted_timestamps if 'Post-' in ts['event']]
-        
-        pre_deviations = self._calculate_phase_deviations(pre_click)
-        post_deviations = self._calculate_phase_deviations(post_click)
-        
-        if len(self.click_timestamps) >= 2:
-            click_deviations = self._analyze_click_precision()
+    def analyze_timestamps(self, latest_only=False):
+        """
+        Análise detalhada dos timestamps capturados.
+
+        Args:
+            latest_only: Analisa apenas o grupo de cliques mais recente
+
+        Returns:
+            dict com estatísticas de desvio, ou None se não houver dados
+        """
+        since_ns = self.group_starts[-1] if latest_only and self.group_starts else None
+        cols = self.columns(since_ns)
+        if cols['monotonic_ns'].size < 2:
+            return None
+
+        pre_deviations = self._calculate_phase_deviations(cols, self._event_mask(cols['event'], 'Pre-'))
+        post_deviations = self._calculate_phase_deviations(cols, self._event_mask(cols['event'], 'Post-'))
+
+        click_mask = cols['event'] == self.event_codes['Post-Click']
+        if np.count_nonzero(click_mask) >= 2:
+            click_deviations = self._analyze_click_precision(cols, click_mask)
             self._log_click_analysis(click_deviations)
-        
-        self._log_timestamp_analysis(sorted_timestamps, pre_deviations, post_deviations)
+
+        self._log_timestamp_analysis(cols, pre_deviations, post_deviations)
+
+        stats = self.skew_statistics(since_ns, cols=cols)
+        self._log_skew_statistics(stats)
+        return stats
     
-    def _calculate_phase_deviations(self, timestamps):
-        if len(timestamps) < 2:
-            return ([], [], [], [])
-            
-        desvios_monotonic = []
-        desvios_process = []
-        desvios_thread = []
-        desvios_tsc = []
-        
-        for i in range(1, len(timestamps)):
-            prev, curr = timestamps[i-1], timestamps[i]
-            desvios_monotonic.append(abs(curr['monotonic_ns'] - prev['monotonic_ns']))
-            desvios_process.append(abs(curr['process_time_ns'] - prev['process_time_ns']))
-            desvios_thread.append(abs(curr['thread_time_ns'] - prev['thread_time_ns']))
-            
-            if self.has_tsc and 'tsc' in prev and 'tsc' in curr:
-                desvios_tsc.append(abs(curr['tsc'] - prev['tsc']))
-            
-        return (desvios_monotonic, desvios_process, desvios_thread, desvios_tsc)
+    def _calculate_phase_deviations(self, cols, mask):
+        """Desvios entre eventos consecutivos da fase (vetorizado)."""
+        if np.count_nonzero(mask) < 2:
+            return (np.empty(0),) * 4
+
+        desvios_tsc = np.abs(np.diff(cols['tsc'][mask])) if self.has_tsc else np.empty(0)
+        return (
+            np.abs(np.diff(cols['monotonic_ns'][mask])),
+            np.abs(np.diff(cols['process_time_ns'][mask])),
+            np.abs(np.diff(cols['thread_time_ns'][mask])),
+            desvios_tsc
+        )
     
-    def _analyze_click_precision(self):
-        if len(self.click_timestamps) < 2:
+    def _analyze_click_precision(self, cols, click_mask):
+        """Desvio de cada clique em relação ao primeiro (vetorizado)."""
+        if np.count_nonzero(click_mask) < 2:
             return None
-            
-        base_click = self.click_timestamps[0]
-        deviations = {
-            'monotonic': [],
-            'process': [],
-            'thread': []
+
+        columns = {
+            'monotonic': 'monotonic_ns',
+            'process': 'process_time_ns',
+            'thread': 'thread_time_ns'
         }
         
         # Adiciona TSC apenas se disponível
         if self.has_tsc:
-            deviations['tsc'] = []
-        
-        for click in self.click_timestamps[1:]:
-            deviations['monotonic'].append(click['monotonic_ns'] - base_click['monotonic_ns'])
-            deviations['process'].append(click['process_time_ns'] - base_click['process_time_ns'])
-            deviations['thread'].append(click['thread_time_ns'] - base_click['thread_time_ns'])
-            
-            if self.has_tsc and 'tsc' in click and 'tsc' in base_click:
-                deviations['tsc'].append(click['tsc'] - base_click['tsc'])
-            
+            columns['tsc'] = 'tsc'
+
+        deviations = {}
+        for metric, column in columns.items():
+            values = cols[column][click_mask]
+            deviations[metric] = values[1:] - values[0]
         return deviations
+
+    def skew_statistics(self, since_ns=None, cols=None):
+        """
+        Estatísticas de desvio entre navegadores por grupo de cliques.
+
+        Cada grupo (ver begin_group) é comparado com o seu navegador mediano.
+
+        Args:
+            since_ns: Considera apenas eventos a partir deste instante monotonic
+            cols: Colunas já obtidas com columns(since_ns) (evita recalcular)
+
+        Returns:
+            dict com percentis de desvio, histograma de jitter e offset por driver,
+            ou None se nenhum grupo tiver ao menos dois cliques
+        """
+        if cols is None:
+            cols = self.columns(since_ns)
+        click_mask = cols['event'] == self.event_codes['Post-Click']
+        times = cols['monotonic_ns'][click_mask]
+        drivers = cols['driver_id'][click_mask]
+
+        starts = np.asarray(self.group_starts or [0], dtype=np.int64)
+        if len(self.group_starts) == self.group_starts.maxlen:
+            # Início dos grupos mais antigos descartado: seus cliques ficam de fora
+            keep = times >= starts[0]
+            times, drivers = times[keep], drivers[keep]
+        if times.size < 2:
+            return None
+        groups = np.searchsorted(starts, times, side='right') - 1
+
+        # Ordena por (grupo, tempo) para reduzir cada grupo de uma vez
+        order = np.lexsort((times, groups))
+        groups, times, drivers = groups[order], times[order], drivers[order]
+        _, first, counts = np.unique(groups, return_index=True, return_counts=True)
+
+        valid = counts >= 2
+        if not valid.any():
+            return None
+
+        skews = (times[first + counts - 1] - times[first])[valid]
+        medians = (times[first + (counts - 1) // 2] + times[first + counts // 2]) / 2
+
+        per_event_group = np.repeat(np.arange(first.size), counts)
+        in_valid = valid[per_event_group]
+        offsets = (times - medians[per_event_group])[in_valid]
+        offset_drivers = drivers[in_valid]
+
+        driver_ids, inverse = np.unique(offset_drivers, return_inverse=True)
+        mean_offsets = np.bincount(inverse, weights=offsets) / np.bincount(inverse)
+        histogram, _ = np.histogram(np.abs(offsets) / 1000, bins=JITTER_BINS_US)
+
+        return {
+            'groups': int(valid.sum()),
+            'skew_percentiles_ns': dict(zip(SKEW_PERCENTILES, np.percentile(skews, SKEW_PERCENTILES).tolist())),
+            'max_skew_ns': int(skews.max()),
+            'jitter_histogram': dict(zip(JITTER_BINS_US[:-1], histogram.tolist())),
+            'driver_offsets_ns': dict(zip(driver_ids.tolist(), mean_offsets.tolist())),
+        }
     
-    def _log_timestamp_analysis(self, timestamps, pre_deviations, post_deviations):
+    def _log_timestamp_analysis(self, cols, pre_deviations, post_deviations):
         self.logger.info("\n🔬 Análise Precisa de Timestamps:")
         
-        for ts in timestamps:
-            event_icon = "🎯" if "Click" in ts['event'] else "⚡"
+        for i in range(cols['monotonic_ns'].size):
+            event = self.event_names[int(cols['event'][i])]
+            event_icon = "🎯" if "Click" in event else "⚡"
             log_msg = (
-                f"  {event_icon} {ts['event']} (Driver {ts['driver_id']}):\n"
-                f"    ⏱️ Monotonic: {ts['monotonic_ns']} ns\n"
-                f"    ⚙️ Process Time: {ts['process_time_ns']} ns\n"
-                f"    🧵 Thread Time: {ts['thread_time_ns']} ns"
+                f"  {event_icon} {event} (Driver {cols['driver_id'][i]}):\n"
+                f"    ⏱️ Monotonic: {cols['monotonic_ns'][i]} ns\n"
+                f"    ⚙️ Process Time: {cols['process_time_ns'][i]} ns\n"
+                f"    🧵 Thread Time: {cols['thread_time_ns'][i]} ns"
             )
             
-            if self.has_tsc and 'tsc' in ts:
-                log_msg += f"\n    🔄 TSC: {ts['tsc']}"
+            if self.has_tsc:
+                log_msg += f"\n    🔄 TSC: {cols['tsc'][i]}"
             
             self.logger.info(log_msg)
         
@@ -131,27 +367,25 @@ class PreciseTimestampLogger:
         self._log_phase_deviations(post_deviations)
     
     def _log_phase_deviations(self, deviations):
-        if not any(deviations):
+        monotonic, process, thread, tsc = deviations
+        if not monotonic.size:
             return
             
-        monotonic, process, thread, tsc = deviations
         metrics = [
             ("⏱️ Monotonic", monotonic),
             ("⚙️ Process Time", process),
             ("🧵 Thread Time", thread)
         ]
         
-        if self.has_tsc and tsc:
+        if self.has_tsc and tsc.size:
             metrics.append(("🔄 TSC", tsc))
         
         for metric_name, desvios in metrics:
-            if desvios:
-                mean_dev = sum(desvios) / len(desvios)
-                max_dev = max(desvios)
+            if desvios.size:
                 self.logger.info(
                     f"  📏 Desvio {metric_name}:\n"
-                    f"    📉 Médio: {mean_dev:.4f} ns\n"
-                    f"    📈 Máximo: {max_dev:.4f} ns"
+                    f"    📉 Médio: {desvios.mean():.4f} ns\n"
+                    f"    📈 Máximo: {desvios.max():.4f} ns"
                 )
     
     def _log_click_analysis(self, deviations):
@@ -168,9 +402,10 @@ class PreciseTimestampLogger:
         }
         
         for metric, values in deviations.items():
-            if values:
-                max_dev_us = max(map(abs, values)) / 1000
-                avg_dev_us = sum(map(abs, values)) / len(values) / 1000
+            if values.size:
+                abs_us = np.abs(values) / 1000
+                max_dev_us = abs_us.max()
+                avg_dev_us = abs_us.mean()
                 
                 self.logger.info(f"  {icons.get(metric, '📊')} Desvio {metric}:")
                 self.logger.info(f"    🎯 Máximo: {max_dev_us:.3f}μs")
@@ -179,4 +414,21 @@ class PreciseTimestampLogger:
                 if metric in ('monotonic', 'tsc') and max_dev_us > 100:
                     self.logger.warning(
                         f"  ⚠️ Desvio {metric} crítico detectado: {max_dev_us:.3f}μs"
-                    )
\ No newline at end of file
+                    )
+
+    def _log_skew_statistics(self, stats):
+        if not stats:
+            return
+
+        self.logger.info(f"\n📐 Desvio entre navegadores ({stats['groups']} grupos):")
+        for percentile, value in stats['skew_percentiles_ns'].items():
+            self.logger.info(f"    p{percentile:g}: {value / 1000:.3f}μs")
+        self.logger.info(f"    máximo: {stats['max_skew_ns'] / 1000:.3f}μs")
+
+        for driver_id, offset in stats['driver_offsets_ns'].items():
+            self.logger.info(f"  🧭 Driver {driver_id}: {offset / 1000:+.3f}μs em relação ao mediano")
+
+        faixas = list(stats['jitter_histogram'].items())
+        for (inicio, count), fim in zip(faixas, JITTER_BINS_US[1:]):
+            if count:
+                self.logger.info(f"  📊 {inicio:g}-{fim:g}μs: {count}")
@@ -1,5 +1,15 @@
 """Módulo de gerenciamento de comandos."""
-from .executor import executar_comando
+from .executor import (
+    executar_comando, executar_comando_async, obter_engine, encerrar_engine, configurar_store, salvar_configuracao
+)
+from .engine import CommandEngine
+from .restore_command import restaurar_navegadores
+from .plan import PlanoInvalido, carregar_plano, executar_plano, plano_de_argumentos, salvar_resultados
 from .types import CommandType
 
-__all__ = ['executar_comando', 'CommandType']
\ No newline at end of file
+__all__ = [
+    'executar_comando', 'executar_comando_async', 'obter_engine', 'encerrar_engine', 'configurar_store',
+    'salvar_configuracao', 'restaurar_navegadores', 'CommandEngine',
+    'PlanoInvalido', 'carregar_plano', 'executar_plano', 'plano_de_argumentos', 'salvar_resultados',
+    'CommandType'
+]
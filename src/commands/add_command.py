@@ -2,19 +2,30 @@ from log_config import get_logger
 
 logger = get_logger(__name__)
 
+def xpath_valido(xpath):
+    return xpath.startswith("//") or xpath.startswith(".//")
+
+def adicionar_xpath(index, xpath, navegadores_config):
+    """Adiciona um XPath à configuração de um navegador; retorna True se foi aceito."""
+    config = navegadores_config[index]
+    if not config["link"]:
+        logger.warning(f"[Navegador {index + 1}] Nenhum link configurado. Pule este navegador.")
+        return False
+    if not xpath_valido(xpath):
+        logger.warning(f"[Navegador {index + 1}] XPath inválido: {xpath}")
+        return False
+    config["xpaths"].append(xpath)
+    logger.info(f"[Navegador {index + 1}] Novo XPath adicionado: {xpath}")
+    return True
+
 def executar_comando_add(drivers, navegadores_config):
     """Executa comando para adicionar novo XPath."""
     for index, driver in enumerate(drivers):
-        config = navegadores_config[index]
-        if not config["link"]:
+        if not navegadores_config[index]["link"]:
             logger.warning(f"[Navegador {index + 1}] Nenhum link configurado. Pule este navegador.")
             continue
         novo_xpath = input(f"Digite um novo XPath para o navegador {index + 1}: ").strip()
         if novo_xpath:
-            if novo_xpath.startswith("//") or novo_xpath.startswith(".//"):
-                config["xpaths"].append(novo_xpath)
-                logger.info(f"[Navegador {index + 1}] Novo XPath adicionado: {novo_xpath}")
-            else:
-                logger.warning(f"[Navegador {index + 1}] XPath inválido: {novo_xpath}")
+            adicionar_xpath(index, novo_xpath, navegadores_config)
         else:
-            logger.info(f"[Navegador {index + 1}] Nenhum XPath foi adicionado.")
\ No newline at end of file
+            logger.info(f"[Navegador {index + 1}] Nenhum XPath foi adicionado.")
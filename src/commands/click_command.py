@@ -4,18 +4,55 @@ from config import validar_configuracao
 
 logger = get_logger(__name__)
 
-def executar_cliques_simultaneos(drivers, navegadores_config):
-    """Executa cliques sincronizados em múltiplos navegadores."""
+# Gerenciador de cliques compartilhado entre comandos (criado uma vez)
+_click_manager = None
+
+def configurar_click_manager(click_manager):
+    """Registra o gerenciador de cliques criado na inicialização."""
+    global _click_manager
+    _click_manager = click_manager
+
+def obter_click_manager(num_navegadores):
+    """Retorna o gerenciador compartilhado, criando-o apenas na primeira vez."""
+    global _click_manager
+    if _click_manager is None:
+        logger.info("[Clique] Criando gerenciador de cliques persistente")
+        _click_manager = LinuxPrecisionClickManager(max_workers=num_navegadores)
+    return _click_manager
+
+def ultimo_relatorio_alvo():
+    """Relatório do último clique agendado (desvio do disparo em relação ao alvo) ou None."""
+    if _click_manager is None or _click_manager.last_target_report is None:
+        return None
+    return _click_manager.last_target_report.as_dict()
+
+def cancelar_clique_agendado():
+    """Cancela a espera de um clique agendado em andamento (se houver)."""
+    if _click_manager is not None:
+        _click_manager.target_scheduler.cancel()
+
+def executar_cliques_simultaneos(drivers, navegadores_config, mode=None, horario=None):
+    """
+    Executa cliques sincronizados em múltiplos navegadores.
+
+    Args:
+        mode: Executor do click manager ('atomic', 'legacy', 'in_page', 'process', 'cdp');
+            None escolhe automaticamente
+        horario: Horário alvo em ns epoch; os navegadores são armados antes e o
+            disparo acontece no alvo. None clica imediatamente
+
+    Returns:
+        True se os cliques foram executados com sucesso
+    """
     logger.info("[Clique] Iniciando processo de cliques sincronizados...")
     navegadores_validos = validar_configuracao()
     
     if not navegadores_validos:
         logger.warning("[Clique] Nenhum navegador válido para clique.")
-        return
+        return False
 
-    click_manager = LinuxPrecisionClickManager(max_workers=len(navegadores_validos))
-    
     try:
+        click_manager = obter_click_manager(len(navegadores_validos))
         drivers_validos = []
         xpaths_validos = []
         
@@ -28,21 +65,30 @@ def executar_cliques_simultaneos(drivers, navegadores_config):
             
         if not drivers_validos:
             logger.error("[Clique] Nenhum navegador preparado corretamente")
-            return
+            return False
             
         logger.info("[Clique] Navegadores preparados, iniciando sincronização")
         
-        resultados = click_manager.execute_synchronized_clicks(
-            drivers_validos,
-            xpaths_validos
-        )
+        if horario is None:
+            resultados = click_manager.execute_synchronized_clicks(
+                drivers_validos,
+                xpaths_validos,
+                mode=mode
+            )
+        else:
+            resultados = click_manager.schedule_synchronized_clicks(
+                drivers_validos,
+                xpaths_validos,
+                horario,
+                mode=mode
+            )
         
         if resultados:
             logger.info("[Clique] Cliques sincronizados executados com sucesso")
         else:
             logger.error("[Clique] Falha na execução dos cliques sincronizados")
+        return bool(resultados)
     
     except Exception as e:
         logger.error(f"[Clique] Erro durante execução: {e}")
-    finally:
-        click_manager.cleanup()
\ No newline at end of file
+        return False
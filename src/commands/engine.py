@@ -0,0 +1,209 @@
+"""Motor assíncrono que distribui cada comando para todos os navegadores ao mesmo tempo."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Chamadas Selenium em andamento ao mesmo tempo (todas bloqueantes)
+MAX_CHAMADAS_SIMULTANEAS = 16
+# Prazo padrão por navegador para uma operação
+TIMEOUT_NAVEGADOR_S = 35.0
+
+STATUS_OK = "ok"
+STATUS_ERRO = "erro"
+STATUS_TIMEOUT = "timeout"
+STATUS_CANCELADO = "cancelado"
+STATUS_OCUPADO = "ocupado"
+
+@dataclass
+class ResultadoNavegador:
+    """Resultado de uma operação em um navegador."""
+    index: int
+    status: str
+    duracao_s: float = 0.0
+    valor: Any = None
+    detalhe: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+class CommandEngine:
+    """
+    Executa as chamadas bloqueantes do Selenium de todos os navegadores em paralelo.
+
+    Cada operação roda em um executor limitado, com prazo por navegador; o
+    comando termina quando todos respondem ou estouram o prazo, e o resultado
+    vira uma tabela de status por navegador. Uma chamada que estourou o prazo
+    continua presa na thread até o Selenium devolver; enquanto isso o
+    navegador é marcado como ocupado e fica fora dos comandos seguintes.
+    Serviços de fundo (monitor de saúde, frota) consultam ocupados() e
+    em_clique() para não disputar o navegador com um comando em andamento.
+
+    Args:
+        max_workers: Tamanho do executor de chamadas bloqueantes
+        timeout: Prazo padrão por navegador (s)
+    """
+
+    def __init__(self, max_workers: int = MAX_CHAMADAS_SIMULTANEAS, timeout: float = TIMEOUT_NAVEGADOR_S):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="comando")
+        self._loop = asyncio.new_event_loop()
+        self._ocupados = set()
+        self._cliques = 0
+        self._lock = threading.Lock()
+
+    def executar(self, coro) -> Any:
+        """Executa um comando no laço do motor; Ctrl+C cancela só o comando em andamento."""
+        task = self._loop.create_task(coro)
+        try:
+            return self._loop.run_until_complete(task)
+        except KeyboardInterrupt:
+            task.cancel()
+            try:
+                self._loop.run_until_complete(task)
+            except (asyncio.CancelledError, KeyboardInterrupt):
+                pass
+            logger.warning("[Comando] Comando cancelado pelo usuário.")
+            return None
+
+    def _executar(self, index: int, funcao: Callable[[], Any]):
+        try:
+            return funcao()
+        finally:
+            with self._lock:
+                self._ocupados.discard(index)
+
+    async def _executar_navegador(self, index: int, funcao: Callable[[], Any], timeout: float) -> ResultadoNavegador:
+        with self._lock:
+            if index in self._ocupados:
+                return ResultadoNavegador(index, STATUS_OCUPADO, detalhe="operação anterior ainda em andamento")
+            self._ocupados.add(index)
+
+        inicio = time.perf_counter()
+        chamada = self._executor.submit(self._executar, index, funcao)
+        futuro = asyncio.wrap_future(chamada)
+        # Resultado de chamadas abandonadas pelo prazo é descartado sem aviso
+        futuro.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            # shield: o prazo encerra a espera, não a chamada já iniciada
+            valor = await asyncio.wait_for(asyncio.shield(futuro), timeout)
+            return ResultadoNavegador(index, STATUS_OK, time.perf_counter() - inicio, valor)
+        except asyncio.TimeoutError:
+            self._descartar(index, chamada)
+            return ResultadoNavegador(index, STATUS_TIMEOUT, time.perf_counter() - inicio,
+                                      detalhe=f"sem resposta em {timeout:.1f}s")
+        except asyncio.CancelledError:
+            self._descartar(index, chamada)
+            raise
+        except Exception as e:
+            return ResultadoNavegador(index, STATUS_ERRO, time.perf_counter() - inicio, detalhe=str(e))
+
+    def _descartar(self, index: int, chamada) -> None:
+        """Tira da fila uma chamada que ainda não começou; as iniciadas terminam sozinhas."""
+        if chamada.cancel():
+            with self._lock:
+                self._ocupados.discard(index)
+
+    async def distribuir(
+        self,
+        nome: str,
+        tarefas: Dict[int, Callable[[], Any]],
+        timeout: Optional[float] = None
+    ) -> Dict[int, ResultadoNavegador]:
+        """
+        Executa uma função por navegador, todas ao mesmo tempo.
+
+        Args:
+            nome: Nome do comando (para a tabela de status)
+            tarefas: índice do navegador -> função sem argumentos (bloqueante)
+            timeout: Prazo por navegador; padrão self.timeout
+
+        Returns:
+            índice -> ResultadoNavegador
+        """
+        timeout = self.timeout if timeout is None else timeout
+        tasks = {
+            index: asyncio.ensure_future(self._executar_navegador(index, funcao, timeout))
+            for index, funcao in tarefas.items()
+        }
+        inicio = time.perf_counter()
+        try:
+            await asyncio.gather(*tasks.values())
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            resultados = self._coletar(tasks)
+            registrar_tabela(nome, resultados, time.perf_counter() - inicio)
+            raise
+
+        resultados = self._coletar(tasks)
+        registrar_tabela(nome, resultados, time.perf_counter() - inicio)
+        return resultados
+
+    @staticmethod
+    def _coletar(tasks) -> Dict[int, ResultadoNavegador]:
+        resultados = {}
+        for index, task in tasks.items():
+            if task.cancelled() or task.exception() is not None:
+                resultados[index] = ResultadoNavegador(index, STATUS_CANCELADO)
+            else:
+                resultados[index] = task.result()
+        return resultados
+
+    async def chamar(self, funcao: Callable[[], Any], *args) -> Any:
+        """Executa uma chamada bloqueante única (ex.: clique sincronizado) sem travar o laço."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, funcao, *args)
+
+    async def clicar(self, funcao: Callable[[], Any], *args) -> Any:
+        """Como chamar(), marcando a janela de clique (arm→fire) até a chamada terminar."""
+        with self._lock:
+            self._cliques += 1
+        chamada = self._executor.submit(funcao, *args)
+        # A janela fecha quando a thread termina, mesmo que a espera seja cancelada
+        chamada.add_done_callback(lambda _: self._fechar_clique())
+        return await asyncio.wrap_future(chamada)
+
+    def _fechar_clique(self) -> None:
+        with self._lock:
+            self._cliques -= 1
+
+    def ocupados(self) -> Set[int]:
+        """Índices dos navegadores com uma chamada em andamento."""
+        with self._lock:
+            return set(self._ocupados)
+
+    def em_clique(self) -> bool:
+        """True enquanto um clique sincronizado está em andamento."""
+        with self._lock:
+            return self._cliques > 0
+
+    def em_uso(self) -> bool:
+        """True se algum comando ou clique está usando os navegadores."""
+        with self._lock:
+            return bool(self._ocupados) or self._cliques > 0
+
+    def encerrar(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop.close()
+
+def registrar_tabela(nome: str, resultados: Dict[int, ResultadoNavegador], duracao_s: float) -> None:
+    """Loga a tabela de status por navegador de um comando."""
+    if not resultados:
+        return
+    ok = sum(1 for r in resultados.values() if r.ok)
+    logger.info(f"[Comando] '{nome}': {ok}/{len(resultados)} navegadores ok em {duracao_s:.2f}s")
+    for index in sorted(resultados):
+        r = resultados[index]
+        detalhe = f"  {r.detalhe}" if r.detalhe else ""
+        linha = f"  Navegador {index + 1:>2} | {r.status:<9} | {r.duracao_s:7.2f}s{detalhe}"
+        if r.ok:
+            logger.info(linha)
+        else:
+            logger.warning(linha)
@@ -1,6 +1,7 @@
 """Módulo principal para execução de comandos."""
 from log_config import get_logger
 from src.commands.types import CommandType
+from src.commands.engine import CommandEngine
 from src.commands.add_command import executar_comando_add
 from src.commands.click_command import executar_cliques_simultaneos
 from src.commands.link_command import executar_comando_new_link
@@ -8,11 +9,40 @@ from src.commands.locate_command import executar_comando_localize
 
 logger = get_logger(__name__)
 
-def executar_comando(comando, drivers, navegadores_config):
+# Motor de comandos compartilhado (criado uma vez)
+_engine = None
+# Perfis persistentes (registrado na inicialização)
+_store = None
+
+def configurar_store(store):
+    """Registra o ConfigStore onde navegadores_config é salvo após cada comando."""
+    global _store
+    _store = store
+
+def salvar_configuracao(navegadores_config):
+    """Persiste navegadores_config se houver um store registrado (só grava se mudou)."""
+    if _store is not None:
+        _store.salvar(navegadores_config)
+
+def obter_engine():
+    """Retorna o motor compartilhado, criando-o apenas na primeira vez."""
+    global _engine
+    if _engine is None:
+        _engine = CommandEngine()
+    return _engine
+
+def encerrar_engine():
+    global _engine
+    if _engine is not None:
+        _engine.encerrar()
+        _engine = None
+
+async def executar_comando_async(engine, comando, drivers, navegadores_config):
     """
-    Executa o comando especificado nos navegadores.
-    
+    Executa o comando especificado nos navegadores, todos ao mesmo tempo.
+
     Args:
+        engine: CommandEngine que executa as chamadas bloqueantes
         comando: Tipo do comando a ser executado
         drivers: Lista de drivers dos navegadores
         navegadores_config: Configuração dos navegadores
@@ -22,14 +52,30 @@ def executar_comando(comando, drivers, navegadores_config):
     except ValueError:
         logger.warning("[Sistema] Comando inválido.")
         return
-        
-    command_handlers = {
-        CommandType.NEW_LINK: executar_comando_new_link,
-        CommandType.ADD: executar_comando_add,
-        CommandType.CLICK: executar_cliques_simultaneos,
-        CommandType.LOCATE: executar_comando_localize
-    }
-    
-    handler = command_handlers.get(command_type)
-    if handler:
-        handler(drivers, navegadores_config)
\ No newline at end of file
+
+    if command_type == CommandType.NEW_LINK:
+        return await executar_comando_new_link(engine, drivers, navegadores_config)
+    if command_type == CommandType.LOCATE:
+        return await executar_comando_localize(engine, drivers, navegadores_config)
+    if command_type == CommandType.CLICK:
+        # O click manager já sincroniza os navegadores; aqui só sai do laço de eventos
+        return await engine.clicar(executar_cliques_simultaneos, drivers, navegadores_config)
+    if command_type == CommandType.ADD:
+        # Só leitura do terminal, sem chamadas ao navegador
+        return executar_comando_add(drivers, navegadores_config)
+
+def executar_comando(comando, drivers, navegadores_config, engine=None):
+    """
+    Executa o comando especificado nos navegadores.
+
+    Args:
+        comando: Tipo do comando a ser executado
+        drivers: Lista de drivers dos navegadores
+        navegadores_config: Configuração dos navegadores
+        engine: CommandEngine (padrão: motor compartilhado)
+    """
+    engine = engine or obter_engine()
+    try:
+        return engine.executar(executar_comando_async(engine, comando, drivers, navegadores_config))
+    finally:
+        salvar_configuracao(navegadores_config)
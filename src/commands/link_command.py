@@ -1,22 +1,37 @@
+from functools import partial
 from log_config import get_logger
 
 logger = get_logger(__name__)
 
-def executar_comando_new_link(drivers, navegadores_config):
-    """Executa comando para configurar novo link."""
+def ler_links(drivers):
+    """Pergunta o novo link de cada navegador com sessão válida; retorna {índice: link}."""
+    links = {}
     for index, driver in enumerate(drivers):
         if driver is None or not driver.session_id:
             logger.warning(f"[Navegador {index + 1}] Sessão inválida. Pule este navegador.")
             continue
         novo_link = input(f"Digite o novo link para o navegador {index + 1}: ").strip()
         if novo_link:
-            try:
-                logger.info(f"[Navegador {index + 1}] Carregando link: {novo_link}")
-                driver.get(novo_link)
-                navegadores_config[index]["link"] = novo_link
-                navegadores_config[index]["xpaths"] = []
-                logger.info(f"[Navegador {index + 1}] Link configurado com sucesso.")
-            except Exception as e:
-                logger.error(f"[Navegador {index + 1}] Erro ao carregar o link: {e}")
+            links[index] = novo_link
         else:
-            logger.warning(f"[Navegador {index + 1}] Nenhum link fornecido. Pulando.")
\ No newline at end of file
+            logger.warning(f"[Navegador {index + 1}] Nenhum link fornecido. Pulando.")
+    return links
+
+def carregar_link(driver, index, link, navegadores_config, manter_xpaths=False):
+    """Carrega o link em um navegador; os XPaths são reiniciados salvo `manter_xpaths` (bloqueante)."""
+    logger.info(f"[Navegador {index + 1}] Carregando link: {link}")
+    driver.get(link)
+    navegadores_config[index]["link"] = link
+    if not manter_xpaths:
+        navegadores_config[index]["xpaths"] = []
+    logger.info(f"[Navegador {index + 1}] Link configurado com sucesso.")
+
+async def executar_comando_new_link(engine, drivers, navegadores_config):
+    """Executa comando para configurar novo link (carregamentos em paralelo)."""
+    links = ler_links(drivers)
+    if not links:
+        return {}
+    return await engine.distribuir("new link", {
+        index: partial(carregar_link, drivers[index], index, link, navegadores_config)
+        for index, link in links.items()
+    })
@@ -1,20 +1,39 @@
+from functools import partial
 from log_config import get_logger
+from src.click_manager.element_cache import LOCATE_TIMEOUT_S
 from src.navegador.operacoes import localizar_elementos_em_abas
 
 logger = get_logger(__name__)
 
-def executar_comando_localize(drivers, navegadores_config):
-    """Executa comando para localizar elementos."""
+# Folga sobre o prazo de localização para validação e preparação da sessão
+MARGEM_LOCALIZACAO_S = 5.0
+
+def _localizar_navegador(index, driver, config):
+    """Localiza os elementos de um navegador (executado em paralelo)."""
+    encontrados = localizar_elementos_em_abas(driver, index, config["xpaths"])
+    if encontrados:
+        logger.info(f"[Navegador {index + 1}] Elementos encontrados: {len(encontrados)}")
+    else:
+        logger.warning(f"[Navegador {index + 1}] Nenhum elemento localizado.")
+    return len(encontrados)
+
+async def executar_comando_localize(engine, drivers, navegadores_config, indices=None):
+    """Executa comando para localizar elementos em todos os navegadores (ou em `indices`) ao mesmo tempo."""
+    tarefas = []
     for index, driver in enumerate(drivers):
+        if indices is not None and index not in indices:
+            continue
         config = navegadores_config[index]
         if not config["link"] or not config["xpaths"]:
             logger.warning(f"[Navegador {index + 1}] Não configurado corretamente. Pulando.")
             continue
-        try:
-            encontrados = localizar_elementos_em_abas(driver, index, config["xpaths"])
-            if encontrados:
-                logger.info(f"[Navegador {index + 1}] Elementos encontrados: {len(encontrados)}")
-            else:
-                logger.warning(f"[Navegador {index + 1}] Nenhum elemento localizado.")
-        except Exception as e:
-            logger.error(f"[Navegador {index + 1}] Erro ao localizar elementos: {e}")
\ No newline at end of file
+        tarefas.append((index, driver, config))
+
+    if not tarefas:
+        return {}
+
+    return await engine.distribuir(
+        "localize",
+        {index: partial(_localizar_navegador, index, driver, config) for index, driver, config in tarefas},
+        timeout=LOCATE_TIMEOUT_S + MARGEM_LOCALIZACAO_S
+    )
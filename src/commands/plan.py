@@ -0,0 +1,245 @@
+"""
+Modo roteirizado: executa um plano de comandos sem prompts e grava os resultados.
+
+Formato do plano (JSON):
+
+    {
+      "passos": [
+        {"comando": "new link", "links": {"1": "https://...", "2": "https://..."}},
+        {"comando": "add", "xpaths": {"*": ["//button[@id='comprar']"]}},
+        {"comando": "localize"},
+        {"comando": "wait", "segundos": 0.5},
+        {"comando": "click", "horario": "2026-10-18T12:00:00.000-03:00", "modo": "atomic"}
+      ]
+    }
+
+Chaves de navegador são 1-based como no terminal; "*" vale para todos.
+"horario" aceita ISO 8601 (sem fuso = horário local) ou segundos epoch; o clique
+é armado antes do horário e disparado no alvo (ver click_manager.target_time).
+"""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from functools import partial
+from log_config import get_logger
+from config_store import escrever_json_atomico
+from src.commands.types import CommandType
+from src.commands.add_command import adicionar_xpath
+from src.commands.click_command import (
+    cancelar_clique_agendado,
+    executar_cliques_simultaneos,
+    ultimo_relatorio_alvo,
+)
+from src.commands.link_command import carregar_link
+from src.commands.locate_command import executar_comando_localize
+
+logger = get_logger(__name__)
+
+COMANDO_ESPERA = "wait"
+# Início da contagem epoch para a conversão exata de horários ISO em ns
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class PlanoInvalido(ValueError):
+    """Plano de comandos malformado."""
+
+def horario_epoch(valor):
+    """Converte o horário do plano (ISO 8601 ou epoch) em segundos epoch."""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    try:
+        return datetime.fromisoformat(valor).timestamp()
+    except (TypeError, ValueError):
+        raise PlanoInvalido(f"Horário inválido: {valor!r}")
+
+def horario_epoch_ns(valor):
+    """Converte o horário do plano em ns epoch sem perder precisão em horários ISO."""
+    if isinstance(valor, int):
+        return valor * 1_000_000_000
+    if isinstance(valor, float):
+        return round(valor * 1e9)
+    try:
+        momento = datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise PlanoInvalido(f"Horário inválido: {valor!r}")
+    delta = momento.astimezone() - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+def _por_navegador(valor, num_navegadores):
+    """Expande {"1": v, "*": v} (ou um valor único) em {índice: v}."""
+    if not isinstance(valor, dict):
+        return {index: valor for index in range(num_navegadores)}
+    resultado = {}
+    if "*" in valor:
+        resultado = {index: valor["*"] for index in range(num_navegadores)}
+    for chave, item in valor.items():
+        if chave == "*":
+            continue
+        try:
+            index = int(chave) - 1
+        except ValueError:
+            raise PlanoInvalido(f"Navegador inválido: {chave!r}")
+        if 0 <= index < num_navegadores:
+            resultado[index] = item
+        else:
+            logger.warning(f"[Plano] Navegador {chave} não existe na frota atual ({num_navegadores}). Ignorado.")
+    return resultado
+
+def validar_plano(plano):
+    """Verifica a estrutura do plano antes de tocar nos navegadores."""
+    passos = plano.get("passos") if isinstance(plano, dict) else None
+    if not isinstance(passos, list) or not passos:
+        raise PlanoInvalido("O plano precisa de uma lista 'passos' não vazia")
+    comandos = {tipo.value for tipo in CommandType} | {COMANDO_ESPERA}
+    for numero, passo in enumerate(passos, 1):
+        comando = passo.get("comando") if isinstance(passo, dict) else None
+        if comando not in comandos:
+            raise PlanoInvalido(f"Passo {numero}: comando desconhecido {comando!r}")
+        if comando == CommandType.NEW_LINK.value and not passo.get("links"):
+            raise PlanoInvalido(f"Passo {numero}: 'new link' sem 'links'")
+        if comando == CommandType.ADD.value and not passo.get("xpaths"):
+            raise PlanoInvalido(f"Passo {numero}: 'add' sem 'xpaths'")
+        if comando == CommandType.CLICK.value and "horario" in passo:
+            horario_epoch(passo["horario"])
+        if comando == COMANDO_ESPERA and not isinstance(passo.get("segundos"), (int, float)):
+            raise PlanoInvalido(f"Passo {numero}: 'wait' sem 'segundos'")
+    return plano
+
+def carregar_plano(caminho):
+    """Lê e valida um plano JSON."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        try:
+            plano = json.load(arquivo)
+        except json.JSONDecodeError as e:
+            raise PlanoInvalido(f"JSON inválido em {caminho}: {e}")
+    return validar_plano(plano)
+
+def plano_de_argumentos(link=None, xpaths=None, horarios_clique=None, modo=None):
+    """Monta um plano para todos os navegadores a partir dos argumentos de linha de comando."""
+    passos = []
+    if link:
+        passos.append({"comando": CommandType.NEW_LINK.value, "links": {"*": link}})
+    if xpaths:
+        passos.append({"comando": CommandType.ADD.value, "xpaths": {"*": list(xpaths)}})
+        passos.append({"comando": CommandType.LOCATE.value})
+    for horario in horarios_clique or []:
+        passo = {"comando": CommandType.CLICK.value, "horario": horario}
+        if modo:
+            passo["modo"] = modo
+        passos.append(passo)
+    return validar_plano({"passos": passos})
+
+def _resultado_navegadores(resultados):
+    """Converte ResultadoNavegador em dicionários serializáveis (chaves 1-based)."""
+    saida = {}
+    for index, r in sorted(resultados.items()):
+        item = {"status": r.status, "duracao_s": round(r.duracao_s, 6)}
+        if r.detalhe:
+            item["detalhe"] = r.detalhe
+        if isinstance(r.valor, (int, float, str, bool)):
+            item["valor"] = r.valor
+        saida[str(index + 1)] = item
+    return saida
+
+async def _executar_passo(passo, engine, drivers, navegadores_config, clicar, registro):
+    comando = passo["comando"]
+    num = len(drivers)
+
+    if comando == CommandType.NEW_LINK.value:
+        links = _por_navegador(passo["links"], num)
+        resultados = await engine.distribuir("new link", {
+            index: partial(carregar_link, drivers[index], index, link, navegadores_config)
+            for index, link in links.items()
+            if drivers[index] is not None and drivers[index].session_id
+        }, timeout=passo.get("timeout_s"))
+        registro["navegadores"] = _resultado_navegadores(resultados)
+        return len(resultados) == len(links) and all(r.ok for r in resultados.values())
+
+    if comando == CommandType.ADD.value:
+        aceitos = {}
+        for index, xpaths in _por_navegador(passo["xpaths"], num).items():
+            xpaths = [xpaths] if isinstance(xpaths, str) else xpaths
+            aceitos[str(index + 1)] = sum(adicionar_xpath(index, x, navegadores_config) for x in xpaths)
+        registro["xpaths_adicionados"] = aceitos
+        return all(aceitos.values())
+
+    if comando == CommandType.LOCATE.value:
+        resultados = await executar_comando_localize(engine, drivers, navegadores_config)
+        registro["navegadores"] = _resultado_navegadores(resultados)
+        return bool(resultados) and all(r.ok and r.valor for r in resultados.values())
+
+    if comando == CommandType.CLICK.value:
+        alvo_ns = None
+        if "horario" in passo:
+            alvo_ns = horario_epoch_ns(passo["horario"])
+            registro["horario"] = alvo_ns / 1e9
+        inicio = time.perf_counter()
+        try:
+            ok = await engine.clicar(partial(
+                clicar, drivers, navegadores_config, mode=passo.get("modo"), horario=alvo_ns
+            ))
+        except asyncio.CancelledError:
+            # A thread do clique continua esperando o alvo; libera-a antes de propagar
+            cancelar_clique_agendado()
+            raise
+        registro["duracao_clique_s"] = round(time.perf_counter() - inicio, 6)
+        if alvo_ns is not None:
+            relatorio = ultimo_relatorio_alvo()
+            if relatorio:
+                registro["alvo"] = relatorio
+        return bool(ok)
+
+    if comando == COMANDO_ESPERA:
+        await asyncio.sleep(passo["segundos"])
+        return True
+
+async def executar_plano(plano, engine, drivers, navegadores_config, clicar=None):
+    """
+    Executa os passos do plano em ordem, sem prompts.
+
+    Args:
+        plano: Plano validado (ver validar_plano)
+        engine: CommandEngine
+        drivers: Lista de drivers dos navegadores
+        navegadores_config: Configuração dos navegadores (atualizada pelos passos)
+        clicar: Função de clique (drivers, navegadores_config, mode=None, horario=None) -> bool,
+            com horario em ns epoch; padrão executar_cliques_simultaneos
+
+    Returns:
+        Resultados serializáveis em JSON, com tempos por passo e por navegador
+    """
+    clicar = clicar or executar_cliques_simultaneos
+    parar_em_falha = plano.get("parar_em_falha", False)
+    resultados = {
+        "inicio": datetime.now().astimezone().isoformat(),
+        "navegadores": len(drivers),
+        "passos": [],
+    }
+    base = time.perf_counter()
+
+    for numero, passo in enumerate(plano["passos"], 1):
+        registro = {"passo": numero, "comando": passo["comando"]}
+        inicio = time.perf_counter()
+        registro["inicio_s"] = round(inicio - base, 6)
+        logger.info(f"[Plano] Passo {numero}: {passo['comando']}")
+        try:
+            registro["ok"] = await _executar_passo(passo, engine, drivers, navegadores_config, clicar, registro)
+        except Exception as e:
+            logger.error(f"[Plano] Passo {numero} falhou: {e}")
+            registro["ok"] = False
+            registro["erro"] = str(e)
+        registro["duracao_s"] = round(time.perf_counter() - inicio, 6)
+        resultados["passos"].append(registro)
+
+        if not registro["ok"] and parar_em_falha:
+            logger.error("[Plano] Execução interrompida (parar_em_falha).")
+            break
+
+    resultados["duracao_s"] = round(time.perf_counter() - base, 6)
+    resultados["ok"] = all(registro["ok"] for registro in resultados["passos"])
+    return resultados
+
+def salvar_resultados(resultados, caminho):
+    """Grava os resultados em JSON de forma atômica (arquivo temporário + rename)."""
+    escrever_json_atomico(caminho, resultados)
+    logger.info(f"[Plano] Resultados gravados em {caminho}")
@@ -0,0 +1,41 @@
+from functools import partial
+from log_config import get_logger
+from src.commands.link_command import carregar_link
+from src.commands.locate_command import executar_comando_localize
+
+logger = get_logger(__name__)
+
+async def restaurar_navegadores(engine, drivers, navegadores_config, store, indices=None):
+    """
+    Reinício rápido: aplica os perfis salvos, navega todos os navegadores em
+    paralelo e pré-resolve os XPaths (handles ficam no cache para o clique).
+
+    Args:
+        indices: Navegadores a restaurar (padrão: todos); ex.: os abertos pela frota depois
+
+    Returns:
+        Índices dos navegadores prontos para clicar
+    """
+    perfis = store.carregar()
+    if indices is None:
+        restaurados = store.aplicar(navegadores_config)
+    else:
+        indices = set(indices)
+        restaurados = store.aplicar({i: c for i, c in navegadores_config.items() if i in indices})
+    if not restaurados:
+        if perfis:
+            logger.info("[Config] Nenhum perfil salvo corresponde à frota atual.")
+        return []
+
+    cargas = await engine.distribuir("restaurar links", {
+        index: partial(carregar_link, drivers[index], index, navegadores_config[index]["link"],
+                       navegadores_config, manter_xpaths=True)
+        for index in restaurados
+        if drivers[index] is not None and drivers[index].session_id
+    })
+
+    carregados = {index for index, resultado in cargas.items() if resultado.ok}
+    localizados = await executar_comando_localize(engine, drivers, navegadores_config, indices=carregados)
+    prontos = sorted(index for index, resultado in localizados.items() if resultado.ok and resultado.valor)
+    logger.info(f"[Config] {len(prontos)}/{len(drivers)} navegadores prontos para clicar após a restauração.")
+    return prontos
@@ -1,34 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from log_config import get_logger
-from navegador_op import verificar_e_restaurar_sessao
+from navegador.operacoes import preparar_sessao
+from src.sistema.system_resources import get_cpu_sampler
 import os
+import time
 import psutil
 
 logger = get_logger(__name__)
 
+# Estimativa usada enquanto nenhum navegador foi medido
+MEMORIA_POR_INSTANCIA_PADRAO = 2 * 1024 ** 3
+# Fração da memória disponível que a frota pode ocupar
+FRACAO_MEMORIA_FROTA = 0.8
+
 # Cálculo automático de instâncias baseado nos recursos
-def calcular_num_instancias():
-    """Calcula o número ótimo de instâncias baseado nos recursos do sistema."""
+def calcular_num_instancias(rss_por_navegador=None, cpu_por_navegador=None, mem_disponivel=None, minimo=2, cpu_count=None):
+    """
+    Calcula o número ótimo de instâncias baseado nos recursos do sistema.
+
+    Args:
+        rss_por_navegador: RSS medido (bytes) de um navegador com toda a árvore de processos
+        cpu_por_navegador: Uso medido de CPU de um navegador, em núcleos (1.0 = um núcleo)
+        mem_disponivel: Memória (bytes) disponível para a frota; padrão: memória livre atual
+        minimo: Número mínimo de instâncias
+        cpu_count: Núcleos do host; padrão os.cpu_count()
+    """
     try:
         # Obtém informações do sistema
-        cpu_count = os.cpu_count()
-        mem_info = psutil.virtual_memory()
-        mem_available_gb = mem_info.available / (1024 ** 3)  # Converte para GB
+        cpu_count = cpu_count or os.cpu_count()
+        if mem_disponivel is None:
+            mem_disponivel = psutil.virtual_memory().available
         
-        # Reserva 2 cores para sistema
+        # Reserva 2 cores para sistema (um worker de clique por navegador)
         cores_disponíveis = max(cpu_count - 2, 2)
         
-        # Calcula baseado em memória (2GB por instância)
-        max_por_memoria = int(mem_available_gb / 2)
+        # Calcula baseado na memória medida (ou 2GB por instância sem medição)
+        rss = rss_por_navegador or MEMORIA_POR_INSTANCIA_PADRAO
+        max_por_memoria = int(mem_disponivel * FRACAO_MEMORIA_FROTA / rss)
         
         # Usa o menor valor entre cores disponíveis e limite de memória
         num_instancias = min(cores_disponíveis, max_por_memoria)
+
+        # Limite por CPU medida dos navegadores
+        if cpu_por_navegador:
+            num_instancias = min(num_instancias, int(cores_disponíveis / cpu_por_navegador))
         
-        # Garante pelo menos 2 instâncias
-        return max(num_instancias, 2)
+        # Garante o mínimo de instâncias
+        return max(num_instancias, minimo)
     except:
         return 2  # Valor padrão seguro
 
 # Configurações globais otimizadas
+# Valor inicial: a frota é redimensionada em tempo de execução (navegador/frota.py)
 NUM_INSTANCIAS = 2
 drivers = []
 navegadores_config = {i: {"link": None, "xpaths": []} for i in range(NUM_INSTANCIAS)}
@@ -41,75 +64,119 @@ PERFORMANCE_CONFIG = {
     'distribuicao_ccx': True,  # Habilita distribuição por CCX
 }
 
+# Prazo para a validação de cada navegador
+VALIDACAO_TIMEOUT_S = 2.0
+
+# Monitor de saúde dos navegadores (registrado na inicialização)
+_monitor_saude = None
+
+def configurar_monitor_saude(monitor):
+    """Registra o monitor cujo bitmap de prontos dispensa os pings na validação."""
+    global _monitor_saude
+    _monitor_saude = monitor
+
 def validar_configuracao():
-    """Valida a configuração de cada navegador com verificações adicionais."""
+    """Valida a configuração de todos os navegadores em paralelo, com prazo por navegador."""
     validos = []
     logger.info("[Validação] Iniciando validação de configurações...")
     
-    # Verifica recursos do sistema primeiro
+    # Verifica recursos do sistema primeiro (leituras sem bloqueio)
     mem_info = psutil.virtual_memory()
     if mem_info.percent > 90:
         logger.warning("[Validação] Sistema com pouca memória disponível")
     
-    cpu_percent = psutil.cpu_percent(interval=1)
-    if cpu_percent > 80:
+    cpu_percent = get_cpu_sampler().percent
+    if cpu_percent is not None and cpu_percent > 80:
         logger.warning("[Validação] Alta utilização de CPU detectada")
-    
-    for index, driver in enumerate(drivers):
-        logger.info(f"[Validação] Verificando Navegador {index + 1}...")
-        
-        # Verificação de driver e sessão
-        if not _validar_driver(driver, index):
-            continue
-            
-        # Verificação de configuração
-        config = navegadores_config[index]
-        if not _validar_config(config, driver, index):
-            continue
-            
-        # Verificação de performance
-        if not _validar_performance(driver, index):
-            continue
-        
-        # Navegador válido
-        logger.info(f"[Validação] Navegador {index + 1}: Configuração válida.")
-        validos.append(index)
+
+    if not drivers:
+        _exibir_resumo_validacao(validos)
+        return validos
+
+    executor = ThreadPoolExecutor(max_workers=len(drivers), thread_name_prefix="validacao")
+    futures = [
+        executor.submit(_validar_navegador, driver, index)
+        for index, driver in enumerate(list(drivers))
+    ]
+    prazo = time.monotonic() + VALIDACAO_TIMEOUT_S
+    for index, future in enumerate(futures):
+        try:
+            valido = future.result(timeout=max(0.0, prazo - time.monotonic()))
+        except FuturesTimeoutError:
+            logger.error(f"[Validação] Navegador {index + 1}: Prazo de {VALIDACAO_TIMEOUT_S:.1f}s excedido.")
+            valido = False
+        except Exception as e:
+            logger.error(f"[Validação] Navegador {index + 1}: Erro na validação: {e}")
+            valido = False
+        if valido:
+            validos.append(index)
+    # Navegadores travados não seguram o comando
+    executor.shutdown(wait=False)
     
     _exibir_resumo_validacao(validos)
     return validos
 
+def _validar_navegador(driver, index):
+    """Todas as verificações de um navegador (executado em paralelo)."""
+    logger.info(f"[Validação] Verificando Navegador {index + 1}...")
+
+    # Verificação de driver e sessão
+    url = _validar_driver(driver, index)
+    if url is None:
+        return False
+
+    # Verificação de configuração
+    config = navegadores_config.get(index, {})
+    if not _validar_config(config, url, index):
+        return False
+
+    # Verificação de performance
+    if not _validar_performance(driver, index):
+        return False
+
+    # Navegador válido
+    logger.info(f"[Validação] Navegador {index + 1}: Configuração válida.")
+    return True
+
 def _validar_driver(driver, index):
-    """Valida o driver e sua sessão."""
+    """Valida o driver e sua sessão; retorna a URL atual ou None."""
     if driver is None:
         logger.error(f"[Validação] Navegador {index + 1}: Driver inexistente.")
-        return False
+        return None
     
     if not driver.session_id:
         logger.error(f"[Validação] Navegador {index + 1}: Sessão inativa.")
-        return False
+        return None
+
+    # Estado recente do monitor de saúde dispensa o round-trip
+    estado = _monitor_saude.estado_recente(index, driver) if _monitor_saude else None
+    if estado is not None:
+        if not estado.pronto:
+            logger.error(f"[Validação] Navegador {index + 1}: Marcado como não saudável pelo monitor.")
+            return None
+        link = navegadores_config.get(index, {}).get("link")
+        # Após um 'new link' a URL do monitor pode estar defasada: confirma ao vivo
+        if not link or estado.url.startswith(link):
+            return estado.url
     
-    if not verificar_e_restaurar_sessao(driver, index):
+    url = preparar_sessao(driver, index)
+    if url is None:
         logger.error(f"[Validação] Navegador {index + 1}: Falha ao verificar sessão.")
-        return False
+        return None
         
     logger.info(f"[Validação] Navegador {index + 1}: Sessão ativa e válida.")
-    return True
+    return url
 
-def _validar_config(config, driver, index):
+def _validar_config(config, current_url, index):
     """Valida configurações específicas do navegador."""
     link_configurado = config.get("link")
     if not link_configurado:
         logger.warning(f"[Validação] Navegador {index + 1}: Nenhum link configurado.")
         return False
     
-    try:
-        current_url = driver.current_url
-        if not current_url.startswith(link_configurado):
-            logger.warning(f"[Validação] Navegador {index + 1}: URL não corresponde.")
-            logger.debug(f"[Validação] URL atual = {current_url}, esperado = {link_configurado}")
-            return False
-    except Exception as e:
-        logger.error(f"[Validação] Erro ao verificar URL: {e}")
+    if not current_url.startswith(link_configurado):
+        logger.warning(f"[Validação] Navegador {index + 1}: URL não corresponde.")
+        logger.debug(f"[Validação] URL atual = {current_url}, esperado = {link_configurado}")
         return False
     
     xpaths_configurados = config.get("xpaths", [])
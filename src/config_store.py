@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import threading
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Arquivo padrão dos perfis (link + XPaths) por navegador
+CAMINHO_CONFIG_PADRAO = os.path.join(
+    os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")), "click_sync", "navegadores.json"
+)
+# Versão do formato gravado em disco
+VERSAO_FORMATO = 1
+
+def escrever_json_atomico(caminho, dados):
+    """Grava JSON em arquivo temporário no mesmo diretório, fsync e rename por cima do destino."""
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=diretorio)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+class ConfigStore:
+    """
+    Perfis persistentes de navegadores_config (link e XPaths por navegador).
+
+    O arquivo é JSON com chaves 1-based, como no terminal. Perfis de
+    navegadores fora da frota atual são preservados ao salvar, e a gravação
+    só acontece quando algo mudou.
+
+    Args:
+        caminho: Arquivo JSON dos perfis
+    """
+
+    def __init__(self, caminho=CAMINHO_CONFIG_PADRAO):
+        self.caminho = caminho
+        self._perfis = {}
+        self._gravado = None
+        self._lock = threading.Lock()
+
+    def carregar(self):
+        """Lê os perfis do disco; retorna {índice: {"link", "xpaths"}} (vazio se não houver arquivo)."""
+        try:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"[Config] Não foi possível ler {self.caminho}: {e}")
+            return {}
+
+        perfis = {}
+        for chave, perfil in dados.get("navegadores", {}).items():
+            try:
+                index = int(chave) - 1
+            except ValueError:
+                continue
+            if index >= 0 and isinstance(perfil, dict):
+                perfis[index] = {"link": perfil.get("link"), "xpaths": list(perfil.get("xpaths") or [])}
+
+        with self._lock:
+            self._perfis = perfis
+            self._gravado = self._serializar(perfis)
+        logger.info(f"[Config] {len(perfis)} perfil(is) carregado(s) de {self.caminho}")
+        return {index: {"link": p["link"], "xpaths": list(p["xpaths"])} for index, p in perfis.items()}
+
+    @staticmethod
+    def _serializar(perfis):
+        return {
+            "versao": VERSAO_FORMATO,
+            "navegadores": {
+                str(index + 1): {"link": perfil["link"], "xpaths": perfil["xpaths"]}
+                for index, perfil in sorted(perfis.items())
+            },
+        }
+
+    def aplicar(self, navegadores_config):
+        """Copia os perfis carregados para navegadores_config (apenas índices da frota atual)."""
+        with self._lock:
+            perfis = dict(self._perfis)
+        aplicados = []
+        for index, config in navegadores_config.items():
+            perfil = perfis.get(index)
+            if perfil and perfil["link"]:
+                config["link"] = perfil["link"]
+                config["xpaths"] = list(perfil["xpaths"])
+                aplicados.append(index)
+        return aplicados
+
+    def salvar(self, navegadores_config):
+        """Grava os perfis configurados; retorna True se o arquivo foi reescrito."""
+        with self._lock:
+            perfis = dict(self._perfis)
+            for index, config in navegadores_config.items():
+                if config.get("link"):
+                    perfis[index] = {"link": config["link"], "xpaths": list(config.get("xpaths") or [])}
+            dados = self._serializar(perfis)
+            if dados == self._gravado:
+                return False
+            try:
+                escrever_json_atomico(self.caminho, dados)
+            except OSError as e:
+                logger.error(f"[Config] Não foi possível gravar {self.caminho}: {e}")
+                return False
+            self._perfis = perfis
+            self._gravado = dados
+        logger.info(f"[Config] Perfis salvos em {self.caminho}")
+        return True
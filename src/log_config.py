@@ -1,6 +1,14 @@
+import atexit
 import logging
+import queue
+import threading
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from colorama import Fore, Style
 
+# Formatação e I/O dos logs em thread de fundo por padrão
+ASYNC_LOGGING = True
+
 # Classe de formatação personalizada para logs com cores
 class LogFormatter(logging.Formatter):
     FORMATS = {
@@ -11,28 +19,81 @@ class LogFormatter(logging.Formatter):
         logging.CRITICAL: f"{Fore.RED}{Style.BRIGHT}%(asctime)s - [CRITICAL] - %(message)s{Style.RESET_ALL}",
     }
 
+    def __init__(self):
+        super().__init__()
+        # Um formatter por nível, criado uma única vez
+        self._formatters = {
+            level: logging.Formatter(fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            for level, fmt in self.FORMATS.items()
+        }
+        self._default = logging.Formatter("%(message)s")
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno, "%(message)s")
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default).format(record)
 
-# Configuração global de logging
-def setup_logging(level=logging.WARNING, log_file=None):
-    # Evita reconfigurar múltiplos handlers
-    if logging.getLogger().hasHandlers():
-        return
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler que não formata na thread chamadora: tudo é feito pelo listener."""
 
-    # Handler de log para console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(LogFormatter())
+    def prepare(self, record):
+        # Fila em memória do mesmo processo: o registro não precisa ser serializado
+        return record
+
+class HotSectionFilter(logging.Filter):
+    """
+    Retém (ou descarta) registros da thread que está em uma seção crítica.
+
+    O estado é por thread: filter() roda na thread que emite o registro, então
+    só os registros da própria seção crítica são retidos, e o buffer nunca é
+    compartilhado com outra thread (monitor, posicionamento etc. seguem livres).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def _state(self):
+        local = self._local
+        if not hasattr(local, 'depth'):
+            local.depth = 0
+            local.suppress = False
+            local.buffer = []
+        return local
+
+    @property
+    def depth(self):
+        """Profundidade da seção crítica na thread chamadora."""
+        return getattr(self._local, 'depth', 0)
+
+    def filter(self, record):
+        if not getattr(self._local, 'depth', 0):
+            return True
+        if not self._local.suppress:
+            self._local.buffer.append(record)
+        return False
+
+    def enter(self, suppress):
+        state = self._state()
+        if not state.depth:
+            state.suppress = suppress
+        state.depth += 1
+
+    def exit(self):
+        state = self._state()
+        state.depth -= 1
+        if state.depth:
+            return []
+        pending, state.buffer = state.buffer, []
+        # Com vários handlers o mesmo registro é retido uma vez por handler
+        return list(dict.fromkeys(pending))
 
-    # Configura o logger principal
-    logging.basicConfig(
-        level=level,
-        handlers=[console_handler],
-        format="%(asctime)s - [%(levelname)s] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+_hot_filter = HotSectionFilter()
+_listener = None
+
+def _build_handlers(log_file=None, stream=None):
+    """Cria os handlers de console e arquivo (executados pelo listener no modo assíncrono)."""
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(LogFormatter())
+    handlers = [console_handler]
 
     # Adiciona handler para arquivo, se especificado
     if log_file:
@@ -40,7 +101,59 @@ def setup_logging(level=logging.WARNING, log_file=None):
         file_handler.setFormatter(
             logging.Formatter("%(asctime)s - [%(levelname)s] - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
         )
-        logging.getLogger().addHandler(file_handler)
+        handlers.append(file_handler)
+    return handlers
+
+def stop_logging():
+    """Esvazia a fila e encerra a thread de logging assíncrono."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+# Configuração global de logging
+def setup_logging(level=logging.WARNING, log_file=None, async_mode=ASYNC_LOGGING, stream=None, force=False):
+    global _listener
+
+    root = logging.getLogger()
+    # Evita reconfigurar múltiplos handlers
+    if root.hasHandlers() and not force:
+        return
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    stop_logging()
+
+    handlers = _build_handlers(log_file, stream)
+    if async_mode:
+        queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [queue_handler]
+
+    for handler in handlers:
+        handler.addFilter(_hot_filter)
+        root.addHandler(handler)
+    root.setLevel(level)
+
+atexit.register(stop_logging)
+
+@contextmanager
+def hot_section(suppress=False):
+    """
+    Janela crítica (arm→fire): os logs da thread chamadora são retidos e emitidos ao sair.
+
+    Args:
+        suppress: Descarta os registros em vez de retê-los
+    """
+    _hot_filter.enter(suppress)
+    try:
+        yield
+    finally:
+        pending = _hot_filter.exit()
+        for record in pending:
+            logging.getLogger(record.name).handle(record)
 
 # Função utilitária para obter loggers específicos
 def get_logger(name, level=logging.INFO, log_file=None):
@@ -1,24 +1,44 @@
 import click_sync
 from log_config import get_logger
-from navegador import abrir_navegador
-from comando_exec import executar_comando
-from config import NUM_INSTANCIAS, drivers, navegadores_config
-from click_manager import LinuxPrecisionClickManager
-from gerenciador_memoria import GerenciadorMemoria
+from navegador.pool_navegadores import BrowserPool, NUM_RESERVAS_PADRAO
+from navegador.gerenciador import configurar_pool
+from navegador.frota import FleetScaler
+from navegador.monitor_saude import HealthMonitor
+from navegador.posicionamento import ProcessPlacementService
+from src.commands import (
+    executar_comando, encerrar_engine, obter_engine, carregar_plano, executar_plano,
+    plano_de_argumentos, salvar_resultados, configurar_store, salvar_configuracao, restaurar_navegadores
+)
+from src.commands.click_command import configurar_click_manager
+from config import NUM_INSTANCIAS, PERFORMANCE_CONFIG, drivers, navegadores_config, configurar_monitor_saude
+from config_store import ConfigStore, CAMINHO_CONFIG_PADRAO
+from src.click_manager.precision_click_manager import LinuxPrecisionClickManager
+from src.click_manager.rt_profile import RT_POLICIES, RT_POLICY_FIFO
 from gerenciador_sistema_avancado import EnhancedSystemManager
-from concurrent.futures import ThreadPoolExecutor
-from threading import Barrier
+from src.sistema.cgroup_v2 import CgroupManager
+import argparse
 import sys
 import os
 
 logger = get_logger(__name__)
 
+# Pool de navegadores ativos + reservas quentes
+browser_pool = None
+# Dimensionamento da frota a partir do consumo medido
+frota = None
+# Pings e medições dos navegadores em segundo plano
+monitor_saude = None
+# Afinidade/cgroup das árvores de processos dos navegadores
+posicionamento = None
+
 def fechar_navegadores():
     """Fecha todos os navegadores abertos."""
     try:
         for driver in drivers:
             if driver and hasattr(driver, 'session_id') and driver.session_id:
                 driver.quit()
+        if browser_pool is not None:
+            browser_pool.encerrar()
         logger.info("[Sistema] Todos os navegadores foram encerrados.")
     except Exception as e:
         logger.error(f"[Sistema] Erro ao fechar navegadores: {e}")
@@ -32,38 +52,12 @@ def exibir_configuracao():
         xpaths = xpaths if xpaths else "Nenhum XPath configurado"
         logger.info(f"  Navegador {index + 1}: Link = {link}, XPaths = {xpaths}")
 
-def abrir_todos_navegadores(num_instancias):
-    """Abre navegadores em paralelo e aguarda que todos estejam prontos."""
-    barrier = Barrier(num_instancias)
-    opened_drivers = []
-
-    def abrir_com_barreira(index):
-        driver = None
-        try:
-            logger.info(f"Iniciando abertura do navegador {index + 1}...")
-            driver = abrir_navegador(index)
-            logger.info(f"Navegador {index + 1} aberto com sucesso.")
-            return driver
-        except Exception as e:
-            logger.error(f"Erro ao abrir navegador {index + 1}: {e}")
-            return None
-        finally:
-            try:
-                barrier.wait()
-            except Exception as e:
-                logger.error(f"Erro na sincronização da barreira para navegador {index + 1}: {e}")
-
-    with ThreadPoolExecutor(max_workers=num_instancias) as executor:
-        futures = [executor.submit(abrir_com_barreira, i) for i in range(num_instancias)]
-        for future in futures:
-            try:
-                driver = future.result()
-                if driver is not None:
-                    opened_drivers.append(driver)
-            except Exception as e:
-                logger.error(f"Erro ao obter resultado do future: {e}")
-
-    return opened_drivers
+def abrir_todos_navegadores(num_instancias, num_reservas=NUM_RESERVAS_PADRAO):
+    """Abre navegadores ativos e reservas em paralelo; os ativos vão para `drivers`."""
+    global browser_pool
+    browser_pool = BrowserPool(num_instancias, num_reservas)
+    configurar_pool(browser_pool)
+    return browser_pool.iniciar(drivers)
 
 def verificar_privilegios():
     """Verifica se o programa está sendo executado com privilégios necessários."""
@@ -73,45 +67,133 @@ def verificar_privilegios():
         return False
     return True
 
+def ler_argumentos(argv=None):
+    """Argumentos do modo roteirizado (sem argumentos: modo interativo)."""
+    parser = argparse.ArgumentParser(description="Cliques sincronizados em vários navegadores.")
+    parser.add_argument("--plano", help="Arquivo JSON com o plano de comandos (sem prompts)")
+    parser.add_argument("--link", help="Link carregado em todos os navegadores")
+    parser.add_argument("--xpath", action="append", help="XPath adicionado em todos os navegadores (repetível)")
+    parser.add_argument("--click-at", action="append", dest="click_at",
+                        help="Horário absoluto de clique, ISO 8601 ou epoch (repetível)")
+    parser.add_argument("--modo", help="Executor de clique (atomic, legacy, in_page, process, cdp)")
+    parser.add_argument("--resultados", default="resultados_plano.json",
+                        help="Arquivo JSON com resultados e tempos do plano")
+    parser.add_argument("--config", default=CAMINHO_CONFIG_PADRAO,
+                        help="Arquivo com os perfis (link e XPaths) salvos por navegador")
+    parser.add_argument("--sem-restaurar", action="store_true", dest="sem_restaurar",
+                        help="Não reabre os links salvos na inicialização")
+    parser.add_argument("--rt", choices=RT_POLICIES, default=RT_POLICY_FIFO,
+                        help="Escalonamento das threads de clique na janela arm→fire (padrão fifo)")
+    parser.add_argument("--mlockall", action="store_true",
+                        help="Trava toda a memória do processo (padrão: só as pilhas das threads de disparo)")
+    parser.add_argument("--cgroup", action="store_true",
+                        help="Cria um cgroup v2 por navegador (cpuset, cpu.max, memory.high/max e PSI)")
+    parser.add_argument("--cgroup-memoria", dest="cgroup_memoria",
+                        help="memory.max de cada navegador com --cgroup (ex.: 3G; padrão 2,5x memoria_por_instancia)")
+    return parser.parse_args(argv)
+
+def obter_plano(args):
+    """Plano do arquivo ou dos argumentos; None para o modo interativo."""
+    if args.plano:
+        return carregar_plano(args.plano)
+    if args.link or args.xpath or args.click_at:
+        return plano_de_argumentos(args.link, args.xpath, args.click_at, args.modo)
+    return None
+
 if __name__ == "__main__":
+    args = ler_argumentos()
     click_manager = None
-    memoria_manager = None
     sistema_manager = None
     
     try:
+        # Plano validado antes de abrir qualquer navegador
+        plano = obter_plano(args)
+
         # Verificação de privilégios
         verificar_privilegios()
         
         # Inicialização dos gerenciadores
-        memoria_manager = GerenciadorMemoria(logger)
         sistema_manager = EnhancedSystemManager(logger)
         
         try:
-            # Configurações de sistema e memória
-            memoria_manager.configurar_memoria_locked()
+            # Ajustes do sistema (uma vez, restaurados no atexit/sinais) e afinidade
+            sistema_manager.apply_system_tuning()
             sistema_manager.optimize_cpu_affinity()
             sistema_manager.set_process_priority(-10)  # Prioridade alta (-10)
-            sistema_manager.optimize_memory_settings()
             
-            # Inicialização do gerenciador de cliques
-            click_manager = LinuxPrecisionClickManager(max_workers=NUM_INSTANCIAS)
+            # Inicialização do gerenciador de cliques (pilhas das threads RT travadas)
+            click_manager = LinuxPrecisionClickManager(
+                max_workers=NUM_INSTANCIAS, rt_policy=args.rt, lock_all_memory=args.mlockall
+            )
+            configurar_click_manager(click_manager)
+
+            # Latência de despertar sob o perfil RT: o host está apto a cliques precisos?
+            click_manager.measure_wakeup_latency()
             
-            # Abrir navegadores em paralelo
-            drivers.clear()
+            # Abrir navegadores em paralelo (ativos preenchem `drivers`)
             novos_drivers = abrir_todos_navegadores(NUM_INSTANCIAS)
             
             if not novos_drivers:
                 logger.error("[Sistema] Nenhum navegador foi aberto com sucesso.")
                 raise RuntimeError("Falha ao abrir navegadores")
+            # Navegadores substituídos ou removidos não deixam calibração para trás
+            browser_pool.ao_descartar.append(click_manager.forget_driver)
+
+            # Perfis salvos: links reabertos em paralelo e XPaths pré-resolvidos
+            store = ConfigStore(args.config)
+            configurar_store(store)
+            engine = obter_engine()
+            if args.sem_restaurar:
+                store.carregar()
+            else:
+                engine.executar(restaurar_navegadores(engine, drivers, navegadores_config, store))
+
+            # Ajusta o tamanho da frota ao consumo real, medido com as páginas já
+            # carregadas (abas em branco subestimam o RSS de cada navegador)
+            frota = FleetScaler(browser_pool, navegadores_config, PERFORMANCE_CONFIG)
+            abertos = len(drivers)
+            frota.dimensionar()
+            if not args.sem_restaurar and len(drivers) > abertos:
+                engine.executar(restaurar_navegadores(
+                    engine, drivers, navegadores_config, store, indices=range(abertos, len(drivers))
+                ))
+
+            # Sessões verificadas em segundo plano; navegadores doentes são trocados antes do clique.
+            # Sem pings em navegadores com comando em andamento nem durante a janela de clique
+            monitor_saude = HealthMonitor(
+                drivers, browser_pool, ocupados=engine.ocupados, pausado=engine.em_clique
+            ).iniciar()
+            configurar_monitor_saude(monitor_saude)
+
+            # Árvores de processos fixadas nas CPUs de cada navegador (renderers novos inclusos)
+            posicionamento = ProcessPlacementService(
+                drivers, sistema_manager.cpu_manager,
+                cgroups=CgroupManager(logger) if args.cgroup else None,
+                memoria_max=args.cgroup_memoria,
+                performance_config=PERFORMANCE_CONFIG
+            ).iniciar()
+            # PSI da frota (cgroups ou sistema) limita o dimensionamento
+            frota.pressao = posicionamento.ler_pressao
+            # Ajuste da frota fora do caminho dos comandos, adiado durante comandos e cliques
+            frota.em_uso = engine.em_uso
+            frota.iniciar()
                 
-            drivers.extend(novos_drivers)
             logger.info(f"Todos os {len(drivers)} navegadores foram abertos com sucesso.")
             
             # Exibir configuração inicial
             exibir_configuracao()
 
+            # Modo roteirizado: executa o plano e encerra
+            if plano is not None:
+                resultados = engine.executar(executar_plano(plano, engine, drivers, navegadores_config))
+                if resultados is not None:
+                    resultados["latencia_despertar"] = click_manager.last_wakeup_report.as_dict()
+                    salvar_resultados(resultados, args.resultados)
+                salvar_configuracao(navegadores_config)
+                exibir_configuracao()
+
             # Loop principal aguardando comandos
-            while True:
+            while plano is None:
                 try:
                     comando = input("Digite um comando ('add', 'localize', 'click', 'new link', ou 'exit'): ").strip().lower()
                     if comando in {"new link", "add", "localize", "click"}:
@@ -149,8 +231,23 @@ if __name__ == "__main__":
             except Exception as e:
                 logger.error(f"[Sistema] Erro ao limpar click manager: {e}")
 
+        # Monitor e frota param antes de fechar os navegadores
+        if frota:
+            frota.parar()
+        if monitor_saude:
+            monitor_saude.parar()
+        if posicionamento:
+            posicionamento.parar()
+
+        # Motor de comandos (executor de chamadas e laço de eventos)
+        encerrar_engine()
+
         # Fechamento dos navegadores
         fechar_navegadores()
+
+        # cgroups vazios só podem ser removidos depois do fechamento
+        if posicionamento and posicionamento.cgroups:
+            posicionamento.cgroups.cleanup()
         
         # Limpeza do sistema
         if sistema_manager:
@@ -159,11 +256,4 @@ if __name__ == "__main__":
             except Exception as e:
                 logger.error(f"[Sistema] Erro durante graceful shutdown: {e}")
         
-        # Limpeza da memória
-        if memoria_manager:
-            try:
-                memoria_manager.limpar_configuracoes()
-            except Exception as e:
-                logger.error(f"[Sistema] Erro ao limpar configurações de memória: {e}")
-        
         logger.info("[Sistema] Programa encerrado.")
\ No newline at end of file
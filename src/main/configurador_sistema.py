@@ -3,21 +3,28 @@
 from src.memory import MemoryManager
 from src.sistema.gerenciador_sistema_avancado import EnhancedSystemManager
 from src.click_manager.precision_click_manager import LinuxPrecisionClickManager
+from src.commands.click_command import configurar_click_manager
 from log_config import get_logger
 
 logger = get_logger(__name__)
 
-def inicializar_sistema():
-    """Inicializa memória, CPU e gerenciadores do sistema."""
+def inicializar_sistema(lock_all_memory=False):
+    """
+    Inicializa memória, CPU e gerenciadores do sistema.
+
+    Args:
+        lock_all_memory: mlockall do processo inteiro (mesmo opt-in do --mlockall);
+            por padrão só as pilhas dos workers de disparo são travadas
+    """
     memoria_manager = MemoryManager(logger)
     sistema_manager = EnhancedSystemManager(logger)
     
-    # Configuração
-    memoria_manager.lock_memory()  # Mudou de configurar_memoria_locked para lock_memory
+    # Configuração (travamento de memória fica com o RTProfile do click manager)
     sistema_manager.optimize_cpu_affinity()
     sistema_manager.set_process_priority(-10)
-    sistema_manager.optimize_memory_settings()
+    sistema_manager.apply_system_tuning()
     
-    click_manager = LinuxPrecisionClickManager()
+    click_manager = LinuxPrecisionClickManager(lock_all_memory=lock_all_memory)
+    configurar_click_manager(click_manager)
     
     return memoria_manager, sistema_manager, click_manager
\ No newline at end of file
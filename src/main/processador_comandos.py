@@ -1,6 +1,6 @@
 # Contém a lógica para processar os comandos no loop principal.
 
-from src.commands import executar_comando
+from src.commands import executar_comando, encerrar_engine
 from log_config import get_logger
 
 logger = get_logger(__name__)
@@ -22,3 +22,4 @@ def processar_comandos(drivers, navegadores_config):
             break
         except Exception as e:
             logger.error(f"[Sistema] Erro ao executar comando: {e}")
+    encerrar_engine()
@@ -6,7 +6,7 @@ from typing import Optional
 
 from .constants import MemoryFlags, IOPriority, LIBC_PATHS
 from .exceptions import LibCError, MemoryLockError, IOPriorityError
-from .utils import run_with_sudo, set_sysfs_value
+from .utils import run_with_sudo
 
 class MemoryManager:
     def __init__(self, logger: Optional[logging.Logger] = None):
@@ -55,31 +55,12 @@ class MemoryManager:
                 if self.libc.mlockall(flags) != 0:
                     raise MemoryLockError("Falha ao bloquear memória")
             
-            self._configure_memory_settings()
+            # swappiness/THP ficam com o TuningEngine (src/sistema/tuning.py)
             return True
             
         except Exception as e:
             raise MemoryLockError(f"Erro ao bloquear memória: {e}")
 
-    def _configure_memory_settings(self) -> None:
-        """Configura parâmetros adicionais de memória."""
-        # Configura swappiness
-        success, message = set_sysfs_value('/proc/sys/vm/swappiness', '0')
-        if success:
-            self.logger.info("[Sistema] Swappiness configurado para 0")
-        else:
-            self.logger.warning(f"[Sistema] Falha ao configurar swappiness: {message}")
-
-        # Configura THP
-        success, message = set_sysfs_value(
-            '/sys/kernel/mm/transparent_hugepage/enabled', 
-            'never'
-        )
-        if success:
-            self.logger.info("[Sistema] THP desativado com sucesso")
-        else:
-            self.logger.debug(f"[Sistema] Falha ao configurar THP: {message}")
-
     def set_io_priority(self) -> None:
         """Configura prioridade de I/O."""
         try:
@@ -105,24 +86,11 @@ class MemoryManager:
                 raise IOPriorityError(f"Falha ao configurar prioridade de I/O: {message}")
 
     def cleanup(self) -> None:
-        """Restaura configurações originais."""
+        """Desfaz o lock de memória."""
         try:
             if self.libc and hasattr(self.libc, 'munlockall'):
                 self.libc.munlockall()
                 self.logger.info("[Sistema] Configurações de memória restauradas")
 
-            # Restaura swappiness
-            success, _ = set_sysfs_value('/proc/sys/vm/swappiness', '60')
-            if success:
-                self.logger.info("[Sistema] Swappiness restaurado para 60")
-
-            # Restaura THP
-            success, _ = set_sysfs_value(
-                '/sys/kernel/mm/transparent_hugepage/enabled',
-                'madvise'
-            )
-            if success:
-                self.logger.info("[Sistema] THP restaurado para configuração padrão")
-
         except Exception as e:
             self.logger.error(f"[Sistema] Falha ao limpar configurações: {e}")
\ No newline at end of file
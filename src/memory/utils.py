@@ -24,20 +24,3 @@ def run_with_sudo(command: List[str]) -> Tuple[bool, str]:
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         return False, str(e)
-
-def set_sysfs_value(path: str, value: str) -> Tuple[bool, str]:
-    """
-    Define valor em arquivo sysfs.
-    
-    Args:
-        path: Caminho do arquivo
-        value: Valor a ser definido
-        
-    Returns:
-        Tuple[bool, str]: Status de sucesso e mensagem
-    """
-    if not os.path.exists(path):
-        return False, f"Path não existe: {path}"
-        
-    success, message = run_with_sudo(['sh', '-c', f'echo {value} > {path}'])
-    return success, message
\ No newline at end of file
@@ -0,0 +1,270 @@
+import math
+import os
+import statistics
+import threading
+import time
+import psutil
+from config import MEMORIA_POR_INSTANCIA_PADRAO, calcular_num_instancias
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Janela de amostragem do uso de CPU dos navegadores
+JANELA_CPU_S = 0.5
+# Navegadores adicionados no máximo por ajuste (a abertura também é escalonada no pool)
+PASSO_CRESCIMENTO = 2
+# Intervalo mínimo entre medições no ajuste em tempo de execução
+INTERVALO_MEDICAO_S = 30.0
+# Intervalo do laço de ajuste em segundo plano
+INTERVALO_AJUSTE_S = 5.0
+# PSI de memória da frota (avg10 %) a partir do qual ela encolhe um navegador
+PSI_MEMORIA_LIMITE = 10.0
+# PSI de CPU da frota (avg10 %) a partir do qual ela para de crescer
+PSI_CPU_LIMITE = 40.0
+# PSI de memória de um navegador (avg10 %) que o marca como fora de controle (contido pelo memory.high)
+PSI_NAVEGADOR_LIMITE = 20.0
+
+def processos_do_navegador(driver):
+    """Processos do chromedriver e do Chrome (com filhos) de um driver."""
+    pids = []
+    processo = getattr(getattr(driver, 'service', None), 'process', None)
+    if processo is not None:
+        pids.append(processo.pid)
+    browser_pid = getattr(driver, 'browser_pid', None)
+    if browser_pid:
+        pids.append(browser_pid)
+
+    processos = {}
+    for pid in pids:
+        try:
+            raiz = psutil.Process(pid)
+            for proc in [raiz] + raiz.children(recursive=True):
+                processos[proc.pid] = proc
+        except psutil.Error:
+            continue
+    return list(processos.values())
+
+def tempo_cpu(processos):
+    total = 0.0
+    for proc in processos:
+        try:
+            tempos = proc.cpu_times()
+            total += tempos.user + tempos.system
+        except psutil.Error:
+            continue
+    return total
+
+def rss_total(processos):
+    total = 0
+    for proc in processos:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+def medir_frota(drivers, janela_s=JANELA_CPU_S):
+    """
+    Mede RSS (bytes) e CPU (núcleos) da árvore de processos de cada navegador.
+
+    Uma única janela de amostragem serve para todos os navegadores.
+
+    Returns:
+        Lista com (rss, cpu) por driver, ou None quando não há processo local
+    """
+    arvores = [processos_do_navegador(driver) for driver in drivers]
+    inicio = [tempo_cpu(processos) for processos in arvores]
+    time.sleep(janela_s)
+    medidas = []
+    for processos, cpu_inicial in zip(arvores, inicio):
+        if not processos:
+            medidas.append(None)
+            continue
+        cpu = (tempo_cpu(processos) - cpu_inicial) / janela_s
+        medidas.append((rss_total(processos), cpu))
+    return medidas
+
+def _memoria_disponivel():
+    return psutil.virtual_memory().available
+
+class FleetScaler:
+    """
+    Dimensiona a frota de navegadores a partir do consumo medido.
+
+    O alvo vem de calcular_num_instancias() com o RSS e a CPU medidos por
+    navegador; a frota cresce (aberturas escalonadas pelo pool) ou encolhe
+    conforme a pressão de memória, e navegadores_config/PERFORMANCE_CONFIG
+    acompanham o tamanho de `pool.ativos`.
+
+    Com uma fonte de PSI (ex.: ProcessPlacementService.ler_pressao), a
+    pressão medida limita o alvo: memória sob pressão na frota encolhe um
+    navegador e CPU sob pressão impede o crescimento. Navegadores isolados
+    sob pressão (uma aba fora de controle contida pelo memory.high do próprio
+    cgroup) não encolhem a frota.
+
+    O ajuste em tempo de execução roda em uma thread própria (iniciar/parar),
+    fora do caminho dos comandos, e é adiado enquanto `em_uso()` indicar um
+    comando ou clique em andamento (encolher fecharia um navegador em uso).
+
+    Args:
+        pool: BrowserPool cujos ativos formam a frota
+        navegadores_config: Configuração por navegador (redimensionada no lugar)
+        performance_config: PERFORMANCE_CONFIG (atualizado no lugar), opcional
+        medidor: Função (drivers) -> [(rss, cpu) | None]; padrão medir_frota
+        memoria_disponivel: Função () -> bytes livres; padrão psutil
+        minimo: Menor tamanho da frota
+        maximo: Maior tamanho da frota (None = sem limite além dos recursos)
+        nucleos: Núcleos considerados no dimensionamento; padrão os.cpu_count()
+        pressao: Função () -> (ResourcePressure da frota | None, [ResourcePressure | None] por navegador)
+        em_uso: Função () -> bool; True adia o ajuste (ex.: CommandEngine.em_uso)
+        intervalo: Intervalo do laço de ajuste em segundo plano (s)
+    """
+
+    def __init__(
+        self,
+        pool,
+        navegadores_config,
+        performance_config=None,
+        medidor=None,
+        memoria_disponivel=None,
+        minimo=2,
+        maximo=None,
+        nucleos=None,
+        pressao=None,
+        em_uso=None,
+        intervalo=INTERVALO_AJUSTE_S
+    ):
+        self.pool = pool
+        self.navegadores_config = navegadores_config
+        self.performance_config = performance_config
+        self.medidor = medidor or medir_frota
+        self.memoria_disponivel = memoria_disponivel or _memoria_disponivel
+        self.minimo = minimo
+        self.maximo = maximo
+        self.nucleos = nucleos or os.cpu_count()
+        self.pressao = pressao
+        self.em_uso = em_uso
+        self.intervalo = intervalo
+        self.rss_por_navegador = None
+        self.cpu_por_navegador = None
+        self._ultima_medicao = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def medir(self):
+        """Atualiza o consumo médio por navegador a partir dos ativos."""
+        self._ultima_medicao = time.monotonic()
+        medidas = [m for m in self.medidor(list(self.pool.ativos)) if m]
+        if not medidas:
+            return False
+        self.rss_por_navegador = statistics.median(rss for rss, _ in medidas)
+        self.cpu_por_navegador = statistics.median(cpu for _, cpu in medidas)
+        logger.info(
+            f"[Frota] Consumo por navegador: {self.rss_por_navegador / 1024 ** 2:.0f}MB RSS, "
+            f"{self.cpu_por_navegador:.2f} núcleos"
+        )
+        return True
+
+    def alvo(self):
+        """Tamanho ideal da frota com a memória livre mais a já ocupada pelos ativos."""
+        rss = self.rss_por_navegador or MEMORIA_POR_INSTANCIA_PADRAO
+        orcamento = self.memoria_disponivel() + rss * len(self.pool.ativos)
+        alvo = calcular_num_instancias(rss, self.cpu_por_navegador, orcamento, self.minimo, self.nucleos)
+        if self.maximo is not None:
+            alvo = min(alvo, self.maximo)
+        return self._limitar_por_pressao(alvo)
+
+    def _limitar_por_pressao(self, alvo):
+        """Aplica o PSI da frota ao alvo (sem fonte de PSI, o alvo fica como está)."""
+        if self.pressao is None:
+            return alvo
+        frota, por_navegador = self.pressao()
+        if frota is None:
+            return alvo
+        atual = len(self.pool.ativos)
+        isolados = [
+            index for index, pressao in enumerate(por_navegador)
+            if pressao is not None and pressao.memory_some >= PSI_NAVEGADOR_LIMITE
+        ]
+        for index in isolados:
+            logger.warning(
+                f"[Frota] Navegador {index + 1} sob pressão no próprio cgroup ({por_navegador[index].describe()})."
+            )
+        medidos = sum(pressao is not None for pressao in por_navegador)
+        # Pressão concentrada em poucos navegadores é contida pelos cgroups deles; só a espalhada encolhe a frota
+        contida = bool(isolados) and len(isolados) * 2 < medidos
+        if frota.memory_some >= PSI_MEMORIA_LIMITE and not contida and atual > self.minimo:
+            logger.warning(f"[Frota] PSI de memória em {frota.memory_some:.1f}%: encolhendo para {atual - 1}.")
+            return min(alvo, atual - 1)
+        if frota.cpu_some >= PSI_CPU_LIMITE and alvo > atual:
+            logger.info(f"[Frota] PSI de CPU em {frota.cpu_some:.1f}%: frota mantida em {atual}.")
+            return atual
+        return alvo
+
+    def _aplicar(self, alvo, passo=None):
+        atual = len(self.pool.ativos)
+        if alvo > atual:
+            quantidade = alvo - atual if passo is None else min(alvo - atual, passo)
+            adicionados = self.pool.crescer(quantidade)
+            logger.info(f"[Frota] +{adicionados} navegador(es) (alvo {alvo}).")
+        elif alvo < atual:
+            removidos = self.pool.encolher(atual - alvo)
+            logger.warning(f"[Frota] Pressão de memória: -{removidos} navegador(es) (alvo {alvo}).")
+        self._sincronizar_config()
+        return len(self.pool.ativos)
+
+    def _sincronizar_config(self):
+        """Mantém navegadores_config e PERFORMANCE_CONFIG (núcleos e RSS medido) do tamanho da frota."""
+        tamanho = len(self.pool.ativos)
+        for index in range(tamanho):
+            self.navegadores_config.setdefault(index, {"link": None, "xpaths": []})
+        for index in [i for i in self.navegadores_config if i >= tamanho]:
+            del self.navegadores_config[index]
+
+        if self.performance_config is not None and tamanho:
+            self.performance_config['cores_por_instancia'] = max(2, (self.nucleos - 2) // tamanho)
+            if self.rss_por_navegador:
+                # Medido à parte: memoria_por_instancia é o orçamento configurado (base dos cgroups)
+                self.performance_config['rss_por_instancia'] = f"{math.ceil(self.rss_por_navegador / 1024 ** 2)}M"
+
+    def dimensionar(self):
+        """Dimensionamento inicial: mede os navegadores abertos e vai direto ao alvo."""
+        self.medir()
+        return self._aplicar(self.alvo())
+
+    def _ocupada(self):
+        return self.em_uso is not None and self.em_uso()
+
+    def ajustar(self):
+        """Ajuste em tempo de execução: encolhe na hora, cresce aos poucos."""
+        if self._ultima_medicao is None or time.monotonic() - self._ultima_medicao >= INTERVALO_MEDICAO_S:
+            self.medir()
+        if self._ocupada():
+            # Um comando começou durante a medição: não mexe na frota agora
+            return len(self.pool.ativos)
+        return self._aplicar(self.alvo(), passo=PASSO_CRESCIMENTO)
+
+    def iniciar(self) -> 'FleetScaler':
+        """Inicia o ajuste periódico em segundo plano."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="frota", daemon=True)
+            self._thread.start()
+            logger.info(f"[Frota] Ajuste em segundo plano iniciado (intervalo {self.intervalo:.1f}s).")
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.intervalo):
+            if self._ocupada():
+                # Comando ou clique em andamento: tenta de novo na próxima volta
+                continue
+            try:
+                self.ajustar()
+            except Exception as e:
+                logger.error(f"[Frota] Erro no ajuste da frota: {e}")
+
+    def parar(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            # Uma abertura de navegador em andamento termina antes
+            self._thread.join()
@@ -1,21 +1,32 @@
 from .inicializador import abrir_navegador
 from .operacoes import verificar_e_restaurar_sessao
 from log_config import get_logger
-import time
 
 logger = get_logger(__name__)
 
+# Pool de navegadores com reservas quentes (registrado na inicialização)
+_pool = None
+
+def configurar_pool(pool):
+    """Registra o pool usado para substituir navegadores com sessão perdida."""
+    global _pool
+    _pool = pool
+
 def reiniciar_navegador(driver, index):
-    """Reinicia o navegador de forma segura."""
+    """Reinicia o navegador de forma segura (usa uma reserva do pool, se houver)."""
     try:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
-            time.sleep(1)
-            
-        novo_driver = abrir_navegador(index)
+        if _pool is not None:
+            novo_driver = _pool.substituir(index, driver)
+            if novo_driver is None:
+                raise RuntimeError("pool sem navegador disponível")
+        else:
+            if driver:
+                try:
+                    driver.quit()
+                except:
+                    pass
+            novo_driver = abrir_navegador(index)
+
         logger.info(f"[Navegador {index + 1}] Reiniciado com sucesso.")
         return novo_driver
     except Exception as e:
@@ -6,10 +6,39 @@ import time
 
 logger = get_logger(__name__)
 
-def abrir_navegador(index=0, max_retries=3):
-    """Abre navegador com proteções anti-detecção e garantia de conexão."""
+# Prazo para a página inicial ficar pronta após a abertura
+READY_TIMEOUT_S = 10.0
+# Intervalo de polling do estado do documento
+READY_POLL_S = 0.05
+# Espera base entre tentativas de abertura (dobra a cada falha)
+RETRY_BACKOFF_S = 0.25
+
+def aguardar_pronto(driver, timeout=READY_TIMEOUT_S):
+    """Aguarda (por polling) o documento atual terminar de carregar."""
+    limite = time.monotonic() + timeout
+    while True:
+        try:
+            if driver.execute_script("return document.readyState") == "complete":
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= limite:
+            return False
+        time.sleep(READY_POLL_S)
+
+def abrir_navegador(index=0, max_retries=3, tempos=None):
+    """
+    Abre navegador com proteções anti-detecção e garantia de conexão.
+
+    Args:
+        index: Índice do navegador (apenas para logs)
+        max_retries: Número de tentativas
+        tempos: Dicionário opcional que recebe a duração (s) de cada fase da abertura
+    """
+    tempos = tempos if tempos is not None else {}
     for attempt in range(max_retries):
         try:
+            inicio = time.perf_counter()
             options = Options()
             
             # Configurações críticas
@@ -31,31 +60,39 @@ def abrir_navegador(index=0, max_retries=3):
             perfil = criar_perfil_navegador()
             options.add_argument(f"user-agent={perfil['user_agent']}")
             
-            # Inicialização do driver
+            # Inicialização do driver (spawn do chromedriver + sessão)
             driver = Chrome(
                 options=options,
                 driver_executable_path="/usr/local/bin/chromedriver"
             )
-            
+            tempos['spawn'] = time.perf_counter() - inicio
+
+            # Verifica conexão
+            fase = time.perf_counter()
+            driver.execute_script("return navigator.userAgent")
+            tempos['primeiro_script'] = time.perf_counter() - fase
+
             # Configuração básica
+            fase = time.perf_counter()
             largura, altura = perfil['resolution']
             driver.set_window_size(largura, altura)
-            
-            # Verifica conexão
-            driver.execute_script("return navigator.userAgent")
-            
+            tempos['janela'] = time.perf_counter() - fase
+
             # Configurações adicionais após conexão estabelecida
             driver.set_page_load_timeout(30)
             driver.implicitly_wait(10)
-            
-            # Importante: Aguarda estabilização
-            time.sleep(1)
-            
-            logger.info(f"Navegador {index + 1} aberto com sucesso.")
+
+            # Estabilização por polling em vez de pausa fixa
+            fase = time.perf_counter()
+            aguardar_pronto(driver)
+            tempos['pronto'] = time.perf_counter() - fase
+            tempos['total'] = time.perf_counter() - inicio
+
+            logger.info(f"Navegador {index + 1} aberto com sucesso em {tempos['total']:.2f}s.")
             return driver
             
         except Exception as e:
             logger.error(f"Tentativa {attempt + 1} falhou ao abrir navegador {index}: {e}")
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2)
\ No newline at end of file
+            time.sleep(RETRY_BACKOFF_S * 2 ** attempt)
\ No newline at end of file
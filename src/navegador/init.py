@@ -1,6 +1,7 @@
 from .inicializador import abrir_navegador
 from .operacoes import verificar_e_restaurar_sessao, localizar_elementos_em_abas, clicar_elementos_em_navegador
-from .gerenciador import reiniciar_navegador, fechar_todos_navegadores
+from .gerenciador import reiniciar_navegador, fechar_todos_navegadores, configurar_pool
+from .pool_navegadores import BrowserPool
 
 __all__ = [
     'abrir_navegador',
@@ -8,5 +9,7 @@ __all__ = [
     'localizar_elementos_em_abas',
     'clicar_elementos_em_navegador',
     'reiniciar_navegador',
-    'fechar_todos_navegadores'
+    'fechar_todos_navegadores',
+    'configurar_pool',
+    'BrowserPool'
 ]
\ No newline at end of file
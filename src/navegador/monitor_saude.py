@@ -0,0 +1,245 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+from .operacoes import SCRIPT_SEM_ANIMACOES
+from .frota import processos_do_navegador, rss_total, tempo_cpu
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Intervalo entre rodadas de verificação
+INTERVALO_MONITOR_S = 1.0
+# Prazo de resposta de um ping
+PING_TIMEOUT_S = 2.0
+# Pings com erro seguidos antes de substituir o navegador (pings sem resposta não contam)
+FALHAS_PARA_REINICIAR = 2
+
+@dataclass
+class SaudeNavegador:
+    """Último estado conhecido de um navegador."""
+    driver_id: int
+    pronto: bool = False
+    url: Optional[str] = None
+    ultimo_ping: float = 0.0
+    latencia_ms: Optional[float] = None
+    falhas: int = 0
+    rss: Optional[int] = None
+    cpu: Optional[float] = None
+    _cpu_total: Optional[float] = None
+    _cpu_instante: Optional[float] = None
+
+class HealthMonitor:
+    """
+    Monitor de saúde em segundo plano para os navegadores ativos.
+
+    A cada rodada faz um ping barato em todos os drivers (em paralelo), que
+    também mantém as animações desativadas e devolve a URL atual, mede
+    RSS/CPU da árvore de processos de cada navegador e atualiza o bitmap de
+    prontos. Navegadores com pings que falham seguidamente (ou acima do
+    limite de RSS) são substituídos antes do próximo comando.
+
+    Um ping sem resposta no prazo não conta como falha: o chromedriver
+    serializa os comandos da sessão, então o ping pode só estar atrás de um
+    driver.get lento. O navegador fica fora dos prontos e não recebe outro
+    ping até o anterior voltar. Navegadores com comando em andamento não são
+    pingados, e a rodada inteira é pulada durante a janela de clique.
+
+    Args:
+        drivers: Lista de drivers ativos (ex.: config.drivers), lida a cada rodada
+        pool: BrowserPool usado para substituir navegadores doentes (opcional)
+        intervalo: Intervalo entre rodadas (s)
+        limite_rss: RSS máximo (bytes) por navegador antes de reiniciar (None = sem limite)
+        ocupados: Função () -> índices com comando em andamento (ex.: CommandEngine.ocupados)
+        pausado: Função () -> bool; True pula a rodada (ex.: CommandEngine.em_clique)
+    """
+
+    def __init__(self, drivers: List, pool=None, intervalo: float = INTERVALO_MONITOR_S, limite_rss: Optional[int] = None,
+                 ocupados: Optional[Callable[[], Set[int]]] = None, pausado: Optional[Callable[[], bool]] = None):
+        self.drivers = drivers
+        self.pool = pool
+        self.intervalo = intervalo
+        self.limite_rss = limite_rss
+        self.ocupados = ocupados
+        self.pausado = pausado
+        # Ping ainda sem resposta por índice (não é enviado outro enquanto isso)
+        self._pendentes: Dict[int, object] = {}
+        self.estados: Dict[int, SaudeNavegador] = {}
+        self.bitmap = 0
+        self.reinicios = 0
+        self._executor = None
+        self._max_workers = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def iniciar(self) -> 'HealthMonitor':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="monitor-saude", daemon=True)
+            self._thread.start()
+            logger.info(f"[Saúde] Monitor iniciado (intervalo {self.intervalo:.1f}s).")
+        return self
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.verificar()
+            except Exception as e:
+                logger.error(f"[Saúde] Erro na rodada de verificação: {e}")
+            if self._stop.wait(self.intervalo):
+                break
+
+    def _ping(self, driver):
+        inicio = time.perf_counter()
+        url, _ = driver.execute_script(SCRIPT_SEM_ANIMACOES)
+        return url, (time.perf_counter() - inicio) * 1000
+
+    def _medir(self, estado: SaudeNavegador, driver) -> None:
+        processos = processos_do_navegador(driver)
+        if not processos:
+            return
+        agora = time.monotonic()
+        total = tempo_cpu(processos)
+        if estado._cpu_total is not None and agora > estado._cpu_instante:
+            estado.cpu = max(0.0, (total - estado._cpu_total) / (agora - estado._cpu_instante))
+        estado._cpu_total, estado._cpu_instante = total, agora
+        estado.rss = rss_total(processos)
+
+    def _pausado(self) -> bool:
+        return self.pausado is not None and self.pausado()
+
+    def verificar(self) -> int:
+        """Executa uma rodada de verificação; retorna o bitmap de prontos."""
+        drivers = list(self.drivers)
+        if not drivers:
+            self.bitmap = 0
+            return 0
+        if self._pausado():
+            # Janela de clique: nenhum ping entre a armação e o disparo
+            return self.bitmap
+
+        if self._executor is None or self._max_workers < len(drivers):
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._max_workers = len(drivers)
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="monitor-ping")
+
+        ocupados = self.ocupados() if self.ocupados is not None else set()
+        futures = []
+        tardios = {}
+        for index, driver in enumerate(drivers):
+            pendente = self._pendentes.get(index)
+            if pendente is not None and (pendente[0] != id(driver) or pendente[1].done()):
+                # O ping atrasado voltou (ou o driver mudou); só um erro dele conta como falha
+                del self._pendentes[index]
+                if pendente[0] == id(driver) and pendente[1].exception() is not None:
+                    tardios[index] = pendente[1].exception()
+                pendente = None
+            if driver is None or pendente is not None or index in ocupados or self._pausado():
+                futures.append(None)
+                continue
+            futures.append(self._executor.submit(self._ping, driver))
+
+        prazo = time.monotonic() + PING_TIMEOUT_S
+        bitmap = 0
+        doentes = []
+        for index, (driver, future) in enumerate(zip(drivers, futures)):
+            estado = self.estados.get(index)
+            if estado is None or estado.driver_id != id(driver):
+                estado = self.estados[index] = SaudeNavegador(driver_id=id(driver))
+
+            if index in tardios:
+                estado.falhas += 1
+                logger.warning(f"[Saúde] Navegador {index + 1} com sessão inválida: {tardios[index]}")
+
+            if driver is not None and future is None:
+                if index in self._pendentes:
+                    # Ainda preso no ping anterior: fora dos prontos, sem contar falha
+                    estado.pronto = False
+                # Ocupado (ou rodada pausada): mantém o último estado conhecido
+                if estado.pronto:
+                    bitmap |= 1 << index
+                elif estado.falhas >= FALHAS_PARA_REINICIAR and index not in ocupados:
+                    doentes.append((index, driver))
+                continue
+
+            try:
+                if future is None:
+                    raise RuntimeError("driver inexistente")
+                estado.url, estado.latencia_ms = future.result(timeout=max(0.0, prazo - time.monotonic()))
+                estado.pronto = True
+                estado.falhas = 0
+            except FuturesTimeoutError:
+                estado.pronto = False
+                self._pendentes[index] = (id(driver), future)
+                logger.warning(f"[Saúde] Navegador {index + 1} não respondeu em {PING_TIMEOUT_S:.1f}s.")
+            except Exception as e:
+                estado.pronto = False
+                estado.falhas += 1
+                logger.warning(f"[Saúde] Navegador {index + 1} com sessão inválida: {e}")
+            estado.ultimo_ping = time.monotonic()
+
+            if driver is not None:
+                self._medir(estado, driver)
+            if self.limite_rss and estado.rss and estado.rss > self.limite_rss:
+                logger.warning(f"[Saúde] Navegador {index + 1} acima do limite de memória ({estado.rss / 1024 ** 2:.0f}MB).")
+                estado.pronto = False
+                estado.falhas = FALHAS_PARA_REINICIAR
+
+            if estado.pronto:
+                bitmap |= 1 << index
+            elif estado.falhas >= FALHAS_PARA_REINICIAR:
+                doentes.append((index, driver))
+
+        # Remove estados de navegadores que saíram da frota
+        for index in [i for i in self.estados if i >= len(drivers)]:
+            del self.estados[index]
+        for index in [i for i in self._pendentes if i >= len(drivers)]:
+            del self._pendentes[index]
+        self.bitmap = bitmap
+
+        for index, driver in doentes:
+            if self._pausado():
+                # Substituição adiada: uma janela de clique começou durante a rodada
+                break
+            self._reiniciar(index, driver)
+        return self.bitmap
+
+    def _reiniciar(self, index: int, driver) -> None:
+        """Substitui um navegador doente antes que um comando precise dele."""
+        if self.pool is None:
+            return
+        novo = self.pool.substituir(index, driver)
+        if novo is None and index >= len(self.drivers):
+            # A frota encolheu durante a troca; o navegador novo ficou como reserva
+            self.estados.pop(index, None)
+            return
+        if novo is None:
+            logger.error(f"[Saúde] Não foi possível substituir o navegador {index + 1}.")
+            return
+        self.reinicios += 1
+        self.estados.pop(index, None)
+        logger.info(f"[Saúde] Navegador {index + 1} substituído proativamente.")
+
+    def pronto(self, index: int) -> bool:
+        return bool(self.bitmap >> index & 1)
+
+    def indices_prontos(self) -> List[int]:
+        return [index for index in range(len(self.drivers)) if self.pronto(index)]
+
+    def estado_recente(self, index: int, driver) -> Optional[SaudeNavegador]:
+        """Estado do navegador se for do mesmo driver e recente o bastante para dispensar um ping."""
+        estado = self.estados.get(index)
+        if estado is None or estado.driver_id != id(driver):
+            return None
+        if time.monotonic() - estado.ultimo_ping > 2 * self.intervalo + PING_TIMEOUT_S:
+            return None
+        return estado
+
+    def parar(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=PING_TIMEOUT_S + self.intervalo)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
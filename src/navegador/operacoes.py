@@ -1,12 +1,28 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from log_config import get_logger
+from src.click_manager.element_cache import element_cache
 
 logger = get_logger(__name__)
 
-def verificar_e_restaurar_sessao(driver, index):
-    """Verifica se o navegador está ativo e tenta restaurar a sessão se necessário."""
+# Desativa animações uma única vez por página: o <style> com id marca a página
+# como preparada. Retorna [URL atual, estilo injetado agora?]
+SCRIPT_SEM_ANIMACOES = """
+if (document.getElementById('clique-sem-animacoes')) {
+    return [location.href, false];
+}
+const style = document.createElement('style');
+style.id = 'clique-sem-animacoes';
+style.textContent = '* { animation: none !important; transition: none !important; }';
+(document.head || document.documentElement).appendChild(style);
+return [location.href, true];
+"""
+
+def preparar_sessao(driver, index):
+    """
+    Verifica a sessão e desativa animações em um único round-trip.
+
+    Returns:
+        URL atual do navegador, ou None se a sessão não estiver operacional
+    """
     logger.info(f"[Sessão] Verificando sessão para o navegador {index + 1}...")
     try:
         if driver.session_id is None:
@@ -14,15 +30,19 @@ def verificar_e_restaurar_sessao(driver, index):
             driver.execute_script("window.open('');")
             driver.switch_to.window(driver.window_handles[-1])
             logger.info(f"[Sessão] Recuperação bem-sucedida no navegador {index + 1}.")
-            desativar_animacoes_e_transicoes(driver, index)
-            return True
-        driver.title
+
+        url, injetado = driver.execute_script(SCRIPT_SEM_ANIMACOES)
+        if injetado:
+            logger.info(f"[Navegador {index + 1}] Animações e transições desativadas.")
         logger.info(f"[Sessão] Sessão ativa no navegador {index + 1}.")
-        desativar_animacoes_e_transicoes(driver, index)
-        return True
+        return url
     except Exception as e:
         logger.error(f"[Sessão] Falha ao verificar ou restaurar sessão no navegador {index + 1}: {e}")
-        return False
+        return None
+
+def verificar_e_restaurar_sessao(driver, index):
+    """Verifica se o navegador está ativo e tenta restaurar a sessão se necessário."""
+    return preparar_sessao(driver, index) is not None
 
 def localizar_elementos_em_abas(driver, index, xpaths):
     """Localiza elementos nos navegadores usando XPaths configurados."""
@@ -33,19 +53,21 @@ def localizar_elementos_em_abas(driver, index, xpaths):
     encontrados = []
     logger.info(f"[Navegador {index + 1}] Iniciando localização de elementos com {len(xpaths)} XPaths...")
 
-    for xpath in xpaths:
-        try:
-            elemento = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
-            )
-            if elemento and elemento.tag_name.lower() in {"button", "input", "div"}:
-                encontrados.append((xpath, elemento))
-                logger.info(f"[Navegador {index + 1}] Elemento interativo encontrado: {xpath}")
-            else:
-                logger.info(f"[Navegador {index + 1}] Elemento encontrado, mas não é considerado interativo: {xpath}")
+    # Todos os XPaths em lote; handles ficam no cache para o comando click reutilizar
+    falhas = {}
+    resultados = element_cache.lookup(driver, xpaths, interactable=False, errors=falhas)
 
-        except Exception as e:
-            logger.warning(f"[Navegador {index + 1}] Falha ao localizar elemento para XPath '{xpath}': {e}")
+    for xpath, resultado in zip(xpaths, resultados):
+        if resultado is None:
+            logger.warning(f"[Navegador {index + 1}] Falha ao localizar elemento para XPath '{xpath}': {falhas.get(xpath)}")
+            continue
+
+        elemento, tag = resultado
+        if tag in {"button", "input", "div"}:
+            encontrados.append((xpath, elemento))
+            logger.info(f"[Navegador {index + 1}] Elemento interativo encontrado: {xpath}")
+        else:
+            logger.info(f"[Navegador {index + 1}] Elemento encontrado, mas não é considerado interativo: {xpath}")
 
     logger.info(f"[Navegador {index + 1}] Total de elementos interativos localizados: {len(encontrados)}")
     return encontrados
@@ -63,7 +85,7 @@ def clicar_elementos_em_navegador(driver, elementos, index):
         if clicou_botao:
             break
         try:
-            elemento = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+            elemento = element_cache.get(driver, xpath)
             driver.execute_script("arguments[0].click();", elemento)
             logger.info(f"[Navegador {index + 1}] Botão clicado com sucesso: {xpath}")
             clicou_botao = True
@@ -76,12 +98,8 @@ def clicar_elementos_em_navegador(driver, elementos, index):
 def desativar_animacoes_e_transicoes(driver, index):
     """Desativa animações e transições CSS no navegador."""
     try:
-        driver.execute_script("""
-            var style = document.createElement('style');
-            style.type = 'text/css';
-            style.innerHTML = '* { animation: none !important; transition: none !important; }';
-            document.head.appendChild(style);
-        """)
-        logger.info(f"[Navegador {index + 1}] Animações e transições desativadas.")
+        _, injetado = driver.execute_script(SCRIPT_SEM_ANIMACOES)
+        if injetado:
+            logger.info(f"[Navegador {index + 1}] Animações e transições desativadas.")
     except Exception as e:
         logger.warning(f"[Navegador {index + 1}] Falha ao desativar animações e transições: {e}")
\ No newline at end of file
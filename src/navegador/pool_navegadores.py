@@ -0,0 +1,289 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Navegadores reserva mantidos abertos por padrão
+NUM_RESERVAS_PADRAO = 1
+# Aberturas de Chrome em andamento ao mesmo tempo
+MAX_ABERTURAS_SIMULTANEAS = 4
+# Intervalo mínimo entre o início de duas aberturas
+INTERVALO_ABERTURA_S = 0.25
+
+def sessao_ativa(driver):
+    """Verificação rápida (um round-trip) de que a sessão ainda responde."""
+    if driver is None or not getattr(driver, 'session_id', None):
+        return False
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+def abrir_navegador_padrao(index, tempos):
+    """Fábrica padrão: Chrome via undetected_chromedriver."""
+    # Import tardio: fábricas alternativas não dependem do undetected_chromedriver
+    from .inicializador import abrir_navegador
+    return abrir_navegador(index, tempos=tempos)
+
+def _encerrar_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class BrowserPool:
+    """
+    Pool de navegadores: N ativos + K reservas já abertas ("quentes").
+
+    Quando a sessão de um ativo morre, uma reserva assume o lugar na hora
+    e uma nova reserva é aberta em segundo plano.
+
+    Args:
+        num_ativos: Navegadores em uso pelos comandos
+        num_reservas: Navegadores reserva mantidos abertos
+        fabrica: Função (index, tempos) -> driver usada para abrir navegadores
+        max_aberturas: Aberturas simultâneas permitidas
+        intervalo_abertura_s: Escalonamento entre o início das aberturas
+    """
+
+    def __init__(
+        self,
+        num_ativos,
+        num_reservas=NUM_RESERVAS_PADRAO,
+        fabrica=None,
+        max_aberturas=MAX_ABERTURAS_SIMULTANEAS,
+        intervalo_abertura_s=INTERVALO_ABERTURA_S
+    ):
+        self.num_ativos = num_ativos
+        self.num_reservas = num_reservas
+        self.fabrica = fabrica or abrir_navegador_padrao
+        self.intervalo_abertura_s = intervalo_abertura_s
+        self._aberturas = threading.BoundedSemaphore(max(1, max_aberturas))
+        self._proxima_abertura = 0.0
+        self.ativos = []
+        self.reservas = []
+        # Tempos por fase de cada abertura (spawn, primeiro_script, janela, pronto, total)
+        self.tempos = []
+        self._lock = threading.Lock()
+        self._repondo = 0
+        self._proximo_indice = 0
+        # Chamadas com cada driver que sai dos ativos (ex.: descartar estado guardado por id(driver))
+        self.ao_descartar = []
+
+    def _aguardar_vez(self):
+        """Escalona o início das aberturas para não disparar todos os Chromes juntos."""
+        with self._lock:
+            inicio = max(time.monotonic(), self._proxima_abertura)
+            self._proxima_abertura = inicio + self.intervalo_abertura_s
+        espera = inicio - time.monotonic()
+        if espera > 0:
+            time.sleep(espera)
+
+    def _abrir(self, index):
+        """Abre um navegador registrando os tempos de cada fase."""
+        tempos = {}
+        try:
+            with self._aberturas:
+                self._aguardar_vez()
+                driver = self.fabrica(index, tempos)
+        except Exception as e:
+            logger.error(f"[Pool] Falha ao abrir navegador {index + 1}: {e}")
+            return None
+        with self._lock:
+            self.tempos.append(tempos)
+        return driver
+
+    def _descartar(self, driver):
+        """Avisa os interessados e fecha um driver que saiu dos ativos."""
+        for funcao in self.ao_descartar:
+            try:
+                funcao(driver)
+            except Exception as e:
+                logger.error(f"[Pool] Erro ao descartar estado de um navegador: {e}")
+        _encerrar_driver(driver)
+
+    def _novo_indice(self):
+        with self._lock:
+            index = self._proximo_indice
+            self._proximo_indice += 1
+            return index
+
+    def iniciar(self, destino=None):
+        """
+        Abre ativos e reservas em paralelo.
+
+        Args:
+            destino: Lista preenchida (no lugar) com os ativos, ex.: config.drivers;
+                substituições posteriores também são feitas nela
+
+        Returns:
+            Lista de navegadores ativos
+        """
+        total = self.num_ativos + self.num_reservas
+        with ThreadPoolExecutor(max_workers=max(1, total), thread_name_prefix="pool-abertura") as executor:
+            abertos = [d for d in executor.map(self._abrir, [self._novo_indice() for _ in range(total)]) if d]
+
+        self.ativos = destino if destino is not None else []
+        self.ativos[:] = abertos[:self.num_ativos]
+        self.reservas = abertos[self.num_ativos:]
+        logger.info(f"[Pool] {len(self.ativos)} navegadores ativos e {len(self.reservas)} reservas prontos.")
+        self.registrar_tempos()
+        return self.ativos
+
+    def _repor_reserva(self):
+        """Abre uma reserva em segundo plano."""
+        driver = self._abrir(self._novo_indice())
+        with self._lock:
+            self._repondo -= 1
+            if driver is not None:
+                self.reservas.append(driver)
+        if driver is not None:
+            logger.info(f"[Pool] Reserva reposta ({len(self.reservas)} disponíveis).")
+
+    def _agendar_reposicao(self):
+        with self._lock:
+            faltam = self.num_reservas - len(self.reservas) - self._repondo
+            self._repondo += max(0, faltam)
+        for _ in range(max(0, faltam)):
+            threading.Thread(target=self._repor_reserva, name="pool-reserva", daemon=True).start()
+
+    def _obter_reserva(self):
+        """Retira a primeira reserva com sessão viva."""
+        while True:
+            with self._lock:
+                if not self.reservas:
+                    return None
+                driver = self.reservas.pop(0)
+            if sessao_ativa(driver):
+                return driver
+            threading.Thread(target=_encerrar_driver, args=(driver,), daemon=True).start()
+
+    def substituir(self, index, driver_antigo=None):
+        """
+        Substitui o navegador ativo `index` por uma reserva (ou por um novo, se não houver).
+
+        A troca é feita sob o lock do pool, pois a frota pode crescer ou
+        encolher em outra thread durante a abertura: se o slot sumiu, o
+        navegador novo volta para as reservas; se outra thread já trocou o
+        `driver_antigo`, prevalece a troca dela.
+
+        Returns:
+            O driver ativo no slot `index` após a troca, ou None se não foi
+            possível abrir um navegador ou o slot não existe mais
+        """
+        novo = self._obter_reserva()
+        if novo is not None:
+            logger.info(f"[Pool] Navegador {index + 1} substituído por reserva quente.")
+        else:
+            logger.warning(f"[Pool] Sem reservas; abrindo navegador {index + 1} a frio.")
+            novo = self._abrir(index)
+        if novo is None:
+            self._agendar_reposicao()
+            return None
+
+        encerrar = None
+        with self._lock:
+            if index >= len(self.ativos):
+                # A frota encolheu durante a abertura (o antigo já foi fechado por encolher)
+                self.reservas.insert(0, novo)
+                atual = None
+            elif driver_antigo is not None and self.ativos[index] is not driver_antigo:
+                # Slot já trocado por outra thread
+                self.reservas.insert(0, novo)
+                atual = self.ativos[index]
+            else:
+                encerrar = self.ativos[index] if driver_antigo is not None else None
+                self.ativos[index] = novo
+                atual = novo
+        if atual is not novo:
+            logger.info(f"[Pool] Navegador {index + 1} já trocado ou removido; novo navegador mantido como reserva.")
+        if encerrar is not None:
+            threading.Thread(target=self._descartar, args=(encerrar,), daemon=True).start()
+        self._agendar_reposicao()
+        return atual
+
+    def crescer(self, quantidade):
+        """
+        Adiciona navegadores ativos (reservas primeiro, depois aberturas escalonadas).
+
+        Returns:
+            Número de navegadores efetivamente adicionados
+        """
+        novos = []
+        while len(novos) < quantidade:
+            driver = self._obter_reserva()
+            if driver is None:
+                break
+            novos.append(driver)
+
+        faltam = quantidade - len(novos)
+        if faltam > 0:
+            indices = [self._novo_indice() for _ in range(faltam)]
+            with ThreadPoolExecutor(max_workers=faltam, thread_name_prefix="pool-abertura") as executor:
+                novos.extend(d for d in executor.map(self._abrir, indices) if d)
+
+        with self._lock:
+            self.ativos.extend(novos)
+            self.num_ativos = len(self.ativos)
+        self._agendar_reposicao()
+        return len(novos)
+
+    def encolher(self, quantidade):
+        """Fecha os últimos `quantidade` navegadores ativos; retorna quantos foram fechados."""
+        removidos = []
+        with self._lock:
+            for _ in range(min(quantidade, len(self.ativos))):
+                removidos.append(self.ativos.pop())
+            self.num_ativos = len(self.ativos)
+        for driver in removidos:
+            self._descartar(driver)
+        return len(removidos)
+
+    def verificar_ativos(self):
+        """Troca por reservas os ativos cuja sessão morreu; retorna os índices trocados."""
+        with self._lock:
+            ativos = list(self.ativos)
+        with ThreadPoolExecutor(max_workers=max(1, len(ativos)), thread_name_prefix="pool-ping") as executor:
+            vivos = list(executor.map(sessao_ativa, ativos))
+
+        trocados = []
+        for index, vivo in enumerate(vivos):
+            if not vivo:
+                logger.warning(f"[Pool] Sessão do navegador {index + 1} perdida.")
+                if self.substituir(index, ativos[index]) is not None:
+                    trocados.append(index)
+        return trocados
+
+    def resumo_tempos(self):
+        """Mediana e máximo (s) de cada fase de abertura registrada."""
+        with self._lock:
+            tempos = list(self.tempos)
+        fases = {}
+        for registro in tempos:
+            for fase, duracao in registro.items():
+                fases.setdefault(fase, []).append(duracao)
+        return {
+            fase: {'mediana': statistics.median(valores), 'max': max(valores), 'n': len(valores)}
+            for fase, valores in fases.items()
+        }
+
+    def registrar_tempos(self):
+        """Loga onde o tempo de abertura foi gasto."""
+        for fase, valores in self.resumo_tempos().items():
+            logger.info(
+                f"[Pool] ⏱️ Fase {fase}: mediana {valores['mediana']:.3f}s, "
+                f"máx {valores['max']:.3f}s ({valores['n']} aberturas)"
+            )
+
+    def encerrar(self):
+        """Fecha ativos e reservas."""
+        with self._lock:
+            todos = self.ativos + self.reservas
+            self.ativos.clear()
+            self.reservas = []
+        for driver in todos:
+            _encerrar_driver(driver)
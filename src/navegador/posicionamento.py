@@ -0,0 +1,240 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import psutil
+from .frota import processos_do_navegador
+from src.sistema.cgroup_v2 import ResourcePressure, parse_size, system_pressure
+from src.sistema.cpu_manager import CPUManager
+from src.sistema.cpu_topology import format_cpu_list
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Intervalo entre varreduras das árvores de processos (renderers novos)
+INTERVALO_POSICIONAMENTO_S = 2.0
+# nice aplicado aos processos dos navegadores (None = não altera)
+NICE_NAVEGADOR = -5
+# Nível de I/O best-effort dos navegadores (0 = mais alto da classe; None = não altera)
+IOPRIO_NIVEL_NAVEGADOR = 0
+# memory.high de cada navegador em múltiplos do orçamento por navegador (throttle antes do limite)
+FOLGA_MEMORIA_ALTA = 1.5
+# memory.max de cada navegador em múltiplos do orçamento por navegador (OOM só dentro do grupo)
+FOLGA_MEMORIA_MAX = 2.5
+
+@dataclass
+class PosicaoNavegador:
+    """Posicionamento aplicado à árvore de processos de um navegador."""
+    driver_id: int
+    cpus: Set[int]
+    worker_cpu: Optional[int]
+    grupo: Optional[str] = None
+    pids: Set[int] = field(default_factory=set)
+    limites: Optional[Tuple] = None
+    pressao: Optional[ResourcePressure] = None
+
+class ProcessPlacementService:
+    """
+    Fixa a árvore de processos de cada navegador (chromedriver, Chrome e
+    renderers) nas CPUs do seu slot no plano de posicionamento.
+
+    Cada rodada relê a árvore de cada driver e posiciona apenas processos
+    ainda não vistos (renderers criados por navegação), aplicando afinidade,
+    nice, prioridade de I/O e, opcionalmente, o cgroup do navegador. Drivers
+    substituídos ou frotas redimensionadas recebem um plano novo.
+
+    Com cgroups, cada navegador tem memory.high/memory.max derivados do
+    orçamento configurado em memoria_por_instancia (ou do RSS medido pelo
+    FleetScaler, se maior) e cpu.max de cores_por_instancia, reaplicados
+    quando mudam; o PSI de cada grupo é lido a cada rodada para ler_pressao().
+
+    Args:
+        drivers: Lista de drivers ativos (ex.: config.drivers), lida a cada rodada
+        cpu_manager: CPUManager com a topologia (um novo por padrão)
+        cgroups: CgroupManager para cpuset/memória/CPU por navegador (opcional)
+        memoria_max: memory.max fixo de cada navegador (ex.: '3G'; substitui a folga)
+        performance_config: PERFORMANCE_CONFIG com memoria_por_instancia, rss_por_instancia e cores_por_instancia
+        nice: nice dos processos (None não altera)
+        ioprio: Nível best-effort de I/O (None não altera)
+        intervalo: Intervalo entre rodadas (s)
+    """
+
+    def __init__(self, drivers: List, cpu_manager: Optional[CPUManager] = None, cgroups=None,
+                 memoria_max: Optional[str] = None, performance_config: Optional[Dict] = None,
+                 nice: Optional[int] = NICE_NAVEGADOR, ioprio: Optional[int] = IOPRIO_NIVEL_NAVEGADOR,
+                 intervalo: float = INTERVALO_POSICIONAMENTO_S):
+        self.drivers = drivers
+        self.cpu_manager = cpu_manager or CPUManager(logger)
+        self.cgroups = cgroups if cgroups is not None and cgroups.available else None
+        self.memoria_max = memoria_max
+        self.performance_config = performance_config or {}
+        self.nice = nice
+        self.ioprio = ioprio
+        self.intervalo = intervalo
+        # CPUs do processo principal (já sem o conjunto do sistema)
+        self.permitidas = os.sched_getaffinity(0)
+        self.estados: Dict[int, PosicaoNavegador] = {}
+        self._plano = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def iniciar(self) -> 'ProcessPlacementService':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="posicionamento", daemon=True)
+            self._thread.start()
+            logger.info(f"[Posição] Serviço iniciado (intervalo {self.intervalo:.1f}s).")
+        return self
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.aplicar()
+            except Exception as e:
+                logger.error(f"[Posição] Erro na rodada de posicionamento: {e}")
+            if self._stop.wait(self.intervalo):
+                break
+
+    def _slots(self, quantidade: int):
+        """Slots do plano para a frota atual (refeito quando o tamanho muda)."""
+        if self._plano is None or len(self._plano.slots) != quantidade:
+            self._plano = self.cpu_manager.plan_placement(quantidade, allowed=self.permitidas)
+            for linha in self._plano.describe():
+                logger.info(f"[Posição] {linha}")
+        return self._plano.slots
+
+    def _nos(self, cpus: Set[int]) -> Set[int]:
+        topologia = self.cpu_manager.topology.cpus
+        return {topologia[cpu].node for cpu in cpus if cpu in topologia}
+
+    def _novo_estado(self, index: int, driver, slot) -> PosicaoNavegador:
+        estado = PosicaoNavegador(driver_id=id(driver), cpus=set(slot.browser_cpus), worker_cpu=slot.worker_cpu)
+        if self.cgroups is not None:
+            nome = f"navegador-{index + 1}"
+            if self.cgroups.ensure_group(nome, cpus=estado.cpus, mems=self._nos(estado.cpus) or None):
+                estado.grupo = nome
+        return estado
+
+    def _limites(self) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+        """(memory.high, memory.max, cpu.max em núcleos) a partir do PERFORMANCE_CONFIG atual."""
+        # O RSS medido só aumenta o orçamento: medido em abas leves, ele estrangularia páginas reais
+        medidas = [
+            parse_size(self.performance_config.get(chave)) for chave in ('memoria_por_instancia', 'rss_por_instancia')
+        ]
+        por_instancia = max((m for m in medidas if m), default=None)
+        alta = int(por_instancia * FOLGA_MEMORIA_ALTA) if por_instancia else None
+        maxima = parse_size(self.memoria_max) if self.memoria_max else None
+        if maxima is None and por_instancia:
+            maxima = int(por_instancia * FOLGA_MEMORIA_MAX)
+        if alta is not None and maxima is not None:
+            alta = min(alta, maxima)
+        return alta, maxima, self.performance_config.get('cores_por_instancia')
+
+    def _atualizar_grupo(self, index: int, estado: PosicaoNavegador) -> None:
+        """Reaplica os limites quando mudam e lê o PSI do grupo."""
+        limites = self._limites()
+        if limites != estado.limites:
+            alta, maxima, nucleos = limites
+            if self.cgroups.ensure_group(estado.grupo, memory_high=alta, memory_max=maxima, cpu_max=nucleos):
+                estado.limites = limites
+                logger.debug(
+                    f"[Posição] Navegador {index + 1}: memory.high {alta}, memory.max {maxima}, cpu.max {nucleos}"
+                )
+        estado.pressao = self.cgroups.read_pressure(estado.grupo)
+
+    def _posicionar(self, proc: psutil.Process, estado: PosicaoNavegador) -> bool:
+        """Aplica afinidade, nice e I/O a um processo; False se ele já terminou."""
+        try:
+            proc.cpu_affinity(sorted(estado.cpus))
+        except psutil.NoSuchProcess:
+            return False
+        except (psutil.AccessDenied, OSError) as e:
+            logger.warning(f"[Posição] Afinidade negada para PID {proc.pid}: {e}")
+        if self.nice is not None:
+            try:
+                proc.nice(self.nice)
+            except psutil.NoSuchProcess:
+                return False
+            except psutil.AccessDenied:
+                logger.warning(f"[Posição] Sem permissão para nice {self.nice}; mantendo o nice atual.")
+                self.nice = None
+        if self.ioprio is not None:
+            try:
+                proc.ionice(psutil.IOPRIO_CLASS_BE, value=self.ioprio)
+            except psutil.NoSuchProcess:
+                return False
+            except (psutil.AccessDenied, OSError):
+                logger.warning("[Posição] Sem permissão para prioridade de I/O; mantendo a atual.")
+                self.ioprio = None
+        return True
+
+    def aplicar(self) -> int:
+        """Executa uma rodada de posicionamento; retorna quantos processos novos foram posicionados."""
+        with self._lock:
+            drivers = list(self.drivers)
+            slots = self._slots(len(drivers))
+            posicionados = 0
+            for index, (driver, slot) in enumerate(zip(drivers, slots)):
+                if driver is None:
+                    self._descartar(index)
+                    continue
+                estado = self.estados.get(index)
+                if estado is None or estado.driver_id != id(driver) or estado.cpus != slot.browser_cpus:
+                    self._descartar(index)
+                    estado = self.estados[index] = self._novo_estado(index, driver, slot)
+
+                processos = processos_do_navegador(driver)
+                novos = [proc for proc in processos if proc.pid not in estado.pids]
+                vivos = [proc for proc in novos if self._posicionar(proc, estado)]
+                if estado.grupo:
+                    self._atualizar_grupo(index, estado)
+                    if vivos:
+                        self.cgroups.attach(estado.grupo, [proc.pid for proc in vivos])
+                if vivos:
+                    logger.debug(
+                        f"[Posição] Navegador {index + 1}: {len(vivos)} processo(s) novo(s) "
+                        f"em CPUs {format_cpu_list(estado.cpus)}"
+                    )
+                posicionados += len(vivos)
+                estado.pids = {proc.pid for proc in processos}
+
+            for index in [i for i in self.estados if i >= len(drivers)]:
+                self._descartar(index)
+            return posicionados
+
+    def _descartar(self, index: int) -> None:
+        estado = self.estados.pop(index, None)
+        if estado is not None and estado.grupo:
+            self.cgroups.remove(estado.grupo)
+
+    def ler_pressao(self) -> Tuple[Optional[ResourcePressure], List[Optional[ResourcePressure]]]:
+        """
+        PSI da frota e de cada navegador (última rodada).
+
+        Returns:
+            (pressão da frota: grupo-base com cgroups, senão o sistema inteiro;
+             lista por navegador, None sem cgroup)
+        """
+        with self._lock:
+            frota = self.cgroups.read_pressure() if self.cgroups is not None else system_pressure()
+            quantidade = len(self.drivers)
+            por_navegador = [
+                self.estados[index].pressao if index in self.estados else None for index in range(quantidade)
+            ]
+        return frota, por_navegador
+
+    def resumo(self) -> List[str]:
+        """Uma linha por navegador: processos posicionados e CPUs."""
+        return [
+            f"Navegador {index + 1}: {len(estado.pids)} processos em CPUs {format_cpu_list(estado.cpus)}"
+            f" (worker {estado.worker_cpu}){f', cgroup {estado.grupo}' if estado.grupo else ''}"
+            f"{f' | {estado.pressao.describe()}' if estado.pressao else ''}"
+            for index, estado in sorted(self.estados.items())
+        ]
+
+    def parar(self) -> None:
+        """Para as rodadas (os cgroups só podem ser removidos depois que os navegadores fecharem)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.intervalo + 1.0)
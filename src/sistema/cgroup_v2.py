@@ -0,0 +1,243 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+from .cpu_topology import format_cpu_list
+
+# Montagem do cgroup v2 (hierarquia unificada)
+CGROUP_ROOT = "/sys/fs/cgroup"
+# Grupo-base criado para os navegadores
+CGROUP_BASE = "click_sync"
+# Controladores habilitados para os grupos filhos
+CGROUP_CONTROLLERS = ("cpu", "cpuset", "memory")
+# Período de cpu.max (µs); a cota é núcleos × período
+CPU_MAX_PERIOD_US = 100000
+# PSI do sistema inteiro (mesmo formato de memory.pressure/cpu.pressure)
+PROC_PRESSURE_ROOT = "/proc/pressure"
+# Sufixos aceitos em tamanhos de memória
+SIZE_SUFFIXES = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+def parse_size(value: Union[int, str, None]) -> Optional[int]:
+    """'2G', '512M', '1048576' ou int -> bytes; None ou 'max' -> None."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    text = value.strip().upper().rstrip("B")
+    if text in ("", "MAX"):
+        return None
+    if text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+def parse_psi(text: str) -> Dict[str, Dict[str, float]]:
+    """
+    Lê um arquivo PSI:
+
+        some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+        full avg10=0.00 avg60=0.00 avg300=0.00 total=0
+
+    Returns:
+        {"some": {"avg10": ..., "avg60": ..., "avg300": ..., "total": ...}, "full": {...}}
+    """
+    result = {}
+    for line in text.splitlines():
+        kind, *fields = line.split() or [None]
+        if not fields:
+            continue
+        result[kind] = {key: float(value) for key, value in (field.split("=", 1) for field in fields)}
+    return result
+
+@dataclass
+class ResourcePressure:
+    """
+    Pressão de um grupo (ou do sistema) nos últimos 10 s.
+
+    memory_some/memory_full/cpu_some são o avg10 do PSI (% do tempo com
+    alguma/todas as tarefas paradas esperando memória ou CPU).
+    """
+    memory_some: float = 0.0
+    memory_full: float = 0.0
+    cpu_some: float = 0.0
+    memory_current: Optional[int] = None
+    memory_high_events: int = 0
+
+    def describe(self) -> str:
+        atual = f", {self.memory_current / 1024 ** 2:.0f}MB" if self.memory_current is not None else ""
+        return (f"memória {self.memory_some:.1f}% (full {self.memory_full:.1f}%), "
+                f"CPU {self.cpu_some:.1f}%{atual}, memory.high {self.memory_high_events}x")
+
+def _limit(value: Union[int, str]) -> str:
+    size = parse_size(value)
+    return "max" if size is None else str(size)
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+def read_pressure_files(memory_path: str, cpu_path: str) -> Optional[ResourcePressure]:
+    """ResourcePressure a partir de um par de arquivos PSI; None se nenhum existir."""
+    memory, cpu = _read_text(memory_path), _read_text(cpu_path)
+    if memory is None and cpu is None:
+        return None
+    memory_psi = parse_psi(memory or "")
+    cpu_psi = parse_psi(cpu or "")
+    return ResourcePressure(
+        memory_some=memory_psi.get("some", {}).get("avg10", 0.0),
+        memory_full=memory_psi.get("full", {}).get("avg10", 0.0),
+        cpu_some=cpu_psi.get("some", {}).get("avg10", 0.0),
+    )
+
+def system_pressure(root: str = PROC_PRESSURE_ROOT) -> Optional[ResourcePressure]:
+    """PSI do sistema inteiro (None em kernels sem PSI)."""
+    return read_pressure_files(os.path.join(root, "memory"), os.path.join(root, "cpu"))
+
+class CgroupManager:
+    """
+    Grupos cgroup v2 por navegador (cpuset, cpu.max, memory.high/max e PSI).
+
+    Cria `<root>/<base>/<nome>` e move processos para ele; processos filhos
+    criados depois (novos renderers) nascem no mesmo grupo. Sem cgroup v2
+    montado ou sem permissão de escrita, `available` fica False e nada é
+    aplicado. Só arquivos são lidos e escritos, então `root` pode ser um
+    diretório comum que imite o cgroupfs.
+
+    Args:
+        logger: Logger
+        root: Montagem do cgroup v2 (substituível por um diretório de teste)
+        base: Nome do grupo-base
+    """
+
+    def __init__(self, logger: logging.Logger, root: str = CGROUP_ROOT, base: str = CGROUP_BASE):
+        self.logger = logger
+        self.root = root
+        self.base = os.path.join(root, base)
+        self.groups: Dict[str, str] = {}
+        self.available = self._prepare()
+
+    def _write(self, path: str, value: str) -> None:
+        with open(path, "w") as f:
+            f.write(value)
+
+    def _enable_controllers(self, path: str) -> None:
+        """Habilita os controladores disponíveis em cgroup.subtree_control de `path`."""
+        try:
+            with open(os.path.join(path, "cgroup.controllers")) as f:
+                present = set(f.read().split())
+        except OSError:
+            return
+        wanted = [c for c in CGROUP_CONTROLLERS if c in present]
+        if wanted:
+            self._write(os.path.join(path, "cgroup.subtree_control"), " ".join(f"+{c}" for c in wanted))
+
+    def _prepare(self) -> bool:
+        if not os.path.exists(os.path.join(self.root, "cgroup.controllers")):
+            self.logger.info("cgroup v2 não montado; limites por navegador desativados")
+            return False
+        try:
+            self._enable_controllers(self.root)
+            os.makedirs(self.base, exist_ok=True)
+            self._enable_controllers(self.base)
+        except OSError as e:
+            self.logger.warning(f"Sem permissão para criar cgroups em {self.base}: {e}")
+            return False
+        return True
+
+    def ensure_group(self, name: str, cpus: Optional[Iterable[int]] = None, mems: Optional[Iterable[int]] = None,
+                     memory_high: Union[int, str, None] = None, memory_max: Union[int, str, None] = None,
+                     cpu_max: Optional[float] = None) -> Optional[str]:
+        """
+        Cria (ou atualiza) o grupo `name`.
+
+        Args:
+            cpus: CPUs do cpuset (None mantém as do pai)
+            mems: Nós NUMA do cpuset (None mantém os do pai)
+            memory_high: memory.high, limite de reclaim/throttle (bytes ou com sufixo K/M/G)
+            memory_max: memory.max, limite rígido (OOM dentro do grupo)
+            cpu_max: Núcleos de CPU por período (ex.: 1.5), escrito em cpu.max
+
+        Returns:
+            Caminho do grupo, ou None se indisponível
+        """
+        if not self.available:
+            return None
+        path = os.path.join(self.base, name)
+        try:
+            os.makedirs(path, exist_ok=True)
+            if cpus is not None:
+                self._write(os.path.join(path, "cpuset.cpus"), format_cpu_list(cpus))
+            if mems is not None:
+                self._write(os.path.join(path, "cpuset.mems"), format_cpu_list(mems))
+            if memory_high is not None:
+                self._write(os.path.join(path, "memory.high"), _limit(memory_high))
+            if memory_max is not None:
+                self._write(os.path.join(path, "memory.max"), _limit(memory_max))
+            if cpu_max is not None:
+                quota = max(1000, int(cpu_max * CPU_MAX_PERIOD_US))
+                self._write(os.path.join(path, "cpu.max"), f"{quota} {CPU_MAX_PERIOD_US}")
+        except OSError as e:
+            self.logger.warning(f"Falha ao configurar cgroup {name}: {e}")
+            return None
+        self.groups[name] = path
+        return path
+
+    def attach(self, name: str, pids: Iterable[int]) -> int:
+        """Move processos para o grupo; retorna quantos foram movidos."""
+        path = self.groups.get(name)
+        if path is None:
+            return 0
+        moved = 0
+        for pid in pids:
+            try:
+                self._write(os.path.join(path, "cgroup.procs"), str(pid))
+                moved += 1
+            except OSError:
+                # Processo encerrado no meio do caminho (ou thread de outro grupo)
+                continue
+        return moved
+
+    def read_pressure(self, name: Optional[str] = None) -> Optional[ResourcePressure]:
+        """
+        PSI, memory.current e contagem de memory.high do grupo `name`
+        (None = grupo-base, a soma de todos os navegadores).
+        """
+        if not self.available:
+            return None
+        path = self.base if name is None else self.groups.get(name)
+        if path is None:
+            return None
+        pressure = read_pressure_files(os.path.join(path, "memory.pressure"), os.path.join(path, "cpu.pressure"))
+        if pressure is None:
+            return None
+        current = _read_text(os.path.join(path, "memory.current"))
+        if current and current.strip().isdigit():
+            pressure.memory_current = int(current)
+        # memory.events: uma linha "chave N" por evento (low, high, max, oom, ...)
+        for line in (_read_text(os.path.join(path, "memory.events")) or "").splitlines():
+            key, _, value = line.partition(" ")
+            if key == "high" and value.strip().isdigit():
+                pressure.memory_high_events = int(value)
+                break
+        return pressure
+
+    def remove(self, name: str) -> None:
+        """Remove o grupo (só funciona depois que os processos saírem)."""
+        path = self.groups.pop(name, None)
+        if path is None:
+            return
+        try:
+            os.rmdir(path)
+        except OSError as e:
+            self.logger.debug(f"cgroup {name} não removido: {e}")
+
+    def cleanup(self) -> None:
+        for name in list(self.groups):
+            self.remove(name)
+        try:
+            os.rmdir(self.base)
+        except OSError:
+            pass
@@ -0,0 +1,333 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Raiz do sistema de arquivos lida na descoberta (substituível por fixtures)
+SYSFS_ROOT = "/"
+# Diretórios relativos à raiz
+CPU_DIR = "sys/devices/system/cpu"
+NODE_DIR = "sys/devices/system/node"
+CPUINFO_PATH = "proc/cpuinfo"
+# Núcleos físicos reservados ao sistema (no primeiro grupo de L3)
+SYSTEM_CORES = 1
+# Núcleos físicos mínimos do Chrome de cada navegador antes de dar núcleo exclusivo ao worker
+CHROME_CORES_PER_BROWSER = 1
+
+# vendor_id de /proc/cpuinfo -> nome usado nas otimizações específicas
+VENDORS = {
+    "AuthenticAMD": "AMD",
+    "HygonGenuine": "AMD",
+    "GenuineIntel": "Intel",
+}
+
+def parse_cpu_list(text: str) -> Set[int]:
+    """Converte uma lista de CPUs do sysfs ("0-5,12-17") em conjunto."""
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+def format_cpu_list(cpus: Iterable[int]) -> str:
+    """Inverso de parse_cpu_list (faixas compactas)."""
+    cpus = sorted(cpus)
+    parts = []
+    start = prev = None
+    for cpu in cpus:
+        if prev is not None and cpu == prev + 1:
+            prev = cpu
+            continue
+        if start is not None:
+            parts.append(f"{start}-{prev}" if prev != start else str(start))
+        start = prev = cpu
+    if start is not None:
+        parts.append(f"{start}-{prev}" if prev != start else str(start))
+    return ','.join(parts)
+
+@dataclass(frozen=True)
+class LogicalCPU:
+    """CPU lógica com seus vizinhos de núcleo físico, L3 e nó NUMA."""
+    cpu: int
+    package: int
+    siblings: FrozenSet[int]
+    l3: FrozenSet[int]
+    node: int
+
+@dataclass
+class CPUTopology:
+    """Topologia descoberta no sysfs."""
+    cpus: Dict[int, LogicalCPU]
+    vendor: str = "desconhecido"
+
+    @property
+    def l3_groups(self) -> List[FrozenSet[int]]:
+        """Grupos de CPUs que compartilham L3 (CCX/CCD na AMD, socket na Intel), em ordem."""
+        groups = {c.l3 for c in self.cpus.values()}
+        return sorted(groups, key=lambda g: (self.cpus[min(g)].node, min(g)))
+
+    @property
+    def cores(self) -> List[FrozenSet[int]]:
+        """Núcleos físicos (conjuntos de irmãos SMT), em ordem."""
+        return sorted({c.siblings for c in self.cpus.values()}, key=min)
+
+    @property
+    def nodes(self) -> Dict[int, Set[int]]:
+        nodes: Dict[int, Set[int]] = {}
+        for c in self.cpus.values():
+            nodes.setdefault(c.node, set()).add(c.cpu)
+        return nodes
+
+    @property
+    def smt(self) -> bool:
+        return any(len(c.siblings) > 1 for c in self.cpus.values())
+
+    def restrict(self, allowed: Iterable[int]) -> 'CPUTopology':
+        """Topologia limitada às CPUs permitidas (irmãos e L3 também são recortados)."""
+        allowed = frozenset(allowed)
+        return CPUTopology(
+            cpus={
+                cpu: LogicalCPU(c.cpu, c.package, c.siblings & allowed, c.l3 & allowed, c.node)
+                for cpu, c in self.cpus.items() if cpu in allowed
+            },
+            vendor=self.vendor,
+        )
+
+    def describe(self) -> str:
+        return (
+            f"{len(self.cpus)} CPUs, {len(self.cores)} núcleos físicos, "
+            f"{len(self.l3_groups)} grupo(s) de L3, {len(self.nodes)} nó(s) NUMA, "
+            f"SMT {'sim' if self.smt else 'não'}, fabricante {self.vendor}"
+        )
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _l3_of(cpu_dir: str) -> Optional[Set[int]]:
+    """CPUs que compartilham o cache de último nível (L3) com a CPU."""
+    cache_dir = os.path.join(cpu_dir, "cache")
+    try:
+        indexes = sorted(d for d in os.listdir(cache_dir) if d.startswith("index"))
+    except OSError:
+        return None
+    for index in indexes:
+        if _read(os.path.join(cache_dir, index, "level")) == "3":
+            shared = _read(os.path.join(cache_dir, index, "shared_cpu_list"))
+            if shared:
+                return parse_cpu_list(shared)
+    return None
+
+def _nodes(root: str) -> Dict[int, int]:
+    """CPU -> nó NUMA."""
+    node_dir = os.path.join(root, NODE_DIR)
+    mapping = {}
+    try:
+        entries = os.listdir(node_dir)
+    except OSError:
+        return mapping
+    for entry in entries:
+        if entry.startswith("node") and entry[4:].isdigit():
+            cpulist = _read(os.path.join(node_dir, entry, "cpulist"))
+            for cpu in parse_cpu_list(cpulist or ""):
+                mapping[cpu] = int(entry[4:])
+    return mapping
+
+def _vendor(root: str) -> str:
+    cpuinfo = _read(os.path.join(root, CPUINFO_PATH)) or ""
+    for line in cpuinfo.splitlines():
+        if line.startswith("vendor_id"):
+            vendor_id = line.split(":", 1)[1].strip()
+            return VENDORS.get(vendor_id, vendor_id)
+    return "desconhecido"
+
+def discover_topology(root: str = SYSFS_ROOT) -> CPUTopology:
+    """
+    Lê a topologia de CPU do sysfs.
+
+    Args:
+        root: Raiz do sistema de arquivos ("/" ou um diretório de fixture)
+
+    Returns:
+        CPUTopology das CPUs online; sem sysfs, uma CPU por núcleo em um único L3
+    """
+    cpu_root = os.path.join(root, CPU_DIR)
+    online = _read(os.path.join(cpu_root, "online"))
+    cpu_ids = sorted(parse_cpu_list(online)) if online else list(range(os.cpu_count() or 1))
+    nodes = _nodes(root)
+
+    cpus = {}
+    for cpu in cpu_ids:
+        cpu_dir = os.path.join(cpu_root, f"cpu{cpu}")
+        topology = os.path.join(cpu_dir, "topology")
+        siblings = (
+            _read(os.path.join(topology, "core_cpus_list"))
+            or _read(os.path.join(topology, "thread_siblings_list"))
+        )
+        package = _read(os.path.join(topology, "physical_package_id"))
+        package = int(package) if package and package.lstrip('-').isdigit() else 0
+        cpus[cpu] = LogicalCPU(
+            cpu=cpu,
+            package=package,
+            siblings=frozenset(parse_cpu_list(siblings) if siblings else {cpu}),
+            l3=frozenset(_l3_of(cpu_dir) or ()),
+            node=nodes.get(cpu, 0),
+        )
+
+    # Sem L3 no sysfs (VMs, ARM): o pacote inteiro é tratado como um grupo
+    for cpu, c in list(cpus.items()):
+        if not c.l3:
+            package = frozenset(o for o, other in cpus.items() if other.package == c.package)
+            cpus[cpu] = LogicalCPU(c.cpu, c.package, c.siblings, package, c.node)
+
+    online_set = frozenset(cpus)
+    return CPUTopology(
+        cpus={
+            cpu: LogicalCPU(c.cpu, c.package, c.siblings & online_set, c.l3 & online_set, c.node)
+            for cpu, c in cpus.items()
+        },
+        vendor=_vendor(root),
+    )
+
+@dataclass
+class BrowserSlot:
+    """CPUs de um navegador: árvore de processos do Chrome e thread de clique."""
+    index: int
+    l3: FrozenSet[int]
+    browser_cpus: Set[int]
+    worker_cpu: Optional[int]
+    # Irmãos SMT do núcleo do worker ficam ociosos (sem navegador) no disparo
+    worker_exclusive: bool = False
+
+@dataclass
+class PlacementPlan:
+    system: Set[int]
+    slots: List[BrowserSlot] = field(default_factory=list)
+
+    def worker_cpus(self) -> List[Optional[int]]:
+        return [slot.worker_cpu for slot in self.slots]
+
+    def browser_sets(self) -> List[Set[int]]:
+        return [set(slot.browser_cpus) for slot in self.slots]
+
+    def describe(self) -> List[str]:
+        lines = [f"Sistema: {format_cpu_list(self.system) or '-'}"]
+        for slot in self.slots:
+            lines.append(
+                f"Navegador {slot.index + 1}: L3 {format_cpu_list(slot.l3)} | "
+                f"Chrome {format_cpu_list(slot.browser_cpus)} | worker {slot.worker_cpu}"
+                f"{' (núcleo exclusivo)' if slot.worker_exclusive else ''}"
+            )
+        return lines
+
+def system_cpus(topology: CPUTopology) -> Set[int]:
+    """
+    CPUs reservadas ao sistema.
+
+    Os primeiros SYSTEM_CORES núcleos físicos (com irmãos SMT) do primeiro
+    grupo de L3, com um ou vários L3; o resto do grupo fica para os
+    navegadores. Nada é reservado se sobrar menos de um núcleo para eles.
+    """
+    groups = topology.l3_groups
+    if not groups or len(topology.cores) <= SYSTEM_CORES:
+        return set()
+    first = [core for core in topology.cores if core <= groups[0]]
+    return set().union(*first[:SYSTEM_CORES])
+
+def plan_placement(topology: CPUTopology, browsers: int,
+                   allowed: Optional[Iterable[int]] = None, reserve_system: bool = True) -> PlacementPlan:
+    """
+    Distribui navegadores pelos grupos de L3.
+
+    Cada navegador recebe CPUs de um único L3 para o Chrome e, no mesmo L3,
+    uma CPU para a thread de clique. Se o grupo tiver núcleos para isso
+    (CHROME_CORES_PER_BROWSER por navegador além dos workers), o núcleo do
+    worker é exclusivo: seus irmãos SMT não entram em nenhum conjunto, para
+    que o disparo não divida o núcleo com renderização. Caso contrário os
+    workers se concentram no menor número de núcleos (irmãos SMT de um
+    núcleo de worker recebem outros workers, não Chrome) e o Chrome fica com
+    os demais; só num grupo de um único núcleo o Chrome divide núcleo com
+    um worker.
+
+    Args:
+        topology: Topologia descoberta
+        browsers: Número de navegadores
+        allowed: CPUs permitidas (padrão: todas da topologia)
+        reserve_system: Separa system_cpus() dos navegadores
+
+    Returns:
+        PlacementPlan com o conjunto do sistema e um BrowserSlot por navegador
+    """
+    system = system_cpus(topology) if reserve_system else set()
+    usable = set(topology.cpus) - system
+    if allowed is not None:
+        usable &= set(allowed)
+    if not usable:
+        # Reserva impossível nas CPUs permitidas: navegadores usam tudo
+        usable = set(topology.cpus) if allowed is None else set(allowed) & set(topology.cpus)
+        system = set()
+
+    plan = PlacementPlan(system=system)
+    if browsers <= 0 or not usable:
+        return plan
+    view = topology.restrict(usable)
+
+    # Núcleos físicos livres por grupo de L3
+    groups = [
+        {"l3": group, "cores": [core for core in view.cores if core <= group], "browsers": []}
+        for group in view.l3_groups
+    ]
+    for index in range(browsers):
+        # Grupo com mais núcleos por navegador já alocado
+        group = max(groups, key=lambda g: (len(g["cores"]) / (len(g["browsers"]) + 1), -min(g["l3"])))
+        group["browsers"].append(index)
+
+    slots = {}
+    for group in groups:
+        members = group["browsers"]
+        if not members:
+            continue
+        cores = list(group["cores"])
+        # Núcleo exclusivo por worker só se cada Chrome ainda ficar com núcleos próprios
+        exclusive = len(cores) >= len(members) * (1 + CHROME_CORES_PER_BROWSER)
+        if exclusive:
+            workers = [min(core) for core in cores[:len(members)]]
+            units = cores[len(members):]
+        else:
+            # Workers ocupam todas as CPUs lógicas dos núcleos de worker (poucos
+            # núcleos), deixando ao menos um núcleo para o Chrome
+            width = max(len(core) for core in cores)
+            worker_cores = cores[:max(1, min(-(-len(members) // width), len(cores) - 1))]
+            # Primeiro uma CPU lógica por núcleo, depois os irmãos SMT
+            candidates = [
+                cpu for level in range(max(len(core) for core in worker_cores))
+                for cpu in (sorted(core)[level] for core in worker_cores if level < len(core))
+            ]
+            workers = [candidates[position % len(candidates)] for position in range(len(members))]
+            units = cores[len(worker_cores):]
+            if not units:
+                # Um único núcleo no grupo: o Chrome fica com o que sobrar dele
+                units = [core - set(workers) for core in cores if core - set(workers)] or cores
+
+        # Núcleos do Chrome distribuídos em rodízio entre os navegadores do grupo
+        for position, index in enumerate(members):
+            if len(units) >= len(members):
+                share = units[position::len(members)]
+            else:
+                share = [units[position % len(units)]]
+            slots[index] = BrowserSlot(
+                index=index,
+                l3=group["l3"],
+                browser_cpus=set().union(*share),
+                worker_cpu=workers[position],
+                worker_exclusive=exclusive,
+            )
+    plan.slots = [slots[index] for index in range(browsers)]
+    return plan
@@ -4,9 +4,9 @@ import os
 
 from .system_resources import get_system_resources
 from .cpu_manager import CPUManager
-from .memory_manager import MemoryManager
-from .signal_handler import SignalHandler
+from .signal_handler import SignalHandler, TERMINATION_SIGNALS
 from .process_cleaner import ProcessCleaner
+from .tuning import TuningEngine
 
 class EnhancedSystemManager:
     def __init__(self, logger: logging.Logger):
@@ -15,56 +15,52 @@ class EnhancedSystemManager:
         
         # Inicializa gerenciadores modulares
         self.cpu_manager = CPUManager(logger)
-        self.memory_manager = MemoryManager(logger)
         self.process_cleaner = ProcessCleaner(logger)
-        
-        # Configurações originais
-        self.cpu_governors = {}
+
+        # Ajustes de sysfs/procfs/cpufreq: aplicados uma vez por apply_system_tuning()
+        self.tuning = TuningEngine(logger, vendor=self.cpu_manager.topology.vendor)
+        self.signal_handler = None
         
         # Executor de threads
         self.executor = None
-        
-        # Configuração inicial
-        self._initialize_system()
+        self._initialize_thread_pool()
 
     def optimize_cpu_affinity(self):
         """Wrapper para otimização de afinidade de CPU."""
         return self.cpu_manager.optimize_cpu_affinity(self.resources.logical_processors)
 
-    def optimize_memory_settings(self):
-        """Wrapper para otimização de configurações de memória."""
-        self.memory_manager.memory_lock()
-        self.memory_manager.configure_memory_settings()
-
-    def _initialize_system(self):
-        """Inicialização centralizada do sistema."""
-        # Otimizações de CPU
-        self.cpu_manager.configure_cpu_specific_settings()
-        self.cpu_manager.optimize_cpu_affinity(self.resources.logical_processors)
-        
-        # Otimizações de memória
-        self.memory_manager.memory_lock()
-        self.memory_manager.configure_memory_settings()
-        
-        # Inicializa pool de threads
-        self._initialize_thread_pool()
+    def apply_system_tuning(self):
+        """
+        Aplica o perfil de ajustes (swappiness, THP, governor, turbo/boost) e
+        garante a restauração no atexit e nos sinais de término.
+        """
+        if self.signal_handler is None:
+            self.signal_handler = SignalHandler(self.logger, signals=TERMINATION_SIGNALS, exit_on_signal=True)
+        self.tuning.install_restore_hooks(self.signal_handler)
+        return self.tuning.apply()
 
     def _initialize_thread_pool(self, tasks: int = 4):
-        """Inicializa o pool de threads com otimização."""
+        """
+        Inicializa o pool de threads de uso geral nas CPUs do sistema.
+
+        As CPUs de worker ficam para as threads de clique; sem CPUs de sistema
+        (ou fora da afinidade permitida) o pool fica sem fixação.
+        """
         try:
-            core_assignments = self.cpu_manager.assign_cores_for_tasks(
-                tasks, 
-                self.resources.logical_processors
-            )
-            
+            cores = self.cpu_manager.system_cores(self.resources.logical_processors) & os.sched_getaffinity(0)
+
+            def fixar_thread():
+                # Executa na própria thread do pool: pid 0 = thread chamadora
+                if cores:
+                    os.sched_setaffinity(0, cores)
+
             self.executor = ThreadPoolExecutor(
                 max_workers=tasks,
-                thread_name_prefix="worker"
+                thread_name_prefix="worker",
+                initializer=fixar_thread
             )
-
-            for idx, cores in enumerate(core_assignments):
-                os.sched_setaffinity(idx, cores)
-                self.logger.info(f"Thread {idx} configurada com afinidade: {cores}")
+            if cores:
+                self.logger.info(f"Pool de threads nas CPUs do sistema: {sorted(cores)}")
 
         except Exception as e:
             self.logger.error(f"Erro ao inicializar pool de threads: {e}")
@@ -93,9 +89,8 @@ class EnhancedSystemManager:
             if self.executor:
                 self.executor.shutdown(wait=False)
 
-            # Restaura configurações do sistema
-            self.cpu_manager.restore_cpu_settings(self.cpu_governors)
-            self.memory_manager.restore_memory_settings()
+            # Restaura configurações do sistema (os._exit abaixo não passa pelo atexit)
+            self.tuning.restore()
 
             self.logger.info("Desligamento gracioso completado")
 
@@ -2,20 +2,28 @@ import signal
 import os
 import logging
 from threading import Event
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Sequence
+
+# Sinais que encerram o processo sem passar pelo atexit (SIGINT já vira KeyboardInterrupt)
+TERMINATION_SIGNALS = (signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT)
 
 class SignalHandler:
     def __init__(self, 
                  logger: logging.Logger, 
-                 shutdown_callback: Optional[Callable] = None):
+                 shutdown_callback: Optional[Callable] = None,
+                 signals: Optional[Sequence[int]] = None,
+                 exit_on_signal: bool = False):
         self.logger = logger
         self.shutdown_event = Event()
-        self.shutdown_callback = shutdown_callback
+        self.callbacks: List[Callable] = [shutdown_callback] if shutdown_callback else []
+        # SystemExit após os callbacks: o finally e o atexit do programa também rodam
+        self.exit_on_signal = exit_on_signal
+        self.signals = signals
         self._setup_signal_handlers()
 
     def _setup_signal_handlers(self):
         """Configura handlers para todos os sinais relevantes."""
-        signals = [
+        signals = self.signals or [
             signal.SIGTERM, signal.SIGINT, signal.SIGQUIT,
             signal.SIGSEGV, signal.SIGABRT
         ]
@@ -27,6 +35,10 @@ class SignalHandler:
         
         self.logger.info("Manipuladores de sinais registrados com sucesso.")
 
+    def add_shutdown_callback(self, callback: Callable):
+        """Adiciona um callback executado (em ordem de registro) ao receber um sinal."""
+        self.callbacks.append(callback)
+
     def _handle_signal(self, signum, frame):
         """Handler central para todos os sinais."""
         if self.shutdown_event.is_set():
@@ -35,8 +47,14 @@ class SignalHandler:
         self.logger.info(f"Sinal {signum} recebido. Iniciando desligamento seguro...")
         self.shutdown_event.set()
         
-        if self.shutdown_callback:
-            self.shutdown_callback()
+        for callback in self.callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Erro no callback de desligamento: {e}")
+
+        if self.exit_on_signal:
+            raise SystemExit(128 + signum)
 
     def wait_for_shutdown(self, timeout: Optional[float] = None):
         """Aguarda evento de shutdown."""
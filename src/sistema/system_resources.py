@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 import os
+import threading
 import psutil
 
+# Intervalo entre amostras do monitor de CPU
+CPU_SAMPLE_INTERVAL_S = 1.0
+
 @dataclass
 class SystemResources:
     total_cores: int
@@ -17,3 +21,37 @@ def get_system_resources() -> SystemResources:
         available_memory=psutil.virtual_memory().available,
         process_id=os.getpid()
     )
+
+class CpuSampler:
+    """Mantém o uso de CPU atualizado em segundo plano; a leitura nunca bloqueia."""
+
+    def __init__(self, interval: float = CPU_SAMPLE_INTERVAL_S):
+        self.interval = interval
+        self.percent = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'CpuSampler':
+        if self._thread is None or not self._thread.is_alive():
+            # Primeira chamada apenas define a referência do psutil
+            psutil.cpu_percent(interval=None)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.percent = psutil.cpu_percent(interval=None)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+_cpu_sampler = None
+
+def get_cpu_sampler() -> CpuSampler:
+    """Amostrador de CPU compartilhado (iniciado na primeira chamada)."""
+    global _cpu_sampler
+    if _cpu_sampler is None:
+        _cpu_sampler = CpuSampler().start()
+    return _cpu_sampler
@@ -0,0 +1,200 @@
+import atexit
+import glob
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .cpu_topology import SYSFS_ROOT
+
+# Perfil declarativo padrão: (nome, caminho relativo à raiz, valor, fabricante ou None)
+TUNING_PROFILE = (
+    # Menos swap sem chegar a 0 (0 troca swap por OOM sob pressão)
+    ("vm.swappiness", "proc/sys/vm/swappiness", "10", None),
+    # Sem compactação de huge pages transparentes no meio de um clique
+    ("thp.enabled", "sys/kernel/mm/transparent_hugepage/enabled", "never", None),
+    ("thp.defrag", "sys/kernel/mm/transparent_hugepage/defrag", "never", None),
+    # Frequência máxima fixa: sem latência de subida de clock
+    ("cpufreq.governor", "sys/devices/system/cpu/cpu*/cpufreq/scaling_governor", "performance", None),
+    # Turbo/boost desligados: frequência estável entre os núcleos
+    ("intel.no_turbo", "sys/devices/system/cpu/intel_pstate/no_turbo", "1", "Intel"),
+    ("amd.boost", "sys/devices/system/cpu/cpufreq/boost", "0", "AMD"),
+)
+
+@dataclass(frozen=True)
+class Knob:
+    """Um ajuste declarativo: escreve `value` em `path` (glob relativo à raiz)."""
+    name: str
+    path: str
+    value: str
+    vendor: Optional[str] = None
+
+@dataclass
+class KnobResult:
+    """Resultado de um ajuste em um arquivo."""
+    name: str
+    path: str
+    value: str
+    original: Optional[str] = None
+    status: str = "pendente"
+    elapsed_ns: int = 0
+    error: Optional[str] = None
+
+class TuningError(Exception):
+    """Falha em um ajuste obrigatório (os anteriores são desfeitos)."""
+
+def _selected(text: str) -> str:
+    """Valor efetivo de arquivos no formato 'always madvise [never]'."""
+    match = re.search(r"\[([^\]]+)\]", text)
+    return match.group(1) if match else text.strip()
+
+def default_profile() -> List[Knob]:
+    return [Knob(*entry) for entry in TUNING_PROFILE]
+
+class TuningEngine:
+    """
+    Camada única de ajustes de sysfs/procfs/cpufreq.
+
+    Recebe um perfil declarativo, expande os globs (um arquivo por CPU no
+    governor), guarda o valor original de cada arquivo uma única vez e
+    aplica com escritas diretas, sem subprocessos. restore() devolve os
+    originais na ordem inversa e é idempotente; install_restore_hooks()
+    o registra no atexit e no SignalHandler.
+
+    Args:
+        logger: Logger
+        profile: Lista de Knob (padrão TUNING_PROFILE)
+        root: Raiz do sistema de arquivos (substituível por um diretório de teste)
+        vendor: Fabricante da CPU ('Intel', 'AMD'); ajustes de outro fabricante são ignorados
+        required: Nomes de ajustes cuja falha desfaz a transação inteira
+    """
+
+    def __init__(self, logger: logging.Logger, profile: Optional[Sequence[Knob]] = None, root: str = SYSFS_ROOT,
+                 vendor: Optional[str] = None, required: Sequence[str] = ()):
+        self.logger = logger
+        self.profile = list(profile) if profile is not None else default_profile()
+        self.root = root
+        self.vendor = vendor
+        self.required = set(required)
+        # Originais lidos uma única vez por arquivo (sobrevivem a apply() repetidos)
+        self.originals: Dict[str, str] = {}
+        self.results: List[KnobResult] = []
+        self.applied: List[KnobResult] = []
+        self._lock = threading.RLock()
+        self._hooks_installed = False
+
+    def _expand(self, knob: Knob) -> List[str]:
+        pattern = os.path.join(self.root, knob.path)
+        return sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+
+    def _read(self, path: str) -> str:
+        with open(path) as f:
+            return _selected(f.read())
+
+    def _write(self, path: str, value: str) -> None:
+        with open(path, "w") as f:
+            f.write(value)
+
+    def snapshot(self) -> Dict[str, str]:
+        """Lê os originais dos arquivos do perfil ainda não vistos."""
+        with self._lock:
+            for knob in self.profile:
+                if knob.vendor and knob.vendor != self.vendor:
+                    continue
+                for path in self._expand(knob):
+                    if path not in self.originals and os.path.exists(path):
+                        try:
+                            self.originals[path] = self._read(path)
+                        except OSError:
+                            continue
+            return dict(self.originals)
+
+    def _apply_one(self, knob: Knob, path: str) -> KnobResult:
+        result = KnobResult(knob.name, path, knob.value, self.originals.get(path))
+        start = time.perf_counter_ns()
+        try:
+            if not os.path.exists(path):
+                result.status = "ausente"
+            elif self._read(path) == knob.value:
+                result.status = "inalterado"
+            else:
+                self._write(path, knob.value)
+                result.status = "aplicado"
+        except OSError as e:
+            result.status = "negado"
+            result.error = str(e)
+        result.elapsed_ns = time.perf_counter_ns() - start
+        return result
+
+    def apply(self) -> List[KnobResult]:
+        """
+        Aplica o perfil. Falhas em ajustes obrigatórios desfazem os já
+        aplicados e levantam TuningError; as demais ficam no relatório.
+        """
+        with self._lock:
+            self.snapshot()
+            results = []
+            for knob in self.profile:
+                if knob.vendor and knob.vendor != self.vendor:
+                    continue
+                for path in self._expand(knob):
+                    result = self._apply_one(knob, path)
+                    results.append(result)
+                    if result.status == "aplicado":
+                        self.applied.append(result)
+                    elif result.status in ("negado", "ausente") and knob.name in self.required:
+                        self.results = results
+                        self.restore()
+                        raise TuningError(f"Ajuste obrigatório {knob.name} falhou em {path}: {result.error or result.status}")
+            self.results = results
+        self._log(results)
+        return results
+
+    def restore(self) -> int:
+        """Devolve os originais dos arquivos alterados (ordem inversa); retorna quantos."""
+        with self._lock:
+            restored = 0
+            while self.applied:
+                result = self.applied.pop()
+                original = self.originals.get(result.path)
+                if original is None:
+                    continue
+                try:
+                    self._write(result.path, original)
+                    restored += 1
+                except OSError as e:
+                    self.logger.warning(f"Falha ao restaurar {result.name} ({result.path}): {e}")
+        if restored:
+            self.logger.info(f"⚙️ {restored} ajuste(s) do sistema restaurado(s)")
+        return restored
+
+    def install_restore_hooks(self, signal_handler=None) -> None:
+        """Garante restore() no atexit e no SignalHandler (uma única vez)."""
+        if self._hooks_installed:
+            return
+        atexit.register(self.restore)
+        if signal_handler is not None:
+            signal_handler.add_shutdown_callback(self.restore)
+        self._hooks_installed = True
+
+    def report(self) -> List[str]:
+        """Uma linha por arquivo: estado, valores e tempo gasto."""
+        return [
+            f"{result.name} ({os.path.relpath(result.path, self.root)}): {result.status} "
+            f"{result.original!r} -> {result.value!r} em {result.elapsed_ns / 1000:.0f}μs"
+            + (f" ({result.error})" if result.error else "")
+            for result in self.results
+        ]
+
+    def _log(self, results: List[KnobResult]) -> None:
+        total_ms = sum(result.elapsed_ns for result in results) / 1e6
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        self.logger.info(f"⚙️ Ajustes do sistema em {total_ms:.2f}ms: {summary or 'nenhum'}")
+        for line in self.report():
+            self.logger.debug(f"   {line}")
@@ -0,0 +1,6 @@
+"""Mesmos caminhos de importação de src/main.py e dos benchmarks."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
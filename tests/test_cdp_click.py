@@ -0,0 +1,155 @@
+"""CDPClickExecutor contra um servidor DevTools local (websocket)."""
+import json
+import logging
+
+import pytest
+
+from benchmarks.fake_cdp_server import FakeCDPServer
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.cdp_click import CDPClickExecutor, CDPConnection, CDPError
+from src.click_manager.element_cache import ElementCache
+
+XPATH = "//button[@id='alvo']"
+# Centro da caixa devolvido pelo FakeWebDriver para o script de centralização
+CENTRO = (100.0, 50.0)
+
+
+class ServidorQueRejeita(FakeCDPServer):
+    """Responde com erro os mousePressed das páginas em `rejeitadas`."""
+
+    def __init__(self, rejeitadas):
+        super().__init__()
+        self.rejeitadas = set(rejeitadas)
+
+    async def _handler(self, websocket):
+        page = websocket.request.path.rsplit("/", 1)[-1]
+        async for raw in websocket:
+            message = json.loads(raw)
+            params = message.get("params", {})
+            if page in self.rejeitadas and params.get("type") == "mousePressed":
+                resposta = {"id": message["id"], "error": {"code": -32000, "message": "Target closed"}}
+            else:
+                resposta = {"id": message["id"], "result": {}}
+            await websocket.send(json.dumps(resposta))
+
+
+@pytest.fixture
+def cdp():
+    servidor = FakeCDPServer().start()
+    yield servidor
+    servidor.stop()
+
+
+@pytest.fixture
+def cdp_que_rejeita():
+    servidor = ServidorQueRejeita({"page-2"}).start()
+    yield servidor
+    servidor.stop()
+
+
+@pytest.fixture
+def drivers():
+    return [FakeWebDriver(rtt_ms=0.0, jitter_ms=0.0, seed=i) for i in range(3)]
+
+
+def criar_executor(servidor, drivers):
+    paginas = {id(d): f"page-{i + 1}" for i, d in enumerate(drivers)}
+    executor = CDPClickExecutor(
+        logging.getLogger("teste"),
+        element_cache=ElementCache(),
+        url_resolver=lambda d: servidor.url(paginas[id(d)]),
+    )
+    return executor, paginas
+
+
+def test_conexao_call_e_pipeline(cdp):
+    conexao = CDPConnection(cdp.url())
+    try:
+        assert conexao.call("Runtime.evaluate", {"expression": "1"}) == {"result": {"type": "number", "value": 1}}
+        assert conexao.pipeline([("Page.enable", {}), ("Network.enable", {})]) == [{}, {}]
+    finally:
+        conexao.close()
+
+
+def test_arm_e_fire_em_todas_as_paginas(cdp, drivers):
+    executor, paginas = criar_executor(cdp, drivers)
+    handle = executor.arm(drivers, [XPATH] * len(drivers))
+    assert handle is not None
+    assert handle.points == [CENTRO] * len(drivers)
+    assert len(handle.arm_ns) == len(drivers)
+
+    assert executor.fire(handle)
+    for pagina in paginas.values():
+        # Hover na armação; pressionar e soltar no disparo
+        assert [tipo for tipo, _ in cdp.events[pagina]] == ["mouseMoved", "mousePressed", "mouseReleased"]
+    assert all(t is not None for t in handle.sent_ns)
+    assert handle.skew_ns() == max(handle.sent_ns) - min(handle.sent_ns)
+    executor.cleanup()
+
+
+def test_fire_uma_vez_por_handle(cdp, drivers):
+    executor, paginas = criar_executor(cdp, drivers)
+    handle = executor.arm(drivers, [XPATH] * len(drivers))
+    assert executor.fire(handle)
+    assert not executor.fire(handle)
+    assert all(len(cdp.press_times(pagina)) == 1 for pagina in paginas.values())
+    executor.cleanup()
+
+
+def test_conexao_reutilizada_entre_rodadas(cdp, drivers):
+    executor, paginas = criar_executor(cdp, drivers)
+    assert executor.execute_synchronized_clicks(drivers, [XPATH] * len(drivers))
+    conexoes = [conexao for _, conexao in executor.connections.values()]
+    assert executor.execute_synchronized_clicks(drivers, [XPATH] * len(drivers))
+    assert [conexao for _, conexao in executor.connections.values()] == conexoes
+    assert all(len(cdp.press_times(pagina)) == 2 for pagina in paginas.values())
+    executor.cleanup()
+
+
+def test_nova_sessao_reabre_a_conexao(cdp, drivers):
+    executor, _ = criar_executor(cdp, drivers)
+    executor.arm(drivers, [XPATH] * len(drivers))
+    anterior = executor.connections[id(drivers[0])][1]
+    drivers[0].session_id = "outra-sessao"
+    executor.arm(drivers, [XPATH] * len(drivers))
+    assert executor.connections[id(drivers[0])][1] is not anterior
+    executor.cleanup()
+
+
+def test_arm_falha_com_url_invalida(cdp, drivers):
+    executor = CDPClickExecutor(
+        logging.getLogger("teste"),
+        element_cache=ElementCache(),
+        url_resolver=lambda d: "ws://127.0.0.1:1/devtools/page/inexistente",
+    )
+    assert executor.arm(drivers, [XPATH] * len(drivers)) is None
+    assert not executor.execute_synchronized_clicks(drivers, [XPATH] * len(drivers))
+
+
+def test_arm_rejeita_listas_de_tamanhos_diferentes(cdp, drivers):
+    executor, _ = criar_executor(cdp, drivers)
+    assert executor.arm(drivers, [XPATH]) is None
+    assert executor.arm([], []) is None
+
+
+def test_resposta_de_erro_falha_o_disparo(cdp_que_rejeita):
+    drivers = [FakeWebDriver(rtt_ms=0.0, jitter_ms=0.0, seed=i) for i in range(2)]
+    executor, _ = criar_executor(cdp_que_rejeita, drivers)
+    handle = executor.arm(drivers, [XPATH] * 2)
+    assert not executor.fire(handle)
+    # Erro do protocolo não derruba a conexão
+    assert len(executor.connections) == 2
+    with pytest.raises(CDPError, match="Target closed"):
+        executor.connections[id(drivers[1])][1].call(
+            "Input.dispatchMouseEvent", {"type": "mousePressed", "x": 0, "y": 0}
+        )
+    executor.cleanup()
+
+
+def test_cleanup_fecha_as_conexoes(cdp, drivers):
+    executor, _ = criar_executor(cdp, drivers)
+    executor.arm(drivers, [XPATH] * len(drivers))
+    conexoes = [conexao for _, conexao in executor.connections.values()]
+    executor.cleanup()
+    assert executor.connections == {}
+    assert all(not conexao.ws.connected for conexao in conexoes)
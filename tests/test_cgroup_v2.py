@@ -0,0 +1,153 @@
+"""CgroupManager e leitura de PSI sobre um cgroupfs em diretório temporário."""
+import logging
+import os
+
+import pytest
+
+from src.sistema.cgroup_v2 import CgroupManager, parse_psi, parse_size, system_pressure
+
+LOGGER = logging.getLogger("teste")
+
+PSI = ("some avg10={some:.2f} avg60=1.50 avg300=0.25 total=12345\n"
+       "full avg10={full:.2f} avg60=0.00 avg300=0.00 total=678\n")
+
+
+def ler(*partes):
+    with open(os.path.join(*partes)) as f:
+        return f.read()
+
+
+def escrever(caminho, texto):
+    with open(caminho, "w") as f:
+        f.write(texto)
+
+
+@pytest.fixture
+def cgroupfs(tmp_path):
+    escrever(tmp_path / "cgroup.controllers", "cpuset cpu io memory pids\n")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def manager(cgroupfs):
+    # O grupo-base de um cgroupfs real herda os controladores da raiz
+    os.makedirs(os.path.join(cgroupfs, "click_sync"))
+    escrever(os.path.join(cgroupfs, "click_sync", "cgroup.controllers"), "cpuset cpu memory\n")
+    return CgroupManager(LOGGER, root=cgroupfs)
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("2G", 2 * 1024 ** 3),
+    ("512M", 512 * 1024 ** 2),
+    ("1.5g", int(1.5 * 1024 ** 3)),
+    ("64KB", 64 * 1024),
+    ("1048576", 1048576),
+    (4096, 4096),
+    ("max", None),
+    (None, None),
+])
+def test_parse_size(valor, esperado):
+    assert parse_size(valor) == esperado
+
+
+def test_parse_psi():
+    psi = parse_psi(PSI.format(some=12.5, full=3.25))
+    assert psi["some"] == {"avg10": 12.5, "avg60": 1.5, "avg300": 0.25, "total": 12345.0}
+    assert psi["full"]["avg10"] == 3.25
+
+
+def test_parse_psi_sem_linha_full():
+    # cpu.pressure em kernels antigos só tem a linha "some"
+    psi = parse_psi("some avg10=7.00 avg60=0.00 avg300=0.00 total=1\n\n")
+    assert set(psi) == {"some"}
+
+
+def test_indisponivel_sem_cgroup_v2(tmp_path):
+    manager = CgroupManager(LOGGER, root=str(tmp_path))
+    assert not manager.available
+    assert manager.ensure_group("navegador_1", cpus={2, 3}) is None
+    assert manager.read_pressure() is None
+    assert not os.path.exists(tmp_path / "click_sync")
+
+
+def test_controladores_habilitados(manager, cgroupfs):
+    assert manager.available
+    # io e pids ficam de fora; só os controladores usados são habilitados
+    assert ler(cgroupfs, "cgroup.subtree_control") == "+cpu +cpuset +memory"
+    assert ler(cgroupfs, "click_sync", "cgroup.subtree_control") == "+cpu +cpuset +memory"
+
+
+def test_ensure_group_escreve_limites(manager, cgroupfs):
+    caminho = manager.ensure_group("navegador_1", cpus={2, 3, 4, 14}, mems={0},
+                                   memory_high="1536M", memory_max="2G", cpu_max=1.5)
+    assert caminho == os.path.join(cgroupfs, "click_sync", "navegador_1")
+    assert ler(caminho, "cpuset.cpus") == "2-4,14"
+    assert ler(caminho, "cpuset.mems") == "0"
+    assert ler(caminho, "memory.high") == str(1536 * 1024 ** 2)
+    assert ler(caminho, "memory.max") == str(2 * 1024 ** 3)
+    assert ler(caminho, "cpu.max") == "150000 100000"
+    assert manager.groups == {"navegador_1": caminho}
+
+
+def test_ensure_group_sem_limite_e_cota_minima(manager):
+    caminho = manager.ensure_group("navegador_2", memory_max="max", cpu_max=0.001)
+    assert ler(caminho, "memory.max") == "max"
+    # Cota mínima de 1 ms por período
+    assert ler(caminho, "cpu.max") == "1000 100000"
+    # Campos não informados ficam com o valor do pai
+    assert not os.path.exists(os.path.join(caminho, "cpuset.cpus"))
+    assert not os.path.exists(os.path.join(caminho, "memory.high"))
+
+
+def test_attach(manager):
+    caminho = manager.ensure_group("navegador_1")
+    assert manager.attach("navegador_1", [4321]) == 1
+    assert ler(caminho, "cgroup.procs") == "4321"
+    assert manager.attach("desconhecido", [4321]) == 0
+
+
+def test_read_pressure_do_grupo(manager):
+    caminho = manager.ensure_group("navegador_1")
+    escrever(os.path.join(caminho, "memory.pressure"), PSI.format(some=22.0, full=11.0))
+    escrever(os.path.join(caminho, "cpu.pressure"), PSI.format(some=45.5, full=0.0))
+    escrever(os.path.join(caminho, "memory.current"), f"{700 * 1024 ** 2}\n")
+    escrever(os.path.join(caminho, "memory.events"), "low 0\nhigh 17\nmax 2\noom 0\noom_kill 0\n")
+
+    pressao = manager.read_pressure("navegador_1")
+    assert pressao.memory_some == 22.0
+    assert pressao.memory_full == 11.0
+    assert pressao.cpu_some == 45.5
+    assert pressao.memory_current == 700 * 1024 ** 2
+    assert pressao.memory_high_events == 17
+
+
+def test_read_pressure_do_grupo_base(manager, cgroupfs):
+    escrever(os.path.join(cgroupfs, "click_sync", "memory.pressure"), PSI.format(some=5.0, full=1.0))
+    pressao = manager.read_pressure()
+    assert pressao.memory_some == 5.0
+    assert pressao.cpu_some == 0.0
+    assert pressao.memory_current is None
+    assert pressao.memory_high_events == 0
+
+
+def test_read_pressure_sem_psi(manager):
+    manager.ensure_group("navegador_1")
+    assert manager.read_pressure("navegador_1") is None
+    assert manager.read_pressure("desconhecido") is None
+
+
+def test_system_pressure(tmp_path):
+    assert system_pressure(str(tmp_path)) is None
+    escrever(tmp_path / "memory", PSI.format(some=3.0, full=0.5))
+    escrever(tmp_path / "cpu", PSI.format(some=60.0, full=0.0))
+    pressao = system_pressure(str(tmp_path))
+    assert (pressao.memory_some, pressao.memory_full, pressao.cpu_some) == (3.0, 0.5, 60.0)
+
+
+def test_cleanup_remove_grupos_vazios(manager, cgroupfs):
+    os.remove(os.path.join(cgroupfs, "click_sync", "cgroup.controllers"))
+    os.remove(os.path.join(cgroupfs, "click_sync", "cgroup.subtree_control"))
+    manager.ensure_group("navegador_1")
+    manager.cleanup()
+    assert manager.groups == {}
+    assert not os.path.exists(os.path.join(cgroupfs, "click_sync"))
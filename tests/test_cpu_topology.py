@@ -0,0 +1,115 @@
+"""Descoberta de topologia e plan_placement sobre árvores sysfs capturadas."""
+import pytest
+
+from benchmarks.fake_sysfs import LAYOUTS, write_sysfs
+from benchmarks.plan_topology import verificar
+from src.sistema.cpu_topology import SYSTEM_CORES, discover_topology, plan_placement, system_cpus
+
+FROTAS = [1, 2, 4, 8]
+
+
+def layout_hibrido():
+    """Alder Lake (i5-12600K): 6 núcleos P com irmãos SMT vizinhos (0-1, 2-3...) e 4 núcleos E."""
+    l3 = set(range(16))
+    cpus = []
+    for core in range(6):
+        siblings = {2 * core, 2 * core + 1}
+        for cpu in sorted(siblings):
+            cpus.append({"cpu": cpu, "package": 0, "core": core, "siblings": siblings, "l3": l3, "node": 0})
+    for cpu in range(12, 16):
+        cpus.append({"cpu": cpu, "package": 0, "core": cpu - 6, "siblings": {cpu}, "l3": l3, "node": 0})
+    return {"vendor": "Intel", "cpus": cpus, "l3": True, "numa": False}
+
+
+CAPTURAS = dict(LAYOUTS, alder_lake_12600k=layout_hibrido())
+
+
+def topologia(tmp_path, nome):
+    return discover_topology(write_sysfs(str(tmp_path), CAPTURAS[nome]))
+
+
+def nucleo(topology, cpu):
+    return topology.cpus[cpu].siblings
+
+
+@pytest.mark.parametrize("nome", sorted(CAPTURAS))
+def test_descoberta(tmp_path, nome):
+    layout = CAPTURAS[nome]
+    topology = topologia(tmp_path, nome)
+    assert topology.vendor == layout["vendor"]
+    assert sorted(topology.cpus) == sorted(c["cpu"] for c in layout["cpus"])
+    for c in layout["cpus"]:
+        assert topology.cpus[c["cpu"]].siblings == frozenset(c["siblings"])
+
+
+@pytest.mark.parametrize("nome", sorted(CAPTURAS))
+def test_sistema_fica_com_um_nucleo_do_primeiro_l3(tmp_path, nome):
+    topology = topologia(tmp_path, nome)
+    sistema = system_cpus(topology)
+    assert len({nucleo(topology, cpu) for cpu in sistema}) == SYSTEM_CORES
+    assert sistema == set(topology.cores[0])
+    assert sistema <= topology.l3_groups[0]
+
+
+@pytest.mark.parametrize("browsers", FROTAS)
+@pytest.mark.parametrize("nome", sorted(CAPTURAS))
+def test_regras_do_plano(tmp_path, nome, browsers):
+    topology = topologia(tmp_path, nome)
+    plan = plan_placement(topology, browsers)
+    assert verificar(topology, plan, browsers) == []
+    assert [slot.index for slot in plan.slots] == list(range(browsers))
+
+
+@pytest.mark.parametrize("browsers", FROTAS)
+@pytest.mark.parametrize("nome", sorted(CAPTURAS))
+def test_chrome_nunca_no_nucleo_do_worker(tmp_path, nome, browsers):
+    topology = topologia(tmp_path, nome)
+    plan = plan_placement(topology, browsers)
+    for slot in plan.slots:
+        nucleos_worker = set().union(*(nucleo(topology, s.worker_cpu) for s in plan.slots if s.l3 == slot.l3))
+        assert not slot.browser_cpus & nucleos_worker
+        if slot.worker_exclusive:
+            outros = {s.worker_cpu for s in plan.slots if s is not slot}
+            assert not nucleo(topology, slot.worker_cpu) & outros
+
+
+def test_ryzen_dois_navegadores_em_ccx_diferentes(tmp_path):
+    topology = topologia(tmp_path, "ryzen_5900x")
+    plan = plan_placement(topology, 2)
+    assert plan.slots[0].l3 != plan.slots[1].l3
+    assert all(slot.worker_exclusive for slot in plan.slots)
+
+
+def test_intel_oito_navegadores_concentra_workers(tmp_path):
+    topology = topologia(tmp_path, "intel_8c16t")
+    plan = plan_placement(topology, 8)
+    workers = plan.worker_cpus()
+    # 8 workers em 4 núcleos (2 threads cada), sem repetir CPU
+    assert len(set(workers)) == 8
+    assert len({nucleo(topology, cpu) for cpu in workers}) == 4
+    assert not any(slot.worker_exclusive for slot in plan.slots)
+
+
+def test_hibrido_nao_divide_nucleo_p_com_chrome(tmp_path):
+    topology = topologia(tmp_path, "alder_lake_12600k")
+    plan = plan_placement(topology, 2)
+    assert plan.system == {0, 1}
+    for slot in plan.slots:
+        assert slot.worker_exclusive
+        irmaos = nucleo(topology, slot.worker_cpu) - {slot.worker_cpu}
+        assert not irmaos & set().union(*plan.browser_sets())
+
+
+def test_cpus_permitidas_sao_respeitadas(tmp_path):
+    topology = topologia(tmp_path, "epyc_7313")
+    permitidas = set(range(4, 8)) | set(range(20, 24))
+    plan = plan_placement(topology, 2, allowed=permitidas)
+    for slot in plan.slots:
+        assert slot.browser_cpus | {slot.worker_cpu} <= permitidas
+
+
+def test_sem_cpus_para_reservar_navegadores_usam_tudo(tmp_path):
+    topology = topologia(tmp_path, "vm_4vcpu")
+    plan = plan_placement(topology, 1, allowed={0})
+    assert plan.system == set()
+    assert plan.slots[0].worker_cpu == 0
@@ -0,0 +1,25 @@
+"""Um único cache de elementos entre localize (navegador.operacoes) e o clique."""
+import ast
+import logging
+import os
+
+import navegador.operacoes as operacoes
+from src.click_manager.precision_click_manager import LinuxPrecisionClickManager
+
+
+def test_manager_usa_o_cache_de_operacoes():
+    manager = LinuxPrecisionClickManager(max_workers=2, logger=logging.getLogger("teste"))
+    try:
+        assert manager.element_cache is operacoes.element_cache
+        assert manager.in_page_executor.element_cache is operacoes.element_cache
+    finally:
+        manager.cleanup()
+
+
+def test_main_importa_o_click_manager_pelo_pacote_src():
+    # "click_manager.*" carregaria uma segunda cópia de element_cache
+    with open(os.path.join(os.path.dirname(__file__), "..", "src", "main.py")) as f:
+        arvore = ast.parse(f.read())
+    modulos = [no.module for no in ast.walk(arvore) if isinstance(no, ast.ImportFrom) and no.module]
+    assert "src.click_manager.precision_click_manager" in modulos
+    assert not [m for m in modulos if m.split(".")[0] == "click_manager"]
@@ -0,0 +1,160 @@
+"""FleetScaler: crescimento, encolhimento e PSI com um pool falso."""
+import threading
+import time
+
+import pytest
+
+from navegador.frota import PASSO_CRESCIMENTO, FleetScaler
+from src.sistema.cgroup_v2 import ResourcePressure
+
+MIB = 1024 ** 2
+GIB = 1024 ** 3
+
+
+class PoolFalso:
+    """Mesma interface do BrowserPool usada pela frota: ativos, crescer() e encolher()."""
+
+    def __init__(self, ativos):
+        self.ativos = [object() for _ in range(ativos)]
+        self.crescimentos = []
+        self.encolhimentos = []
+
+    def crescer(self, quantidade):
+        self.crescimentos.append(quantidade)
+        self.ativos.extend(object() for _ in range(quantidade))
+        return quantidade
+
+    def encolher(self, quantidade):
+        self.encolhimentos.append(quantidade)
+        del self.ativos[len(self.ativos) - quantidade:]
+        return quantidade
+
+
+def criar_frota(ativos, rss=100 * MIB, cpu=0.5, livre=64 * GIB, **kwargs):
+    pool = PoolFalso(ativos)
+    config = {index: {"link": None, "xpaths": []} for index in range(ativos)}
+    performance = {'cores_por_instancia': 2, 'memoria_por_instancia': '2G'}
+    frota = FleetScaler(
+        pool, config, performance,
+        medidor=lambda drivers: [(rss, cpu)] * len(drivers),
+        memoria_disponivel=lambda: livre,
+        nucleos=10,
+        **kwargs
+    )
+    return frota, pool, config, performance
+
+
+def test_dimensionar_vai_direto_ao_alvo():
+    # 10 núcleos - 2 do sistema = 8 navegadores; memória e CPU medida não limitam
+    frota, pool, config, performance = criar_frota(2)
+    assert frota.dimensionar() == 8
+    assert pool.crescimentos == [6]
+    assert sorted(config) == list(range(8))
+    assert performance['cores_por_instancia'] == 2
+    # O orçamento configurado fica intacto; o RSS medido vai para outra chave
+    assert performance['memoria_por_instancia'] == "2G"
+    assert performance['rss_por_instancia'] == "100M"
+
+
+def test_cpu_medida_limita_o_alvo():
+    # 8 núcleos disponíveis / 2 núcleos por navegador
+    frota, pool, _, _ = criar_frota(2, cpu=2.0)
+    assert frota.dimensionar() == 4
+
+
+def test_ajustar_cresce_no_maximo_um_passo():
+    frota, pool, config, _ = criar_frota(2)
+    assert frota.ajustar() == 2 + PASSO_CRESCIMENTO
+    assert frota.ajustar() == 2 + 2 * PASSO_CRESCIMENTO
+    assert all(quantidade <= PASSO_CRESCIMENTO for quantidade in pool.crescimentos)
+    assert len(config) == len(pool.ativos)
+
+
+def test_ajustar_encolhe_de_uma_vez_sem_memoria():
+    # Sem memória livre: só cabem 80% dos 8 navegadores já abertos
+    frota, pool, config, _ = criar_frota(8, rss=GIB, livre=0)
+    assert frota.ajustar() == 6
+    assert pool.encolhimentos == [2]
+    assert sorted(config) == list(range(6))
+
+
+def test_maximo_limita_o_alvo():
+    frota, pool, _, _ = criar_frota(2, maximo=3)
+    assert frota.dimensionar() == 3
+
+
+def test_minimo_e_respeitado():
+    frota, pool, _, _ = criar_frota(3, rss=GIB, livre=0, minimo=3)
+    assert frota.ajustar() == 3
+    assert not pool.encolhimentos
+
+
+def _pressao(frota_psi, navegadores):
+    return lambda: (frota_psi, navegadores)
+
+
+def test_pressao_de_memoria_espalhada_encolhe_um():
+    psi = [ResourcePressure(memory_some=30.0) for _ in range(4)]
+    frota, pool, _, _ = criar_frota(4, pressao=_pressao(ResourcePressure(memory_some=25.0), psi))
+    assert frota.ajustar() == 3
+
+
+def test_pressao_de_um_navegador_contida_nao_encolhe():
+    psi = [ResourcePressure(memory_some=50.0)] + [ResourcePressure() for _ in range(3)]
+    frota, pool, _, _ = criar_frota(4, maximo=4, pressao=_pressao(ResourcePressure(memory_some=25.0), psi))
+    assert frota.ajustar() == 4
+    assert not pool.encolhimentos
+
+
+def test_pressao_de_cpu_impede_crescimento():
+    psi = [ResourcePressure() for _ in range(2)]
+    frota, pool, _, _ = criar_frota(2, pressao=_pressao(ResourcePressure(cpu_some=60.0), psi))
+    assert frota.ajustar() == 2
+    assert not pool.crescimentos
+
+
+def test_sem_psi_alvo_inalterado():
+    frota, pool, _, _ = criar_frota(2, pressao=lambda: (None, []))
+    assert frota.dimensionar() == 8
+
+
+def test_laco_em_segundo_plano_adiado_durante_comandos():
+    em_uso = threading.Event()
+    em_uso.set()
+    frota, pool, _, _ = criar_frota(2, em_uso=em_uso.is_set, intervalo=0.01)
+    frota.iniciar()
+    try:
+        time.sleep(0.1)
+        assert len(pool.ativos) == 2
+
+        em_uso.clear()
+        prazo = time.monotonic() + 2
+        while len(pool.ativos) < 8 and time.monotonic() < prazo:
+            time.sleep(0.01)
+        assert len(pool.ativos) == 8
+    finally:
+        frota.parar()
+    assert not frota._thread.is_alive()
+
+
+def test_comando_iniciado_durante_a_medicao_adia_o_ajuste():
+    frota, pool, _, _ = criar_frota(2)
+    ocupada = threading.Event()
+    medidor = frota.medidor
+
+    def medir_e_ocupar(drivers):
+        # Um comando começa enquanto a medição está em andamento
+        ocupada.set()
+        return medidor(drivers)
+
+    frota.medidor = medir_e_ocupar
+    frota.em_uso = ocupada.is_set
+    assert frota.ajustar() == 2
+    assert not pool.crescimentos
+
+
+@pytest.mark.parametrize("ativos", [2, 5])
+def test_config_acompanha_o_pool(ativos):
+    frota, pool, config, _ = criar_frota(ativos, maximo=ativos)
+    frota.ajustar()
+    assert sorted(config) == list(range(len(pool.ativos)))
@@ -0,0 +1,126 @@
+"""BrowserPool: substituição concorrente com a frota encolhendo ou outra troca."""
+import threading
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from navegador.pool_navegadores import BrowserPool
+from src.click_manager.latency_model import DriverLatencyModel
+
+
+class DriverFalso:
+    def __init__(self, nome):
+        self.nome = nome
+        self.session_id = nome
+        self.encerramentos = 0
+
+    def execute_script(self, script, *args):
+        if self.session_id is None:
+            raise RuntimeError("sessão encerrada")
+        return 1
+
+    def quit(self):
+        self.encerramentos += 1
+        self.session_id = None
+
+
+class Fabrica:
+    """Abre DriverFalso; com `liberar` definido, a abertura espera o evento (abertura lenta)."""
+
+    def __init__(self):
+        self.abertos = []
+        self.liberar = None
+        self.iniciou = threading.Event()
+
+    def __call__(self, index, tempos):
+        if self.liberar is not None:
+            self.iniciou.set()
+            self.liberar.wait(5)
+        driver = DriverFalso(f"chrome-{len(self.abertos)}")
+        self.abertos.append(driver)
+        return driver
+
+
+def criar_pool(ativos, reservas=0):
+    fabrica = Fabrica()
+    pool = BrowserPool(ativos, num_reservas=reservas, fabrica=fabrica, intervalo_abertura_s=0)
+    pool.iniciar()
+    return pool, fabrica
+
+
+def aguardar_encerramento(driver):
+    for _ in range(200):
+        if driver.encerramentos:
+            return
+        threading.Event().wait(0.005)
+
+
+def test_substituir_troca_e_fecha_o_antigo():
+    pool, _ = criar_pool(2, reservas=1)
+    antigo = pool.ativos[1]
+    novo = pool.substituir(1, antigo)
+    assert pool.ativos[1] is novo is not antigo
+    aguardar_encerramento(antigo)
+    assert antigo.encerramentos == 1
+
+
+def test_slot_removido_durante_a_abertura_nao_vaza_o_novo():
+    pool, fabrica = criar_pool(3)
+    antigo = pool.ativos[2]
+    fabrica.liberar = threading.Event()
+    resultado = []
+    troca = threading.Thread(target=lambda: resultado.append(pool.substituir(2, antigo)))
+    troca.start()
+    assert fabrica.iniciou.wait(5)
+
+    # A frota encolhe enquanto o navegador novo ainda abre
+    assert pool.encolher(1) == 1
+    fabrica.liberar.set()
+    troca.join(5)
+
+    assert resultado == [None]
+    assert len(pool.ativos) == 2
+    # O antigo é fechado uma vez só (por encolher) e o novo fica como reserva
+    threading.Event().wait(0.05)
+    assert antigo.encerramentos == 1
+    novo = fabrica.abertos[-1]
+    assert novo in pool.reservas and novo.encerramentos == 0
+
+
+def test_slot_ja_trocado_por_outra_thread_prevalece():
+    pool, fabrica = criar_pool(2)
+    antigo = pool.ativos[0]
+    primeiro = pool.substituir(0, antigo)
+    segundo = pool.substituir(0, antigo)
+    assert segundo is primeiro is pool.ativos[0]
+    aguardar_encerramento(antigo)
+    assert antigo.encerramentos == 1
+    # O navegador aberto pela segunda troca volta para as reservas
+    assert pool.reservas == [fabrica.abertos[-1]]
+
+
+def test_descarte_avisa_substituidos_e_removidos():
+    pool, _ = criar_pool(3)
+    descartados = []
+    pool.ao_descartar.append(descartados.append)
+    antigo = pool.ativos[0]
+    pool.substituir(0, antigo)
+    removido = pool.ativos[2]
+    pool.encolher(1)
+    aguardar_encerramento(antigo)
+    assert set(map(id, descartados)) == {id(antigo), id(removido)}
+
+
+def test_modelo_de_latencia_esquece_navegador_removido():
+    drivers = iter([FakeWebDriver(rtt_ms=0.0, jitter_ms=0.0, seed=i) for i in range(2)])
+    pool = BrowserPool(2, num_reservas=0, fabrica=lambda index, tempos: next(drivers), intervalo_abertura_s=0)
+    pool.iniciar()
+    modelo = DriverLatencyModel()
+    pool.ao_descartar.append(modelo.forget)
+    for driver in pool.ativos:
+        modelo.ensure_clock(driver, samples=2)
+        modelo.record_round_trip(id(driver), 400_000)
+
+    removido = pool.ativos[1]
+    pool.encolher(1)
+    assert id(removido) not in modelo.clocks
+    assert id(removido) not in modelo.half_trip_ns
+    assert id(pool.ativos[0]) in modelo.clocks
@@ -0,0 +1,38 @@
+"""Limites de cgroup por navegador: orçamento configurado x RSS medido pela frota."""
+import logging
+
+from navegador.posicionamento import FOLGA_MEMORIA_ALTA, FOLGA_MEMORIA_MAX, ProcessPlacementService
+from src.sistema.cpu_manager import CPUManager
+
+GIB = 1024 ** 3
+MIB = 1024 ** 2
+
+
+def servico(performance_config, **kwargs):
+    return ProcessPlacementService([], CPUManager(logging.getLogger("teste")),
+                                   performance_config=performance_config, **kwargs)
+
+
+def test_rss_de_abas_em_branco_nao_reduz_os_limites():
+    alta, maxima, nucleos = servico({
+        'memoria_por_instancia': '2G', 'rss_por_instancia': '200M', 'cores_por_instancia': 2
+    })._limites()
+    assert alta == int(2 * GIB * FOLGA_MEMORIA_ALTA)
+    assert maxima == int(2 * GIB * FOLGA_MEMORIA_MAX)
+    assert nucleos == 2
+
+
+def test_rss_medido_acima_do_orcamento_aumenta_os_limites():
+    alta, maxima, _ = servico({'memoria_por_instancia': '2G', 'rss_por_instancia': '3072M'})._limites()
+    assert alta == int(3072 * MIB * FOLGA_MEMORIA_ALTA)
+    assert maxima == int(3072 * MIB * FOLGA_MEMORIA_MAX)
+
+
+def test_memoria_max_fixa_limita_memory_high():
+    alta, maxima, _ = servico({'memoria_por_instancia': '2G'}, memoria_max='2G')._limites()
+    assert maxima == 2 * GIB
+    assert alta == 2 * GIB
+
+
+def test_sem_orcamento_sem_limites():
+    assert servico({})._limites() == (None, None, None)
@@ -0,0 +1,99 @@
+"""InPageScheduledClickExecutor com páginas falsas que imitam o agendador da página."""
+import logging
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from src.click_manager.element_cache import ElementCache
+from src.click_manager.scheduled_click import (
+    CLOCK_SCRIPT,
+    SCHEDULER_ARM_SCRIPT,
+    SCHEDULER_DISARM_SCRIPT,
+    SCHEDULER_INSTALL_SCRIPT,
+    SCHEDULER_RESULT_SCRIPT,
+    InPageScheduledClickExecutor,
+    ScheduledClickError,
+)
+
+XPATH = "//button[@id='alvo']"
+
+
+class PaginaComAgendador(FakeWebDriver):
+    """
+    FakeWebDriver com o window.__cliqueScheduler simulado: arm() agenda o
+    clique com um timer no prazo (relógio da página), disarm() o cancela.
+
+    Args:
+        recusa: A página responde {armed: false} a toda armação
+    """
+
+    def __init__(self, recusa=False, **kwargs):
+        super().__init__(rtt_ms=0.0, jitter_ms=0.0, **kwargs)
+        self.recusa = recusa
+        self.timer = None
+        self.resultado = None
+
+    def _agora_ms(self):
+        return self.time_origin + (time.monotonic_ns() - self.origin_ns) / 1e6
+
+    def _disparar(self, deadline):
+        self.click_times.append(time.monotonic_ns())
+        self.resultado = {'deadline': deadline, 'fired': self._agora_ms()}
+
+    def _desarmar(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = None
+        self.resultado = None
+
+    def execute_script(self, script, *args):
+        if script == SCHEDULER_INSTALL_SCRIPT:
+            return self.time_origin
+        if script == CLOCK_SCRIPT:
+            return [self.time_origin, self._agora_ms() - self.time_origin]
+        if script == SCHEDULER_ARM_SCRIPT:
+            self._desarmar()
+            _, deadline, _ = args
+            agora = self._agora_ms()
+            if self.recusa or agora >= deadline:
+                return {'armed': False, 'now': agora}
+            self.timer = threading.Timer((deadline - agora) / 1000, self._disparar, args=(deadline,))
+            self.timer.start()
+            return {'armed': True, 'now': agora}
+        if script == SCHEDULER_DISARM_SCRIPT:
+            self._desarmar()
+            return None
+        if script == SCHEDULER_RESULT_SCRIPT:
+            return self.resultado
+        return super().execute_script(script, *args)
+
+
+def criar_executor():
+    return InPageScheduledClickExecutor(logging.getLogger("teste"), element_cache=ElementCache())
+
+
+def test_todas_as_paginas_disparam():
+    drivers = [PaginaComAgendador(seed=i) for i in range(3)]
+    assert criar_executor().execute_synchronized_clicks(drivers, [XPATH] * 3)
+    assert all(len(driver.click_times) == 1 for driver in drivers)
+
+
+def test_recusa_de_uma_pagina_desarma_as_outras():
+    drivers = [PaginaComAgendador(seed=0), PaginaComAgendador(recusa=True, seed=1), PaginaComAgendador(seed=2)]
+    executor = criar_executor()
+    with pytest.raises(ScheduledClickError, match=r"sem disparo: \[1\]"):
+        executor.arm(drivers, [XPATH] * 3, delay_ns=30_000_000)
+
+    # Passado o prazo, nenhuma página disparou
+    time.sleep(0.08)
+    assert all(driver.click_times == [] for driver in drivers)
+    assert all(driver.timer is None for driver in drivers)
+
+
+def test_falha_reportada_sem_clique_parcial():
+    drivers = [PaginaComAgendador(seed=0), PaginaComAgendador(recusa=True, seed=1)]
+    assert not criar_executor().execute_synchronized_clicks(drivers, [XPATH] * 2)
+    time.sleep(0.08)
+    assert all(driver.click_times == [] for driver in drivers)